@@ -0,0 +1,9 @@
+"""
+Benchmarks de rendimiento - BienestarUPC
+Ejecutar desde la raíz del proyecto, por ejemplo:
+    python -m benchmarks.bench_schema
+
+Suite con líneas base y detección de regresiones:
+    python -m benchmarks.suite run --output benchmarks/baselines/base.json
+    python -m benchmarks.suite compare benchmarks/baselines/base.json benchmarks/baselines/latest.json
+"""
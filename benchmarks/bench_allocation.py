@@ -0,0 +1,173 @@
+"""
+Benchmark: asignación de cupos en lote vs. orden de llegada
+
+Sobre solicitudes sintéticas de deportes y cultura (demanda mayor que el
+cupo, horarios de clases y frecuencia_semanal) se mide:
+- Recepción de la ventana desde varios hilos (submit)
+- Asignación en lote (allocate) y verificación de las restricciones
+- Equidad frente a atender por orden de llegada con las mismas reglas
+- Orden de llegada con transacciones y bloqueos en SQLite (referencia)
+- Reasignación incremental al liberar cupos
+
+Uso:
+    python -m benchmarks.bench_allocation [n_solicitudes]
+"""
+
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.data import make_activity_groups, make_enrollment_requests
+from services.allocation import ActivityGroup, EnrollmentRequest, SlotAllocator
+
+THREADS = 8
+RELEASES = 500
+
+
+def satisfied(allocator: SlotAllocator, requests) -> tuple:
+    """(fracción de estudiantes con algún cupo, fracción con su primera opción)"""
+    students = {request.student for request in requests}
+    first_choice = {request.student: request.activity for request in requests if request.preference == 0}
+    with_any = sum(1 for student in students if allocator.assignments_of(student))
+    with_first = sum(1 for student, activity in first_choice.items()
+                     if any(assignment.activity == activity for assignment in allocator.assignments_of(student)))
+    return with_any / len(students), with_first / len(first_choice)
+
+
+def check_constraints(allocator: SlotAllocator, requests) -> bool:
+    """Cupos, cruces de horario y frecuencia_semanal de todas las asignaciones"""
+    limits, busy = {}, {}
+    for request in requests:
+        limits[(request.student, request.area)] = request.frecuencia_semanal
+        busy[request.student] = request.busy
+    for code, group in allocator.groups.items():
+        if len(allocator.members(code)) > group.capacity:
+            return False
+    for student in busy:
+        sessions, load = list(busy[student]), {}
+        for assignment in allocator.assignments_of(student):
+            group = allocator.groups[assignment.group]
+            sessions.extend(group.sessions)
+            load[group.area] = load.get(group.area, 0) + len(group.sessions)
+        if len(sessions) != len(set(sessions)):
+            return False
+        if any(total > limits[(student, area)] for area, total in load.items()):
+            return False
+    return True
+
+
+def first_come(groups, requests) -> SlotAllocator:
+    """Mismas reglas atendiendo cada solicitud al llegar (sin rondas ni sorteo)"""
+    allocator = SlotAllocator(groups, seed=0)
+    for request in requests:
+        allocator.submit(request)
+        allocator.allocate()
+    return allocator
+
+
+def sqlite_first_come(groups, requests) -> tuple:
+    """Orden de llegada con una transacción por solicitud desde varios hilos: (s, p99 ms, fallidas)"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cupos.db")
+        connection = sqlite3.connect(path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("CREATE TABLE grupos (codigo TEXT PRIMARY KEY, actividad TEXT, libres INTEGER)")
+        connection.execute("CREATE TABLE inscripciones (estudiante TEXT, actividad TEXT, grupo TEXT, "
+                           "PRIMARY KEY (estudiante, actividad))")
+        connection.executemany("INSERT INTO grupos VALUES (?, ?, ?)",
+                               [(group.code, group.activity, group.capacity) for group in groups])
+        connection.commit()
+        connection.close()
+        latencies, failures = [], []
+
+        def worker(chunk):
+            db = sqlite3.connect(path, timeout=1.0, isolation_level=None)
+            for request in chunk:
+                start = time.perf_counter()
+                try:
+                    db.execute("BEGIN IMMEDIATE")
+                    row = db.execute("SELECT codigo FROM grupos WHERE actividad = ? AND libres > 0 "
+                                     "ORDER BY libres DESC LIMIT 1", (request.activity,)).fetchone()
+                    if row:
+                        db.execute("UPDATE grupos SET libres = libres - 1 WHERE codigo = ?", row)
+                        db.execute("INSERT OR IGNORE INTO inscripciones VALUES (?, ?, ?)",
+                                   (request.student, request.activity, row[0]))
+                    db.execute("COMMIT")
+                except sqlite3.OperationalError:
+                    failures.append(request)
+                    if db.in_transaction:
+                        db.execute("ROLLBACK")
+                latencies.append((time.perf_counter() - start) * 1000)
+            db.close()
+
+        threads = [threading.Thread(target=worker, args=(requests[index::THREADS],)) for index in range(THREADS)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - start
+    ordered = sorted(latencies)
+    return seconds, ordered[int(len(ordered) * 0.99) - 1], len(failures)
+
+
+def run(n: int = 20_000) -> dict:
+    groups = [ActivityGroup(**group) for group in make_activity_groups()]
+    requests = [EnrollmentRequest(**request) for request in make_enrollment_requests(n)]
+    results = {"requests": n, "groups": len(groups), "capacity": sum(group.capacity for group in groups)}
+
+    allocator = SlotAllocator(groups, seed=23)
+    start = time.perf_counter()
+    threads = [threading.Thread(target=lambda chunk: [allocator.submit(request) for request in chunk],
+                                args=(requests[index::THREADS],)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results["submit_seconds"] = time.perf_counter() - start
+
+    result = allocator.allocate()
+    results["allocate"] = (result.seconds, len(result.assigned), result.waitlisted, len(result.rejected))
+    results["valid"] = check_constraints(allocator, requests)
+    results["batch_fairness"] = satisfied(allocator, requests)
+
+    start = time.perf_counter()
+    arrival = first_come(groups, requests)
+    results["first_come_seconds"] = time.perf_counter() - start
+    results["first_come_fairness"] = satisfied(arrival, requests)
+    results["sqlite"] = sqlite_first_come(groups, requests)
+
+    rng = random.Random(5)
+    released = rng.sample(result.assigned, RELEASES)
+    timings, refilled = [], 0
+    for assignment in released:
+        start = time.perf_counter()
+        refilled += len(allocator.release(assignment.student, assignment.activity))
+        timings.append((time.perf_counter() - start) * 1000)
+    results["release"] = (statistics.median(timings), max(timings), refilled)
+    results["valid_after_release"] = check_constraints(allocator, requests)
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    result = run(n)
+    print(f"Solicitudes: {result['requests']:,}; grupos: {result['groups']} ({result['capacity']:,} cupos)")
+    print(f"Ventana ({THREADS} hilos): {result['submit_seconds'] * 1000:.1f} ms")
+    seconds, assigned, waitlisted, rejected = result["allocate"]
+    print(f"Asignación en lote: {seconds:.2f} s; {assigned:,} asignadas, {waitlisted:,} en espera, "
+          f"{rejected:,} rechazadas; restricciones cumplidas: {result['valid']}")
+    for name, label in (("batch_fairness", "En lote"), ("first_come_fairness", "Orden de llegada")):
+        with_any, with_first = result[name]
+        print(f"{label + ':':18} {with_any:.1%} de estudiantes con cupo, {with_first:.1%} con su primera opción")
+    print(f"Orden de llegada en memoria: {result['first_come_seconds']:.2f} s")
+    seconds, p99, failures = result["sqlite"]
+    print(f"Orden de llegada en SQLite ({THREADS} hilos): {seconds:.2f} s, p99 {p99:.1f} ms, {failures:,} fallidas")
+    median, worst, refilled = result["release"]
+    print(f"Liberar un cupo: {median:.3f} ms mediana, {worst:.2f} ms máx.; {refilled:,} reasignadas "
+          f"de {RELEASES} liberadas; restricciones cumplidas: {result['valid_after_release']}")
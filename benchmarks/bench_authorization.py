@@ -0,0 +1,68 @@
+"""
+Benchmark: comprobación de permisos con máscaras de bits vs. búsqueda en listas
+
+Uso:
+    python -m benchmarks.bench_authorization [n_comprobaciones]
+"""
+
+import random
+import sys
+import time
+
+from config import ROLES_CONFIG
+from services.authorization import Authorizer
+
+USER_ROLES = [("estudiante",), ("profesor",), ("administrativo",), ("egresado",), ("profesor", "egresado")]
+PERMISSIONS = [
+    "read_own_profile", "generate_reports", "alumni_services",
+    "view_student_activities", "admin_functions", "request_assistance",
+]
+
+
+def list_check(roles, permission) -> bool:
+    """Comprobación original: recorrer la lista de permisos de cada rol"""
+    return any(permission in ROLES_CONFIG[role]["default_permissions"] for role in roles)
+
+
+def run(n: int = 2_000_000) -> dict:
+    generator = random.Random(12)
+    users = [(user_id, USER_ROLES[user_id % len(USER_ROLES)]) for user_id in range(1_000)]
+    checks = [(generator.randrange(len(users)), generator.choice(PERMISSIONS)) for _ in range(n)]
+
+    authorizer = Authorizer()
+    for user_id, roles in users:
+        authorizer.user_mask(user_id, roles)
+
+    start = time.perf_counter()
+    expected = [list_check(users[user_id][1], permission) for user_id, permission in checks]
+    list_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    user_can = authorizer.user_can
+    result = [user_can(user_id, permission) for user_id, permission in checks]
+    method_seconds = time.perf_counter() - start
+    assert result == expected
+
+    # Ruta más rápida: máscara del usuario y bit del permiso ya resueltos
+    bits = {permission: authorizer.bit(permission) for permission in PERMISSIONS}
+    masks = {user_id: authorizer.user_mask(user_id).granted for user_id, _ in users}
+    start = time.perf_counter()
+    result = [masks[user_id] & bits[permission] != 0 for user_id, permission in checks]
+    inline_seconds = time.perf_counter() - start
+    assert result == expected
+
+    return {
+        "checks": n,
+        "list_per_second": n / list_seconds,
+        "user_can_per_second": n / method_seconds,
+        "inline_mask_per_second": n / inline_seconds,
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    result = run(n)
+    print(f"Comprobaciones: {result['checks']:,}")
+    print(f"Listas de ROLES_CONFIG: {result['list_per_second'] / 1e6:.2f} M/s")
+    print(f"Authorizer.user_can:    {result['user_can_per_second'] / 1e6:.2f} M/s")
+    print(f"Máscara precalculada:   {result['inline_mask_per_second'] / 1e6:.2f} M/s")
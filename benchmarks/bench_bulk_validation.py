@@ -0,0 +1,145 @@
+"""
+Benchmark: escalamiento de la validación masiva por fragmentos en un pool de procesos
+
+Sobre estudiantes sintéticos (una fracción con email, celular o documento
+inválidos) se mide:
+- Tamaño y tiempo de serialización de un fragmento como lista de
+  diccionarios vs. columnar
+- Validación y enriquecimiento en un solo proceso con el ciclo simple por
+  registro (referencia)
+- BulkValidator con 1, 2, 4, ... procesos hasta el número de núcleos:
+  tiempo, aceleración y eficiencia
+- Que los errores coincidan con la referencia y que el reporte combinado
+  sea idéntico con cualquier número de procesos
+- El mismo número de procesos leyendo un iterable (fragmentos columnares)
+- Fracción serial por fragmento (en el proceso principal: columnas, pickle
+  y recibir el reporte) frente al trabajo de los procesos (validación y
+  enriquecimiento), medidas sin competir por núcleos, con la lista
+  compartida y con fragmentos columnares, y aceleración proyectada con la
+  ley de Amdahl
+
+Uso:
+    python -m benchmarks.bench_bulk_validation [n_registros] [max_procesos]
+"""
+
+import os
+import pickle
+import random
+import sys
+import time
+
+from benchmarks.data import make_people
+from models.validators import compile_schema
+from services.bulk_validation import ENRICHERS, BulkValidator, to_columns, validate_columns, validate_records
+
+SHARD_SIZE = 20_000
+ENRICH = ("edad", "documento_formateado", "email_normalizado")
+
+
+def invalid_people(n: int):
+    rng = random.Random(25)
+    people = make_people(n)
+    for person in rng.sample(people, n // 20):
+        field = rng.choice(("email", "cel", "numero_documento"))
+        person[field] = {"email": "sin-arroba", "cel": "12345", "numero_documento": "12"}[field]
+    return people
+
+
+def worker_counts(maximum: int):
+    counts, workers = [], 1
+    while workers < maximum:
+        counts.append(workers)
+        workers *= 2
+    return counts + [maximum]
+
+
+def run(n: int = 200_000, max_workers: int = 0) -> dict:
+    people = invalid_people(n)
+    results = {"records": n, "cores": os.cpu_count() or 1}
+
+    validator = BulkValidator("estudiante", workers=1, shard_size=SHARD_SIZE, enrich=ENRICH)
+    shard = people[:SHARD_SIZE]
+
+    def columnar(chunk):
+        return to_columns(chunk, validator.columns, validator.dated)
+
+    for label, convert in (("dicts", list), ("columns", columnar)):
+        start = time.perf_counter()
+        data = pickle.dumps(convert(shard), protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.loads(data)
+        results[label] = (len(data) / len(shard), (time.perf_counter() - start) * 1000)
+
+    reference = compile_schema().for_estamento("estudiante")
+    functions = [ENRICHERS[name][1] for name in ENRICH]
+    start = time.perf_counter()
+    expected = []
+    for index, person in enumerate(people):
+        problems = reference.validate(person)
+        expected.extend((index, variable, reason) for variable, reason in problems)
+        if not problems:
+            [function(person) for function in functions]
+    results["reference_seconds"] = time.perf_counter() - start
+
+    # Trabajo del proceso principal vs. de los procesos, fragmento por fragmento en un solo proceso
+    results["serial"] = {"shared": [0.0, 0.0], "columns": [0.0, 0.0]}
+    for first in range(0, n, SHARD_SIZE):
+        # Lista heredada con fork: el proceso principal solo recibe el reporte
+        start = time.perf_counter()
+        report = validate_records(validator.validator, ENRICH, people[first:first + SHARD_SIZE], 0, first)
+        middle = time.perf_counter()
+        pickle.loads(pickle.dumps(report, protocol=pickle.HIGHEST_PROTOCOL))
+        results["serial"]["shared"][0] += time.perf_counter() - middle
+        results["serial"]["shared"][1] += middle - start
+        # Fragmento columnar: además arma las columnas y las serializa
+        start = time.perf_counter()
+        data = pickle.dumps((0, first, columnar(people[first:first + SHARD_SIZE])), protocol=pickle.HIGHEST_PROTOCOL)
+        middle = time.perf_counter()
+        shard_number, shard_start, batch = pickle.loads(data)
+        report = validate_columns(validator.validator, ENRICH, batch, shard_number, shard_start)
+        end = time.perf_counter()
+        pickle.loads(pickle.dumps(report, protocol=pickle.HIGHEST_PROTOCOL))
+        results["serial"]["columns"][0] += middle - start + time.perf_counter() - end
+        results["serial"]["columns"][1] += end - middle
+    for mode, (serial, parallel) in results["serial"].items():
+        results["serial"][mode] = serial / (serial + parallel)
+
+    results["scaling"] = []
+    reports = []
+    for workers in worker_counts(max_workers or max(results["cores"], 2)):
+        report = BulkValidator("estudiante", workers=workers, shard_size=SHARD_SIZE, enrich=ENRICH).run(people)
+        results["scaling"].append((workers, report.seconds, report.worker_seconds))
+        reports.append(report)
+    workers = results["scaling"][-1][0]
+    start = time.perf_counter()
+    reports.append(BulkValidator("estudiante", workers=workers, shard_size=SHARD_SIZE, enrich=ENRICH).run(iter(people)))
+    results["columns_seconds"] = (workers, time.perf_counter() - start)
+    results["invalid"] = reports[0].records - reports[0].valid
+    results["same_errors"] = reports[0].errors == expected
+    results["same_reports"] = all((report.errors, report.counts, report.valid)
+                                  == (reports[0].errors, reports[0].counts, reports[0].valid) for report in reports)
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    maximum = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    result = run(n, maximum)
+    print(f"Registros: {result['records']:,} ({result['invalid']:,} inválidos); núcleos: {result['cores']}")
+    for name, label in (("dicts", "Lista de diccionarios"), ("columns", "Columnar")):
+        size, milliseconds = result[name]
+        print(f"Fragmento {label + ':':23} {size:6.1f} bytes/registro, "
+              f"conversión + pickle + unpickle {milliseconds:6.1f} ms")
+    print(f"Referencia (ciclo por registro, 1 proceso): {result['reference_seconds']:.2f} s")
+    base = result["scaling"][0][1]
+    for workers, seconds, worker_seconds in result["scaling"]:
+        speedup = base / seconds
+        print(f"{workers:3d} proceso(s): {seconds:7.2f} s; aceleración {speedup:5.2f}x, "
+              f"eficiencia {speedup / workers:5.1%} (validación {worker_seconds:.2f} s)")
+    workers, seconds = result["columns_seconds"]
+    print(f"{workers:3d} proceso(s) leyendo un iterable (fragmentos columnares): {seconds:7.2f} s")
+    for mode, label in (("shared", "lista compartida"), ("columns", "fragmentos columnares")):
+        serial = result["serial"][mode]
+        projected = ", ".join(f"{cores} núcleos {1 / (serial + (1 - serial) / cores):.1f}x" for cores in (8, 16, 32))
+        print(f"Fracción serial ({label}): {serial:.1%}; proyección (Amdahl): {projected}")
+    print(f"Errores iguales a la referencia: {result['same_errors']}; "
+          f"reporte idéntico con cualquier número de procesos: {result['same_reports']}")
@@ -0,0 +1,74 @@
+"""
+Benchmark: upsert masivo (executemany por lotes) vs. inserción fila por fila en SQLite
+
+Uso:
+    python -m benchmarks.bench_database [n_registros]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from services.database import PERSON_TABLE, ConnectionPool, Database, adapt_value, quote_identifier
+from benchmarks.data import make_people
+
+
+def make_database(path: str) -> Database:
+    pool = ConnectionPool({"engine": "sqlite", "sqlite_path": path, "pool_size": 2, "batch_size": 5000})
+    database = Database(pool)
+    database.create_schema()
+    return database
+
+
+def row_at_a_time(database: Database, records) -> None:
+    """Una sentencia y un commit por registro"""
+    with database.pool.connection() as connection:
+        for record in records:
+            columns = [column for column in record if column in database.tables[PERSON_TABLE].columns]
+            connection.execute(
+                f"INSERT OR REPLACE INTO {PERSON_TABLE} ({', '.join(quote_identifier(c) for c in columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                [adapt_value(record[column]) for column in columns],
+            )
+            connection.commit()
+
+
+def run(n: int = 100_000) -> dict:
+    people = make_people(n)
+    with tempfile.TemporaryDirectory() as directory:
+        database = make_database(os.path.join(directory, "bulk.db"))
+        start = time.perf_counter()
+        database.upsert_persons("estudiante", people)
+        bulk_seconds = time.perf_counter() - start
+        assert database.count(PERSON_TABLE) == len({p["numero_documento"] for p in people})
+
+        # Segunda pasada: todos los registros ya existen (ruta de actualización)
+        start = time.perf_counter()
+        database.upsert_persons("estudiante", people)
+        update_seconds = time.perf_counter() - start
+        database.pool.close()
+
+        sample = people[: min(n, 5_000)]
+        database = make_database(os.path.join(directory, "rows.db"))
+        start = time.perf_counter()
+        row_at_a_time(database, sample)
+        row_seconds = time.perf_counter() - start
+        database.pool.close()
+
+    # Cada persona son dos filas: personas y estamento_estudiante
+    return {
+        "records": n,
+        "bulk_rows_per_second": 2 * n / bulk_seconds,
+        "update_rows_per_second": 2 * n / update_seconds,
+        "row_at_a_time_rows_per_second": len(sample) / row_seconds,
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    result = run(n)
+    print(f"Personas: {result['records']:,} ({2 * result['records']:,} filas en personas + estamento_estudiante)")
+    print(f"Upsert masivo (inserción):    {result['bulk_rows_per_second']:,.0f} filas/s")
+    print(f"Upsert masivo (actualización): {result['update_rows_per_second']:,.0f} filas/s")
+    print(f"Fila por fila:                {result['row_at_a_time_rows_per_second']:,.0f} filas/s")
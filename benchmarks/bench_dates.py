@@ -0,0 +1,65 @@
+"""
+Benchmark: conversión de fechas con el ciclo de strptime original vs. DateTimeParser
+
+Columnas en '%d/%m/%Y' (formato de las exportaciones de registro académico,
+el último que probaba safe_cast) y en ISO.
+
+Uso:
+    python -m benchmarks.bench_dates [n_valores]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import utils
+
+
+def legacy_safe_cast(value, default=None):
+    """Ciclo original de safe_cast(value, datetime) para textos"""
+    for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y']:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return default
+
+
+def make_column(n: int, fmt: str, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    base = datetime(1980, 1, 1)
+    return [(base + timedelta(days=rng.randint(0, 16_000))).strftime(fmt) for _ in range(n)]
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run(n: int = 200_000) -> dict:
+    results = {}
+    for fmt in ("%d/%m/%Y", "%Y-%m-%d", "%Y-%m-%d %H:%M:%S"):
+        column = make_column(n, fmt)
+        legacy_time, expected = _timed(lambda: [legacy_safe_cast(v) for v in column])
+        scalar_time, scalar = _timed(lambda: [utils.safe_cast(v, datetime) for v in column])
+        column_time, parsed = _timed(lambda: utils.parse_datetime_column(column))
+        array_time, _ = _timed(lambda: utils.parse_datetime_array(column))
+        assert scalar == expected and parsed == expected
+        results[fmt] = {
+            "legacy_seconds": legacy_time,
+            "safe_cast_seconds": scalar_time,
+            "column_seconds": column_time,
+            "array_seconds": array_time,
+            "speedup": legacy_time / column_time if column_time else float("inf"),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    for fmt, result in run(n).items():
+        print(f"{fmt:<20} original {result['legacy_seconds']:.3f}s | safe_cast {result['safe_cast_seconds']:.3f}s "
+              f"| columna {result['column_seconds']:.3f}s | arreglo {result['array_seconds']:.3f}s "
+              f"| {result['speedup']:.1f}x")
@@ -0,0 +1,94 @@
+"""
+Benchmark: detección de personas duplicadas con bloqueo y MinHash/LSH
+
+Sobre personas sintéticas de varias fuentes con duplicados conocidos
+(make_duplicate_feed) se mide:
+- Indexación y comparación de todo el conjunto en un solo lote
+- Pares comparados frente a todos los pares posibles n(n-1)/2
+- Exhaustividad y precisión frente a los duplicados reales
+- Lotes incrementales: el último 10% llega en 5 lotes sobre lo ya indexado
+- Comparación en el proceso actual vs. pool de procesos (muestra de 50.000)
+
+Uso:
+    python -m benchmarks.bench_dedup [n_personas] [procesos]
+"""
+
+import os
+import sys
+
+from benchmarks.data import make_duplicate_feed
+from services.dedup import DedupEngine
+
+INCREMENTAL_BATCHES = 5
+POOL_SAMPLE = 50_000
+
+
+def quality(engine: DedupEngine, truth) -> tuple:
+    """(exhaustividad, precisión): duplicados reales en el mismo grupo / pares encontrados correctos"""
+    groups = clusters_by_id(engine)
+    recalled = sum(1 for first, second in truth if second in groups.get(first, ()))
+    # Dos copias de la misma persona también son un acierto
+    original = {copy: first for first, copy in truth}
+    correct = sum(1 for match in engine.matches
+                  if original.get(match.first, match.first) == original.get(match.second, match.second))
+    return recalled / len(truth), correct / len(engine.matches) if engine.matches else 1.0
+
+
+def clusters_by_id(engine: DedupEngine) -> dict:
+    groups = {}
+    for group in engine.clusters():
+        members = frozenset(group)
+        for record_id in group:
+            groups[record_id] = members
+    return groups
+
+
+def run(n: int = 500_000, workers: int = 0) -> dict:
+    people, truth = make_duplicate_feed(n)
+    results = {"records": n, "true_pairs": len(truth), "all_pairs": n * (n - 1) // 2}
+
+    engine = DedupEngine(workers=1)
+    report = engine.add_batch(people, "id")
+    results["full"] = (report.seconds, report.candidates, len(report.matches))
+    results["quality"] = quality(engine, truth)
+
+    # El último 10% llega en lotes sobre lo ya indexado
+    split = n - n // 10
+    incremental = DedupEngine(workers=1)
+    initial = incremental.add_batch(people[:split], "id")
+    size = (n - split + INCREMENTAL_BATCHES - 1) // INCREMENTAL_BATCHES
+    batches = [incremental.add_batch(people[start:start + size], "id") for start in range(split, n, size)]
+    results["initial_seconds"] = initial.seconds
+    results["batches"] = [(batch.records, batch.seconds, batch.candidates, len(batch.matches)) for batch in batches]
+    results["same_incremental"] = clusters_by_id(incremental) == clusters_by_id(engine)
+    del engine, incremental
+
+    sample = people[:POOL_SAMPLE]
+    results["pool"] = {}
+    for label, processes in (("inline", 1), ("pool", workers or max(2, os.cpu_count() or 1))):
+        engine = DedupEngine(workers=processes)
+        engine.min_parallel_pairs = 0 if processes > 1 else engine.min_parallel_pairs
+        report = engine.add_batch(sample, "id")
+        results["pool"][label] = (processes, report.seconds, sorted(report.matches))
+    results["same_pool"] = results["pool"]["inline"][2] == results["pool"]["pool"][2]
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    result = run(n, processes)
+    seconds, candidates, matches = result["full"]
+    recall, precision = result["quality"]
+    print(f"Personas: {result['records']:,} ({result['true_pairs']:,} duplicados reales)")
+    print(f"Un solo lote: {seconds:8.2f} s; {matches:,} duplicados")
+    print(f"Pares comparados: {candidates:,} de {result['all_pairs']:,} "
+          f"({candidates / result['all_pairs']:.2e})")
+    print(f"Exhaustividad: {recall:.4f}; precisión: {precision:.4f}")
+    print(f"Incremental: índice inicial {result['initial_seconds']:.2f} s")
+    for records, seconds, candidates, matches in result["batches"]:
+        print(f"  lote de {records:,}: {seconds:6.2f} s, {candidates:,} pares, {matches:,} duplicados")
+    print(f"Mismos grupos que en un solo lote: {result['same_incremental']}")
+    for label, (processes, seconds, _) in result["pool"].items():
+        print(f"{POOL_SAMPLE:,} personas, {processes} proceso(s) ({label}): {seconds:6.2f} s")
+    print(f"Mismos duplicados con pool: {result['same_pool']}")
@@ -0,0 +1,71 @@
+"""
+Micro-benchmark: accesores de DataDictionary vs. vistas compartidas inmutables
+
+Mide tiempo por llamada y bloques de memoria asignados por llamada (tracemalloc).
+
+Uso:
+    python -m benchmarks.bench_dictionary [n_llamadas]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from models.data_dictionary import DataDictionary, get_shared_dictionary
+
+ACCESSORS = {
+    "get_variables_by_estamento": lambda d: d.get_variables_by_estamento("estudiante"),
+    "get_variables_by_area": lambda d: d.get_variables_by_area("deportes"),
+    "get_obligatory_variables": lambda d: d.get_obligatory_variables(),
+    "get_all_variables": lambda d: d.get_all_variables(),
+}
+
+
+def allocations_per_call(fn, data_dict, calls: int = 1000) -> float:
+    """Bloques de memoria que siguen vivos tras cada llamada (resultado retenido)"""
+    results = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(calls):
+        results.append(fn(data_dict))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename")
+                 if not stat.traceback[0].filename.endswith("bench_dictionary.py"))
+    return max(blocks, 0) / calls
+
+
+def seconds_per_call(fn, data_dict, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn(data_dict)
+    return (time.perf_counter() - start) / calls
+
+
+def run(calls: int = 200_000) -> dict:
+    """Compara el DataDictionary original con la vista compartida"""
+    original = DataDictionary()
+    shared = get_shared_dictionary()
+    results = {}
+    for name, fn in ACCESSORS.items():
+        results[name] = {
+            "original_ns": seconds_per_call(fn, original, calls) * 1e9,
+            "shared_ns": seconds_per_call(fn, shared, calls) * 1e9,
+            "original_blocks_per_call": allocations_per_call(fn, original),
+            "shared_blocks_per_call": allocations_per_call(fn, shared),
+        }
+    start = time.perf_counter()
+    DataDictionary()
+    results["construccion_ns"] = (time.perf_counter() - start) * 1e9
+    return results
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    results = run(calls)
+    for name, result in results.items():
+        if not isinstance(result, dict):
+            continue
+        print(f"{name:<28} original {result['original_ns']:8.0f} ns ({result['original_blocks_per_call']:.1f} bloques) "
+              f"| compartido {result['shared_ns']:6.0f} ns ({result['shared_blocks_per_call']:.1f} bloques)")
+    print(f"DataDictionary() construcción: {results['construccion_ns']:.0f} ns")
@@ -0,0 +1,64 @@
+"""
+Benchmark: exportación incremental por update_date vs. exportación completa
+
+Con una población fija se modifican C registros y se mide la exportación
+de los cambios para un consumidor que ya estaba al día. El tiempo debe
+crecer con C y no con la población.
+
+Uso:
+    python -m benchmarks.bench_export [población]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.data import make_people
+from services.database import ConnectionPool, Database
+from services.export import ChangeExporter
+
+CHANGE_COUNTS = (100, 1_000, 10_000)
+
+
+def discard(records) -> None:
+    """Destino que solo consume los lotes (se mide la lectura, no la escritura)"""
+
+
+def run(population: int = 100_000) -> dict:
+    people = make_people(population)
+    with tempfile.TemporaryDirectory() as directory:
+        pool = ConnectionPool({"engine": "sqlite", "sqlite_path": os.path.join(directory, "export.db"),
+                               "pool_size": 2, "batch_size": 5000})
+        database = Database(pool)
+        database.create_schema()
+        database.upsert_persons("estudiante", people)
+        exporter = ChangeExporter(database)
+
+        start = time.perf_counter()
+        full = exporter.export("completo", discard)
+        full_seconds = time.perf_counter() - start
+
+        incremental = []
+        changed_at = datetime(2026, 1, 1)
+        for count in CHANGE_COUNTS:
+            changed_at += timedelta(days=1)
+            changes = [dict(person, update_date=changed_at + timedelta(seconds=index))
+                       for index, person in enumerate(people[:count])]
+            database.upsert_persons("estudiante", changes)
+            report = exporter.export("completo", discard)
+            incremental.append({"changes": count, "exported": report.records, "seconds": report.seconds})
+        pool.close()
+
+    return {"population": full.records, "full_seconds": full_seconds, "incremental": incremental}
+
+
+if __name__ == "__main__":
+    population = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    result = run(population)
+    print(f"Población: {result['population']:,}")
+    print(f"Exportación completa: {result['full_seconds'] * 1000:,.0f} ms")
+    for row in result["incremental"]:
+        print(f"Incremental con {row['changes']:>6,} cambios: {row['seconds'] * 1000:>8,.1f} ms "
+              f"({row['exported']:,} registros)")
@@ -0,0 +1,111 @@
+"""
+Benchmark: enmascaramiento por columnas vs. ramificación campo por campo
+
+La referencia recorre cada registro y decide por cada campo qué hacer
+(seudónimo, supresión o celda pequeña), como un filtro escrito a mano.
+MaskingStage aplica la política compilada columna por columna a cada lote.
+
+Uso:
+    python -m benchmarks.bench_masking [n_registros]
+"""
+
+import random
+import sys
+import time
+from collections import Counter
+
+from benchmarks.data import make_people
+from models.data_dictionary import get_shared_dictionary
+from services.masking import (
+    ACTION_PSEUDONYM,
+    ACTION_SUPPRESS,
+    SMALL_CELL_VALUE,
+    MaskingStage,
+    _flag,
+    compile_policy,
+    pseudonymizer,
+)
+
+BATCH_SIZE = 5000
+KEY = "clave-de-benchmark"
+
+
+def per_field_masking(records, policy, pseudonym):
+    """Referencia: decisión por campo en cada registro, con el mismo resultado"""
+    counts = {}
+    for column, action in policy.actions.items():
+        if action not in (ACTION_PSEUDONYM, ACTION_SUPPRESS):
+            counts[column] = Counter()
+    allowed = []
+    for record in records:
+        ok = _flag(record.get(policy.authorization)) and not _flag(record.get(policy.confidentiality))
+        allowed.append(ok)
+        if ok:
+            for column, counter in counts.items():
+                value = record.get(column)
+                if value is not None:
+                    counter[value] += 1
+    masked = []
+    for record, ok in zip(records, allowed):
+        out = {}
+        for name, value in record.items():
+            action = policy.actions.get(name)
+            if action is None:
+                out[name] = value
+            elif action == ACTION_SUPPRESS or value is None:
+                continue
+            elif action == ACTION_PSEUDONYM:
+                out[name] = pseudonym(value)
+            elif ok:
+                counter = counts[name]
+                if counter[value] >= policy.threshold:
+                    out[name] = value
+                elif sum(count for count in counter.values() if count < policy.threshold) >= policy.threshold:
+                    out[name] = SMALL_CELL_VALUE
+        masked.append(out)
+    return masked
+
+
+def run(n: int = 100_000) -> dict:
+    rng = random.Random(17)
+    diferencial = get_shared_dictionary().areas_bienestar_variables["diversidad_inclusion"]["poblacion_diferencial"]
+    people = make_people(n)
+    for person in people:
+        person["poblacion_diferencial"] = rng.choice(diferencial)
+        person["autorizacion_datos_sensibles"] = rng.random() < 0.9
+    batches = [people[start:start + BATCH_SIZE] for start in range(0, n, BATCH_SIZE)]
+    policy = compile_policy()
+    stage = MaskingStage(policy, key=KEY)
+    pseudonym = pseudonymizer(KEY)
+
+    start = time.perf_counter()
+    reference = [per_field_masking(batch, policy, pseudonym) for batch in batches]
+    per_field_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    masked = [stage.mask_records(batch) for batch in batches]
+    stage_seconds = time.perf_counter() - start
+
+    columnar = [{name: [record.get(name) for record in batch] for name in batch[0]} for batch in batches]
+    start = time.perf_counter()
+    for columns in columnar:
+        stage.mask_columns(columns)
+    columns_seconds = time.perf_counter() - start
+
+    return {
+        "records": n,
+        "same_result": reference == masked,
+        "per_field_seconds": per_field_seconds,
+        "stage_seconds": stage_seconds,
+        "columns_seconds": columns_seconds,
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    result = run(n)
+    print(f"Registros: {result['records']:,} (lotes de {BATCH_SIZE:,})")
+    print(f"Campo por campo:        {result['per_field_seconds'] * 1000:8,.0f} ms")
+    print(f"MaskingStage registros: {result['stage_seconds'] * 1000:8,.0f} ms")
+    print(f"MaskingStage columnas:  {result['columns_seconds'] * 1000:8,.0f} ms")
+    print(f"Mismo resultado: {result['same_result']}")
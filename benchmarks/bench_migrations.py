@@ -0,0 +1,219 @@
+"""
+Benchmark: despliegue de un diccionario nuevo con migración perezosa vs. reescritura completa
+
+El repositorio todavía no tiene migraciones reales (MIGRATIONS está vacío),
+así que el benchmark declara un historial de ejemplo (EXAMPLE_MIGRATIONS):
+se guardan personas con un esquema de la versión 1 (telefono en lugar de
+cel, valores anteriores de identidad_genero, sin confidencialidad_solicitada)
+y se despliega el diccionario actual como versión 3 de dos formas, sobre
+copias de la misma base SQLite:
+
+- Reescritura completa: todas las filas en una sola transacción; las
+  escrituras de la aplicación esperan (o fallan) mientras dura
+- Perezosa: evolve_schema (solo ALTER TABLE ADD COLUMN), lecturas que
+  actualizan en memoria y BackgroundMigrator por lotes pequeños
+
+En ambos casos se mide la latencia de escrituras concurrentes de la aplicación.
+
+Uso:
+    python -m benchmarks.bench_migrations [n_registros]
+"""
+
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from benchmarks.data import make_people
+from models.data_dictionary import DataDictionary
+from models.migrations import (BASE_VERSION, BackgroundMigrator, Migration, SchemaMigrator, _step, add_default,
+                               map_values, rename)
+from services.database import PERSON_TABLE, ConnectionPool, Database
+
+LEGACY_VALUES = {
+    "identidad_genero": ["Otro", "No responde"],
+    "expresion_genero": ["Otra", "No responde"],
+    "orientacion_sexual": ["Otra", "No responde"],
+}
+
+
+# Historial de ejemplo: solo existe en el benchmark, no en los datos reales
+EXAMPLE_MIGRATIONS = (
+    Migration(2, "Celular en lugar de teléfono; docentes con código de empleado", (
+        rename("telefono", "cel"),
+        rename("codigo_profesor", "codigo_empleado"),
+    )),
+    Migration(3, "Valores unificados de identidad y confidencialidad", (
+        map_values("identidad_genero", {"Otro": "Otra identidad de género", "No responde": "Prefiero no responder"}),
+        map_values("expresion_genero", {"Otra": "Otra expresión", "No responde": "Prefiero no responder"}),
+        map_values("orientacion_sexual", {"Otra": "Otra orientación", "No responde": "Prefiero no responder"}),
+        add_default("confidencialidad_solicitada", False),
+    )),
+)
+EXAMPLE_VERSION = EXAMPLE_MIGRATIONS[-1].version
+
+
+def example_migrator() -> SchemaMigrator:
+    return SchemaMigrator(EXAMPLE_MIGRATIONS, current=EXAMPLE_VERSION)
+
+
+def deployed_dictionary() -> DataDictionary:
+    """Diccionario actual desplegado como la última versión del historial de ejemplo"""
+    deployed = DataDictionary()
+    deployed.schema_version = EXAMPLE_VERSION
+    return deployed
+
+
+def legacy_dictionary() -> DataDictionary:
+    """Diccionario de la versión 1 (antes de EXAMPLE_MIGRATIONS)"""
+    legacy = DataDictionary()
+    legacy.schema_version = BASE_VERSION
+    variables = {}
+    for name, declared in legacy.identificacion_variables.items():
+        if name == "confidencialidad_solicitada":
+            continue
+        if name in LEGACY_VALUES:
+            declared = declared + LEGACY_VALUES[name]
+        variables["telefono" if name == "cel" else name] = declared
+    legacy.identificacion_variables = variables
+    return legacy
+
+
+def legacy_people(n: int):
+    rng = random.Random(20)
+    people = make_people(n)
+    for person in people:
+        person["telefono"] = person.pop("cel")
+        del person["confidencialidad_solicitada"]
+        for name, values in LEGACY_VALUES.items():
+            if rng.random() < 0.1:
+                person[name] = rng.choice(values)
+    return people
+
+
+def open_database(path: str, data_dict: DataDictionary, migrator: Optional[SchemaMigrator] = None) -> Database:
+    pool = ConnectionPool({"engine": "sqlite", "sqlite_path": path, "pool_size": 4, "batch_size": 5000})
+    return Database(pool, data_dict, migrator)
+
+
+def sequential_upgrade(record, version):
+    """Referencia: cada migración copia el registro e interpreta sus operaciones"""
+    for migration in EXAMPLE_MIGRATIONS[version - BASE_VERSION:]:
+        record = dict(record)
+        for operation in migration.operations:
+            _step(operation)(record)
+    return record
+
+
+def foreground_writes(database: Database, people, stop: threading.Event):
+    """Escrituras de la aplicación (una persona por transacción) hasta stop; latencias en ms y errores"""
+    rng = random.Random(7)
+    latencies, errors = [], 0
+    while not stop.is_set():
+        person = dict(rng.choice(people), estado_academico="Actualizado")
+        person["cel"] = person.pop("telefono")
+        start = time.perf_counter()
+        try:
+            database.upsert_persons("estudiante", [person])
+        except Exception:
+            errors += 1
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.002)
+    return latencies, errors
+
+
+def under_load(database: Database, people, work):
+    """Ejecuta work() con escrituras concurrentes; retorna (segundos, latencias, errores)"""
+    stop = threading.Event()
+    result = {}
+    writer = threading.Thread(target=lambda: result.update(zip(("latencies", "errors"),
+                                                               foreground_writes(database, people, stop))))
+    writer.start()
+    start = time.perf_counter()
+    work()
+    seconds = time.perf_counter() - start
+    stop.set()
+    writer.join()
+    return seconds, result["latencies"], result["errors"]
+
+
+def latency_summary(latencies):
+    ordered = sorted(latencies)
+    return statistics.median(ordered), ordered[int(len(ordered) * 0.99) - 1], ordered[-1]
+
+
+def run(n: int = 100_000) -> dict:
+    people = legacy_people(n)
+    # Las escrituras concurrentes usan personas distintas de las que se leen para comparar
+    written, read = people[:1000], people[1000:]
+    results = {"records": n}
+    with tempfile.TemporaryDirectory() as directory:
+        base = os.path.join(directory, "v1.db")
+        legacy = open_database(base, legacy_dictionary())
+        legacy.create_schema()
+        legacy.upsert_persons("estudiante", people)
+        legacy.pool.close()
+        eager_path = os.path.join(directory, "eager.db")
+        shutil.copy(base, eager_path)
+
+        # Reescritura completa en una transacción
+        eager = open_database(eager_path, deployed_dictionary(), example_migrator())
+        eager.evolve_schema()
+        seconds, latencies, errors = under_load(eager, written, lambda: eager.migrate_batch(PERSON_TABLE, n))
+        results["eager"] = (seconds, latency_summary(latencies), errors)
+        eager.pool.close()
+
+        # Perezosa: solo se agregan columnas; las filas se actualizan al leer o en segundo plano
+        database = open_database(base, deployed_dictionary(), example_migrator())
+        start = time.perf_counter()
+        database.evolve_schema()
+        results["deploy_ms"] = (time.perf_counter() - start) * 1000
+
+        keys = [person["numero_documento"] for person in random.Random(3).sample(read, 2000)]
+        start = time.perf_counter()
+        stale = [database.fetch_one(PERSON_TABLE, key) for key in keys]
+        results["read_stale_us"] = (time.perf_counter() - start) / len(keys) * 1e6
+        results["upgraded"] = all("cel" in record and "telefono" not in record for record in stale)
+
+        migrator = BackgroundMigrator(database.migration_steps([PERSON_TABLE]), batch_size=1000, pause_seconds=0.005)
+        seconds, latencies, errors = under_load(database, written, lambda: migrator.start().join())
+        results["background"] = (seconds, latency_summary(latencies), errors)
+        results["pending"] = database.pending_migration(PERSON_TABLE)
+
+        start = time.perf_counter()
+        current = [database.fetch_one(PERSON_TABLE, key) for key in keys]
+        results["read_current_us"] = (time.perf_counter() - start) / len(keys) * 1e6
+        results["same_records"] = current == stale
+        database.pool.close()
+
+    sample = people[:20_000]
+    schema = example_migrator()
+    start = time.perf_counter()
+    compiled = [schema.upgrade(record, BASE_VERSION) for record in sample]
+    results["compiled_us"] = (time.perf_counter() - start) / len(sample) * 1e6
+    start = time.perf_counter()
+    reference = [sequential_upgrade(record, BASE_VERSION) for record in sample]
+    results["sequential_us"] = (time.perf_counter() - start) / len(sample) * 1e6
+    results["same_upgrade"] = compiled == reference
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    result = run(n)
+    print(f"Registros versión 1: {result['records']:,}")
+    print(f"Despliegue perezoso (evolve_schema): {result['deploy_ms']:8.1f} ms")
+    for name, label in (("eager", "Reescritura completa"), ("background", "Migración por lotes")):
+        seconds, (median, p99, worst), errors = result[name]
+        print(f"{label + ':':22} {seconds:6.2f} s; escrituras concurrentes {median:.1f} ms mediana, "
+              f"{p99:.1f} ms p99, {worst:.0f} ms máx., {errors} fallidas")
+    print(f"Pendientes tras la migración: {result['pending']}; lecturas antiguas actualizadas: {result['upgraded']}")
+    print(f"fetch_one fila antigua: {result['read_stale_us']:6.1f} µs; "
+          f"fila migrada: {result['read_current_us']:6.1f} µs; mismo registro: {result['same_records']}")
+    print(f"Actualización en memoria: {result['compiled_us']:.2f} µs compilada vs. "
+          f"{result['sequential_us']:.2f} µs migración por migración (igual: {result['same_upgrade']})")
@@ -0,0 +1,93 @@
+"""
+Benchmark: despacho de notificaciones en mensajes por segundo
+
+Contra LocalSMTPServer (en memoria) se compara:
+- Una conexión por mensaje con EmailMessage (envío ingenuo)
+- NotificationDispatcher con 1 conexión persistente
+- NotificationDispatcher con el pool completo (lotes en paralelo)
+
+Con --delay se agrega una espera por respuesta del servidor para simular
+la latencia de un servidor SMTP remoto.
+
+Uso:
+    python -m benchmarks.bench_notifications [n_mensajes] [--delay segundos]
+"""
+
+import argparse
+import smtplib
+import time
+from email.message import EmailMessage
+
+from config import get_config
+from services.notifications import (
+    LocalSMTPServer,
+    Notification,
+    NotificationDispatcher,
+    SMTPConnectionPool,
+    TemplateRegistry,
+)
+
+
+def make_notifications(n: int):
+    context = {"nombre": "Valentina", "area": "deportes", "promedio": 2.9, "promedio_minimo": 3.0}
+    return [Notification(f"estudiante{index}@upc.edu.co", "aviso_veto", context) for index in range(n)]
+
+
+def naive_send(config, notifications) -> float:
+    """Referencia: abre una conexión SMTP y construye un EmailMessage por mensaje"""
+    templates = TemplateRegistry()
+    start = time.perf_counter()
+    for notification in notifications:
+        subject, body = templates.render(notification.template, notification.context)
+        message = EmailMessage()
+        message["From"] = config["sender"]
+        message["To"] = notification.recipient
+        message["Subject"] = subject
+        message.set_content(body)
+        with smtplib.SMTP(config["smtp_server"], config["smtp_port"]) as connection:
+            connection.send_message(message)
+    return len(notifications) / (time.perf_counter() - start)
+
+
+def dispatch(config, notifications, pool_size: int):
+    config = {**config, "pool_size": pool_size}
+    dispatcher = NotificationDispatcher(SMTPConnectionPool(config), config=config)
+    try:
+        return dispatcher.send_many(notifications)
+    finally:
+        dispatcher.close()
+
+
+def run(n: int = 5000, delay: float = 0.0, fail_every: int = 50) -> dict:
+    base = {**get_config("external")["email_service"], "rate_limit_per_second": 0, "retry_backoff_seconds": 0.001}
+    notifications = make_notifications(n)
+    results = {"messages": n, "delay": delay}
+    with LocalSMTPServer(delay=delay) as server:
+        config = {**base, **server.config}
+        # La referencia es lenta: se mide con una muestra
+        results["naive"] = naive_send(config, notifications[:max(1, n // 10)])
+        results["pooled_1"] = dispatch(config, notifications, 1).messages_per_second
+        pooled = dispatch(config, notifications, base["pool_size"])
+        results["pooled"] = pooled.messages_per_second
+        results["pool_size"] = base["pool_size"]
+        results["delivered"] = len(server.messages)
+    with LocalSMTPServer(delay=delay, fail_every=fail_every) as server:
+        report = dispatch({**base, **server.config}, notifications, base["pool_size"])
+        results["with_failures"] = report.messages_per_second
+        results["retries"] = report.retries
+        results["failed"] = len(report.failed)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("n", nargs="?", type=int, default=5000)
+    parser.add_argument("--delay", type=float, default=0.0, help="Espera por respuesta del servidor (s)")
+    args = parser.parse_args()
+    result = run(args.n, args.delay)
+    print(f"Mensajes: {result['messages']:,} (latencia simulada por respuesta: {result['delay'] * 1000:.1f} ms)")
+    print(f"Una conexión por mensaje:     {result['naive']:8,.0f} mensajes/s")
+    print(f"Dispatcher, 1 conexión:       {result['pooled_1']:8,.0f} mensajes/s")
+    print(f"Dispatcher, {result['pool_size']} conexiones:    {result['pooled']:8,.0f} mensajes/s")
+    print(f"Con fallas temporales (1/50): {result['with_failures']:8,.0f} mensajes/s "
+          f"({result['retries']:,} reintentos, {result['failed']} fallidos)")
@@ -0,0 +1,88 @@
+"""
+Benchmark: latencia de una denuncia que llega al final de una ráfaga de PQRS
+
+Se compara la cola por vencimiento (SLA) con una cola FIFO (mismo código,
+prioridad constante). En FIFO la espera crece con el tamaño de la ráfaga;
+con la cola por SLA la solicitud urgente se atiende casi de inmediato.
+
+Uso:
+    python -m benchmarks.bench_pqrs_queue [tamaño_máximo_ráfaga]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from services.pqrs_queue import PQRSQueue, SLAPolicy
+
+BURST_SIZES = (1_000, 5_000, 10_000, 50_000, 100_000)
+
+
+class FIFOPolicy(SLAPolicy):
+    """Prioridad constante: el consecutivo de llegada define el orden"""
+
+    def priority_key(self, pqrs):
+        return (0.0, 0)
+
+
+def make_burst(n: int, seed: int = 11) -> list:
+    generator = random.Random(seed)
+    now = datetime.now()
+    tipos = ["Petición", "Queja", "Reclamo", "Sugerencia"]
+    return [
+        {
+            "tipo_solicitud": generator.choice(tipos),
+            "descripcion": f"Solicitud {index}",
+            "fecha_solicitud": now - timedelta(minutes=generator.randint(0, 60)),
+        }
+        for index in range(n)
+    ]
+
+
+async def urgent_latency(burst: list, policy: SLAPolicy) -> dict:
+    served = {}
+
+    async def handler(pqrs):
+        if pqrs.get("urgente"):
+            served["at"] = time.perf_counter()
+        await asyncio.sleep(0)
+        return None
+
+    queue = PQRSQueue(handler, policy=policy, max_concurrency=8, maxsize=len(burst) + 1)
+    await queue.start()
+    start = time.perf_counter()
+    for pqrs in burst:
+        queue.submit_nowait(pqrs)
+    submitted = time.perf_counter()
+    urgent = {"tipo_solicitud": "Denuncia", "fecha_solicitud": datetime.now(), "urgente": True}
+    queue.submit_nowait(urgent)
+    await queue.stop()
+    finished = time.perf_counter()
+    return {
+        "submit_us_per_item": (submitted - start) / len(burst) * 1e6,
+        "urgent_latency_ms": (served["at"] - submitted) * 1000,
+        "throughput": (len(burst) + 1) / (finished - start),
+        "stats": queue.stats(),
+    }
+
+
+def run(max_burst: int = 50_000) -> list:
+    results = []
+    for size in (size for size in BURST_SIZES if size <= max_burst):
+        burst = make_burst(size)
+        sla = asyncio.run(urgent_latency([dict(p) for p in burst], SLAPolicy()))
+        fifo = asyncio.run(urgent_latency([dict(p) for p in burst], FIFOPolicy()))
+        results.append({"burst": size, "sla": sla, "fifo": fifo})
+    return results
+
+
+if __name__ == "__main__":
+    max_burst = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    print(f"{'ráfaga':>8} {'denuncia SLA (ms)':>18} {'denuncia FIFO (ms)':>19} "
+          f"{'encolar (µs/PQRS)':>18} {'PQRS/s':>10}")
+    for row in run(max_burst):
+        print(f"{row['burst']:>8,} {row['sla']['urgent_latency_ms']:>18.2f} "
+              f"{row['fifo']['urgent_latency_ms']:>19.2f} "
+              f"{row['sla']['submit_us_per_item']:>18.2f} {row['sla']['throughput']:>10,.0f}")
@@ -0,0 +1,53 @@
+"""
+Benchmark: memoria por persona en lista de diccionarios vs. RecordStore columnar
+
+Uso:
+    python -m benchmarks.bench_record_store [n_personas]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from models.record_store import RecordStore
+from benchmarks.data import make_people
+
+
+def measure(build) -> tuple:
+    """Retorna (objeto construido, bytes asignados que siguen vivos)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def run(n: int = 100_000) -> dict:
+    people, dict_bytes = measure(lambda: make_people(n))
+
+    def build_store():
+        # Los registros de origen se descartan: solo queda lo que retiene el almacén
+        store = RecordStore.for_estamento("estudiante")
+        store.extend(make_people(n))
+        return store
+
+    store, store_bytes = measure(build_store)
+    assert store.to_dict(0) == people[0] and len(store) == len(people)
+    return {
+        "records": n,
+        "dict_bytes_per_record": dict_bytes / n,
+        "store_bytes_per_record": store_bytes / n,
+        "ratio": dict_bytes / store_bytes if store_bytes else float("inf"),
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    result = run(n)
+    print(f"Personas: {result['records']:,}")
+    print(f"Diccionarios: {result['dict_bytes_per_record']:.0f} bytes/persona")
+    print(f"RecordStore:  {result['store_bytes_per_record']:.0f} bytes/persona")
+    print(f"Reducción: {result['ratio']:.1f}x")
@@ -0,0 +1,81 @@
+"""
+Benchmark: validadores compilados vs. validador ingenuo que recorre el diccionario
+
+Uso:
+    python -m benchmarks.bench_schema [n_registros]
+"""
+
+import sys
+import time
+from datetime import date, datetime
+
+import utils
+from models.data_dictionary import DataDictionary
+from models.validators import DOCUMENT_TYPE_ALIASES, compile_schema
+from benchmarks.data import make_people
+
+NAIVE_TYPES = {
+    "string": str, "text": str, "integer": int, "float": (int, float),
+    "boolean": bool, "date": date, "datetime": datetime, "array": (list, tuple),
+}
+
+
+def naive_validate(data_dict: DataDictionary, estamento: str, record: dict) -> list:
+    """Valida recorriendo los diccionarios anidados en cada registro"""
+    errors = []
+    variables = data_dict.get_variables_by_estamento(estamento)
+    obligatory = data_dict.get_obligatory_variables()
+    for variable, declared in variables.items():
+        value = record.get(variable)
+        is_required = any(variable in group for group in obligatory.values())
+        if value is None or value == "":
+            if is_required:
+                errors.append((variable, "missing"))
+            continue
+        if isinstance(declared, list):
+            if value not in declared:
+                errors.append((variable, "invalid_enum"))
+        elif variable == "email" and not utils.validate_email(value):
+            errors.append((variable, "invalid_format"))
+        elif variable == "cel" and not utils.validate_phone_number(value):
+            errors.append((variable, "invalid_format"))
+        elif variable == "numero_documento":
+            document_type = DOCUMENT_TYPE_ALIASES.get(record.get("tipo_documento"), "")
+            if not utils.validate_document_number(value, document_type):
+                errors.append((variable, "invalid_format"))
+        elif declared in NAIVE_TYPES and not isinstance(value, NAIVE_TYPES[declared]):
+            errors.append((variable, "invalid_type"))
+    return errors
+
+
+def run(n: int = 100_000) -> dict:
+    """Ejecuta ambos validadores sobre n registros y retorna los tiempos"""
+    records = make_people(n)
+    data_dict = DataDictionary()
+
+    start = time.perf_counter()
+    naive_invalid = sum(1 for r in records if naive_validate(data_dict, "estudiante", r))
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    validator = compile_schema(data_dict).for_estamento("estudiante")
+    compiled_invalid = sum(1 for r in records if validator.validate(r))
+    compiled_time = time.perf_counter() - start
+
+    return {
+        "records": n,
+        "naive_seconds": naive_time,
+        "compiled_seconds": compiled_time,
+        "speedup": naive_time / compiled_time if compiled_time else float("inf"),
+        "naive_invalid": naive_invalid,
+        "compiled_invalid": compiled_invalid,
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    result = run(n)
+    print(f"Registros: {result['records']:,}")
+    print(f"Ingenuo:   {result['naive_seconds']:.3f}s ({result['records'] / result['naive_seconds']:,.0f} reg/s)")
+    print(f"Compilado: {result['compiled_seconds']:.3f}s ({result['records'] / result['compiled_seconds']:,.0f} reg/s)")
+    print(f"Aceleración: {result['speedup']:.1f}x")
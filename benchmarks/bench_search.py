@@ -0,0 +1,109 @@
+"""
+Benchmark: búsqueda de PQRS con índice invertido vs. recorrido lineal
+
+Sobre PQRS sintéticas con texto libre se mide:
+- Construcción del índice, guardado y carga desde disco
+- Latencia (mediana y p95) de consultas cortas (en frío y repetidas),
+  filtradas y de similares
+- La misma consulta corta con búsqueda lineal por subcadena (referencia)
+- Actualización incremental (alta/cambio de una PQRS)
+
+Uso:
+    python -m benchmarks.bench_search [n_pqrs]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import utils
+from benchmarks.data import make_pqrs_tickets
+from services.search import PQRSSearchIndex, tokenize
+
+QUERIES = 200
+
+
+def latencies(function, arguments):
+    """Latencias en ms de function(*argumento) para cada argumento"""
+    result = []
+    for argument in arguments:
+        start = time.perf_counter()
+        function(*argument)
+        result.append((time.perf_counter() - start) * 1000)
+    return result
+
+
+def summary(values):
+    ordered = sorted(values)
+    return statistics.median(ordered), ordered[int(len(ordered) * 0.95) - 1]
+
+
+def linear_search(tickets, words):
+    """Referencia: subcadena sin tildes en descripción y respuesta, todas las palabras"""
+    matches = []
+    for ticket in tickets:
+        text = utils.normalize_text(f"{ticket['descripcion']} {ticket['respuesta'] or ''}")
+        if all(word in text for word in words):
+            matches.append(ticket["id"])
+    return matches
+
+
+def run(n: int = 100_000) -> dict:
+    rng = random.Random(19)
+    tickets = make_pqrs_tickets(n)
+    index = PQRSSearchIndex()
+
+    start = time.perf_counter()
+    index.build(tickets)
+    build_seconds = time.perf_counter() - start
+
+    samples = rng.sample(tickets, QUERIES)
+    short = [(" ".join(rng.sample(tokenize(ticket["descripcion"]), 3)),) for ticket in samples]
+    filtered = [(query, 10, {"estado_pqrs": "Radicada", "tipo_solicitud": ["queja", "reclamo"]})
+                for (query,) in short]
+    similar = [(ticket["id"],) for ticket in samples]
+
+    results = {
+        "tickets": n,
+        "terms": len(index.postings),
+        "build_seconds": build_seconds,
+        # La primera consulta de cada término calcula sus aportes BM25; luego se reutilizan
+        "short_cold": summary(latencies(index.search, short)),
+        "short": summary(latencies(index.search, short)),
+        "filtered": summary(latencies(index.search, filtered)),
+        "similar": summary(latencies(index.similar, similar)),
+        "linear": summary(latencies(lambda query: linear_search(tickets, query.split()), short[:5])),
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "pqrs.idx")
+        start = time.perf_counter()
+        index.save(path)
+        results["save_seconds"] = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = PQRSSearchIndex.load(path)
+        results["load_seconds"] = time.perf_counter() - start
+    results["same_after_load"] = all(loaded.search(*arguments) == index.search(*arguments)
+                                     for arguments in short[:20])
+
+    updates = [(ticket["id"], {**ticket, "descripcion": ticket["descripcion"] + " actualizada"})
+               for ticket in samples]
+    results["update"] = summary(latencies(index.add, updates))
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    result = run(n)
+    print(f"PQRS: {result['tickets']:,} ({result['terms']:,} términos)")
+    print(f"Construcción del índice: {result['build_seconds']:8.2f} s")
+    print(f"Guardar / cargar:        {result['save_seconds']:8.2f} s / {result['load_seconds']:.2f} s")
+    for name, label in (("short_cold", "Consulta corta (fría)"), ("short", "Consulta corta"), ("filtered", "Consulta filtrada"),
+                        ("similar", "Similares"), ("update", "Actualización"),
+                        ("linear", "Recorrido lineal")):
+        median, p95 = result[name]
+        print(f"{label + ':':24} {median:8.2f} ms mediana, {p95:8.2f} ms p95")
+    print(f"Mismo resultado tras cargar: {result['same_after_load']}")
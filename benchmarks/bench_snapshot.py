@@ -0,0 +1,111 @@
+"""
+Benchmark: arranque construyendo el diccionario y sus derivados vs. snapshot precompilado
+
+Mide en el mismo proceso el costo de derivar (DataDictionary, vistas,
+validadores y tablas de códigos) frente a abrir el snapshot, y el tiempo
+total de arranque de un proceso nuevo con cada camino.
+
+Uso:
+    python -m benchmarks.bench_snapshot [repeticiones]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from models.data_dictionary import DataDictionary, DataDictionaryView
+from models.snapshot import build_sections, build_snapshot, load_snapshot
+from models.validators import compile_schema
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_FROM_SOURCE = """
+from models.data_dictionary import DataDictionary, reload_shared_dictionary
+from models.snapshot import build_sections
+from models.validators import compile_schema
+view = reload_shared_dictionary(DataDictionary())
+schema = compile_schema(view)
+sections = build_sections(view)
+"""
+
+COLD_FROM_SNAPSHOT = """
+from models.snapshot import load_snapshot
+snapshot = load_snapshot({path!r}, rebuild=False)
+view = snapshot.install()
+schema = snapshot.compiled_schema()
+"""
+
+
+def derive() -> None:
+    view = DataDictionaryView(DataDictionary())
+    compile_schema(view)
+    build_sections(view)
+
+
+def one_estamento_from_source() -> None:
+    view = DataDictionaryView(DataDictionary())
+    compile_schema(view).for_estamento("estudiante")
+
+
+def one_estamento_from_snapshot(path: str) -> None:
+    snapshot = load_snapshot(path, rebuild=False)
+    snapshot.validator("estamentos", "estudiante")
+    snapshot.close()
+
+
+def from_snapshot(path: str) -> None:
+    snapshot = load_snapshot(path, rebuild=False)
+    DataDictionaryView(snapshot.data_dictionary())
+    snapshot.compiled_schema()
+    snapshot.close()
+
+
+def best_of(function, repeat: int, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def cold_start(code: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run(repeat: int = 20) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dictionary.snapshot")
+        start = time.perf_counter()
+        build_snapshot(path).close()
+        build_seconds = time.perf_counter() - start
+        return {
+            "build_ms": build_seconds * 1000,
+            "derive_ms": best_of(derive, repeat) * 1000,
+            "snapshot_ms": best_of(from_snapshot, repeat, path) * 1000,
+            "one_source_ms": best_of(one_estamento_from_source, repeat) * 1000,
+            "one_snapshot_ms": best_of(one_estamento_from_snapshot, repeat, path) * 1000,
+            "snapshot_bytes": os.path.getsize(path),
+            "cold_source_ms": cold_start(COLD_FROM_SOURCE, max(3, repeat // 4)) * 1000,
+            "cold_snapshot_ms": cold_start(COLD_FROM_SNAPSHOT.format(path=path), max(3, repeat // 4)) * 1000,
+        }
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    result = run(repeat)
+    print(f"Construcción del snapshot: {result['build_ms']:.2f} ms ({result['snapshot_bytes']:,} bytes)")
+    print(f"Derivar en proceso:        {result['derive_ms']:.3f} ms")
+    print(f"Abrir snapshot en proceso: {result['snapshot_ms']:.3f} ms")
+    print(f"Un estamento (fuente):     {result['one_source_ms']:.3f} ms")
+    print(f"Un estamento (snapshot):   {result['one_snapshot_ms']:.3f} ms")
+    print(f"Arranque en frío (fuente):   {result['cold_source_ms']:.1f} ms")
+    print(f"Arranque en frío (snapshot): {result['cold_snapshot_ms']:.1f} ms")
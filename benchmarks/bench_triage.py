@@ -0,0 +1,118 @@
+"""
+Benchmark: cola de triaje de ayuda social con montículo indexado vs. reordenar la lista
+
+Sobre casos abiertos sintéticos de ayuda_social se mide:
+- Carga inicial de la cola
+- Actualización de un caso (cambio de nivel_urgencia, tipos de asistencia)
+  y consulta del siguiente caso más urgente, frente a reordenar toda la
+  lista después de cada actualización (referencia)
+- Consultas top-k de todos los casos y por tipo de asistencia
+- Que el top-k coincida con ordenar todos los casos por puntaje
+
+Uso:
+    python -m benchmarks.bench_triage [n_casos]
+"""
+
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.data import NIVELES_URGENCIA, TIPOS_ASISTENCIA, make_ayuda_social_case, make_ayuda_social_cases
+from services.triage import TriagePolicy, TriageQueue
+
+UPDATES = 20_000
+SORTED_UPDATES = 100
+TOP_K = 20
+
+
+def latencies(function, arguments):
+    result = []
+    for argument in arguments:
+        start = time.perf_counter()
+        function(*argument)
+        result.append((time.perf_counter() - start) * 1e6)
+    return result
+
+
+def summary(values):
+    ordered = sorted(values)
+    return statistics.median(ordered), ordered[int(len(ordered) * 0.99) - 1]
+
+
+def run(n: int = 100_000) -> dict:
+    rng = random.Random(24)
+    cases = make_ayuda_social_cases(n)
+    records = {case["id"]: case for case in cases}
+    policy = TriagePolicy()
+    queue = TriageQueue(policy)
+
+    start = time.perf_counter()
+    for case in cases:
+        queue.upsert(case["id"], case, case["fecha_apertura"])
+    results = {"cases": n, "load_seconds": time.perf_counter() - start, "types": len(queue.types())}
+
+    def update(case_id, changes):
+        records[case_id] = dict(records[case_id], **changes)
+        queue.upsert(case_id, records[case_id])
+        queue.next()
+
+    changes = []
+    next_id = n
+    for _ in range(UPDATES):
+        roll = rng.random()
+        if roll < 0.8:
+            changes.append((rng.randrange(n), {"nivel_urgencia": rng.choice(NIVELES_URGENCIA)}))
+        elif roll < 0.95:
+            changes.append((rng.randrange(n), {"tipo_asistencia_requerida": rng.sample(TIPOS_ASISTENCIA, 2)}))
+        else:
+            records[next_id] = dict(make_ayuda_social_case(rng), fecha_apertura=datetime.now())
+            changes.append((next_id, {}))
+            next_id += 1
+    results["update"] = summary(latencies(update, changes))
+
+    # Referencia: lista de casos que se reordena completa después de cada actualización
+    now = datetime.now()
+    ordered = [(policy.score(record, record["fecha_apertura"], now), case_id) for case_id, record in records.items()]
+
+    def resort(case_id, changes):
+        records[case_id] = dict(records[case_id], **changes)
+        for position, (_, other) in enumerate(ordered):
+            if other == case_id:
+                ordered[position] = (policy.score(records[case_id], records[case_id]["fecha_apertura"], now), case_id)
+                break
+        ordered.sort(reverse=True)
+
+    results["resort"] = summary(latencies(resort, changes[:SORTED_UPDATES]))
+    for case_id, _ in changes[:SORTED_UPDATES]:
+        queue.upsert(case_id, records[case_id])
+
+    results["top"] = summary(latencies(queue.top, [(TOP_K,)] * 1000))
+    results["top_by_type"] = summary(latencies(queue.top, [(TOP_K, tipo) for tipo in TIPOS_ASISTENCIA] * 100))
+    start = time.perf_counter()
+    taken = [queue.take() for _ in range(1000)]
+    results["take_us"] = (time.perf_counter() - start) / len(taken) * 1e6
+
+    # El top-k debe coincidir con ordenar todos los casos abiertos por puntaje actual (los empates
+    # en puntaje pueden salir en otro orden)
+    now = datetime.now()
+    expected = sorted(((policy.score(records[case_id], records[case_id]["fecha_apertura"], now), case_id)
+                       for case_id in records if case_id in queue), reverse=True)[:TOP_K]
+    actual = queue.top(TOP_K)
+    results["same_top"] = len(actual) == len(expected) and \
+        all(abs(score - case.score) < 1e-3 for (score, _), case in zip(expected, actual))
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    result = run(n)
+    print(f"Casos abiertos: {result['cases']:,} ({result['types']} tipos de asistencia)")
+    print(f"Carga inicial: {result['load_seconds']:.2f} s")
+    for name, label in (("update", "Actualizar + siguiente"), ("resort", "Reordenar la lista"),
+                        ("top", f"Top {TOP_K}"), ("top_by_type", f"Top {TOP_K} por tipo")):
+        median, p99 = result[name]
+        print(f"{label + ':':24} {median:10.1f} µs mediana, {p99:10.1f} µs p99")
+    print(f"Tomar el siguiente caso: {result['take_us']:.1f} µs")
+    print(f"Top {TOP_K} igual al orden completo: {result['same_top']}")
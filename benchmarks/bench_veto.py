@@ -0,0 +1,115 @@
+"""
+Benchmark: veto automático incremental vs. reevaluación completa
+
+Sobre inscripciones sintéticas de deportes y cultura se mide:
+- Carga inicial de las inscripciones en VetoEngine
+- Publicación de lotes de notas: solo los estudiantes del lote vs.
+  reevaluar todas las inscripciones (recorrido completo de referencia)
+- Cambio del promedio mínimo de un programa
+- Que ambos caminos dejen los mismos estados
+
+Uso:
+    python -m benchmarks.bench_veto [n_estudiantes]
+"""
+
+import random
+import statistics
+import sys
+import time
+
+from benchmarks.data import PROGRAMAS, make_grade_batch, make_participants
+from services.veto import ESTADO_ACTIVO, ESTADO_VETADO, VetoEngine, VetoPolicy, program_key
+
+GRADE_BATCHES = 10
+BATCH_SIZE = 5_000
+
+
+def full_scan(policy: VetoPolicy, enrollments, students) -> int:
+    """Referencia: reevalúa todas las inscripciones con el último promedio de cada estudiante"""
+    changed = 0
+    for enrollment in enrollments:
+        student = students[enrollment["numero_documento"]]
+        reason = policy.reason(student["programa"], student["promedio_academico"], student["vetado"])
+        target = ESTADO_VETADO if reason else ESTADO_ACTIVO
+        if enrollment["estado_participacion"] != target:
+            enrollment["estado_participacion"] = target
+            changed += 1
+    return changed
+
+
+def run(n: int = 200_000) -> dict:
+    rng = random.Random(22)
+    areas = make_participants(n)
+    enrollments = [dict(record, area=area) for area, records in areas.items() for record in records]
+    students = {}
+    for record in enrollments:
+        students[record["numero_documento"]] = {
+            "programa": program_key(record["registro_programa_academico"]),
+            "promedio_academico": record["promedio_academico"],
+            "vetado": None,
+        }
+    results = {"students": n, "enrollments": len(enrollments)}
+
+    delta = []
+    engine = VetoEngine(sinks=[delta.extend])
+    start = time.perf_counter()
+    for area, records in areas.items():
+        engine.enroll(records, area)
+    results["load_seconds"] = time.perf_counter() - start
+    results["initial_vetoes"] = len(delta)
+
+    reference_policy = VetoPolicy()
+    for student in students.values():
+        student["vetado"] = False
+    for record in enrollments:
+        student = students[record["numero_documento"]]
+        student["vetado"] = student["vetado"] or reference_policy.flagged(record["seguimiento_administrador"])
+    full_scan(reference_policy, enrollments, students)
+
+    incremental_ms, scan_ms, changes = [], [], 0
+    keys = list(students)
+    for _ in range(GRADE_BATCHES):
+        batch = make_grade_batch(rng, keys, BATCH_SIZE)
+        start = time.perf_counter()
+        changes += len(engine.apply_grades(batch))
+        incremental_ms.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        for key, average in batch.items():
+            students[key]["promedio_academico"] = average
+        full_scan(reference_policy, enrollments, students)
+        scan_ms.append((time.perf_counter() - start) * 1000)
+    results["grades"] = (statistics.median(incremental_ms), statistics.median(scan_ms), changes)
+
+    program = PROGRAMAS[0]
+    evaluated = engine.evaluated
+    start = time.perf_counter()
+    threshold_changes = engine.set_minimum(program, 3.4)
+    results["threshold"] = ((time.perf_counter() - start) * 1000, engine.evaluated - evaluated,
+                            len(threshold_changes))
+    start = time.perf_counter()
+    reference_policy.minimums[program_key(program)] = 3.4
+    full_scan(reference_policy, enrollments, students)
+    results["threshold_scan_ms"] = (time.perf_counter() - start) * 1000
+
+    results["same_states"] = all(engine.state(record["numero_documento"], record["area"])
+                                 == record["estado_participacion"] for record in enrollments)
+    results["sequences"] = [change.sequence for change in delta] == list(range(1, len(delta) + 1))
+    start = time.perf_counter()
+    results["at_risk"] = len(engine.at_risk(program, 0.2))
+    results["at_risk_ms"] = (time.perf_counter() - start) * 1000
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    result = run(n)
+    print(f"Estudiantes: {result['students']:,}; inscripciones deportes/cultura: {result['enrollments']:,}")
+    print(f"Carga inicial: {result['load_seconds']:.2f} s ({result['initial_vetoes']:,} vetos)")
+    incremental, scan, changes = result["grades"]
+    print(f"Lote de {BATCH_SIZE:,} notas: {incremental:8.2f} ms incremental vs. {scan:8.2f} ms "
+          f"recorrido completo (mediana; {changes:,} cambios en {GRADE_BATCHES} lotes)")
+    milliseconds, evaluated, changes = result["threshold"]
+    print(f"Nuevo mínimo de {PROGRAMAS[0]}: {milliseconds:8.2f} ms, {evaluated:,} reevaluados, "
+          f"{changes:,} cambios (recorrido completo {result['threshold_scan_ms']:.2f} ms)")
+    print(f"En riesgo (0.2 sobre el mínimo): {result['at_risk']:,} en {result['at_risk_ms']:.2f} ms")
+    print(f"Mismos estados: {result['same_states']}; secuencia continua: {result['sequences']}")
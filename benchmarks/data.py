@@ -0,0 +1,354 @@
+"""
+Generador de datos sintéticos para benchmarks
+Cédulas, celulares que inician con 3 y correos @upc.edu.co
+"""
+
+import itertools
+import random
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from models.data_dictionary import DataDictionaryView, get_shared_dictionary
+
+NOMBRES = ["María", "José", "Luis", "Ana", "Carlos", "Valentina", "Andrés", "Daniela", "Camilo", "Laura"]
+APELLIDOS = ["Gómez", "Rodríguez", "Martínez", "Pérez", "Díaz", "Torres", "Ramírez", "Vargas", "Mendoza", "Ospina"]
+PROGRAMAS = ["Ingeniería de Sistemas", "Derecho", "Enfermería", "Licenciatura en Música", "Administración"]
+FACULTADES = ["Ingenierías", "Derecho", "Ciencias de la Salud", "Bellas Artes", "Ciencias Administrativas"]
+
+
+def make_cedula(rng: random.Random) -> str:
+    """Cédula colombiana de 8 a 10 dígitos"""
+    return str(rng.randint(10_000_000, 1_199_999_999))
+
+
+def make_celular(rng: random.Random) -> str:
+    """Celular colombiano de 10 dígitos que inicia con 3"""
+    return "3" + "".join(rng.choice("0123456789") for _ in range(9))
+
+
+def make_email(rng: random.Random, nombre: str, apellido: str) -> str:
+    """Correo institucional (sin tildes)"""
+    local = f"{nombre.lower()}.{apellido.lower()}"
+    local = unicodedata.normalize("NFKD", local).encode("ascii", "ignore").decode("ascii")
+    return f"{local}{rng.randint(1, 9_999_999)}@upc.edu.co"
+
+
+def make_person(rng: random.Random, data_dict: DataDictionaryView) -> Dict[str, Any]:
+    """Genera un registro de estudiante con las variables del diccionario"""
+    ident = data_dict.identificacion_variables
+    nombre = rng.choice(NOMBRES)
+    apellido = rng.choice(APELLIDOS)
+    now = datetime(2025, 8, 1)
+    return {
+        "tipo_documento": "CC",
+        "numero_documento": make_cedula(rng),
+        "nombres": nombre,
+        "apellidos": apellido,
+        "sexo_biologico": rng.choice(ident["sexo_biologico"]),
+        "identidad_genero": rng.choice(ident["identidad_genero"]),
+        "expresion_genero": rng.choice(ident["expresion_genero"]),
+        "orientacion_sexual": rng.choice(ident["orientacion_sexual"]),
+        "pronombres_preferidos": rng.choice(ident["pronombres_preferidos"]),
+        "fecha_nacimiento": (now - timedelta(days=rng.randint(17 * 365, 40 * 365))).date(),
+        "domicilio": "Valledupar",
+        "email": make_email(rng, apellido, nombre),
+        "cel": make_celular(rng),
+        "update_date": now - timedelta(minutes=rng.randint(0, 500_000)),
+        "autorizacion_datos_sensibles": True,
+        "confidencialidad_solicitada": rng.random() < 0.2,
+        "fecha_autorizacion": now,
+        "programa_academico": rng.choice(PROGRAMAS),
+        "facultad": rng.choice(FACULTADES),
+        "promedio": round(rng.uniform(2.5, 5.0), 2),
+        "codigo_estudiante": str(rng.randint(10_000_000, 99_999_999)),
+        "semestre": rng.randint(1, 10),
+        "estado_academico": "Activo",
+    }
+
+
+def make_people(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Genera n registros de estudiantes reproducibles"""
+    rng = random.Random(seed)
+    data_dict = get_shared_dictionary()
+    return [make_person(rng, data_dict) for _ in range(n)]
+
+
+TIPOS_SOLICITUD = ["Petición", "Queja", "Reclamo", "Sugerencia", "Denuncia"]
+ESTADOS_PQRS = ["Radicada", "En proceso", "Respondida"]
+TEMAS_PQRS = [
+    "el horario del gimnasio", "la inscripción en danza", "los implementos deportivos",
+    "la atención psicológica", "el apoyo alimentario", "la beca de ayuda social",
+    "el préstamo de instrumentos musicales", "la cancha de fútbol", "el torneo de baloncesto",
+    "el grupo de teatro", "la piscina", "el servicio de enfermería", "los talleres de música",
+    "el transporte a los eventos", "la convocatoria de monitores", "el podcast informativo",
+]
+PROBLEMAS_PQRS = [
+    "no hay respuesta desde hace semanas", "cancelaron sin avisar", "el personal no atendió la solicitud",
+    "los espacios están en mal estado", "no aparezco en la lista de inscritos", "cobraron un valor indebido",
+    "recibí un trato discriminatorio", "el cupo se asignó a otra persona", "los horarios se cruzan con clases",
+    "falta información en la página", "el formulario presenta errores", "solicito ampliar los cupos",
+]
+_SILABAS = ["ca", "de", "mi", "lo", "ra", "ti", "pe", "su", "no", "ve", "ga", "ce", "bo", "ru", "fa", "le"]
+
+
+def _vocabulario(rng: random.Random, size: int) -> List[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(_SILABAS) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def make_pqrs_tickets(n: int, seed: int = 19, vocabulary: int = 5000) -> List[Dict[str, Any]]:
+    """
+    Genera n PQRS con descripción y respuesta de texto libre
+
+    El texto combina temas y problemas frecuentes con palabras de un
+    vocabulario amplio de frecuencia tipo Zipf (cola larga de términos raros).
+    """
+    rng = random.Random(seed)
+    words = _vocabulario(rng, vocabulary)
+    cumulative = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    tickets = []
+    for index in range(n):
+        tema = rng.choice(TEMAS_PQRS)
+        problema = rng.choice(PROBLEMAS_PQRS)
+        extra = " ".join(rng.choices(words, cum_weights=cumulative, k=rng.randint(8, 30)))
+        estado = rng.choice(ESTADOS_PQRS)
+        tickets.append({
+            "id": index,
+            "tipo_solicitud": rng.choice(TIPOS_SOLICITUD),
+            "descripcion": f"Sobre {tema}: {problema}. {extra}",
+            "estado_pqrs": estado,
+            "respuesta": f"Se revisó {tema} y se dio trámite." if estado == "Respondida" else None,
+        })
+    return tickets
+
+
+NOMBRES_PILA = [
+    "María", "José", "Luis", "Ana", "Carlos", "Valentina", "Andrés", "Daniela", "Camilo", "Laura",
+    "Juan", "Sofía", "Santiago", "Isabella", "Sebastián", "Mariana", "Alejandro", "Gabriela", "Diego", "Paula",
+    "Nicolás", "Natalia", "Felipe", "Carolina", "Javier", "Juliana", "Miguel", "Catalina", "David", "Andrea",
+    "Jorge", "Manuela", "Óscar", "Lucía", "Julián", "Ximena", "Esteban", "Yuliana", "Héctor", "Mónica",
+    "Fabián", "Liliana", "Iván", "Tatiana", "Ramiro", "Yesenia", "Wilmer", "Dayana", "Édgar", "Viviana",
+]
+APELLIDOS_FAMILIA = [
+    "Gómez", "Rodríguez", "Martínez", "Pérez", "Díaz", "Torres", "Ramírez", "Vargas", "Mendoza", "Ospina",
+    "García", "López", "González", "Hernández", "Sánchez", "Romero", "Suárez", "Castro", "Rojas", "Moreno",
+    "Vásquez", "Jiménez", "Ortiz", "Castillo", "Gutiérrez", "Muñoz", "Álvarez", "Ruiz", "Quintero", "Giraldo",
+    "Cárdenas", "Zuluaga", "Arias", "Cabrera", "Villa", "Orozco", "Guerrero", "Maestre", "Daza", "Cuello",
+    "Araújo", "Oñate", "Zuleta", "Pumarejo", "Molina", "Barros", "Mejía", "Cely", "Chávez", "Llanos",
+    "Acosta", "Benavides", "Camargo", "Escobar", "Fuentes", "Herrera", "Ibarra", "Londoño", "Navarro", "Peña",
+    "Quiroz", "Restrepo", "Salazar", "Toro", "Uribe", "Valencia", "Yepes", "Zapata", "Bermúdez", "Carvajal",
+    "Duarte", "Estrada", "Florez", "Hoyos", "Jaramillo", "Lozano", "Montoya", "Nieto", "Ochoa", "Parra",
+]
+_VARIANTES_FONETICAS = {"z": "s", "v": "b", "ll": "y", "y": "ll", "s": "z", "b": "v"}
+
+
+def _sin_tildes(texto: str) -> str:
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+
+
+def _variante_nombre(rng: random.Random, texto: str) -> str:
+    """Variación de captura: sin tildes, mayúsculas, espacios o una letra cambiada"""
+    opcion = rng.random()
+    if opcion < 0.35:
+        return _sin_tildes(texto)
+    if opcion < 0.55:
+        return texto.upper()
+    if opcion < 0.7:
+        return "  ".join(texto.split()) + " "
+    for original, variante in _VARIANTES_FONETICAS.items():
+        if original in texto:
+            return texto.replace(original, variante, 1)
+    return texto
+
+
+def make_feed_person(rng: random.Random, index: int) -> Dict[str, Any]:
+    """Persona de una fuente (registro académico, talento humano o egresados)"""
+    nombres = " ".join(rng.sample(NOMBRES_PILA, rng.choice((1, 2))))
+    apellidos = " ".join(rng.sample(APELLIDOS_FAMILIA, 2))
+    nacimiento = datetime(1960, 1, 1) + timedelta(days=rng.randint(0, 45 * 365))
+    return {
+        "id": index,
+        "tipo_documento": rng.choice(("CC", "CC", "CC", "TI", "CE")),
+        "numero_documento": make_cedula(rng),
+        "nombres": nombres,
+        "apellidos": apellidos,
+        "fecha_nacimiento": nacimiento.date(),
+        "email": make_email(rng, nombres.split()[0], apellidos.split()[0]),
+        "cel": make_celular(rng),
+    }
+
+
+def make_duplicate_feed(n: int, duplicate_rate: float = 0.05, seed: int = 21):
+    """
+    Genera n personas de varias fuentes donde una fracción son la misma persona
+
+    Los duplicados cambian el tipo de documento (TI -> CC, a veces con otro
+    número que conserva los últimos dígitos), la escritura del nombre y el
+    correo o celular.
+
+    Returns:
+        (registros en orden aleatorio, pares (id, id) de duplicados reales)
+    """
+    rng = random.Random(seed)
+    originals = int(n / (1 + duplicate_rate))
+    people = [make_feed_person(rng, index) for index in range(originals)]
+    pairs = []
+    for index in range(originals, n):
+        original = people[rng.randrange(originals)]
+        copy = dict(original, id=index, tipo_documento="CC")
+        copy["nombres"] = _variante_nombre(rng, original["nombres"])
+        copy["apellidos"] = _variante_nombre(rng, original["apellidos"])
+        if rng.random() < 0.3:
+            # Documento nuevo que conserva los últimos 6 dígitos
+            copy["numero_documento"] = str(rng.randint(1, 99)) + original["numero_documento"][-6:]
+        elif rng.random() < 0.3:
+            copy["numero_documento"] = f"{int(original['numero_documento']):,}".replace(",", ".")
+        if rng.random() < 0.7:
+            copy["email"] = make_email(rng, copy["apellidos"].split()[0], copy["nombres"].split()[0])
+        if rng.random() < 0.5:
+            copy["cel"] = make_celular(rng)
+        people.append(copy)
+        pairs.append((original["id"], index))
+    rng.shuffle(people)
+    return people, pairs
+
+
+SEGUIMIENTOS = ["", "", "Asistencia regular", "Vetado", "Suspendido"]
+
+
+def _promedio(rng: random.Random) -> float:
+    """Promedio académico en la escala de 0 a 5 (la mayoría entre 3 y 4.5)"""
+    return round(min(max(rng.gauss(3.7, 0.45), 0.0), 5.0), 2)
+
+
+def make_participants(n: int, seed: int = 22) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Genera inscripciones de deportes y cultura para n estudiantes
+
+    Cerca del 70% está en deportes, el 45% en cultura (algunos en ambas) y
+    el 1% tiene un seguimiento_administrador que veta.
+
+    Returns:
+        {"deportes": registros, "cultura": registros}
+    """
+    rng = random.Random(seed)
+    areas: Dict[str, List[Dict[str, Any]]] = {"deportes": [], "cultura": []}
+    documentos = set()
+    while len(documentos) < n:
+        documentos.add(make_cedula(rng))
+    for documento in sorted(documentos):
+        student = {
+            "numero_documento": documento,
+            "registro_programa_academico": rng.choice(PROGRAMAS),
+            "facultad_inscrito": rng.choice(FACULTADES),
+            "promedio_academico": _promedio(rng),
+            "seguimiento_administrador": rng.choice(SEGUIMIENTOS[3:]) if rng.random() < 0.01
+                                         else rng.choice(SEGUIMIENTOS[:3]),
+            "estado_participacion": "Activo",
+        }
+        in_sports = rng.random() < 0.7
+        if in_sports:
+            areas["deportes"].append(dict(student, frecuencia_semanal=rng.randint(1, 5)))
+        if rng.random() < 0.45 or not in_sports:
+            areas["cultura"].append(dict(student, participacion_eventos=[]))
+    return areas
+
+
+def make_grade_batch(rng: random.Random, students: List[str], size: int) -> Dict[str, float]:
+    """Publicación de notas: nuevo promedio para `size` estudiantes al azar"""
+    return {student: _promedio(rng) for student in rng.sample(students, size)}
+
+
+DEPORTES_UPC = ["Fútbol", "Baloncesto", "Voleibol", "Natación", "Atletismo", "Ajedrez", "Tenis de mesa", "Gimnasio"]
+ACTIVIDADES_CULTURA = ["Danza", "Teatro", "Música", "Artes plásticas", "Coro"]
+# Días de las sesiones semanales de un grupo (0 = lunes)
+_PATRONES_SESIONES = [(0, 2), (1, 3), (0, 2, 4), (1, 3, 5), (5,)]
+
+
+def make_activity_groups(groups_per_activity: int = 30, seed: int = 23) -> List[Dict[str, Any]]:
+    """
+    Genera los grupos de las actividades de deportes y cultura
+
+    Returns:
+        Grupos con code, area, activity, capacity y sessions ((día, hora), ...)
+    """
+    rng = random.Random(seed)
+    groups = []
+    for area, activities in (("deportes", DEPORTES_UPC), ("cultura", ACTIVIDADES_CULTURA)):
+        for activity in activities:
+            for number in range(groups_per_activity):
+                hour = rng.choice((6, 7, 12, 14, 16, 17, 18, 19))
+                groups.append({
+                    "code": f"{activity[:3].upper()}-{number + 1:02d}",
+                    "area": area,
+                    "activity": activity,
+                    "capacity": rng.randint(15, 35),
+                    "sessions": tuple((day, hour) for day in rng.choice(_PATRONES_SESIONES)),
+                })
+    return groups
+
+
+def make_enrollment_requests(n: int, seed: int = 23) -> List[Dict[str, Any]]:
+    """
+    Genera n solicitudes de actividades (1 a 3 por estudiante, en orden de preferencia)
+
+    La demanda se concentra en pocas actividades (Fútbol, Gimnasio, Danza,
+    Música) y cada estudiante tiene un horario de clases entre semana.
+    """
+    rng = random.Random(seed)
+    activities = [("deportes", activity) for activity in DEPORTES_UPC] + \
+                 [("cultura", activity) for activity in ACTIVIDADES_CULTURA]
+    weights = [6 if activity in ("Fútbol", "Gimnasio", "Danza", "Música") else 2 for _, activity in activities]
+    requests: List[Dict[str, Any]] = []
+    student = 0
+    while len(requests) < n:
+        student += 1
+        documento = str(1_000_000_000 + student)
+        busy = frozenset((rng.randrange(5), rng.randint(7, 18)) for _ in range(12))
+        estamento = "estudiante" if rng.random() < 0.9 else rng.choice(("docente", "administrativo", "egresado"))
+        frecuencia = rng.randint(2, 6)
+        chosen = set()
+        for preference in range(rng.choice((1, 2, 3, 3))):
+            area, activity = rng.choices(activities, weights)[0]
+            if activity in chosen:
+                continue
+            chosen.add(activity)
+            requests.append({
+                "student": documento,
+                "area": area,
+                "activity": activity,
+                "preference": preference,
+                "frecuencia_semanal": frecuencia,
+                "estamento": estamento,
+                "busy": busy,
+            })
+    rng.shuffle(requests)
+    return requests[:n]
+
+
+NIVELES_URGENCIA = ["Crítica", "Alta", "Alta", "Media", "Media", "Media", "Baja", "Baja"]
+ESTRATOS = ["Estrato 1", "Estrato 1", "Estrato 2", "Estrato 2", "Estrato 3", "Estrato 4", "Estrato 5"]
+TIPOS_ASISTENCIA = ["Alimentaria", "Vivienda", "Salud", "Psicológica", "Económica", "Transporte", "Materiales"]
+
+
+def make_ayuda_social_case(rng: random.Random) -> Dict[str, Any]:
+    """Caso del área ayuda_social con uno a tres tipos de asistencia"""
+    return {
+        "enlace_vinculacion": "https://bienestar.upc.edu.co/ayuda-social",
+        "tipo_asistencia_requerida": rng.sample(TIPOS_ASISTENCIA, rng.randint(1, 3)),
+        "estado_socioeconomico": rng.choice(ESTRATOS),
+        "nivel_urgencia": rng.choice(NIVELES_URGENCIA),
+        "documentos_soporte": [],
+    }
+
+
+def make_ayuda_social_cases(n: int, seed: int = 24) -> List[Dict[str, Any]]:
+    """Genera n casos abiertos con fecha de apertura en los últimos 60 días"""
+    rng = random.Random(seed)
+    now = datetime(2025, 8, 1)
+    return [dict(make_ayuda_social_case(rng), id=index,
+                 fecha_apertura=now - timedelta(minutes=rng.randint(0, 60 * 24 * 60)))
+            for index in range(n)]
@@ -0,0 +1,447 @@
+"""
+Suite de benchmarks de rutas críticas con líneas base en JSON
+
+Cubre los validadores de utils (escalares y por lotes), safe_cast,
+format_document_number, sanitize_string, paginate_results, calculate_age y
+los accesores del diccionario de datos, sobre datos sintéticos colombianos
+(cédulas, celulares que inician con 3, correos @upc.edu.co).
+
+Uso:
+    python -m benchmarks.suite list
+    python -m benchmarks.suite run --sizes 1k,10k,100k,1m --output benchmarks/baselines/base.json
+    python -m benchmarks.suite run --cases utils.validate --output actual.json
+    python -m benchmarks.suite compare benchmarks/baselines/base.json actual.json --threshold 0.1
+
+compare termina con código 1 si algún caso es más lento que la línea base
+por encima del umbral (fracción del tiempo por elemento).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import utils
+from benchmarks.data import APELLIDOS, NOMBRES, make_cedula, make_celular, make_email
+from models.data_dictionary import DataDictionary, get_shared_dictionary
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "latest.json")
+RESULTS_FORMAT_VERSION = 1
+MIN_TIME = 0.25  # Segundos mínimos medidos por caso y tamaño
+MAX_REPEAT = 200
+
+# Preparación: (n, rng) -> función a medir; la función retorna cuántos elementos procesó
+Setup = Callable[[int, random.Random], Callable[[], int]]
+
+
+class Case(NamedTuple):
+    name: str
+    description: str
+    setup: Setup
+
+
+CASES: Dict[str, Case] = {}
+
+
+def benchmark(name: str, description: str) -> Callable[[Setup], Setup]:
+    """Registra un caso de la suite"""
+    def register(setup: Setup) -> Setup:
+        CASES[name] = Case(name, description, setup)
+        return setup
+    return register
+
+
+# Datos sintéticos
+
+def documents(n: int, rng: random.Random) -> List[str]:
+    """Cédulas, con una fracción en formato con puntos o con espacios"""
+    values = []
+    for _ in range(n):
+        cedula = make_cedula(rng)
+        roll = rng.random()
+        if roll < 0.1:
+            cedula = utils.format_document_number(cedula)
+        elif roll < 0.15:
+            cedula = f" {cedula} "
+        values.append(cedula)
+    return values
+
+
+def emails(n: int, rng: random.Random) -> List[str]:
+    return [make_email(rng, rng.choice(NOMBRES), rng.choice(APELLIDOS)) for _ in range(n)]
+
+
+def phones(n: int, rng: random.Random) -> List[str]:
+    return [make_celular(rng) for _ in range(n)]
+
+
+def birth_dates(n: int, rng: random.Random) -> List[date]:
+    today = date.today()
+    return [today - timedelta(days=rng.randint(16 * 365, 70 * 365)) for _ in range(n)]
+
+
+def free_texts(n: int, rng: random.Random) -> List[str]:
+    """Textos de formulario con espacios repetidos y caracteres a limpiar"""
+    fragments = ["Solicito", "apoyo", "  para", "la <actividad>", "de \"danza\"", "en  la", "sede & Sabanas", "\tgracias"]
+    return [" ".join(rng.choice(fragments) for _ in range(rng.randint(3, 8))) for _ in range(n)]
+
+
+# Casos
+
+@benchmark("utils.validate_document_number", "Validación escalar de cédulas (CC)")
+def _bench_validate_document(n, rng):
+    values = documents(n, rng)
+    validate = utils.validate_document_number
+
+    def run():
+        for value in values:
+            validate(value, "CC")
+        return n
+    return run
+
+
+@benchmark("utils.validate_document_numbers", "Validación por lotes de cédulas (CC)")
+def _bench_validate_documents(n, rng):
+    values = documents(n, rng)
+    return lambda: len(utils.validate_document_numbers(values, "CC").mask)
+
+
+@benchmark("utils.validate_email", "Validación escalar de correos institucionales")
+def _bench_validate_email(n, rng):
+    values = emails(n, rng)
+    validate = utils.validate_email
+
+    def run():
+        for value in values:
+            validate(value, True)
+        return n
+    return run
+
+
+@benchmark("utils.validate_emails", "Validación por lotes de correos institucionales")
+def _bench_validate_emails(n, rng):
+    values = emails(n, rng)
+    return lambda: len(utils.validate_emails(values, True).mask)
+
+
+@benchmark("utils.validate_phone_number", "Validación escalar de celulares")
+def _bench_validate_phone(n, rng):
+    values = phones(n, rng)
+    validate = utils.validate_phone_number
+
+    def run():
+        for value in values:
+            validate(value)
+        return n
+    return run
+
+
+@benchmark("utils.validate_phone_numbers", "Validación por lotes de celulares")
+def _bench_validate_phones(n, rng):
+    values = phones(n, rng)
+    return lambda: len(utils.validate_phone_numbers(values).mask)
+
+
+@benchmark("utils.safe_cast.int", "safe_cast de textos numéricos a int")
+def _bench_safe_cast_int(n, rng):
+    values = [str(rng.randint(0, 10_000)) if rng.random() > 0.02 else "N/A" for _ in range(n)]
+    cast = utils.safe_cast
+
+    def run():
+        for value in values:
+            cast(value, int, 0)
+        return n
+    return run
+
+
+@benchmark("utils.safe_cast.float", "safe_cast de promedios a float")
+def _bench_safe_cast_float(n, rng):
+    values = [f"{rng.uniform(0, 5):.2f}" for _ in range(n)]
+    cast = utils.safe_cast
+
+    def run():
+        for value in values:
+            cast(value, float)
+        return n
+    return run
+
+
+@benchmark("utils.safe_cast.datetime", "safe_cast de fechas en formatos mezclados")
+def _bench_safe_cast_datetime(n, rng):
+    start = datetime(2020, 1, 1)
+    formats = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%d/%m/%Y")
+    values = [(start + timedelta(minutes=rng.randint(0, 3_000_000))).strftime(rng.choice(formats))
+              for _ in range(n)]
+    cast = utils.safe_cast
+
+    def run():
+        for value in values:
+            cast(value, datetime)
+        return n
+    return run
+
+
+@benchmark("utils.format_document_number", "Formato con puntos de cédulas")
+def _bench_format_document(n, rng):
+    values = documents(n, rng)
+    format_document = utils.format_document_number
+
+    def run():
+        for value in values:
+            format_document(value)
+        return n
+    return run
+
+
+@benchmark("utils.sanitize_string", "Limpieza de textos de formulario")
+def _bench_sanitize(n, rng):
+    values = free_texts(n, rng)
+    sanitize = utils.sanitize_string
+
+    def run():
+        for value in values:
+            sanitize(value, 200)
+        return n
+    return run
+
+
+@benchmark("utils.paginate_results", "Páginas aleatorias sobre una lista de n elementos (1.000 consultas)")
+def _bench_paginate(n, rng):
+    data = list(range(n))
+    pages = [rng.randint(1, max(1, n // 20)) for _ in range(1_000)]
+    paginate = utils.paginate_results
+
+    def run():
+        for page in pages:
+            paginate(data, page, 20)
+        return len(pages)
+    return run
+
+
+@benchmark("utils.calculate_age", "Edad a partir de fecha de nacimiento")
+def _bench_calculate_age(n, rng):
+    values = birth_dates(n, rng)
+    calculate = utils.calculate_age
+
+    def run():
+        for value in values:
+            calculate(value)
+        return n
+    return run
+
+
+def _accessor_calls(data_dict, n: int, rng: random.Random) -> Callable[[], int]:
+    estamentos = list(data_dict.estamentos_variables)
+    areas = list(data_dict.areas_bienestar_variables)
+    calls = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.4:
+            calls.append((data_dict.get_variables_by_estamento, rng.choice(estamentos)))
+        elif roll < 0.8:
+            calls.append((data_dict.get_variables_by_area, rng.choice(areas)))
+        else:
+            calls.append((data_dict.get_obligatory_variables, None))
+
+    def run():
+        for accessor, argument in calls:
+            accessor() if argument is None else accessor(argument)
+        return n
+    return run
+
+
+@benchmark("data_dictionary.accessors", "Accesores de DataDictionary (instancia nueva)")
+def _bench_dictionary_accessors(n, rng):
+    return _accessor_calls(DataDictionary(), n, rng)
+
+
+@benchmark("data_dictionary.shared_accessors", "Accesores de la vista compartida del diccionario")
+def _bench_shared_accessors(n, rng):
+    return _accessor_calls(get_shared_dictionary(), n, rng)
+
+
+# Ejecución y comparación
+
+def parse_sizes(text: str) -> List[int]:
+    """Convierte '1k,10k,1m' en [1000, 10000, 1000000]"""
+    multipliers = {"k": 1_000, "m": 1_000_000}
+    sizes = []
+    for part in text.split(","):
+        part = part.strip().lower().replace("_", "")
+        if not part:
+            continue
+        multiplier = multipliers.get(part[-1], 1)
+        sizes.append(int(float(part.rstrip("km")) * multiplier))
+    return sizes
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(case: Case, n: int, repeat: int, seed: int = 14, min_time: float = MIN_TIME) -> Dict[str, float]:
+    """
+    Mejor tiempo de un caso con n elementos
+
+    Se ejecuta al menos `repeat` veces y se sigue repitiendo (hasta
+    MAX_REPEAT) mientras el tiempo acumulado sea menor que min_time, para
+    que los tamaños pequeños no dependan de una sola medición ruidosa.
+    """
+    run = case.setup(n, random.Random(seed))
+    best = float("inf")
+    items = 0
+    elapsed = 0.0
+    runs = 0
+    while runs < repeat or (elapsed < min_time and runs < MAX_REPEAT):
+        start = time.perf_counter()
+        items = run()
+        seconds = time.perf_counter() - start
+        best = min(best, seconds)
+        elapsed += seconds
+        runs += 1
+    return {
+        "items": items,
+        "seconds": best,
+        "ns_per_item": best / items * 1e9 if items else 0.0,
+        "items_per_second": items / best if best else 0.0,
+    }
+
+
+def run_suite(sizes=DEFAULT_SIZES, selected: Optional[List[str]] = None, repeat: int = 3,
+              log: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Ejecuta los casos seleccionados en cada tamaño
+
+    Args:
+        sizes: Tamaños de los datos sintéticos
+        selected: Prefijos de nombres de casos (por defecto todos)
+        repeat: Repeticiones por medición (se guarda la mejor); 1 para n >= 1M
+        log: Función para reportar el avance
+
+    Returns:
+        Resultados serializables: {"meta": {...}, "results": {caso: {tamaño: medición}}}
+    """
+    cases = [case for name, case in CASES.items()
+             if not selected or any(name.startswith(prefix) for prefix in selected)]
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for case in cases:
+        for n in sizes:
+            measurement = measure(case, n, 1 if n >= 1_000_000 else repeat)
+            results.setdefault(case.name, {})[str(n)] = measurement
+            if log:
+                log(f"{case.name:<36} n={n:>9,}  {measurement['ns_per_item']:>10.1f} ns/elem  "
+                    f"{measurement['items_per_second']:>14,.0f} elem/s")
+    return {
+        "meta": {
+            "format": RESULTS_FORMAT_VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compara dos ejecuciones por tiempo por elemento
+
+    Returns:
+        Una fila por caso y tamaño presentes en ambas, con "ratio" (actual / base)
+        y "status": "regression", "improvement" u "ok"
+    """
+    rows = []
+    for name, by_size in current["results"].items():
+        for size, measurement in by_size.items():
+            reference = baseline["results"].get(name, {}).get(size)
+            if not reference or not reference["ns_per_item"]:
+                continue
+            ratio = measurement["ns_per_item"] / reference["ns_per_item"]
+            if ratio > 1 + threshold:
+                status = "regression"
+            elif ratio < 1 / (1 + threshold):
+                status = "improvement"
+            else:
+                status = "ok"
+            rows.append({
+                "case": name,
+                "size": int(size),
+                "baseline_ns": reference["ns_per_item"],
+                "current_ns": measurement["ns_per_item"],
+                "ratio": ratio,
+                "status": status,
+            })
+    return rows
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="Lista los casos disponibles")
+
+    run_parser = commands.add_parser("run", help="Ejecuta la suite y guarda los resultados en JSON")
+    run_parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                            help="Tamaños separados por coma (admite k y m, ej. 1k,10k,1m)")
+    run_parser.add_argument("--cases", default="", help="Prefijos de casos separados por coma")
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--output", default=DEFAULT_OUTPUT)
+
+    compare_parser = commands.add_parser("compare", help="Compara resultados contra una línea base")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="Fracción de tiempo adicional tolerada (0.1 = 10%%)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for case in CASES.values():
+            print(f"{case.name:<36} {case.description}")
+        return 0
+
+    if args.command == "run":
+        selected = [prefix.strip() for prefix in args.cases.split(",") if prefix.strip()]
+        results = run_suite(parse_sizes(args.sizes), selected, args.repeat, log=print)
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+        print(f"Resultados guardados en {args.output}")
+        return 0
+
+    rows = compare(_load(args.baseline), _load(args.current), args.threshold)
+    labels = {"regression": "REGRESIÓN", "improvement": "mejora", "ok": ""}
+    for row in rows:
+        print(f"{row['case']:<36} n={row['size']:>9,}  {row['baseline_ns']:>10.1f} -> "
+              f"{row['current_ns']:>10.1f} ns/elem  x{row['ratio']:.2f}  {labels[row['status']]}")
+    regressions = sum(row["status"] == "regression" for row in rows)
+    print(f"{len(rows)} comparaciones, {regressions} regresiones (umbral {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
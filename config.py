@@ -8,6 +8,10 @@ from typing import Dict, Any
 
 # Configuración de la base de datos (placeholder - ajustar según necesidades)
 DATABASE_CONFIG = {
+    "engine": os.getenv("DB_ENGINE", "sqlite"),  # sqlite (local) o postgresql
+    "sqlite_path": os.getenv("DB_SQLITE_PATH", "data/bienestar_upc.db"),
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "batch_size": int(os.getenv("DB_BATCH_SIZE", "5000")),
     "host": os.getenv("DB_HOST", "localhost"),
     "port": os.getenv("DB_PORT", "5432"),
     "database": os.getenv("DB_NAME", "bienestar_upc"),
@@ -23,6 +27,8 @@ SYSTEM_CONFIG = {
     "debug": os.getenv("DEBUG", "True").lower() == "true",
     "timezone": "America/Bogota",
     "language": "es",
+    # Snapshot precompilado del diccionario de datos (ver models/snapshot.py)
+    "dictionary_snapshot_path": os.getenv("DICTIONARY_SNAPSHOT_PATH", "data/dictionary.snapshot"),
 }
 
 # Configuración de roles y permisos
@@ -55,12 +61,40 @@ VALIDATION_RULES = {
     "email_institucional_domain": "@upc.edu.co"
 }
 
+# Configuración de atención de PQRS
+PQRS_CONFIG = {
+    # Plazo de respuesta (horas) por tipo de solicitud
+    "sla_hours": {
+        "peticion": 15 * 24,
+        "queja": 15 * 24,
+        "reclamo": 15 * 24,
+        "sugerencia": 30 * 24,
+        "denuncia": 10 * 24,
+    },
+    "default_sla_hours": 15 * 24,
+    # Prioridad entre tipos con el mismo vencimiento (menor = primero)
+    "type_priority": {"denuncia": 0, "reclamo": 1, "queja": 2, "peticion": 3, "sugerencia": 4},
+    "max_concurrency": int(os.getenv("PQRS_MAX_CONCURRENCY", "8")),
+    "queue_maxsize": int(os.getenv("PQRS_QUEUE_MAXSIZE", "10000")),
+}
+
 # Configuración de servicios externos (placeholder)
 EXTERNAL_SERVICES = {
     "email_service": {
         "enabled": True,
         "smtp_server": os.getenv("SMTP_SERVER", ""),
         "smtp_port": int(os.getenv("SMTP_PORT", "587")),
+        "use_tls": os.getenv("SMTP_USE_TLS", "True").lower() == "true",  # STARTTLS
+        "username": os.getenv("SMTP_USER", ""),
+        "password": os.getenv("SMTP_PASSWORD", ""),
+        "sender": os.getenv("SMTP_SENDER", "bienestar@upc.edu.co"),
+        "timeout_seconds": float(os.getenv("SMTP_TIMEOUT", "30")),
+        # Envío masivo (ver services/notifications.py)
+        "pool_size": int(os.getenv("SMTP_POOL_SIZE", "4")),  # Conexiones SMTP persistentes
+        "batch_size": int(os.getenv("SMTP_BATCH_SIZE", "100")),  # Mensajes por conexión prestada
+        "rate_limit_per_second": float(os.getenv("SMTP_RATE_LIMIT", "20")),  # 0 = sin límite
+        "max_retries": int(os.getenv("SMTP_MAX_RETRIES", "3")),
+        "retry_backoff_seconds": float(os.getenv("SMTP_RETRY_BACKOFF", "1")),
     },
     "sms_service": {
         "enabled": False,
@@ -76,6 +110,78 @@ LOGGING_CONFIG = {
     "file_path": os.getenv("LOG_FILE", "logs/bienestar_upc.log")
 }
 
+# Instrumentación de rutas críticas (desactivada por defecto, ver services/instrumentation.py)
+METRICS_CONFIG = {
+    "enabled": os.getenv("METRICS_ENABLED", "False").lower() == "true",
+    "log_interval_seconds": float(os.getenv("METRICS_LOG_INTERVAL", "60")),
+    "namespace": "bienestar_upc",
+    "profiler_enabled": os.getenv("PROFILER_ENABLED", "False").lower() == "true",
+    "profiler_interval_ms": float(os.getenv("PROFILER_INTERVAL_MS", "10")),
+    "profiler_output": os.getenv("PROFILER_OUTPUT", "logs/profile.folded"),
+}
+
+# Enmascaramiento de datos sensibles en exportaciones y reportes (ver services/masking.py)
+PRIVACY_CONFIG = {
+    "pseudonym_key": os.getenv("PSEUDONYM_KEY", ""),  # Clave de los seudónimos (obligatoria para usarlos)
+    "pseudonym_length": 16,  # Caracteres hexadecimales del seudónimo
+    "small_cell_threshold": int(os.getenv("SMALL_CELL_THRESHOLD", "5")),  # Mínimo de personas por categoría
+}
+
+# Migración en segundo plano de registros de versiones anteriores (ver models/migrations.py)
+MIGRATION_CONFIG = {
+    "batch_size": int(os.getenv("MIGRATION_BATCH_SIZE", "1000")),  # Registros por transacción
+    "pause_seconds": float(os.getenv("MIGRATION_PAUSE_SECONDS", "0.05")),  # Espera entre lotes
+}
+
+# Detección de personas duplicadas entre importaciones (ver services/dedup.py)
+DEDUP_CONFIG = {
+    "threshold": float(os.getenv("DEDUP_THRESHOLD", "0.75")),  # Puntaje mínimo de un duplicado (0 a 1)
+    "workers": int(os.getenv("DEDUP_WORKERS", "0")),  # Procesos para comparar pares (0 = núcleos disponibles)
+    "max_block_size": 500,  # Bloques más grandes se descartan (llave demasiado común)
+    "lsh_bands": 4,
+    "lsh_rows": 6,
+    "min_parallel_pairs": 50_000,  # Por debajo se compara en el proceso actual
+}
+
+# Veto automático de participación en deportes y cultura (ver services/veto.py)
+VETO_CONFIG = {
+    "areas": ("deportes", "cultura"),
+    "promedio_minimo": float(os.getenv("VETO_PROMEDIO_MINIMO", "3.0")),  # Escala de 0 a 5
+    # Promedio mínimo por programa_academico (los demás usan promedio_minimo)
+    "promedio_minimo_programa": {
+        "Licenciatura en Música": 3.2,
+        "Enfermería": 3.3,
+    },
+    # Valores de seguimiento_administrador que vetan sin importar el promedio
+    "seguimiento_veto": ("Vetado", "Suspendido", "Sanción disciplinaria"),
+}
+
+# Asignación de cupos de deportes y cultura (ver services/allocation.py)
+ALLOCATION_CONFIG = {
+    # Prioridad por estamento (menor = primero); con la misma prioridad decide el sorteo
+    "priority_by_estamento": {"estudiante": 0, "docente": 1, "administrativo": 1, "egresado": 2},
+    "max_requests_per_student": 3,
+    "seed": int(os.environ["ALLOCATION_SEED"]) if os.getenv("ALLOCATION_SEED") else None,  # Semilla del sorteo
+}
+
+# Triaje de casos de ayuda social (ver services/triage.py): puntos por valor de cada variable
+TRIAGE_CONFIG = {
+    "nivel_urgencia": {"Crítica": 60, "Alta": 40, "Media": 20, "Baja": 5},
+    "estado_socioeconomico": {"Estrato 1": 20, "Estrato 2": 15, "Estrato 3": 8, "Estrato 4": 3},
+    # Se usa el tipo de asistencia con más puntos del caso
+    "tipo_asistencia": {"Alimentaria": 15, "Vivienda": 15, "Salud": 12, "Psicológica": 10,
+                        "Económica": 8, "Transporte": 5},
+    "tipo_asistencia_default": 3,
+    "aging_per_day": float(os.getenv("TRIAGE_AGING_PER_DAY", "2.0")),  # Puntos por día de espera
+}
+
+# Validación masiva en paralelo (ver services/bulk_validation.py)
+BULK_VALIDATION_CONFIG = {
+    "workers": int(os.getenv("BULK_VALIDATION_WORKERS", "0")),  # Procesos (0 = núcleos disponibles)
+    "shard_size": int(os.getenv("BULK_VALIDATION_SHARD_SIZE", "20000")),  # Registros por fragmento
+    "max_pending_per_worker": 2,  # Fragmentos en vuelo por proceso (memoria acotada)
+}
+
 def get_config(section: str) -> Dict[str, Any]:
     """
     Obtiene una sección específica de la configuración
@@ -91,8 +197,17 @@ def get_config(section: str) -> Dict[str, Any]:
         "system": SYSTEM_CONFIG,
         "roles": ROLES_CONFIG,
         "validation": VALIDATION_RULES,
+        "pqrs": PQRS_CONFIG,
         "external": EXTERNAL_SERVICES,
-        "logging": LOGGING_CONFIG
+        "logging": LOGGING_CONFIG,
+        "metrics": METRICS_CONFIG,
+        "privacy": PRIVACY_CONFIG,
+        "migrations": MIGRATION_CONFIG,
+        "dedup": DEDUP_CONFIG,
+        "veto": VETO_CONFIG,
+        "allocation": ALLOCATION_CONFIG,
+        "triage": TRIAGE_CONFIG,
+        "bulk_validation": BULK_VALIDATION_CONFIG
     }
     
     return config_sections.get(section, {})
\ No newline at end of file
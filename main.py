@@ -8,10 +8,18 @@ Proyecto octavo semestre - Ingeniería de Sistemas
 """
 
 # Importar solo el diccionario de datos
+from config import get_config
 from models.data_dictionary import DataDictionary
 
 def main():
     """Mostrar las variables del diccionario de datos"""
+    # Métricas y perfilador opcionales (METRICS_ENABLED / PROFILER_ENABLED)
+    metrics_config = get_config("metrics")
+    instrumentation = None
+    if metrics_config["enabled"] or metrics_config["profiler_enabled"]:
+        from services import instrumentation
+        instrumentation.configure_from_env()
+    
     print("=== BienestarUPC - Variables del Diccionario ===")
     print("Backend: Alistar primeras variables para cargar en el diccionario")
     print()
@@ -25,6 +33,9 @@ def main():
     data_dict.show_dictionary_structure()
     
     print("\n✅ Variables del diccionario listas para implementación")
+    
+    if instrumentation is not None:
+        instrumentation.shutdown()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,13 +5,45 @@ Tarea: Alistar primeras variables para cargar en el diccionario
 
 Contiene:
 - data_dictionary: Variables del diccionario de datos del sistema
+- validators: Validadores compilados por estamento y por área
+- record_store: Almacén columnar compacto de personas
+- migrations: Versiones del esquema, migraciones declarativas y actualización perezosa
+- snapshot: Snapshot precompilado del diccionario y sus derivados
+  (se importa explícitamente: python -m models.snapshot lo construye)
 """
 
 # Importación principal
-from .data_dictionary import DataDictionary
+from .data_dictionary import (
+    SCHEMA_VERSION,
+    DataDictionary,
+    DataDictionaryView,
+    get_shared_dictionary,
+    invalidate_shared_dictionary,
+    register_reload_hook,
+    reload_shared_dictionary,
+)
+from .migrations import BackgroundMigrator, Migration, MigrationError, RecordEnvelope, SchemaMigrator
+from .record_store import PersonRow, RecordStore
+from .validators import CompiledSchema, RecordValidator, compile_schema
 
 __all__ = [
-    'DataDictionary'
+    'SCHEMA_VERSION',
+    'DataDictionary',
+    'DataDictionaryView',
+    'get_shared_dictionary',
+    'invalidate_shared_dictionary',
+    'register_reload_hook',
+    'reload_shared_dictionary',
+    'BackgroundMigrator',
+    'Migration',
+    'MigrationError',
+    'RecordEnvelope',
+    'SchemaMigrator',
+    'PersonRow',
+    'RecordStore',
+    'CompiledSchema',
+    'RecordValidator',
+    'compile_schema'
 ]
 
 # Información del paquete
@@ -13,8 +13,18 @@ Estamentos: Estudiantes, Administrativos, Docentes, Egresados
 Basado en: Política de bienestar familiar institucional UPC
 """
 
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, List, Mapping, Optional
+
+# Versión del esquema de registros; al cambiar variables o listas de valores se
+# incrementa y se declara la migración en models/migrations.py
+SCHEMA_VERSION = 1
+
 class DataDictionary:
     """Diccionario de variables para el sistema de bienestar universitario UPC"""
+
+    schema_version = SCHEMA_VERSION
     
     def __init__(self):
         """Inicializa las variables del diccionario de datos según apuntes de clase"""
@@ -227,6 +237,21 @@ class DataDictionary:
             ]  # Obligatorio para cumplimiento normativo
         }
     
+    def get_sensitive_variables(self):
+        """Retorna los datos sensibles y las variables que autorizan su manejo (Ley de protección de datos)"""
+        return {
+            "datos_sensibles": [
+                "sexo_biologico", "identidad_genero", "orientacion_sexual",
+                "poblacion_diferencial", "reportes_discriminacion"
+            ],  # Solo con autorización y sin confidencialidad solicitada
+            "identificadores_directos": [
+                "numero_documento", "nombres", "apellidos", "nombre_social",
+                "email", "cel", "domicilio"
+            ],  # Identifican a la persona; se seudonimizan o suprimen al exportar
+            "autorizacion": "autorizacion_datos_sensibles",
+            "confidencialidad": "confidencialidad_solicitada"
+        }
+    
     def get_all_variables(self):
         """Retorna todas las variables del diccionario organizadas según UPC"""
         return {
@@ -235,3 +260,123 @@ class DataDictionary:
             "areas_bienestar": self.areas_bienestar_variables,
             "obligatorias": self.get_obligatory_variables()
         }
+
+
+def _freeze(value: Any) -> Any:
+    """Convierte dicts en MappingProxyType y listas en tuplas, recursivamente"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class DataDictionaryView:
+    """
+    Vistas inmutables y precalculadas de un DataDictionary
+    
+    Los accesores retornan siempre los mismos objetos (MappingProxyType y
+    tuplas), por lo que no hay asignaciones de memoria por llamada. Las
+    listas de valores permitidos se exponen como tuplas.
+    """
+
+    def __init__(self, data_dict: DataDictionary, version: int = 1):
+        self.source = data_dict
+        self.version = version
+        self.schema_version = data_dict.schema_version
+        self.identificacion_variables = _freeze(data_dict.identificacion_variables)
+        self.estamentos_variables = _freeze(data_dict.estamentos_variables)
+        self.areas_bienestar_variables = _freeze(data_dict.areas_bienestar_variables)
+
+        self._by_estamento = {
+            estamento: _freeze(data_dict.get_variables_by_estamento(estamento))
+            for estamento in data_dict.estamentos_variables
+        }
+        self._empty = MappingProxyType({})
+        self._obligatory = _freeze(data_dict.get_obligatory_variables())
+        self._sensitive = _freeze(data_dict.get_sensitive_variables())
+        self._all = MappingProxyType({
+            "identificacion": self.identificacion_variables,
+            "estamentos": self.estamentos_variables,
+            "areas_bienestar": self.areas_bienestar_variables,
+            "obligatorias": self._obligatory,
+        })
+
+    def show_dictionary_structure(self):
+        """Muestra la estructura completa del diccionario de variables"""
+        self.source.show_dictionary_structure()
+
+    def get_variables_by_estamento(self, estamento) -> Mapping[str, Any]:
+        """Obtiene las variables específicas de un estamento (vista inmutable)"""
+        return self._by_estamento.get(estamento, self.identificacion_variables)
+
+    def get_variables_by_area(self, area) -> Mapping[str, Any]:
+        """Obtiene las variables específicas de un área de bienestar (vista inmutable)"""
+        return self.areas_bienestar_variables.get(area, self._empty)
+
+    def get_obligatory_variables(self) -> Mapping[str, Any]:
+        """Retorna las variables obligatorias del sistema (vista inmutable)"""
+        return self._obligatory
+
+    def get_sensitive_variables(self) -> Mapping[str, Any]:
+        """Retorna los datos sensibles y las variables que autorizan su manejo (vista inmutable)"""
+        return self._sensitive
+
+    def get_all_variables(self) -> Mapping[str, Any]:
+        """Retorna todas las variables del diccionario (vista inmutable)"""
+        return self._all
+
+
+# Instancia compartida del proceso
+_shared_view: Optional[DataDictionaryView] = None
+_shared_version = 0
+_shared_lock = threading.Lock()
+_reload_hooks: List[Callable[[DataDictionaryView], None]] = []
+
+
+def get_shared_dictionary() -> DataDictionaryView:
+    """
+    Obtiene la instancia compartida (de todo el proceso) del diccionario
+    
+    Returns:
+        Vista inmutable; se construye en la primera llamada
+    """
+    view = _shared_view
+    if view is None:
+        view = reload_shared_dictionary()
+    return view
+
+
+def reload_shared_dictionary(data_dict: Optional[DataDictionary] = None) -> DataDictionaryView:
+    """
+    Reconstruye la instancia compartida y notifica a los hooks registrados
+    
+    Args:
+        data_dict: Diccionario nuevo (por defecto se construye uno)
+        
+    Returns:
+        La nueva vista compartida
+    """
+    global _shared_view, _shared_version
+    with _shared_lock:
+        _shared_version += 1
+        view = DataDictionaryView(data_dict or DataDictionary(), _shared_version)
+        _shared_view = view
+        hooks = list(_reload_hooks)
+    for hook in hooks:
+        hook(view)
+    return view
+
+
+def invalidate_shared_dictionary() -> None:
+    """Descarta la instancia compartida; la próxima consulta la reconstruye"""
+    global _shared_view
+    with _shared_lock:
+        _shared_view = None
+
+
+def register_reload_hook(hook: Callable[[DataDictionaryView], None]) -> None:
+    """Registra una función a llamar cada vez que se recarga el diccionario compartido"""
+    with _shared_lock:
+        if hook not in _reload_hooks:
+            _reload_hooks.append(hook)
@@ -0,0 +1,309 @@
+"""
+Migraciones declarativas del esquema de registros y actualización perezosa
+
+Cada registro guardado lleva la versión del esquema con la que se escribió
+(RecordEnvelope, o la columna schema_version en services/database.py). Al
+desplegar un diccionario nuevo no se reescriben los registros: se leen con
+su versión y, si es anterior a SCHEMA_VERSION, se actualizan en memoria con
+las migraciones declaradas. Un BackgroundMigrator puede reescribirlos por
+lotes pequeños mientras el sistema sigue atendiendo.
+
+Las migraciones se declaran como operaciones sobre variables (rename,
+add_default, drop, map_values, transform) y se compilan, por versión de
+origen, a una sola secuencia de pasos aplicada sobre una única copia del
+registro. Las operaciones deben ser idempotentes: una fila actualizada de
+forma parcial puede volver a pasar por ellas.
+"""
+
+import json
+import threading
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from config import get_config
+from .data_dictionary import SCHEMA_VERSION
+
+# Versión de los registros guardados antes del versionado
+BASE_VERSION = 1
+
+RENAME = "rename"
+ADD_DEFAULT = "add_default"
+DROP = "drop"
+MAP_VALUES = "map_values"
+TRANSFORM = "transform"
+
+Step = Callable[[Dict[str, Any]], None]
+
+
+class MigrationError(ValueError):
+    """Historial de migraciones inválido o registro de una versión desconocida"""
+
+
+class Operation(NamedTuple):
+    """Operación de migración sobre una variable"""
+    kind: str
+    field: str
+    argument: Any = None
+
+
+def rename(old: str, new: str) -> Operation:
+    """Renombra una variable (si ya existe la nueva, se conserva la nueva)"""
+    return Operation(RENAME, old, new)
+
+
+def add_default(field: str, default: Any) -> Operation:
+    """Agrega una variable nueva con un valor por defecto si no existe"""
+    return Operation(ADD_DEFAULT, field, default)
+
+
+def drop(field: str) -> Operation:
+    """Elimina una variable"""
+    return Operation(DROP, field)
+
+
+def map_values(field: str, mapping: Mapping[Any, Any]) -> Operation:
+    """Reemplaza valores de una lista de valores (también dentro de variables tipo array)"""
+    return Operation(MAP_VALUES, field, dict(mapping))
+
+
+def transform(field: str, function: Callable[[Any], Any]) -> Operation:
+    """Aplica una función al valor de una variable presente (debe ser idempotente)"""
+    return Operation(TRANSFORM, field, function)
+
+
+class Migration(NamedTuple):
+    """Cambios para pasar de la versión anterior a `version`"""
+    version: int
+    description: str
+    operations: Tuple[Operation, ...]
+
+
+# Historial del diccionario de datos (la última versión es SCHEMA_VERSION); vacío mientras el
+# esquema siga en BASE_VERSION. Ej. Migration(2, "Celular en lugar de teléfono", (rename("telefono", "cel"),))
+MIGRATIONS: Tuple[Migration, ...] = ()
+
+
+class RecordEnvelope(NamedTuple):
+    """Registro con la versión del esquema con la que se escribió"""
+    schema_version: int
+    data: Mapping[str, Any]
+
+    def to_json(self) -> str:
+        return json.dumps({"schema_version": self.schema_version, "data": self.data},
+                          ensure_ascii=False, default=str)
+
+    @classmethod
+    def from_json(cls, text: str) -> "RecordEnvelope":
+        """Lee un sobre JSON; un registro sin sobre se considera de BASE_VERSION"""
+        payload = json.loads(text)
+        if "schema_version" in payload and "data" in payload:
+            return cls(int(payload["schema_version"]), payload["data"])
+        return cls(BASE_VERSION, payload)
+
+
+def _step(operation: Operation) -> Step:
+    kind, field, argument = operation
+    if kind == RENAME:
+        def step(record: Dict[str, Any]) -> None:
+            if field in record:
+                value = record.pop(field)
+                record.setdefault(argument, value)
+    elif kind == ADD_DEFAULT:
+        def step(record: Dict[str, Any]) -> None:
+            record.setdefault(field, argument)
+    elif kind == DROP:
+        def step(record: Dict[str, Any]) -> None:
+            record.pop(field, None)
+    elif kind == MAP_VALUES:
+        def step(record: Dict[str, Any]) -> None:
+            value = record.get(field)
+            if value is None:
+                return
+            if isinstance(value, (list, tuple)):
+                record[field] = [argument.get(item, item) for item in value]
+            else:
+                record[field] = argument.get(value, value)
+    elif kind == TRANSFORM:
+        def step(record: Dict[str, Any]) -> None:
+            if field in record:
+                record[field] = argument(record[field])
+    else:
+        raise MigrationError(f"Operación de migración desconocida: {kind}")
+    return step
+
+
+class _Plan(NamedTuple):
+    steps: Tuple[Step, ...]
+    renames: Mapping[str, str]
+
+
+class SchemaMigrator:
+    """
+    Actualiza registros de versiones anteriores a la versión actual
+
+    Los planes compilados se guardan por (versión de origen, variables de
+    destino); un registro ya actualizado no se copia.
+    """
+
+    def __init__(self, migrations: Optional[Iterable[Migration]] = None, current: Optional[int] = None):
+        """
+        Args:
+            migrations: Historial (por defecto MIGRATIONS)
+            current: Versión actual (por defecto SCHEMA_VERSION); se usan las
+                     migraciones hasta esa versión
+
+        Raises:
+            MigrationError: Si faltan versiones o hay versiones repetidas
+        """
+        self.current = SCHEMA_VERSION if current is None else int(current)
+        history = sorted(MIGRATIONS if migrations is None else migrations, key=lambda migration: migration.version)
+        history = [migration for migration in history if migration.version <= self.current]
+        expected = list(range(BASE_VERSION + 1, self.current + 1))
+        if [migration.version for migration in history] != expected:
+            raise MigrationError(
+                f"El historial debe tener una migración por versión {expected}, "
+                f"tiene {[migration.version for migration in history]}")
+        # Operaciones desconocidas se detectan al construir, no al leer el primer registro antiguo
+        for migration in history:
+            for operation in migration.operations:
+                _step(operation)
+        self.migrations = tuple(history)
+        self._plans: Dict[Tuple[int, Optional[FrozenSet[str]]], _Plan] = {}
+
+    def _plan(self, version: int, fields: Optional[FrozenSet[str]] = None) -> _Plan:
+        plan = self._plans.get((version, fields))
+        if plan is None:
+            if not BASE_VERSION <= version <= self.current:
+                raise MigrationError(f"Versión de esquema desconocida: {version} (actual {self.current})")
+            steps: List[Step] = []
+            renames: Dict[str, str] = {}
+            for migration in self.migrations[version - BASE_VERSION:]:
+                for operation in migration.operations:
+                    # Valores por defecto de variables que no existen en el destino: se omiten
+                    if operation.kind == ADD_DEFAULT and fields is not None and operation.field not in fields:
+                        continue
+                    if operation.kind == RENAME:
+                        for old, new in renames.items():
+                            if new == operation.field:
+                                renames[old] = operation.argument
+                        renames.setdefault(operation.field, operation.argument)
+                    steps.append(_step(operation))
+            plan = _Plan(tuple(steps), renames)
+            self._plans[(version, fields)] = plan
+        return plan
+
+    def is_current(self, version: int) -> bool:
+        return version == self.current
+
+    def upgrade(self, record: Mapping[str, Any], version: int,
+                fields: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
+        """
+        Registro en la versión actual
+
+        Args:
+            record: Registro tal como se guardó
+            version: Versión con la que se guardó
+            fields: Variables del destino (ej. columnas de la tabla); los
+                    valores por defecto de otras variables no se agregan
+
+        Returns:
+            El mismo registro si ya está al día; si no, una copia actualizada
+
+        Raises:
+            MigrationError: Si la versión es posterior a la actual o desconocida
+        """
+        if version == self.current:
+            return record
+        steps = self._plan(version, fields).steps
+        upgraded = dict(record)
+        for step in steps:
+            step(upgraded)
+        return upgraded
+
+    def renames(self, version: int) -> Mapping[str, str]:
+        """Nombres antiguos -> nombre actual de las variables renombradas desde `version`"""
+        return self._plan(version).renames
+
+    def wrap(self, record: Mapping[str, Any]) -> RecordEnvelope:
+        """Sobre con la versión actual para un registro nuevo"""
+        return RecordEnvelope(self.current, record)
+
+    def read(self, envelope: RecordEnvelope) -> Dict[str, Any]:
+        """Contenido de un sobre en la versión actual (actualización perezosa)"""
+        return self.upgrade(envelope.data, envelope.schema_version)
+
+    def upgrade_envelope(self, envelope: RecordEnvelope) -> RecordEnvelope:
+        """Sobre reescrito en la versión actual"""
+        if envelope.schema_version == self.current:
+            return envelope
+        return RecordEnvelope(self.current, self.read(envelope))
+
+
+class BackgroundMigrator:
+    """
+    Reescribe por lotes los registros de versiones anteriores en un hilo
+
+    Cada paso recibe un tamaño de lote y retorna cuántos registros
+    reescribió (ej. Database.migrate_batch para una tabla); se detiene
+    cuando un paso retorna menos que el lote. Entre lotes espera
+    `pause_seconds` para ceder la base de datos a las solicitudes normales.
+    """
+
+    def __init__(self, steps: Mapping[str, Callable[[int], int]], batch_size: Optional[int] = None,
+                 pause_seconds: Optional[float] = None):
+        """
+        Args:
+            steps: {nombre (ej. tabla): función de un lote}
+            batch_size: Registros por lote (por defecto el de la configuración)
+            pause_seconds: Espera entre lotes (por defecto la de la configuración)
+        """
+        config = get_config("migrations")
+        self.steps = dict(steps)
+        self.batch_size = int(batch_size or config.get("batch_size", 1000))
+        self.pause_seconds = float(config.get("pause_seconds", 0.05) if pause_seconds is None else pause_seconds)
+        self.migrated: Dict[str, int] = {name: 0 for name in self.steps}
+        self.error: Optional[Exception] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run(self) -> Dict[str, int]:
+        """
+        Migra todo en el hilo actual (o hasta stop())
+
+        Returns:
+            Registros reescritos por paso
+        """
+        for name, step in self.steps.items():
+            while not self._stop.is_set():
+                count = step(self.batch_size)
+                self.migrated[name] += count
+                if count < self.batch_size or self._stop.wait(self.pause_seconds):
+                    break
+        return self.migrated
+
+    def _run_safely(self) -> None:
+        try:
+            self.run()
+        except Exception as error:
+            self.error = error
+
+    def start(self) -> "BackgroundMigrator":
+        """Inicia la migración en un hilo daemon"""
+        self._thread = threading.Thread(target=self._run_safely, name="schema-migrator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Detiene la migración al terminar el lote en curso"""
+        self._stop.set()
+        self.join()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que termine; retorna True si terminó"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
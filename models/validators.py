@@ -0,0 +1,219 @@
+"""
+Validadores compilados a partir del Diccionario de Datos
+Convierte las variables por estamento y por área en validadores reutilizables
+
+El diccionario se recorre una sola vez al compilar; cada validador guarda
+tuplas planas de (variable, chequeo) para que validar un registro sea solo
+un ciclo sobre funciones ya construidas.
+"""
+
+from datetime import date, datetime
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple, Union
+
+import utils
+from .data_dictionary import DataDictionary, DataDictionaryView, get_shared_dictionary
+
+# Códigos de motivo de rechazo
+MISSING = "missing"
+INVALID_TYPE = "invalid_type"
+INVALID_ENUM = "invalid_enum"
+INVALID_FORMAT = "invalid_format"
+
+# Tipo de documento del diccionario -> tipo esperado por utils.validate_document_number
+DOCUMENT_TYPE_ALIASES = {
+    "CC": "cc",
+    "CE": "ce",
+    "TI": "ti",
+    "PAS": "pasaporte",
+}
+
+# Tipos declarados en el diccionario -> tipos de Python aceptados
+PYTHON_TYPES = {
+    "string": (str,),
+    "text": (str,),
+    "integer": (int,),
+    "float": (int, float),
+    "boolean": (bool,),
+    "date": (date,),
+    "datetime": (datetime,),
+    "array": (list, tuple),
+}
+
+Check = Callable[[Any, Dict[str, Any]], Optional[str]]
+ValidationError = Tuple[str, str]
+
+
+def _type_check(python_types: tuple, allow_bool: bool) -> Check:
+    """Construye el chequeo de tipo para un tipo declarado"""
+    def check(value, record):
+        if isinstance(value, python_types) and (allow_bool or not isinstance(value, bool)):
+            return None
+        return INVALID_TYPE
+    return check
+
+
+def _enum_check(allowed: FrozenSet[str]) -> Check:
+    """Construye el chequeo de pertenencia a una lista de valores permitidos"""
+    def check(value, record):
+        if isinstance(value, str):
+            return None if value in allowed else INVALID_ENUM
+        if isinstance(value, (list, tuple)):
+            # Variables multivaluadas (ej. actividades_disponibles)
+            return None if allowed.issuperset(value) else INVALID_ENUM
+        return INVALID_TYPE
+    return check
+
+
+def _email_check(value, record):
+    if not isinstance(value, str):
+        return INVALID_TYPE
+    return None if utils.validate_email(value) else INVALID_FORMAT
+
+
+def _phone_check(value, record):
+    if not isinstance(value, str):
+        return INVALID_TYPE
+    return None if utils.validate_phone_number(value) else INVALID_FORMAT
+
+
+def _document_check(value, record):
+    if not isinstance(value, str):
+        return INVALID_TYPE
+    document_type = record.get("tipo_documento")
+    if not isinstance(document_type, str):
+        # Sin tipo no se puede validar el formato; el tipo se reporta aparte
+        return None
+    document_type = DOCUMENT_TYPE_ALIASES.get(document_type, document_type)
+    return None if utils.validate_document_number(value, document_type) else INVALID_FORMAT
+
+
+# Variables con validación de formato delegada a utils
+FORMAT_CHECKS: Dict[str, Check] = {
+    "email": _email_check,
+    "cel": _phone_check,
+    "numero_documento": _document_check,
+}
+
+
+def build_check(variable: str, declared: Any) -> Check:
+    """
+    Construye el chequeo de una variable según su declaración en el diccionario
+
+    Args:
+        variable: Nombre de la variable
+        declared: Tipo declarado (string) o lista de valores permitidos
+
+    Returns:
+        Función (valor, registro) -> código de motivo o None
+    """
+    if variable in FORMAT_CHECKS:
+        return FORMAT_CHECKS[variable]
+    if isinstance(declared, (list, tuple)):
+        return _enum_check(frozenset(declared))
+    python_types = PYTHON_TYPES.get(declared)
+    if python_types is None:
+        # Tipo desconocido: no se valida
+        return lambda value, record: None
+    return _type_check(python_types, allow_bool=declared == "boolean")
+
+
+class RecordValidator:
+    """Validador compilado para un estamento o un área de bienestar"""
+
+    __slots__ = ("name", "required", "checks")
+
+    def __init__(self, name: str, variables: Mapping[str, Any], required: FrozenSet[str]):
+        self.name = name
+        self.required: Tuple[str, ...] = tuple(v for v in variables if v in required)
+        self.checks: Tuple[Tuple[str, Check], ...] = tuple(
+            (variable, build_check(variable, declared)) for variable, declared in variables.items()
+        )
+
+    def validate(self, record: Dict[str, Any]) -> List[ValidationError]:
+        """
+        Valida un registro contra las variables compiladas
+
+        Args:
+            record: Registro (diccionario variable -> valor)
+
+        Returns:
+            Lista de tuplas (variable, motivo); vacía si el registro es válido
+        """
+        errors = []
+        get = record.get
+        for variable in self.required:
+            value = get(variable)
+            if value is None or value == "":
+                errors.append((variable, MISSING))
+        for variable, check in self.checks:
+            value = get(variable)
+            if value is None or value == "":
+                continue
+            reason = check(value, record)
+            if reason is not None:
+                errors.append((variable, reason))
+        return errors
+
+    def is_valid(self, record: Dict[str, Any]) -> bool:
+        """Retorna True si el registro no tiene errores"""
+        return not self.validate(record)
+
+    __call__ = validate
+
+
+class CompiledSchema:
+    """Conjunto de validadores compilados, uno por estamento y uno por área"""
+
+    def __init__(self, estamentos: Dict[str, RecordValidator], areas: Dict[str, RecordValidator]):
+        self.estamentos = estamentos
+        self.areas = areas
+
+    def for_estamento(self, estamento: str) -> RecordValidator:
+        """Obtiene el validador de un estamento"""
+        try:
+            return self.estamentos[estamento]
+        except KeyError:
+            raise KeyError(f"Estamento no definido en el diccionario: {estamento}") from None
+
+    def for_area(self, area: str) -> RecordValidator:
+        """Obtiene el validador de un área de bienestar"""
+        try:
+            return self.areas[area]
+        except KeyError:
+            raise KeyError(f"Área no definida en el diccionario: {area}") from None
+
+
+def get_required_variables(data_dict: Union[DataDictionary, DataDictionaryView]) -> FrozenSet[str]:
+    """Aplana las variables obligatorias del diccionario en un frozenset"""
+    return frozenset(
+        variable
+        for variables in data_dict.get_obligatory_variables().values()
+        for variable in variables
+    )
+
+
+def compile_schema(data_dict: Union[DataDictionary, DataDictionaryView, None] = None) -> CompiledSchema:
+    """
+    Compila el diccionario de datos en validadores por estamento y por área
+
+    Args:
+        data_dict: Diccionario a compilar (por defecto la instancia compartida)
+
+    Returns:
+        Esquema compilado con un validador por estamento y por área
+    """
+    if data_dict is None:
+        data_dict = get_shared_dictionary()
+    required = get_required_variables(data_dict)
+
+    estamentos = {
+        estamento: RecordValidator(
+            estamento, data_dict.get_variables_by_estamento(estamento), required
+        )
+        for estamento in data_dict.estamentos_variables
+    }
+    areas = {
+        area: RecordValidator(area, data_dict.get_variables_by_area(area), required)
+        for area in data_dict.areas_bienestar_variables
+    }
+    return CompiledSchema(estamentos, areas)
@@ -0,0 +1,101 @@
+# Archivo de inicialización del paquete services
+"""
+Paquete de servicios - BienestarUPC
+Procesos que operan sobre los registros definidos en el diccionario de datos
+
+Contiene:
+- importer: Pipeline de importación por flujo (CSV/JSONL)
+- instrumentation: Métricas opcionales de rutas críticas y perfilador por muestreo
+- aggregation: Conteos y tablas cruzadas con índices de mapas de bits
+- allocation: Asignación en lote de cupos de deportes y cultura con lista de espera
+- authorization: Permisos por rol compilados a máscaras de bits
+- bulk_validation: Validación y enriquecimiento masivo en paralelo por fragmentos
+- database: Pool de conexiones, DDL derivado del diccionario y upsert masivo
+- dedup: Detección incremental de personas duplicadas entre importaciones
+- export: Exportación incremental de cambios por update_date (JSONL o columnar)
+- identity: Índices de identidad y códigos de usuario sin colisiones
+- masking: Seudonimización y enmascaramiento por lotes de datos sensibles
+- metrics: Histogramas de latencia
+- notifications: Envío masivo de correos por lotes con conexiones SMTP persistentes
+- pqrs_queue: Cola asíncrona de atención de PQRS por vencimiento (SLA)
+- search: Búsqueda de texto completo en PQRS (índice invertido y BM25)
+- triage: Cola de triaje de casos de ayuda social (montículo indexado)
+- veto: Veto automático incremental de participación en deportes y cultura
+"""
+
+from .aggregation import AggregationEngine
+from .allocation import ActivityGroup, AllocationResult, Assignment, EnrollmentRequest, SlotAllocator
+from .authorization import AuthorizationError, Authorizer, get_authorizer
+from .bulk_validation import BulkValidationReport, BulkValidator, ShardReport
+from .database import ConnectionPool, Database, DatabaseError
+from .dedup import DedupEngine, DedupReport, DuplicateMatch
+from .export import ChangeExporter, ColumnarWriter, ExportError, JsonlWriter, Watermark
+from .identity import IdentityConflictError, IdentityIndex
+from .importer import ImportPipeline, ImportReport, jsonl_sink
+from .instrumentation import MetricsRegistry, SamplingProfiler, configure_from_env, instrument, uninstrument
+from .masking import MaskingError, MaskingPolicy, MaskingStage, compile_policy, suppress_small_cells
+from .metrics import LatencyHistogram
+from .notifications import LocalSMTPServer, Notification, NotificationDispatcher, NotificationError
+from .pqrs_queue import PQRSQueue, SLAPolicy
+from .search import PQRSSearchIndex, SearchHit, tokenize
+from .triage import IndexedHeap, TriageCase, TriagePolicy, TriageQueue
+from .veto import ParticipationChange, VetoEngine, VetoPolicy, veto_notifications
+
+__all__ = [
+    'ActivityGroup',
+    'AggregationEngine',
+    'AllocationResult',
+    'Assignment',
+    'AuthorizationError',
+    'Authorizer',
+    'BulkValidationReport',
+    'BulkValidator',
+    'ChangeExporter',
+    'ColumnarWriter',
+    'ConnectionPool',
+    'Database',
+    'DatabaseError',
+    'DedupEngine',
+    'DedupReport',
+    'DuplicateMatch',
+    'EnrollmentRequest',
+    'ExportError',
+    'IdentityConflictError',
+    'IdentityIndex',
+    'ImportPipeline',
+    'ImportReport',
+    'IndexedHeap',
+    'JsonlWriter',
+    'LatencyHistogram',
+    'LocalSMTPServer',
+    'MaskingError',
+    'MaskingPolicy',
+    'MaskingStage',
+    'MetricsRegistry',
+    'Notification',
+    'NotificationDispatcher',
+    'NotificationError',
+    'PQRSQueue',
+    'PQRSSearchIndex',
+    'ParticipationChange',
+    'SLAPolicy',
+    'SamplingProfiler',
+    'SearchHit',
+    'ShardReport',
+    'SlotAllocator',
+    'TriageCase',
+    'TriagePolicy',
+    'TriageQueue',
+    'VetoEngine',
+    'VetoPolicy',
+    'Watermark',
+    'compile_policy',
+    'configure_from_env',
+    'get_authorizer',
+    'instrument',
+    'jsonl_sink',
+    'suppress_small_cells',
+    'tokenize',
+    'uninstrument',
+    'veto_notifications'
+]
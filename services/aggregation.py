@@ -0,0 +1,318 @@
+"""
+Motor de agregación con índices de mapas de bits
+Conteos, filtros y tablas cruzadas para reportes de inclusión y bienestar
+
+Cada registro ocupa una posición de bit; por cada dimensión (variable
+categórica) y valor se guarda un entero de Python usado como bitset. Los
+filtros y cruces se resuelven con & / | y conteo de bits, sin recorrer los
+registros. Las variables tipo "array" (ej. deportes_practicados) encienden
+un bit en cada uno de sus valores.
+"""
+
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from models.data_dictionary import DataDictionary, DataDictionaryView, get_shared_dictionary
+
+# Dimensiones de texto libre usadas en los reportes institucionales
+DEFAULT_EXTRA_DIMENSIONS = ("facultad", "programa_academico", "estado_participacion")
+
+Filter = Mapping[str, Union[Any, Iterable[Any]]]
+
+if hasattr(int, "bit_count"):
+    def popcount(bits: int) -> int:
+        return bits.bit_count()
+else:  # Python < 3.10
+    def popcount(bits: int) -> int:
+        return bin(bits).count("1")
+
+
+def _as_values(value: Any) -> Tuple[Any, ...]:
+    """Normaliza el valor de una dimensión a una tupla de valores"""
+    if value is None or value == "":
+        return ()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(dict.fromkeys(item for item in value if item is not None and item != ""))
+    return (value,)
+
+
+def categorical_dimensions(data_dict: Union[DataDictionary, DataDictionaryView]) -> List[str]:
+    """
+    Variables del diccionario que se indexan: listas de valores y tipo "array"
+
+    Args:
+        data_dict: Diccionario de datos
+
+    Returns:
+        Nombres de variables sin repetir, en orden de declaración
+    """
+    groups = [data_dict.identificacion_variables]
+    groups.extend(data_dict.estamentos_variables.values())
+    groups.extend(data_dict.areas_bienestar_variables.values())
+    dimensions: Dict[str, None] = {}
+    for variables in groups:
+        for variable, declared in variables.items():
+            if isinstance(declared, (list, tuple)) or declared == "array":
+                dimensions[variable] = None
+    return list(dimensions)
+
+
+def _bits_from_positions(positions: Iterable[int]) -> int:
+    """Construye un bitset a partir de posiciones usando un bytearray intermedio"""
+    positions = list(positions)
+    if not positions:
+        return 0
+    buffer = bytearray((max(positions) >> 3) + 1)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bytes(buffer), "little")
+
+
+class BitmapIndex:
+    """Índice de una dimensión: valor -> bitset de posiciones"""
+
+    __slots__ = ("name", "bitmaps")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.bitmaps: Dict[Any, int] = {}
+
+    def add(self, position: int, values: Tuple[Any, ...]) -> None:
+        bit = 1 << position
+        bitmaps = self.bitmaps
+        for value in values:
+            bitmaps[value] = bitmaps.get(value, 0) | bit
+
+    def remove(self, position: int, values: Tuple[Any, ...]) -> None:
+        mask = ~(1 << position)
+        bitmaps = self.bitmaps
+        for value in values:
+            remaining = bitmaps.get(value, 0) & mask
+            if remaining:
+                bitmaps[value] = remaining
+            else:
+                bitmaps.pop(value, None)
+
+    def union(self, values: Iterable[Any]) -> int:
+        bits = 0
+        for value in values:
+            bits |= self.bitmaps.get(value, 0)
+        return bits
+
+
+class AggregationEngine:
+    """Motor de conteos y tablas cruzadas con actualización incremental"""
+
+    def __init__(self, dimensions: Iterable[str]):
+        """
+        Args:
+            dimensions: Variables a indexar
+        """
+        self.indexes: Dict[str, BitmapIndex] = {name: BitmapIndex(name) for name in dimensions}
+        self._positions: Dict[Hashable, int] = {}
+        self._ids: List[Optional[Hashable]] = []
+        self._values: List[Optional[Dict[str, Tuple[Any, ...]]]] = []
+        self._free: List[int] = []
+        self.live = 0  # Bitset de posiciones ocupadas
+
+    @classmethod
+    def from_dictionary(cls, data_dict: Union[DataDictionary, DataDictionaryView, None] = None,
+                        extra_dimensions: Iterable[str] = DEFAULT_EXTRA_DIMENSIONS) -> "AggregationEngine":
+        """Crea un motor con las variables categóricas del diccionario más dimensiones extra"""
+        data_dict = data_dict or get_shared_dictionary()
+        dimensions = categorical_dimensions(data_dict)
+        dimensions.extend(name for name in extra_dimensions if name not in dimensions)
+        return cls(dimensions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, record_id: Hashable) -> bool:
+        return record_id in self._positions
+
+    def upsert(self, record_id: Hashable, record: Mapping[str, Any]) -> None:
+        """
+        Inserta o actualiza un registro; solo se tocan las dimensiones que cambian
+
+        Args:
+            record_id: Identificador del registro (ej. numero_documento)
+            record: Registro con las variables a indexar (las ausentes quedan sin valor)
+        """
+        position = self._positions.get(record_id)
+        if position is None:
+            position = self._allocate(record_id)
+            previous: Dict[str, Tuple[Any, ...]] = {}
+        else:
+            previous = self._values[position]
+
+        current = {}
+        for name, index in self.indexes.items():
+            values = _as_values(record.get(name))
+            old = previous.get(name, ())
+            if values != old:
+                if old:
+                    index.remove(position, old)
+                if values:
+                    index.add(position, values)
+            if values:
+                current[name] = values
+        self._values[position] = current
+
+    def bulk_load(self, records: Iterable[Tuple[Hashable, Mapping[str, Any]]]) -> int:
+        """
+        Carga masiva de registros nuevos construyendo los bitsets de una sola vez
+
+        Args:
+            records: Pares (record_id, registro); los ids existentes se actualizan con upsert
+
+        Returns:
+            Cantidad de registros procesados
+        """
+        pending: Dict[str, Dict[Any, List[int]]] = {name: {} for name in self.indexes}
+        loaded: Dict[Hashable, int] = {}
+        stale: Dict[int, Dict[str, set]] = {}
+        count = 0
+        for record_id, record in records:
+            count += 1
+            position = loaded.get(record_id)
+            if position is not None:
+                # Repetido dentro del mismo lote: todos sus valores anteriores se descartan al final
+                previous = stale.setdefault(position, {})
+                for name, values in self._values[position].items():
+                    previous.setdefault(name, set()).update(values)
+            elif record_id in self._positions:
+                self.upsert(record_id, record)
+                continue
+            else:
+                position = loaded[record_id] = self._allocate(record_id, mark_live=False)
+            current = {}
+            for name, per_value in pending.items():
+                values = _as_values(record.get(name))
+                if not values:
+                    continue
+                current[name] = values
+                for value in values:
+                    positions = per_value.get(value)
+                    if positions is None:
+                        per_value[value] = [position]
+                    else:
+                        positions.append(position)
+            self._values[position] = current
+
+        for position, values_by_name in stale.items():
+            current = self._values[position]
+            for name, values in values_by_name.items():
+                for value in values:
+                    if value not in current.get(name, ()):
+                        pending[name][value] = [p for p in pending[name][value] if p != position]
+
+        self.live |= _bits_from_positions(loaded.values())
+        for name, per_value in pending.items():
+            bitmaps = self.indexes[name].bitmaps
+            for value, positions in per_value.items():
+                if positions:
+                    bitmaps[value] = bitmaps.get(value, 0) | _bits_from_positions(positions)
+        return count
+
+    def remove(self, record_id: Hashable) -> bool:
+        """Elimina un registro; retorna False si no existía"""
+        position = self._positions.pop(record_id, None)
+        if position is None:
+            return False
+        for name, values in self._values[position].items():
+            self.indexes[name].remove(position, values)
+        self._values[position] = None
+        self._ids[position] = None
+        self.live &= ~(1 << position)
+        self._free.append(position)
+        return True
+
+    def _allocate(self, record_id: Hashable, mark_live: bool = True) -> int:
+        if self._free:
+            position = self._free.pop()
+            self._ids[position] = record_id
+        else:
+            position = len(self._ids)
+            self._ids.append(record_id)
+            self._values.append(None)
+        self._positions[record_id] = position
+        if mark_live:
+            self.live |= 1 << position
+        return position
+
+    # Consultas
+
+    def _index(self, dimension: str) -> BitmapIndex:
+        try:
+            return self.indexes[dimension]
+        except KeyError:
+            raise KeyError(f"Dimensión no indexada: {dimension}") from None
+
+    def select(self, where: Optional[Filter] = None) -> int:
+        """
+        Bitset de los registros que cumplen el filtro
+
+        Args:
+            where: {dimensión: valor o lista de valores}; listas = O, dimensiones = Y
+
+        Returns:
+            Bitset de posiciones
+        """
+        bits = self.live
+        if where:
+            for dimension, wanted in where.items():
+                bits &= self._index(dimension).union(_as_values(wanted))
+                if not bits:
+                    break
+        return bits
+
+    def count(self, where: Optional[Filter] = None) -> int:
+        """Cantidad de registros que cumplen el filtro"""
+        return popcount(self.select(where))
+
+    def group_by(self, dimension: str, where: Optional[Filter] = None) -> Dict[Any, int]:
+        """
+        Conteo por valor de una dimensión
+
+        Returns:
+            {valor: cantidad} (sin valores en cero)
+        """
+        base = self.select(where)
+        result = {}
+        for value, bits in self._index(dimension).bitmaps.items():
+            total = popcount(bits & base)
+            if total:
+                result[value] = total
+        return result
+
+    def crosstab(self, rows: str, columns: str, where: Optional[Filter] = None) -> Dict[Any, Dict[Any, int]]:
+        """
+        Tabla cruzada entre dos dimensiones (ej. poblacion_diferencial x facultad)
+
+        Returns:
+            {valor_fila: {valor_columna: cantidad}}
+        """
+        base = self.select(where)
+        column_bitmaps = self._index(columns).bitmaps
+        table = {}
+        for row_value, row_bits in self._index(rows).bitmaps.items():
+            row_bits &= base
+            if not row_bits:
+                continue
+            cells = {}
+            for column_value, column_bits in column_bitmaps.items():
+                total = popcount(row_bits & column_bits)
+                if total:
+                    cells[column_value] = total
+            if cells:
+                table[row_value] = cells
+        return table
+
+    def record_ids(self, bits: int) -> Iterator[Hashable]:
+        """Itera los identificadores de un bitset (resultado de select)"""
+        ids = self._ids
+        data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+        for byte_index, byte in enumerate(data):
+            while byte:
+                low = byte & -byte
+                yield ids[(byte_index << 3) + low.bit_length() - 1]
+                byte ^= low
@@ -0,0 +1,298 @@
+"""
+Asignación de cupos en actividades de deportes y cultura
+
+Al inicio del semestre las solicitudes de actividades
+(deportes_upc_disponibles, actividades_disponibles) llegan al mismo tiempo.
+En lugar de atenderlas por orden de llegada con bloqueos de fila, se
+reciben durante una ventana (submit) y se asignan en lote (allocate)
+respetando:
+
+- Cupo de cada grupo de la actividad
+- Cruces de horario entre los grupos asignados (y el horario de clases)
+- frecuencia_semanal: sesiones semanales máximas del estudiante por área
+
+Política de prioridad y equidad: la asignación va por rondas de
+preferencia (la primera opción de todos antes que la segunda de nadie);
+dentro de cada ronda se ordena por prioridad del estamento y, con la
+misma prioridad, por sorteo con semilla (el orden de llegada dentro de la
+ventana no cuenta). Entre los grupos que sirven se elige el de más cupos
+libres para repartir la ocupación.
+
+Las solicitudes sin cupo quedan en lista de espera por actividad, en el
+mismo orden; al liberarse cupos (release, add_capacity) solo se reasigna
+la actividad afectada.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from config import get_config
+
+# (día de la semana 0-6, hora de inicio)
+Session = Tuple[int, int]
+
+# Motivos de rechazo
+MOTIVO_ACTIVIDAD = "actividad desconocida"
+MOTIVO_AREA = "la actividad no pertenece al área"
+MOTIVO_NO_ELEGIBLE = "no elegible"
+MOTIVO_LIMITE = "límite de solicitudes"
+MOTIVO_REPETIDA = "solicitud repetida"
+
+
+class ActivityGroup(NamedTuple):
+    """Grupo de una actividad con cupo y sesiones semanales"""
+    code: str
+    area: str
+    activity: str
+    capacity: int
+    sessions: Tuple[Session, ...]
+
+
+class EnrollmentRequest(NamedTuple):
+    """Solicitud de un estudiante para una actividad"""
+    student: Hashable
+    area: str
+    activity: str
+    preference: int = 0  # 0 = primera opción
+    frecuencia_semanal: Optional[int] = None  # Sesiones semanales máximas en el área
+    estamento: str = "estudiante"
+    busy: FrozenSet[Session] = frozenset()  # Horario de clases
+
+
+class Assignment(NamedTuple):
+    student: Hashable
+    activity: str
+    group: str
+
+
+class AllocationResult(NamedTuple):
+    assigned: List[Assignment]
+    waitlisted: int
+    rejected: List[Tuple[EnrollmentRequest, str]]
+    seconds: float
+
+
+class _Student:
+    __slots__ = ("occupied", "load", "limits", "activities", "groups")
+
+    def __init__(self):
+        self.occupied: Set[Session] = set()
+        self.load: Dict[str, int] = {}  # área -> sesiones semanales asignadas
+        self.limits: Dict[str, int] = {}  # área -> frecuencia_semanal
+        self.activities: Set[str] = set()
+        self.groups: Dict[str, ActivityGroup] = {}  # actividad -> grupo asignado
+
+
+class SlotAllocator:
+    """Ventana de solicitudes, asignación en lote y reasignación incremental"""
+
+    def __init__(self, groups: Iterable[ActivityGroup], seed: Optional[int] = None,
+                 eligible: Optional[Callable[[Hashable, str], bool]] = None,
+                 config: Optional[Mapping[str, Any]] = None):
+        """
+        Args:
+            groups: Grupos ofrecidos
+            seed: Semilla del sorteo (guardarla permite repetir la asignación)
+            eligible: Función (estudiante, área) -> bool, ej. para excluir
+                      vetados con VetoEngine.state
+            config: Política (por defecto get_config("allocation"))
+        """
+        config = config if config is not None else get_config("allocation")
+        self.priority = dict(config.get("priority_by_estamento", {}))
+        self.lowest_priority = max(self.priority.values(), default=0) + 1
+        self.max_requests = int(config.get("max_requests_per_student", 3))
+        self.seed = config.get("seed") if seed is None else seed
+        self.seed = random.randrange(2 ** 32) if self.seed is None else int(self.seed)
+        self.eligible = eligible
+        self.groups: Dict[str, ActivityGroup] = {}
+        self._by_activity: Dict[str, List[ActivityGroup]] = {}
+        self._free: Dict[str, int] = {}
+        self._members: Dict[str, Set[Hashable]] = {}
+        for group in groups:
+            self.groups[group.code] = group
+            self._by_activity.setdefault(group.activity, []).append(group)
+            self._free[group.code] = group.capacity
+            self._members[group.code] = set()
+        self._students: Dict[Hashable, _Student] = {}
+        self._pending: List[EnrollmentRequest] = []
+        self._waitlists: Dict[str, List[EnrollmentRequest]] = {}
+        self._waiting: Dict[Hashable, Set[str]] = {}  # estudiante -> actividades en espera
+        self._lock = threading.Lock()
+
+    def submit(self, request: EnrollmentRequest) -> None:
+        """Recibe una solicitud durante la ventana (seguro entre hilos, sin tocar cupos)"""
+        with self._lock:
+            self._pending.append(request)
+
+    def free(self, activity: str) -> int:
+        """Cupos libres de una actividad"""
+        return sum(self._free[group.code] for group in self._by_activity.get(activity, ()))
+
+    def members(self, group_code: str) -> Set[Hashable]:
+        return set(self._members[group_code])
+
+    def assignments_of(self, student: Hashable) -> List[Assignment]:
+        state = self._students.get(student)
+        if state is None:
+            return []
+        return [Assignment(student, activity, group.code) for activity, group in state.groups.items()]
+
+    def waitlist(self, activity: str) -> List[Hashable]:
+        """Estudiantes en espera de una actividad, en orden"""
+        return [request.student for request in self._waitlists.get(activity, ())]
+
+    def _student(self, request: EnrollmentRequest) -> _Student:
+        state = self._students.get(request.student)
+        if state is None:
+            state = self._students[request.student] = _Student()
+        if request.busy:
+            state.occupied.update(request.busy)
+        if request.frecuencia_semanal is not None:
+            state.limits[request.area] = int(request.frecuencia_semanal)
+        return state
+
+    def _place(self, request: EnrollmentRequest, state: _Student) -> Optional[Assignment]:
+        """Asigna el grupo con más cupos libres que no se cruza ni excede la frecuencia"""
+        limit = state.limits.get(request.area)
+        load = state.load.get(request.area, 0)
+        best = None
+        best_free = 0
+        for group in self._by_activity[request.activity]:
+            free = self._free[group.code]
+            if free <= best_free or group.area != request.area:
+                continue
+            if limit is not None and load + len(group.sessions) > limit:
+                continue
+            if not state.occupied.isdisjoint(group.sessions):
+                continue
+            best, best_free = group, free
+        if best is None:
+            return None
+        self._free[best.code] -= 1
+        self._members[best.code].add(request.student)
+        state.occupied.update(best.sessions)
+        state.load[request.area] = load + len(best.sessions)
+        state.groups[request.activity] = best
+        return Assignment(request.student, request.activity, best.code)
+
+    def _check(self, request: EnrollmentRequest, state: _Student) -> Optional[str]:
+        if request.activity not in self._by_activity:
+            return MOTIVO_ACTIVIDAD
+        if all(group.area != request.area for group in self._by_activity[request.activity]):
+            # La carga y frecuencia_semanal se llevan por área: un área errada las evadiría
+            return MOTIVO_AREA
+        if request.activity in state.activities:
+            return MOTIVO_REPETIDA
+        if len(state.activities) >= self.max_requests:
+            return MOTIVO_LIMITE
+        if self.eligible is not None and not self.eligible(request.student, request.area):
+            return MOTIVO_NO_ELEGIBLE
+        return None
+
+    def allocate(self) -> AllocationResult:
+        """
+        Cierra la ventana y asigna en lote las solicitudes recibidas
+
+        Las solicitudes que lleguen después se atienden con submit + allocate
+        de nuevo (incremental): compiten por los cupos que queden y entran
+        a la lista de espera después de las anteriores.
+
+        Returns:
+            Asignaciones nuevas, solicitudes en espera y rechazadas
+        """
+        start = time.perf_counter()
+        with self._lock:
+            pending, self._pending = self._pending, []
+        rejected: List[Tuple[EnrollmentRequest, str]] = []
+        by_student: Dict[Hashable, List[EnrollmentRequest]] = {}
+        for request in sorted(pending, key=lambda request: request.preference):
+            state = self._student(request)
+            reason = self._check(request, state)
+            if reason:
+                rejected.append((request, reason))
+                continue
+            state.activities.add(request.activity)
+            by_student.setdefault(request.student, []).append(request)
+
+        # Sorteo reproducible: el orden depende de la semilla, no de la llegada
+        students = sorted(by_student, key=str)
+        random.Random(self.seed).shuffle(students)
+        lottery = {student: position for position, student in enumerate(students)}
+        priority, lowest = self.priority, self.lowest_priority
+        students.sort(key=lambda student: (priority.get(by_student[student][0].estamento, lowest), lottery[student]))
+
+        assigned: List[Assignment] = []
+        waitlisted = 0
+        rounds = max((len(requests) for requests in by_student.values()), default=0)
+        for round_index in range(rounds):
+            for student in students:
+                requests = by_student[student]
+                if round_index >= len(requests):
+                    continue
+                request = requests[round_index]
+                assignment = self._place(request, self._students[student])
+                if assignment is None:
+                    self._waitlists.setdefault(request.activity, []).append(request)
+                    self._waiting.setdefault(student, set()).add(request.activity)
+                    waitlisted += 1
+                else:
+                    assigned.append(assignment)
+        return AllocationResult(assigned, waitlisted, rejected, time.perf_counter() - start)
+
+    def _refill(self, activities: Iterable[str]) -> List[Assignment]:
+        """Ofrece los cupos libres de las actividades a sus listas de espera, en orden"""
+        assigned = []
+        for activity in activities:
+            waitlist = self._waitlists.get(activity)
+            if not waitlist or not self.free(activity):
+                continue
+            remaining = []
+            for index, request in enumerate(waitlist):
+                assignment = self._place(request, self._students[request.student])
+                if assignment is None:
+                    remaining.append(request)
+                    continue
+                assigned.append(assignment)
+                self._waiting[request.student].discard(activity)
+                if not self.free(activity):
+                    remaining.extend(waitlist[index + 1:])
+                    break
+            self._waitlists[activity] = remaining
+        return assigned
+
+    def release(self, student: Hashable, activity: str) -> List[Assignment]:
+        """
+        Libera el cupo (o la solicitud en espera) de un estudiante en una actividad
+
+        Se reasigna la actividad liberada y las actividades en las que el
+        estudiante sigue en espera (su horario quedó libre).
+
+        Returns:
+            Asignaciones nuevas desde las listas de espera
+        """
+        state = self._students.get(student)
+        if state is None or activity not in state.activities:
+            return []
+        state.activities.discard(activity)
+        group = state.groups.pop(activity, None)
+        waiting = self._waiting.get(student, set())
+        if group is None:
+            waiting.discard(activity)
+            waitlist = self._waitlists.get(activity, [])
+            self._waitlists[activity] = [request for request in waitlist if request.student != student]
+            return []
+        self._free[group.code] += 1
+        self._members[group.code].discard(student)
+        state.occupied.difference_update(group.sessions)
+        state.load[group.area] -= len(group.sessions)
+        return self._refill([activity] + sorted(waiting))
+
+    def add_capacity(self, group_code: str, seats: int) -> List[Assignment]:
+        """Amplía el cupo de un grupo y lo ofrece a la lista de espera"""
+        group = self.groups[group_code]
+        self.groups[group_code] = group._replace(capacity=group.capacity + seats)
+        self._by_activity[group.activity] = [self.groups[other.code] for other in self._by_activity[group.activity]]
+        self._free[group_code] += seats
+        return self._refill([group.activity])
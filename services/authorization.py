@@ -0,0 +1,215 @@
+"""
+Autorización con máscaras de bits precompiladas a partir de ROLES_CONFIG
+
+Cada permiso recibe un bit en un registro; cada rol se compila a dos
+enteros (permisos otorgados y acciones restringidas). Un usuario con varios
+roles (ej. docente que también es egresado) tiene como máscara el OR de sus
+roles, y la comprobación de un permiso es un & entre enteros.
+
+Un permiso otorgado por cualquiera de los roles prevalece sobre la
+restricción de otro rol.
+"""
+
+import threading
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Union
+
+from config import get_config
+
+# Nombres alternativos de roles (estamento del diccionario -> rol de ROLES_CONFIG)
+ROLE_ALIASES = {"docente": "profesor"}
+
+Roles = Union[str, Iterable[str]]
+
+
+class AuthorizationError(PermissionError):
+    """El usuario no tiene el permiso requerido"""
+
+    def __init__(self, permission: str, roles: Iterable[str]):
+        super().__init__(f"Permiso '{permission}' no otorgado a los roles {sorted(roles)}")
+        self.permission = permission
+        self.roles = tuple(roles)
+
+
+class PermissionRegistry:
+    """Registro nombre de permiso -> bit"""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.bits: Dict[str, int] = {}
+        self._names: List[str] = []
+        for name in names:
+            self.register(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.bits
+
+    def register(self, name: str) -> int:
+        """Registra un permiso (si no existe) y retorna su bit"""
+        bit = self.bits.get(name)
+        if bit is None:
+            bit = self.bits[name] = 1 << len(self._names)
+            self._names.append(name)
+        return bit
+
+    def bit(self, name: str) -> int:
+        """Bit de un permiso (0 si no está registrado: ningún rol lo tiene)"""
+        return self.bits.get(name, 0)
+
+    def mask(self, names: Iterable[str]) -> int:
+        """Máscara con los bits de varios permisos"""
+        mask = 0
+        for name in names:
+            mask |= self.bits.get(name, 0)
+        return mask
+
+    def names(self, mask: int) -> List[str]:
+        """Permisos contenidos en una máscara, en orden de registro"""
+        return [name for position, name in enumerate(self._names) if mask >> position & 1]
+
+
+class RoleMask(NamedTuple):
+    """Máscaras efectivas de un rol o combinación de roles"""
+    granted: int
+    restricted: int
+
+
+class Authorizer:
+    """Comprobaciones de permisos con máscaras precompiladas y caché por usuario"""
+
+    def __init__(self, roles_config: Optional[Mapping[str, Mapping[str, Any]]] = None):
+        """
+        Args:
+            roles_config: Configuración de roles (por defecto get_config("roles"))
+        """
+        self._lock = threading.Lock()
+        self._user_roles: Dict[Hashable, FrozenSet[str]] = {}
+        self.compile(roles_config)
+
+    def compile(self, roles_config: Optional[Mapping[str, Mapping[str, Any]]] = None) -> None:
+        """
+        (Re)compila las máscaras de los roles
+
+        Los bits cambian entre compilaciones, así que las máscaras de los
+        usuarios ya registrados se recalculan con sus roles; los roles que ya
+        no están en la configuración dejan de aportar permisos.
+        """
+        roles_config = roles_config if roles_config is not None else get_config("roles")
+        registry = PermissionRegistry()
+        for settings in roles_config.values():
+            for name in settings.get("default_permissions", ()):
+                registry.register(name)
+            for name in settings.get("restricted_actions", ()):
+                registry.register(name)
+        role_masks = {
+            role: RoleMask(registry.mask(settings.get("default_permissions", ())),
+                           registry.mask(settings.get("restricted_actions", ())))
+            for role, settings in roles_config.items()
+        }
+        with self._lock:
+            self.registry = registry
+            self.role_masks = role_masks
+            self._combined: Dict[FrozenSet[str], RoleMask] = {}
+            self._users: Dict[Hashable, RoleMask] = {
+                user_id: self.mask_for(roles & role_masks.keys())
+                for user_id, roles in self._user_roles.items()
+            }
+
+    @staticmethod
+    def _role_set(roles: Roles) -> FrozenSet[str]:
+        if isinstance(roles, str):
+            roles = (roles,)
+        return frozenset(ROLE_ALIASES.get(role, role) for role in roles)
+
+    def mask_for(self, roles: Roles) -> RoleMask:
+        """
+        Máscaras de una combinación de roles (OR de los roles, con caché)
+
+        Raises:
+            KeyError: Si algún rol no está en ROLES_CONFIG
+        """
+        key = self._role_set(roles)
+        combined = self._combined.get(key)
+        if combined is None:
+            granted = restricted = 0
+            for role in key:
+                try:
+                    mask = self.role_masks[role]
+                except KeyError:
+                    raise KeyError(f"Rol no configurado: {role}") from None
+                granted |= mask.granted
+                restricted |= mask.restricted
+            combined = self._combined[key] = RoleMask(granted, restricted & ~granted)
+        return combined
+
+    def user_mask(self, user_id: Hashable, roles: Optional[Roles] = None) -> RoleMask:
+        """
+        Máscaras efectivas de un usuario (se guardan en caché por user_id)
+
+        Args:
+            user_id: Identificador del usuario (ej. codigo_usuario)
+            roles: Roles del usuario; obligatorio la primera vez o si cambian
+        """
+        if roles is None:
+            try:
+                return self._users[user_id]
+            except KeyError:
+                raise KeyError(f"Usuario sin roles registrados: {user_id}") from None
+        key = self._role_set(roles)
+        mask = self._users[user_id] = self.mask_for(key)
+        self._user_roles[user_id] = key
+        return mask
+
+    def forget(self, user_id: Optional[Hashable] = None) -> None:
+        """Elimina un usuario de la caché (o todos si user_id es None)"""
+        if user_id is None:
+            self._users.clear()
+            self._user_roles.clear()
+        else:
+            self._users.pop(user_id, None)
+            self._user_roles.pop(user_id, None)
+
+    def bit(self, permission: str) -> int:
+        """Bit de un permiso, para precalcularlo en rutas muy frecuentes"""
+        return self.registry.bit(permission)
+
+    def has_permission(self, roles: Roles, permission: str) -> bool:
+        """Indica si una combinación de roles tiene un permiso"""
+        return bool(self.mask_for(roles).granted & self.registry.bits.get(permission, 0))
+
+    def is_restricted(self, roles: Roles, action: str) -> bool:
+        """Indica si una acción está restringida (y ningún rol la otorga)"""
+        return bool(self.mask_for(roles).restricted & self.registry.bits.get(action, 0))
+
+    def user_can(self, user_id: Hashable, permission: str) -> bool:
+        """Comprobación por usuario usando la máscara en caché"""
+        mask = self._users.get(user_id)
+        if mask is None:
+            mask = self.user_mask(user_id)
+        return mask.granted & self.registry.bits.get(permission, 0) != 0
+
+    def require(self, roles: Roles, permission: str) -> None:
+        """
+        Exige un permiso
+
+        Raises:
+            AuthorizationError: Si ningún rol otorga el permiso
+        """
+        if not self.has_permission(roles, permission):
+            raise AuthorizationError(permission, self._role_set(roles))
+
+    def permissions(self, roles: Roles) -> List[str]:
+        """Permisos otorgados a una combinación de roles"""
+        return self.registry.names(self.mask_for(roles).granted)
+
+
+_shared_authorizer: Optional[Authorizer] = None
+
+
+def get_authorizer() -> Authorizer:
+    """Instancia compartida compilada desde ROLES_CONFIG al primer uso"""
+    global _shared_authorizer
+    if _shared_authorizer is None:
+        _shared_authorizer = Authorizer()
+    return _shared_authorizer
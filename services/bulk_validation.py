@@ -0,0 +1,348 @@
+"""
+Validación y enriquecimiento masivo en paralelo por fragmentos
+
+Revalidar toda la población después de un cambio del diccionario o de las
+reglas es trabajo de Python puro sobre un solo núcleo. BulkValidator
+divide los registros en fragmentos (shards) y los reparte en un pool de
+procesos:
+
+- Cada fragmento viaja en formato columnar (una lista por variable) en
+  lugar de una lista de diccionarios: los nombres de las variables no se
+  repiten por registro y pickle comparte los valores repetidos. Las
+  columnas de fechas y fechas-hora viajan como array('q') con la misma
+  codificación de models.record_store (días o microsegundos desde 1970,
+  NAT como nulo), que pickle copia como un solo bloque de bytes
+- Cada proceso compila el validador una vez (initializer) a partir de las
+  variables del diccionario, enviadas como diccionarios simples
+- Los reportes por fragmento (errores con el índice global del registro,
+  conteos por variable y motivo) se combinan en orden de fragmento, de
+  modo que el reporte final no depende del número de procesos ni del
+  orden en que terminen
+
+Si los registros ya están en una lista y los procesos se crean con fork,
+los procesos heredan la lista y cada fragmento es solo un rango de índices:
+el proceso principal no recorre los registros y la parte serial se reduce
+a combinar los reportes. Con un iterable (ej. un lector) o sin fork, los
+fragmentos viajan en formato columnar.
+
+Los fragmentos en vuelo se limitan (max_pending) para que la memoria no
+crezca con el tamaño de la población.
+"""
+
+import itertools
+import multiprocessing
+import os
+import time
+from array import array
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import (Any, Callable, Deque, Dict, FrozenSet, Iterable, Iterator, List, Mapping, NamedTuple, Optional,
+                    Sequence, Tuple, Union)
+
+import utils
+from config import get_config
+from models.data_dictionary import DataDictionary, DataDictionaryView, get_shared_dictionary
+from models.record_store import EPOCH, EPOCH_ORDINAL, NAT
+from models.validators import RecordValidator, ValidationError, get_required_variables
+
+
+def _edad(record: Mapping[str, Any]) -> Optional[int]:
+    birth = record.get("fecha_nacimiento")
+    if isinstance(birth, datetime):
+        birth = birth.date()
+    return utils.calculate_age(birth) if isinstance(birth, date) else None
+
+
+def _documento_formateado(record: Mapping[str, Any]) -> Optional[str]:
+    document = record.get("numero_documento")
+    return utils.format_document_number(document) if isinstance(document, str) and document else None
+
+
+def _email_normalizado(record: Mapping[str, Any]) -> Optional[str]:
+    email = record.get("email")
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+
+# Enriquecimientos disponibles: nombre -> (variables que usa, función sobre el registro)
+ENRICHERS: Dict[str, Tuple[Tuple[str, ...], Callable[[Mapping[str, Any]], Any]]] = {
+    "edad": (("fecha_nacimiento",), _edad),
+    "documento_formateado": (("numero_documento",), _documento_formateado),
+    "email_normalizado": (("email",), _email_normalizado),
+}
+
+# Columna empaquetada: ("date" | "datetime", array('q'))
+PackedColumn = Tuple[str, array]
+# (variables, columnas alineadas)
+ColumnarBatch = Tuple[Tuple[str, ...], List[Union[List[Any], PackedColumn]]]
+EnrichedSink = Callable[[int, Dict[str, List[Any]]], None]
+
+
+class ShardReport(NamedTuple):
+    """Resultado de un fragmento"""
+    shard: int
+    start: int  # Índice global del primer registro del fragmento
+    records: int
+    valid: int
+    errors: List[Tuple[int, str, str]]  # (índice global, variable, motivo)
+    counts: Dict[Tuple[str, str], int]  # (variable, motivo) -> registros
+    enriched: Dict[str, List[Any]]
+    seconds: float
+
+
+class BulkValidationReport(NamedTuple):
+    records: int
+    valid: int
+    errors: List[Tuple[int, str, str]]  # Ordenados por índice del registro
+    counts: Dict[Tuple[str, str], int]  # Ordenados por (variable, motivo)
+    shards: int
+    workers: int
+    seconds: float
+    worker_seconds: float  # Suma del tiempo de validación de los fragmentos
+
+
+def _pack(values: List[Any]) -> Union[List[Any], PackedColumn]:
+    """Empaqueta una columna de solo fechas o solo fechas-hora sin zona horaria; el resto queda como lista"""
+    kinds = set(map(type, values))
+    kinds.discard(type(None))
+    if kinds == {date}:
+        return "date", array("q", [NAT if value is None else value.toordinal() - EPOCH_ORDINAL
+                                   for value in values])
+    if kinds == {datetime} and all(value is None or value.tzinfo is None for value in values):
+        encoded = array("q")
+        for value in values:
+            if value is None:
+                encoded.append(NAT)
+            else:
+                delta = value - EPOCH
+                encoded.append((delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+        return "datetime", encoded
+    return values
+
+
+def _unpack(column: Union[List[Any], PackedColumn]) -> List[Any]:
+    if isinstance(column, list):
+        return column
+    kind, encoded = column
+    if kind == "date":
+        return [None if stored == NAT else date.fromordinal(stored + EPOCH_ORDINAL) for stored in encoded]
+    return [None if stored == NAT else EPOCH + timedelta(microseconds=stored) for stored in encoded]
+
+
+def to_columns(records: Sequence[Mapping[str, Any]], names: Sequence[str],
+               dated: Optional[Iterable[str]] = None) -> ColumnarBatch:
+    """
+    Convierte un bloque de registros en columnas alineadas de las variables indicadas
+
+    Args:
+        records: Registros del fragmento
+        names: Variables a extraer
+        dated: Variables que se intentan empaquetar como fechas (por defecto todas)
+
+    Las columnas de fechas se empaquetan en array('q'); una columna con
+    valores de otros tipos (que la validación debe reportar) queda como
+    lista sin cambios.
+    """
+    dated = set(names if dated is None else dated)
+    return tuple(names), [_pack(column) if name in dated else column
+                          for name, column in ((name, [record.get(name) for record in records]) for name in names)]
+
+
+def validate_records(validator: RecordValidator, enrichers: Sequence[str], records: Iterable[Mapping[str, Any]],
+                     shard: int = 0, start: int = 0) -> ShardReport:
+    """
+    Valida y enriquece un bloque de registros
+
+    Args:
+        validator: Validador compilado
+        enrichers: Nombres de ENRICHERS a calcular para los registros válidos
+                   (None en los inválidos)
+        records: Registros del fragmento
+        shard: Número del fragmento
+        start: Índice global del primer registro
+
+    Returns:
+        Reporte del fragmento
+    """
+    began = time.perf_counter()
+    functions = [ENRICHERS[name][1] for name in enrichers]
+    enriched: Dict[str, List[Any]] = {name: [] for name in enrichers}
+    outputs = [enriched[name].append for name in enrichers]
+    errors: List[Tuple[int, str, str]] = []
+    counts: Counter = Counter()
+    validate = validator.validate
+    valid = 0
+    index = start
+    for record in records:
+        problems: List[ValidationError] = validate(record)
+        if problems:
+            for variable, reason in problems:
+                errors.append((index, variable, reason))
+                counts[(variable, reason)] += 1
+            for output in outputs:
+                output(None)
+        else:
+            valid += 1
+            for function, output in zip(functions, outputs):
+                output(function(record))
+        index += 1
+    return ShardReport(shard, start, index - start, valid, errors, dict(counts), enriched,
+                       time.perf_counter() - began)
+
+
+def validate_columns(validator: RecordValidator, enrichers: Sequence[str], batch: ColumnarBatch,
+                     shard: int = 0, start: int = 0) -> ShardReport:
+    """Valida y enriquece un bloque columnar de to_columns (ver validate_records)"""
+    began = time.perf_counter()
+    names, packed = batch
+    columns = [_unpack(column) for column in packed]
+    report = validate_records(validator, enrichers, (dict(zip(names, values)) for values in zip(*columns)),
+                              shard, start)
+    return report._replace(seconds=time.perf_counter() - began)
+
+
+_worker_state: Tuple[Any, ...] = ()
+
+
+def _init_worker(spec: Tuple[str, Dict[str, Any], FrozenSet[str]], enrichers: Tuple[str, ...],
+                 records: Optional[Sequence[Mapping[str, Any]]] = None) -> None:
+    global _worker_state
+    _worker_state = (RecordValidator(*spec), enrichers, records)
+
+
+def _validate_in_worker(task: Tuple[int, int, Union[int, ColumnarBatch]]) -> ShardReport:
+    validator, enrichers, records = _worker_state
+    shard, start, payload = task
+    if isinstance(payload, int):
+        # Rango de la lista heredada con fork
+        return validate_records(validator, enrichers, itertools.islice(records, start, payload), shard, start)
+    return validate_columns(validator, enrichers, payload, shard, start)
+
+
+class BulkValidator:
+    """Validación de una población completa repartida en un pool de procesos"""
+
+    def __init__(self, estamento: Optional[str] = None, area: Optional[str] = None,
+                 data_dict: Union[DataDictionary, DataDictionaryView, None] = None,
+                 workers: Optional[int] = None, shard_size: Optional[int] = None,
+                 enrich: Iterable[str] = ()):
+        """
+        Args:
+            estamento: Estamento cuyos registros se validan
+            area: Área de bienestar (en lugar de estamento)
+            data_dict: Diccionario a aplicar (por defecto la instancia compartida);
+                       sus variables se envían una vez a cada proceso
+            workers: Procesos (0 = os.cpu_count(), 1 = en el proceso actual)
+            shard_size: Registros por fragmento
+            enrich: Nombres de ENRICHERS a calcular
+
+        Los valores no indicados se toman de get_config("bulk_validation").
+
+        Raises:
+            ValueError: Si no se indica estamento ni área, o un enriquecimiento no existe
+            KeyError: Si el estamento o el área no están en el diccionario
+        """
+        if not estamento and not area:
+            raise ValueError("Se requiere un estamento o un área")
+        config = get_config("bulk_validation")
+        self.estamento = estamento
+        self.area = area
+        self.data_dict = data_dict or get_shared_dictionary()
+        workers = int(config.get("workers", 0) if workers is None else workers)
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = int(shard_size or config.get("shard_size", 20_000))
+        self.max_pending = int(config.get("max_pending_per_worker", 2)) * self.workers
+        self.enrich = tuple(enrich)
+        unknown = [name for name in self.enrich if name not in ENRICHERS]
+        if unknown:
+            raise ValueError(f"Enriquecimientos desconocidos: {unknown}")
+        # Variables y obligatorias en tipos simples: el validador se vuelve a compilar en cada proceso
+        if area:
+            variables = self.data_dict.get_variables_by_area(area)
+            if area not in self.data_dict.areas_bienestar_variables:
+                raise KeyError(f"Área no definida en el diccionario: {area}")
+        else:
+            variables = self.data_dict.get_variables_by_estamento(estamento)
+            if estamento not in self.data_dict.estamentos_variables:
+                raise KeyError(f"Estamento no definido en el diccionario: {estamento}")
+        self._spec = (area or estamento, {name: declared if isinstance(declared, str) else list(declared)
+                                          for name, declared in variables.items()},
+                      get_required_variables(self.data_dict))
+        self.validator = RecordValidator(*self._spec)
+        # Solo viajan las variables que se validan o se usan para enriquecer
+        names = [variable for variable, _ in self.validator.checks]
+        names += [variable for variable in self.validator.required if variable not in names]
+        for name in self.enrich:
+            names += [variable for variable in ENRICHERS[name][0] if variable not in names]
+        if "numero_documento" in names and "tipo_documento" not in names:
+            names.append("tipo_documento")
+        self.columns: Tuple[str, ...] = tuple(names)
+        self.dated = frozenset(name for name in names if self._spec[1].get(name) in ("date", "datetime"))
+
+    def _chunks(self, records: Iterable[Mapping[str, Any]]) -> Iterator[Tuple[int, int, List[Mapping[str, Any]]]]:
+        iterator = iter(records)
+        start = 0
+        for shard in itertools.count():
+            chunk = list(itertools.islice(iterator, self.shard_size))
+            if not chunk:
+                return
+            yield shard, start, chunk
+            start += len(chunk)
+
+    def _inline(self, records: Iterable[Mapping[str, Any]]) -> Iterator[ShardReport]:
+        # En el proceso actual no hay nada que serializar: se validan los registros tal cual
+        for shard, start, chunk in self._chunks(records):
+            yield validate_records(self.validator, self.enrich, chunk, shard, start)
+
+    def _pooled(self, records: Iterable[Mapping[str, Any]]) -> Iterator[ShardReport]:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        shared = context.get_start_method() == "fork" and isinstance(records, Sequence)
+        if shared:
+            tasks: Iterator[Tuple[int, int, Union[int, ColumnarBatch]]] = (
+                (shard, start, min(start + self.shard_size, len(records)))
+                for shard, start in enumerate(range(0, len(records), self.shard_size)))
+        else:
+            tasks = ((shard, start, to_columns(chunk, self.columns, self.dated))
+                     for shard, start, chunk in self._chunks(records))
+        with ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(self._spec, self.enrich, records if shared else None)) as pool:
+            pending: Deque[Future] = deque()
+            for task in tasks:
+                pending.append(pool.submit(_validate_in_worker, task))
+                if len(pending) >= self.max_pending:
+                    # Se entrega en orden de fragmento; el resto sigue en curso
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def run(self, records: Iterable[Mapping[str, Any]], sink: Optional[EnrichedSink] = None) -> BulkValidationReport:
+        """
+        Valida (y enriquece) todos los registros
+
+        Args:
+            records: Registros; una lista se comparte con los procesos (fork),
+                     otro iterable se lee y se envía por fragmentos columnares
+            sink: Función (índice del primer registro, columnas enriquecidas)
+                  llamada por fragmento en orden
+
+        Returns:
+            Reporte combinado; es el mismo con cualquier número de procesos
+        """
+        began = time.perf_counter()
+        reports = self._inline(records) if self.workers <= 1 else self._pooled(records)
+        total = valid = shards = 0
+        worker_seconds = 0.0
+        errors: List[Tuple[int, str, str]] = []
+        counts: Counter = Counter()
+        for report in reports:
+            total += report.records
+            valid += report.valid
+            shards += 1
+            worker_seconds += report.seconds
+            errors.extend(report.errors)
+            counts.update(report.counts)
+            if sink is not None and report.enriched:
+                sink(report.start, report.enriched)
+        return BulkValidationReport(total, valid, errors, dict(sorted(counts.items())), shards,
+                                    self.workers, time.perf_counter() - began, worker_seconds)
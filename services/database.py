@@ -0,0 +1,647 @@
+"""
+Capa de acceso a datos con pool de conexiones y upsert masivo
+Configurada desde get_config("database"); SQLite es el motor local
+
+- Pool de conexiones reutilizables (queue.Queue)
+- DDL derivado del DataDictionary: personas, una tabla por estamento y una por área,
+  con índice (update_date, llave) para la exportación incremental (services/export.py)
+- Upsert masivo con executemany en transacciones por lotes; el SQL de cada
+  tabla/columnas se construye una vez y se reutiliza (el driver conserva la
+  sentencia preparada en su caché)
+- Cada fila guarda la versión del esquema (schema_version): al desplegar un
+  diccionario nuevo, evolve_schema solo agrega columnas y las filas antiguas
+  se actualizan al leerlas o por lotes con migrate_batch (models/migrations.py)
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import partial
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from config import get_config
+from models.data_dictionary import DataDictionary, DataDictionaryView, get_shared_dictionary
+from models.migrations import BASE_VERSION, SchemaMigrator
+
+PERSON_TABLE = "personas"
+PERSON_KEY = "numero_documento"
+AREA_KEY = "registro_id"
+# Columna de fecha de modificación usada para exportaciones incrementales
+CHANGE_TRACKING_COLUMN = "update_date"
+# Versión del esquema con la que se escribió cada fila (las anteriores al versionado son BASE_VERSION)
+SCHEMA_VERSION_COLUMN = "schema_version"
+
+# Tipo declarado en el diccionario -> tipo de columna por motor
+COLUMN_TYPES = {
+    "sqlite": {
+        "string": "TEXT", "text": "TEXT", "integer": "INTEGER", "float": "REAL",
+        "boolean": "INTEGER", "date": "TEXT", "datetime": "TEXT", "array": "TEXT",
+    },
+    "postgresql": {
+        "string": "TEXT", "text": "TEXT", "integer": "INTEGER", "float": "DOUBLE PRECISION",
+        "boolean": "BOOLEAN", "date": "DATE", "datetime": "TIMESTAMP", "array": "JSONB",
+    },
+}
+
+PLACEHOLDERS = {"sqlite": "?", "postgresql": "%s"}
+
+
+class DatabaseError(Exception):
+    """Error de configuración o uso de la capa de datos"""
+
+
+def quote_identifier(name: str) -> str:
+    """Cita un identificador SQL (las variables pueden tener tildes o ñ)"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _quote_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def column_ddl(name: str, declared: Any, engine: str) -> str:
+    """Definición de una columna para CREATE TABLE o ALTER TABLE ADD COLUMN"""
+    column = quote_identifier(name)
+    if isinstance(declared, (list, tuple)):
+        # Cadena de OR en lugar de IN: SQLite arma una tabla efímera por fila para IN (...)
+        allowed = " OR ".join(f"{column} = {_quote_literal(value)}" for value in declared)
+        return f"{column} TEXT CHECK ({allowed})"
+    return f"{column} {COLUMN_TYPES[engine].get(declared, 'TEXT')}"
+
+
+def version_column_ddl() -> str:
+    return f"{quote_identifier(SCHEMA_VERSION_COLUMN)} INTEGER NOT NULL DEFAULT {BASE_VERSION}"
+
+
+def estamento_table(estamento: str) -> str:
+    return f"estamento_{estamento}"
+
+
+def area_table(area: str) -> str:
+    return f"area_{area}"
+
+
+class TableSpec:
+    """Definición de una tabla derivada del diccionario"""
+
+    __slots__ = ("name", "key", "columns")
+
+    def __init__(self, name: str, key: str, columns: Mapping[str, Any]):
+        self.name = name
+        self.key = key
+        # Listas de valores como tuplas: un DataDictionary sin vista las declara como listas
+        self.columns = {column: tuple(declared) if isinstance(declared, list) else declared
+                        for column, declared in columns.items()}
+
+    def ddl(self, engine: str) -> str:
+        """Sentencia CREATE TABLE para el motor indicado"""
+        lines = [f"{quote_identifier(self.key)} TEXT PRIMARY KEY"]
+        for name, declared in self.columns.items():
+            if name != self.key:
+                lines.append(column_ddl(name, declared, engine))
+        lines.append(version_column_ddl())
+        body = ",\n    ".join(lines)
+        return f"CREATE TABLE IF NOT EXISTS {quote_identifier(self.name)} (\n    {body}\n)"
+
+    def index_ddl(self, column: str) -> str:
+        """Índice (columna, llave) para recorrer la tabla ordenada por esa columna"""
+        index = quote_identifier(f"idx_{self.name}_{column}")
+        return (f"CREATE INDEX IF NOT EXISTS {index} ON {quote_identifier(self.name)} "
+                f"({quote_identifier(column)}, {quote_identifier(self.key)})")
+
+
+def build_table_specs(data_dict: Union[DataDictionary, DataDictionaryView, None] = None) -> Dict[str, TableSpec]:
+    """
+    Deriva las tablas del diccionario de datos
+
+    - personas: variables de identificación (llave numero_documento)
+    - estamento_<nombre>: variables del estamento (llave numero_documento)
+    - area_<nombre>: variables del área (llave registro_id, más numero_documento)
+
+    Returns:
+        {nombre_tabla: TableSpec}
+    """
+    data_dict = data_dict or get_shared_dictionary()
+    specs = {PERSON_TABLE: TableSpec(PERSON_TABLE, PERSON_KEY, data_dict.identificacion_variables)}
+    for estamento, variables in data_dict.estamentos_variables.items():
+        name = estamento_table(estamento)
+        specs[name] = TableSpec(name, PERSON_KEY, variables)
+    for area, variables in data_dict.areas_bienestar_variables.items():
+        name = area_table(area)
+        specs[name] = TableSpec(name, AREA_KEY, {PERSON_KEY: "string", **variables})
+    return specs
+
+
+def adapt_value(value: Any, engine: str = "sqlite") -> Any:
+    """
+    Convierte un valor de Python al formato de almacenamiento del motor
+
+    En SQLite las fechas se guardan como texto ISO y los booleanos como 0/1;
+    en PostgreSQL (columnas DATE, TIMESTAMP y BOOLEAN) psycopg2 los adapta
+    directamente. Los arreglos se guardan como JSON en ambos.
+    """
+    if isinstance(value, (list, tuple)):
+        return json.dumps(list(value), ensure_ascii=False)
+    if engine == "postgresql":
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+# Tipos declarados que requieren conversión antes de guardarse, por motor
+ADAPTED_TYPES = {
+    "sqlite": frozenset({"boolean", "date", "datetime", "array"}),
+    "postgresql": frozenset({"array"}),
+}
+
+
+def column_decoders(declared_columns: Mapping[str, Any], engine: str = "sqlite") -> Dict[str, Any]:
+    """
+    Conversión de los valores almacenados (JSON en texto, booleanos 0/1) a tipos de Python
+
+    En PostgreSQL psycopg2 ya entrega JSONB y BOOLEAN como tipos de Python.
+    """
+    decoders = {}
+    if engine == "postgresql":
+        return decoders
+    for name, declared in declared_columns.items():
+        if declared == "array":
+            decoders[name] = json.loads
+        elif declared == "boolean":
+            decoders[name] = bool
+    return decoders
+
+
+class ConnectionPool:
+    """Pool de conexiones de tamaño fijo"""
+
+    def __init__(self, config: Optional[Mapping[str, Any]] = None):
+        """
+        Args:
+            config: Configuración de base de datos (por defecto get_config("database"))
+        """
+        self.config = dict(config if config is not None else get_config("database"))
+        self.engine = self.config.get("engine", "sqlite")
+        if self.engine not in PLACEHOLDERS:
+            raise DatabaseError(f"Motor de base de datos no soportado: {self.engine}")
+        self.size = int(self.config.get("pool_size", 5))
+        if self.engine == "sqlite" and self.config.get("sqlite_path", ":memory:") == ":memory:":
+            # Cada conexión a :memory: es una base vacía distinta; el caché compartido
+            # (file::memory:?cache=shared) bloquea por tabla y falla entre hilos
+            self.size = 1
+        self._idle: "queue.Queue" = queue.Queue(maxsize=self.size)
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self):
+        if self.engine == "sqlite":
+            path = self.config.get("sqlite_path", ":memory:")
+            if path != ":memory:" and os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            connection = sqlite3.connect(path, check_same_thread=False, cached_statements=256)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            return connection
+        try:
+            import psycopg2
+        except ImportError:
+            raise DatabaseError("El motor postgresql requiere el paquete psycopg2") from None
+        return psycopg2.connect(
+            host=self.config["host"], port=self.config["port"], dbname=self.config["database"],
+            user=self.config["username"], password=self.config["password"],
+        )
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Obtiene una conexión libre (o crea una si el pool no está lleno)"""
+        if self._closed:
+            raise DatabaseError("El pool de conexiones está cerrado")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._created -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise DatabaseError("No hay conexiones disponibles en el pool") from None
+
+    def release(self, connection) -> None:
+        """Devuelve una conexión al pool"""
+        if self._closed:
+            connection.close()
+            return
+        self._idle.put_nowait(connection)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Contexto que presta una conexión y la devuelve al pool"""
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self) -> None:
+        """Cierra todas las conexiones libres"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class Database:
+    """Acceso a las tablas del diccionario con upsert masivo"""
+
+    def __init__(self, pool: Optional[ConnectionPool] = None,
+                 data_dict: Union[DataDictionary, DataDictionaryView, None] = None,
+                 migrator: Optional[SchemaMigrator] = None):
+        """
+        Args:
+            pool: Pool de conexiones (por defecto uno con get_config("database"))
+            data_dict: Diccionario de datos (por defecto la instancia compartida)
+            migrator: Migraciones de filas antiguas (por defecto hasta la versión del diccionario)
+        """
+        data_dict = data_dict or get_shared_dictionary()
+        self.pool = pool or ConnectionPool()
+        self.tables = build_table_specs(data_dict)
+        self.migrator = migrator or SchemaMigrator(current=data_dict.schema_version)
+        self.schema_version = self.migrator.current
+        self.batch_size = int(self.pool.config.get("batch_size", 5000))
+        self._statements: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        self._decoders: Dict[str, Dict[str, Any]] = {}
+        self._stored_columns: Dict[str, List[str]] = {}
+
+    def create_schema(self) -> None:
+        """Crea todas las tablas derivadas del diccionario y el índice de update_date"""
+        self.evolve_schema()
+
+    def evolve_schema(self) -> Dict[str, List[str]]:
+        """
+        Lleva las tablas al diccionario actual sin reescribirlas
+
+        Crea las tablas que faltan y agrega con ALTER TABLE ADD COLUMN las
+        variables nuevas y la columna schema_version (las filas existentes
+        quedan en BASE_VERSION). Las columnas de variables renombradas o
+        eliminadas se conservan: las filas antiguas se leen de ellas hasta
+        que se migran. Las restricciones CHECK de las listas de valores de
+        columnas existentes no se modifican (en SQLite requiere reconstruir
+        la tabla).
+
+        Returns:
+            {tabla: columnas agregadas} de las tablas que ya existían
+        """
+        added: Dict[str, List[str]] = {}
+        engine = self.pool.engine
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            for spec in self.tables.values():
+                existing = set(self._read_columns(cursor, spec.name))
+                table = quote_identifier(spec.name)
+                if not existing:
+                    cursor.execute(spec.ddl(engine))
+                else:
+                    definitions = [(name, column_ddl(name, declared, engine))
+                                   for name, declared in spec.columns.items()
+                                   if name != spec.key and name not in existing]
+                    if SCHEMA_VERSION_COLUMN not in existing:
+                        definitions.append((SCHEMA_VERSION_COLUMN, version_column_ddl()))
+                    for _, definition in definitions:
+                        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {definition}")
+                    added[spec.name] = [name for name, _ in definitions]
+                if CHANGE_TRACKING_COLUMN in spec.columns:
+                    cursor.execute(spec.index_ddl(CHANGE_TRACKING_COLUMN))
+                # Permite encontrar las filas pendientes de migrar sin recorrer la tabla
+                cursor.execute(spec.index_ddl(SCHEMA_VERSION_COLUMN))
+            connection.commit()
+        self._stored_columns.clear()
+        self._decoders.clear()
+        return added
+
+    def _read_columns(self, cursor, table: str) -> List[str]:
+        if self.pool.engine == "sqlite":
+            cursor.execute(f"PRAGMA table_info({quote_identifier(table)})")
+            return [row[1] for row in cursor.fetchall()]
+        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name = %s", (table,))
+        return [row[0] for row in cursor.fetchall()]
+
+    def stored_columns(self, table: str) -> List[str]:
+        """Columnas que existen en la tabla (incluye las de variables renombradas o eliminadas)"""
+        columns = self._stored_columns.get(table)
+        if columns is None:
+            self.table(table)
+            with self.pool.connection() as connection:
+                columns = self._read_columns(connection.cursor(), table)
+            self._stored_columns[table] = columns
+        return columns
+
+    def table(self, name: str) -> TableSpec:
+        try:
+            return self.tables[name]
+        except KeyError:
+            raise DatabaseError(f"Tabla no definida en el diccionario: {name}") from None
+
+    def upsert_statement(self, table: str, columns: Sequence[str]) -> str:
+        """SQL de upsert para una tabla y columnas (se construye una sola vez)"""
+        cache_key = (table, tuple(columns))
+        statement = self._statements.get(cache_key)
+        if statement is None:
+            spec = self.table(table)
+            unknown = [column for column in columns
+                       if column != spec.key and column not in spec.columns]
+            if unknown:
+                raise DatabaseError(f"Columnas no definidas en {table}: {unknown}")
+            if spec.key not in columns:
+                raise DatabaseError(f"Falta la llave {spec.key} para {table}")
+            placeholder = PLACEHOLDERS[self.pool.engine]
+            quoted = [quote_identifier(column) for column in columns]
+            updates = [f"{name} = excluded.{name}" for column, name in zip(columns, quoted)
+                       if column != spec.key]
+            conflict = f"DO UPDATE SET {', '.join(updates)}" if updates else "DO NOTHING"
+            # Las filas nuevas llevan la versión actual; una actualización (posiblemente
+            # parcial) conserva la de la fila, que solo avanza con migrate_batch
+            statement = (
+                f"INSERT INTO {quote_identifier(table)} ({', '.join(quoted)}, {quote_identifier(SCHEMA_VERSION_COLUMN)}) "
+                f"VALUES ({', '.join([placeholder] * len(columns))}, {self.schema_version}) "
+                f"ON CONFLICT ({quote_identifier(spec.key)}) {conflict}"
+            )
+            self._statements[cache_key] = statement
+        return statement
+
+    def bulk_upsert(self, table: str, records: Iterable[Mapping[str, Any]],
+                    batch_size: Optional[int] = None) -> int:
+        """
+        Inserta o actualiza registros en lotes con executemany
+
+        Las columnas se toman del primer registro de cada lote; los registros
+        con un conjunto distinto de columnas van en su propio executemany.
+
+        Args:
+            table: Nombre de la tabla (personas, estamento_<x>, area_<x>)
+            records: Registros a guardar
+            batch_size: Registros por transacción (por defecto el de la configuración)
+
+        Returns:
+            Cantidad de registros procesados
+        """
+        batch_size = batch_size or self.batch_size
+        total = 0
+        with self.pool.connection() as connection:
+            batch: List[Mapping[str, Any]] = []
+            for record in records:
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    total += self._write_batch(connection, table, batch)
+                    batch = []
+            if batch:
+                total += self._write_batch(connection, table, batch)
+        return total
+
+    def _write_batch(self, connection, table: str, batch: List[Mapping[str, Any]]) -> int:
+        cursor = connection.cursor()
+        try:
+            self._execute_upserts(cursor, table, batch)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        return len(batch)
+
+    def _execute_upserts(self, cursor, table: str, batch: Iterable[Mapping[str, Any]],
+                         only_table_columns: bool = False) -> None:
+        """
+        Ejecuta los upserts de un lote agrupando los registros por conjunto de columnas
+
+        Args:
+            only_table_columns: Ignorar las variables que no son columnas de la tabla
+                                (registros de persona que mezclan identificación y estamento)
+        """
+        groups: Dict[Tuple[str, ...], List[Mapping[str, Any]]] = {}
+        for record in batch:
+            groups.setdefault(tuple(record), []).append(record)
+        spec = self.table(table)
+        declared = spec.columns
+        engine = self.pool.engine
+        for record_columns, records in groups.items():
+            columns = record_columns
+            if only_table_columns:
+                columns = tuple(column for column in record_columns
+                                if column == spec.key or column in declared)
+            getter = itemgetter(*columns) if len(columns) > 1 else (lambda record: (record[columns[0]],))
+            rows = [list(getter(record)) for record in records]
+            # Solo se convierten las columnas cuyo tipo lo necesita (fechas, booleanos, arreglos)
+            adapted_types = ADAPTED_TYPES[engine]
+            adapted = [position for position, column in enumerate(columns)
+                       if declared.get(column) in adapted_types]
+            if adapted:
+                for row in rows:
+                    for position in adapted:
+                        value = row[position]
+                        if value is not None:
+                            row[position] = adapt_value(value, engine)
+            cursor.executemany(self.upsert_statement(table, columns), rows)
+
+    def upsert_persons(self, estamento: str, records: Iterable[Mapping[str, Any]],
+                       batch_size: Optional[int] = None) -> int:
+        """
+        Guarda registros de personas (identificación + estamento) en sus dos tablas
+
+        Cada lote se escribe en personas y en estamento_<nombre> dentro de la
+        misma transacción.
+
+        Returns:
+            Cantidad de registros procesados
+        """
+        estamento_name = estamento_table(estamento)
+        self.table(estamento_name)
+        batch_size = batch_size or self.batch_size
+
+        def write(connection, batch) -> None:
+            cursor = connection.cursor()
+            try:
+                self._execute_upserts(cursor, PERSON_TABLE, batch, only_table_columns=True)
+                self._execute_upserts(cursor, estamento_name, batch, only_table_columns=True)
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+
+        total = 0
+        with self.pool.connection() as connection:
+            batch: List[Mapping[str, Any]] = []
+            for record in records:
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    write(connection, batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                write(connection, batch)
+                total += len(batch)
+        return total
+
+    def sink(self, table: str):
+        """Destino para services.importer.ImportPipeline que guarda cada bloque aceptado en una tabla"""
+        def write(records: List[Dict[str, Any]]) -> None:
+            self.bulk_upsert(table, records)
+        return write
+
+    def persons_sink(self, estamento: str):
+        """Destino para ImportPipeline.for_estamento (personas + tabla del estamento)"""
+        def write(records: List[Dict[str, Any]]) -> None:
+            self.upsert_persons(estamento, records)
+        return write
+
+    def decoders(self, table: str) -> Dict[str, Any]:
+        """Decodificadores por columna, incluidas las columnas antiguas de variables renombradas"""
+        decoders = self._decoders.get(table)
+        if decoders is None:
+            spec = self.table(table)
+            declared = dict(spec.columns)
+            for version in range(BASE_VERSION, self.schema_version):
+                for old, new in self.migrator.renames(version).items():
+                    if new in spec.columns:
+                        declared.setdefault(old, spec.columns[new])
+            decoders = column_decoders(declared, self.pool.engine)
+            self._decoders[table] = decoders
+        return decoders
+
+    def upgrade_record(self, table: str, record: Mapping[str, Any], version: int) -> Dict[str, Any]:
+        """
+        Actualiza un registro decodificado de una versión anterior
+
+        Returns:
+            Registro en la versión actual con solo las columnas de la tabla
+        """
+        spec = self.table(table)
+        fields = frozenset(spec.columns) | {spec.key}
+        upgraded = self.migrator.upgrade(record, version, fields)
+        return {name: value for name, value in upgraded.items() if name in fields}
+
+    def _upgrade_stored(self, table: str, row: Mapping[str, Any], version: int) -> Dict[str, Any]:
+        """Como upgrade_record, pero con valores en el formato de almacenamiento"""
+        decoders = self.decoders(table)
+        record = {}
+        for name, value in row.items():
+            if value is not None:
+                decoder = decoders.get(name)
+                record[name] = decoder(value) if decoder else value
+        declared = self.table(table).columns
+        engine = self.pool.engine
+        adapted_types = ADAPTED_TYPES[engine]
+        return {name: adapt_value(value, engine) if declared.get(name) in adapted_types else value
+                for name, value in self.upgrade_record(table, record, version).items()
+                if value is not None}
+
+    def migrate_batch(self, table: str, limit: Optional[int] = None) -> int:
+        """
+        Reescribe en la versión actual un lote de filas de versiones anteriores
+
+        Se selecciona y reescribe dentro de una transacción con bloqueo de
+        escritura (BEGIN IMMEDIATE en SQLite, FOR UPDATE en PostgreSQL),
+        por lo que una actualización concurrente de la misma fila no se pierde.
+
+        Args:
+            table: Tabla a migrar
+            limit: Filas por lote (por defecto el de get_config("migrations"))
+
+        Returns:
+            Cantidad de filas reescritas (0 cuando ya no quedan)
+        """
+        spec = self.table(table)
+        limit = limit or int(get_config("migrations").get("batch_size", 1000))
+        placeholder = PLACEHOLDERS[self.pool.engine]
+        version = quote_identifier(SCHEMA_VERSION_COLUMN)
+        select = (f"SELECT * FROM {quote_identifier(table)} WHERE {version} < {placeholder} "
+                  f"ORDER BY {version}, {quote_identifier(spec.key)} LIMIT {placeholder}")
+        if self.pool.engine == "postgresql":
+            select += " FOR UPDATE SKIP LOCKED"
+        columns = [name for name in spec.columns if name != spec.key]
+        assignments = ", ".join(f"{quote_identifier(name)} = {placeholder}" for name in columns)
+        update = (f"UPDATE {quote_identifier(table)} SET {assignments}, {version} = {self.schema_version} "
+                  f"WHERE {quote_identifier(spec.key)} = {placeholder}")
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                if self.pool.engine == "sqlite":
+                    cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute(select, (self.schema_version, limit))
+                names = [description[0] for description in cursor.description]
+                rows = []
+                for values in cursor.fetchall():
+                    row = dict(zip(names, values))
+                    record = self._upgrade_stored(table, row, row.pop(SCHEMA_VERSION_COLUMN))
+                    rows.append([record.get(name) for name in columns] + [row[spec.key]])
+                if rows:
+                    cursor.executemany(update, rows)
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+        return len(rows)
+
+    def migration_steps(self, tables: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Pasos para models.migrations.BackgroundMigrator: {tabla: migrate_batch de la tabla}"""
+        return {table: partial(self.migrate_batch, table) for table in (tables or self.tables)}
+
+    def pending_migration(self, table: str) -> int:
+        """Filas de la tabla escritas con una versión anterior a la actual"""
+        self.table(table)
+        placeholder = PLACEHOLDERS[self.pool.engine]
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM {quote_identifier(table)} "
+                           f"WHERE {quote_identifier(SCHEMA_VERSION_COLUMN)} < {placeholder}",
+                           (self.schema_version,))
+            return cursor.fetchone()[0]
+
+    def fetch_one(self, table: str, key: Any) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene un registro por su llave (valores tal como están almacenados)
+
+        Una fila de una versión anterior se actualiza al leerla, sin reescribirla.
+        """
+        spec = self.table(table)
+        placeholder = PLACEHOLDERS[self.pool.engine]
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                f"SELECT * FROM {quote_identifier(table)} WHERE {quote_identifier(spec.key)} = {placeholder}",
+                (key,),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            names = [description[0] for description in cursor.description]
+        record = dict(zip(names, row))
+        version = record.pop(SCHEMA_VERSION_COLUMN, BASE_VERSION)
+        if version != self.schema_version:
+            return self._upgrade_stored(table, record, version)
+        return {name: value for name, value in record.items()
+                if value is not None and (name == spec.key or name in spec.columns)}
+
+    def count(self, table: str) -> int:
+        """Cantidad de registros de una tabla"""
+        self.table(table)
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM {quote_identifier(table)}")
+            return cursor.fetchone()[0]
@@ -0,0 +1,439 @@
+"""
+Detección de personas duplicadas entre importaciones (registro académico,
+talento humano, egresados)
+
+Comparar todos los pares es cuadrático; en su lugar cada persona recibe
+llaves de bloqueo y solo se comparan las personas que comparten alguna:
+
+- Fecha de nacimiento + inicial fonética del primer apellido
+- Apellidos fonéticos + inicial del nombre ("Vásquez" y "Basques" coinciden)
+- Últimos dígitos del documento (TI que luego pasa a CC)
+- Bandas LSH de una firma MinHash de los trigramas del nombre completo
+
+Los nombres se normalizan con utils.normalize_text (sanitize_string, sin
+tildes ni mayúsculas) y sus palabras se ordenan. Un par que comparte varias
+llaves se compara una sola vez (en el bloque de menor identificador), y
+los bloques con más de max_block_size personas se descartan (llaves
+demasiado comunes). La comparación de pares se reparte por bloques en un
+pool de procesos cuando hay suficientes pares.
+
+Los lotes se procesan de forma incremental: cada lote nuevo solo se compara
+consigo mismo y con lo ya indexado, y los duplicados se agrupan con
+unión-búsqueda.
+"""
+
+import multiprocessing
+import os
+import pickle
+import random
+import re
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+import utils
+from config import get_config
+from .identity import normalize_document
+
+DEDUP_FORMAT_VERSION = 1
+
+DOCUMENT_SUFFIX_LENGTH = 6
+SHINGLE_SIZE = 3
+# Pares estimados por tarea del pool (equilibrio entre reparto y costo de envío)
+PAIRS_PER_TASK = 200_000
+
+# Peso de cada comparación en el puntaje (promedio ponderado de 0 a 1)
+WEIGHTS = {
+    "documento": 2.0,
+    "fecha_nacimiento": 2.0,
+    "nombre": 3.0,
+    "email": 1.0,
+    "cel": 1.0,
+}
+# Puntaje de documentos distintos con los mismos últimos dígitos
+DOCUMENT_SUFFIX_SCORE = 0.8
+
+# Primo menor que 2**30: las firmas caben en un dígito de los enteros de CPython (min más rápido)
+_MINHASH_PRIME = 1_073_741_789
+_PHONETIC_RULES = [(re.compile(pattern), replacement) for pattern, replacement in (
+    (r"[^a-z]", ""),
+    (r"ch", "x"),
+    (r"ll", "y"),
+    (r"qu", "k"),
+    (r"gu(?=[ei])", "G"),
+    (r"g(?=[ei])", "j"),
+    (r"G", "g"),
+    (r"c(?=[ei])", "s"),
+    (r"c", "k"),
+    (r"z", "s"),
+    (r"[vw]", "b"),
+    (r"h", ""),
+    (r"y$", "i"),
+    (r"(.)\1+", r"\1"),
+)]
+
+# Posiciones de la tupla de características de una persona
+DOCUMENT, SUFFIX, BIRTH, SHINGLES, EMAIL, PHONE, KEYS = range(7)
+
+Features = Tuple[Any, ...]
+
+
+class DuplicateMatch(NamedTuple):
+    """Par de registros que probablemente son la misma persona"""
+    first: Hashable
+    second: Hashable
+    score: float
+
+
+class DedupReport(NamedTuple):
+    records: int
+    candidates: int
+    matches: List[DuplicateMatch]
+    seconds: float
+
+
+@lru_cache(maxsize=65536)
+def phonetic_key(word: str) -> str:
+    """
+    Clave fonética simplificada del español
+
+    "Vásquez", "Vazquez" y "Basques" -> "baskes"; "Giraldo" y "Jiraldo" -> "jiraldo"
+    """
+    key = utils.normalize_text(word)
+    for pattern, replacement in _PHONETIC_RULES:
+        key = pattern.sub(replacement, key)
+    return key
+
+
+@lru_cache(maxsize=65536)
+def _words(value: str) -> Tuple[str, ...]:
+    """Palabras normalizadas (los nombres y apellidos se repiten mucho entre personas)"""
+    return tuple(utils.normalize_text(value).replace("-", " ").split())
+
+
+def _birth(value: Any) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)[:10] if value else None
+
+
+class DedupEngine:
+    """Índice incremental de bloqueo y agrupación de duplicados"""
+
+    def __init__(self, threshold: Optional[float] = None, workers: Optional[int] = None,
+                 max_block_size: Optional[int] = None, bands: Optional[int] = None, rows: Optional[int] = None):
+        """
+        Args:
+            threshold: Puntaje mínimo (0 a 1) para considerar un duplicado
+            workers: Procesos para comparar pares (0 = os.cpu_count(), 1 = sin pool)
+            max_block_size: Personas máximas por bloque; los bloques mayores se descartan
+            bands: Bandas LSH (más bandas = más candidatos por nombre)
+            rows: Valores MinHash por banda (más filas = nombres más parecidos)
+
+        Los valores no indicados se toman de get_config("dedup").
+        """
+        config = get_config("dedup")
+        self.threshold = float(config.get("threshold", 0.75) if threshold is None else threshold)
+        workers = int(config.get("workers", 0) if workers is None else workers)
+        self.workers = workers or os.cpu_count() or 1
+        self.max_block_size = int(max_block_size or config.get("max_block_size", 500))
+        self.bands = int(bands or config.get("lsh_bands", 4))
+        self.rows = int(rows or config.get("lsh_rows", 6))
+        self.min_parallel_pairs = int(config.get("min_parallel_pairs", 50_000))
+        rng = random.Random(self.bands * 1000 + self.rows)
+        self._minhash_parameters = [(rng.randrange(1, _MINHASH_PRIME), rng.randrange(_MINHASH_PRIME))
+                                    for _ in range(self.bands * self.rows)]
+        self.ids: List[Hashable] = []
+        self.features: List[Features] = []
+        self._positions: Dict[Hashable, int] = {}
+        self._block_ids: Dict[Tuple[Any, ...], int] = {}
+        self._blocks: List[Optional[List[int]]] = []  # None = bloque descartado por tamaño
+        self._parent: List[int] = []
+        # Trigrama -> (hash, valores de las permutaciones MinHash); el vocabulario es pequeño
+        self._shingles: Dict[str, Tuple[int, Tuple[int, ...]]] = {}
+        self.matches: List[DuplicateMatch] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, record_id: Hashable) -> bool:
+        return record_id in self._positions
+
+    def _shingle(self, shingle: str) -> Tuple[int, Tuple[int, ...]]:
+        value = self._shingles.get(shingle)
+        if value is None:
+            # crc32 y no hash(): estable entre procesos y ejecuciones
+            hashed = zlib.crc32(shingle.encode("ascii"))
+            permuted = tuple((a * hashed + b) % _MINHASH_PRIME for a, b in self._minhash_parameters)
+            value = self._shingles[shingle] = (hashed, permuted)
+        return value
+
+    def features_of(self, record: Mapping[str, Any]) -> Tuple[Features, List[Tuple[Any, ...]]]:
+        """
+        Características de comparación y llaves de bloqueo de una persona
+
+        Returns:
+            (características sin llaves, llaves de bloqueo)
+        """
+        document = record.get("numero_documento")
+        document = normalize_document(str(document)).replace(".", "") if document else None
+        suffix = document[-DOCUMENT_SUFFIX_LENGTH:] if document and len(document) >= DOCUMENT_SUFFIX_LENGTH else None
+        birth = _birth(record.get("fecha_nacimiento"))
+        given = _words(str(record.get("nombres") or ""))
+        surnames = _words(str(record.get("apellidos") or ""))
+        name = " ".join(sorted(given + surnames))
+        padded = f" {name} "
+        trigrams = {self._shingle(padded[start:start + SHINGLE_SIZE])
+                    for start in range(len(padded) - SHINGLE_SIZE + 1)} if name else ()
+        shingles = frozenset(hashed for hashed, _ in trigrams)
+        email = str(record.get("email") or "").strip().lower() or None
+        phone = utils.NON_DIGIT_PATTERN.sub("", str(record.get("cel") or ""))[-10:] or None
+
+        keys: List[Tuple[Any, ...]] = []
+        phonetic = [phonetic_key(word) for word in surnames[:2]]
+        if birth:
+            keys.append(("fecha", birth, phonetic[0][:1] if phonetic else ""))
+        if phonetic and given:
+            keys.append(("apellidos", " ".join(phonetic), given[0][:1]))
+        if suffix:
+            keys.append(("documento", suffix))
+        if trigrams:
+            # Firma MinHash: mínimo por permutación sobre los valores precalculados de cada trigrama
+            signature = list(map(min, zip(*(permuted for _, permuted in trigrams))))
+            for band in range(self.bands):
+                keys.append(("lsh", band, hash(tuple(signature[band * self.rows:(band + 1) * self.rows]))))
+        return (document, suffix, birth, shingles, email, phone), keys
+
+    def _block(self, key: Tuple[Any, ...], position: int, touched: Dict[int, int]) -> Optional[int]:
+        """Agrega la persona al bloque de la llave; retorna el id del bloque si sigue activo"""
+        block_id = self._block_ids.get(key)
+        if block_id is None:
+            block_id = self._block_ids[key] = len(self._blocks)
+            self._blocks.append([])
+        members = self._blocks[block_id]
+        if members is None:
+            return None
+        if len(members) >= self.max_block_size:
+            # Llave demasiado común: se descarta el bloque y se quita de sus miembros
+            for member in members:
+                self.features[member][KEYS].discard(block_id)
+            self._blocks[block_id] = None
+            touched.pop(block_id, None)
+            return None
+        touched.setdefault(block_id, len(members))
+        members.append(position)
+        return block_id
+
+    def add_batch(self, records: Iterable[Mapping[str, Any]], id_field: Optional[str] = None) -> DedupReport:
+        """
+        Indexa un lote y busca sus duplicados entre sí y con lo ya indexado
+
+        Args:
+            records: Personas del lote
+            id_field: Campo con el identificador del registro (por defecto un consecutivo)
+
+        Returns:
+            Resumen con los duplicados nuevos encontrados
+        """
+        start = time.perf_counter()
+        touched: Dict[int, int] = {}  # bloque -> posición del primer miembro nuevo
+        count = 0
+        for record in records:
+            record_id = record.get(id_field) if id_field else len(self.ids)
+            if record_id in self._positions:
+                continue
+            features, keys = self.features_of(record)
+            position = len(self.ids)
+            self.ids.append(record_id)
+            self._positions[record_id] = position
+            self._parent.append(position)
+            block_ids: Set[int] = set()
+            self.features.append(features + (block_ids,))
+            for key in keys:
+                block_id = self._block(key, position, touched)
+                if block_id is not None:
+                    block_ids.add(block_id)
+            count += 1
+
+        tasks = []
+        for block_id, first_new in touched.items():
+            members = self._blocks[block_id]
+            if len(members) > 1:
+                tasks.append((block_id, tuple(members), first_new))
+        compared, found = self._score(tasks)
+        matches = []
+        for first, second, score in found:
+            self._union(first, second)
+            matches.append(DuplicateMatch(self.ids[first], self.ids[second], score))
+        self.matches.extend(matches)
+        return DedupReport(count, compared, matches, time.perf_counter() - start)
+
+    def _score(self, tasks: List[Tuple[int, Tuple[int, ...], int]]) -> Tuple[int, List[Tuple[int, int, float]]]:
+        """Compara los pares de los bloques, en el pool si son suficientes"""
+        estimated = sum((len(members) - first_new) * (len(members) + first_new - 1) // 2
+                        for _, members, first_new in tasks)
+        if self.workers <= 1 or estimated < self.min_parallel_pairs:
+            return _score_blocks(self.features, self.threshold, tasks)
+        chunks: List[List[Tuple[int, Tuple[int, ...], int]]] = [[]]
+        size = 0
+        for task in tasks:
+            _, members, first_new = task
+            chunks[-1].append(task)
+            size += (len(members) - first_new) * len(members)
+            if size >= PAIRS_PER_TASK:
+                chunks.append([])
+                size = 0
+        # Con fork los procesos heredan las características sin serializarlas
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        compared, found = 0, []
+        with ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(self.features, self.threshold)) as pool:
+            for chunk_compared, chunk_found in pool.map(_score_in_worker, chunks):
+                compared += chunk_compared
+                found.extend(chunk_found)
+        return compared, found
+
+    def _find(self, position: int) -> int:
+        parent = self._parent
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    def _union(self, first: int, second: int) -> None:
+        first, second = self._find(first), self._find(second)
+        if first != second:
+            self._parent[max(first, second)] = min(first, second)
+
+    def cluster_of(self, record_id: Hashable) -> List[Hashable]:
+        """Registros agrupados con uno dado como la misma persona (incluido él mismo)"""
+        position = self._positions.get(record_id)
+        if position is None:
+            return []
+        root = self._find(position)
+        return [self.ids[other] for other in range(len(self.ids)) if self._find(other) == root]
+
+    def clusters(self) -> List[List[Hashable]]:
+        """Grupos de dos o más registros de la misma persona"""
+        groups: Dict[int, List[Hashable]] = {}
+        for position, record_id in enumerate(self.ids):
+            groups.setdefault(self._find(position), []).append(record_id)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def import_sink(self, id_field: Optional[str] = None) -> Callable[[List[Dict[str, Any]]], None]:
+        """Destino para services.importer.ImportPipeline: cada bloque aceptado se procesa como un lote"""
+        def sink(records: List[Dict[str, Any]]) -> None:
+            self.add_batch(records, id_field)
+        return sink
+
+    def save(self, path: str) -> None:
+        """Guarda el índice en disco (escritura atómica)"""
+        state = {
+            "settings": (self.threshold, self.max_block_size, self.bands, self.rows),
+            "ids": self.ids,
+            "features": self.features,
+            "block_ids": self._block_ids,
+            "blocks": self._blocks,
+            "parent": self._parent,
+            "matches": self.matches,
+        }
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as handle:
+            pickle.dump((DEDUP_FORMAT_VERSION, state), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str, workers: Optional[int] = None) -> "DedupEngine":
+        """
+        Carga un índice guardado con save()
+
+        Solo debe usarse con archivos generados por el propio sistema
+        (pickle no es seguro con archivos de terceros).
+
+        Raises:
+            ValueError: Si el archivo es de otra versión de formato
+        """
+        with open(path, "rb") as handle:
+            version, state = pickle.load(handle)
+        if version != DEDUP_FORMAT_VERSION:
+            raise ValueError(f"Versión de índice no soportada: {version}")
+        threshold, max_block_size, bands, rows = state["settings"]
+        engine = cls(threshold, workers, max_block_size, bands, rows)
+        engine.ids = state["ids"]
+        engine.features = state["features"]
+        engine._block_ids = state["block_ids"]
+        engine._blocks = state["blocks"]
+        engine._parent = state["parent"]
+        engine.matches = state["matches"]
+        engine._positions = {record_id: position for position, record_id in enumerate(engine.ids)}
+        return engine
+
+
+def score_pair(first: Features, second: Features) -> float:
+    """Puntaje de 0 a 1: promedio ponderado de las comparaciones disponibles en ambos registros"""
+    total = weight = 0.0
+    if first[DOCUMENT] and second[DOCUMENT]:
+        weight += WEIGHTS["documento"]
+        if first[DOCUMENT] == second[DOCUMENT]:
+            total += WEIGHTS["documento"]
+        elif first[SUFFIX] is not None and first[SUFFIX] == second[SUFFIX]:
+            total += WEIGHTS["documento"] * DOCUMENT_SUFFIX_SCORE
+    if first[BIRTH] and second[BIRTH]:
+        weight += WEIGHTS["fecha_nacimiento"]
+        if first[BIRTH] == second[BIRTH]:
+            total += WEIGHTS["fecha_nacimiento"]
+    names = first[SHINGLES], second[SHINGLES]
+    if names[0] and names[1]:
+        weight += WEIGHTS["nombre"]
+        shared = len(names[0] & names[1])
+        total += WEIGHTS["nombre"] * shared / (len(names[0]) + len(names[1]) - shared)
+    # Email y celular cambian entre fuentes: solo suman cuando coinciden
+    for position, field in ((EMAIL, "email"), (PHONE, "cel")):
+        if first[position] and first[position] == second[position]:
+            weight += WEIGHTS[field]
+            total += WEIGHTS[field]
+    return total / weight if weight else 0.0
+
+
+def _score_blocks(features: List[Features], threshold: float,
+                  tasks: Iterable[Tuple[int, Tuple[int, ...], int]]) -> Tuple[int, List[Tuple[int, int, float]]]:
+    """
+    Compara en cada bloque los miembros nuevos con los anteriores
+
+    Un par que comparte varios bloques activos solo se compara en el de menor id.
+    """
+    compared = 0
+    found = []
+    for block_id, members, first_new in tasks:
+        for index in range(first_new, len(members)):
+            second = members[index]
+            second_features = features[second]
+            second_keys = second_features[KEYS]
+            for first in members[:index]:
+                first_features = features[first]
+                if min(second_keys & first_features[KEYS]) != block_id:
+                    continue
+                compared += 1
+                score = score_pair(first_features, second_features)
+                if score >= threshold:
+                    found.append((first, second, score))
+    return compared, found
+
+
+_worker_state: Tuple[Any, ...] = ()
+
+
+def _init_worker(features: List[Features], threshold: float) -> None:
+    global _worker_state
+    _worker_state = (features, threshold)
+
+
+def _score_in_worker(tasks: List[Tuple[int, Tuple[int, ...], int]]) -> Tuple[int, List[Tuple[int, int, float]]]:
+    features, threshold = _worker_state
+    return _score_blocks(features, threshold, tasks)
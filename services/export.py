@@ -0,0 +1,305 @@
+"""
+Exportación incremental de cambios guiada por update_date
+
+Cada consumidor (reportes institucionales, oficina de deportes, cultura...)
+tiene una marca de agua (update_date, llave) del último registro que
+recibió. Una exportación recorre solo los registros posteriores a esa
+marca, en orden (update_date, llave), con consultas por rango sobre el
+índice (update_date, llave) en lugar de recorrer toda la tabla. La marca se
+guarda después de escribir cada lote, por lo que una exportación
+interrumpida se retoma desde el último lote escrito (entrega al menos una
+vez: el lote en curso puede repetirse).
+
+Salidas: JSONL (un registro por línea) o lotes columnares (estilo
+Parquet: una lista de valores por columna; Parquet real si pyarrow está
+instalado). Con una MaskingStage (services/masking.py) cada lote se
+enmascara antes de llegar al destino. Las filas escritas con una versión
+anterior del esquema se exportan ya actualizadas (models/migrations.py).
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .database import (
+    CHANGE_TRACKING_COLUMN,
+    PERSON_TABLE,
+    PLACEHOLDERS,
+    SCHEMA_VERSION_COLUMN,
+    Database,
+    quote_identifier,
+)
+
+if TYPE_CHECKING:
+    from .masking import MaskingStage
+
+WATERMARK_TABLE = "export_watermarks"
+
+Writer = Callable[[List[Dict[str, Any]]], None]
+
+
+class ExportError(Exception):
+    """Error de configuración de una exportación"""
+
+
+class Watermark(NamedTuple):
+    """Posición del último registro exportado: (update_date, llave)"""
+    update_date: Optional[str] = None
+    key: Optional[str] = None
+
+
+class ExportReport(NamedTuple):
+    consumer: str
+    table: str
+    records: int
+    batches: int
+    watermark: Watermark
+    seconds: float
+
+
+class ChangeExporter:
+    """Exportación incremental de una tabla por consumidor"""
+
+    def __init__(self, database: Database, table: str = PERSON_TABLE,
+                 column: str = CHANGE_TRACKING_COLUMN, batch_size: Optional[int] = None,
+                 masking: Optional["MaskingStage"] = None):
+        """
+        Args:
+            database: Capa de datos (con el esquema ya creado)
+            table: Tabla a exportar; debe tener la columna de seguimiento
+            column: Columna de fecha de modificación (update_date)
+            batch_size: Registros por lote (por defecto el de la configuración)
+            masking: Enmascaramiento de datos sensibles aplicado a cada lote
+        """
+        self.database = database
+        self.spec = database.table(table)
+        if column not in self.spec.columns:
+            raise ExportError(f"La tabla {table} no tiene la columna {column}")
+        self.table = table
+        self.column = column
+        self.batch_size = batch_size or database.batch_size
+        self.masking = masking
+        self.columns = [self.spec.key] + [name for name in self.spec.columns if name != self.spec.key]
+        # Columnas de variables renombradas o eliminadas: solo se leen en filas de versiones anteriores
+        self._legacy = [name for name in database.stored_columns(table)
+                        if name not in self.spec.columns and name not in (self.spec.key, SCHEMA_VERSION_COLUMN)]
+        self._decoders = database.decoders(table)
+        self._placeholder = PLACEHOLDERS[database.pool.engine]
+        self._select_first, self._select_after = self._build_select()
+        self._schema_ready = False
+
+    def _build_select(self) -> Tuple[str, str]:
+        """Consultas de la primera página y de las siguientes (después de la llave)"""
+        p = self._placeholder
+        table = quote_identifier(self.table)
+        column = quote_identifier(self.column)
+        key = quote_identifier(self.spec.key)
+        selected = ", ".join(quote_identifier(name)
+                             for name in self.columns + self._legacy + [SCHEMA_VERSION_COLUMN])
+        order = f"ORDER BY {column}, {key} LIMIT {p}"
+        # Comparación por filas (a, b) > (x, y): rango sobre el índice (update_date, llave)
+        after = f"SELECT {selected} FROM {table} WHERE ({column}, {key}) > ({p}, {p}) AND {column} <= {p} {order}"
+        first = f"SELECT {selected} FROM {table} WHERE {column} <= {p} {order}"
+        return first, after
+
+    def ensure_schema(self) -> None:
+        """Crea la tabla de marcas de agua si no existe"""
+        with self.database.pool.connection() as connection:
+            connection.cursor().execute(
+                f"CREATE TABLE IF NOT EXISTS {WATERMARK_TABLE} ("
+                "consumer TEXT NOT NULL, table_name TEXT NOT NULL, "
+                "update_date TEXT, last_key TEXT, exported_at TEXT, "
+                "PRIMARY KEY (consumer, table_name))"
+            )
+            connection.commit()
+        self._schema_ready = True
+
+    def watermark(self, consumer: str) -> Watermark:
+        """Marca de agua actual de un consumidor (vacía si nunca ha exportado)"""
+        p = self._placeholder
+        with self.database.pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                f"SELECT update_date, last_key FROM {WATERMARK_TABLE} WHERE consumer = {p} AND table_name = {p}",
+                (consumer, self.table),
+            )
+            row = cursor.fetchone()
+        return Watermark(*row) if row else Watermark()
+
+    def set_watermark(self, consumer: str, watermark: Watermark) -> None:
+        """Guarda la marca de agua de un consumidor (Watermark() para reexportar todo)"""
+        p = self._placeholder
+        statement = (
+            f"INSERT INTO {WATERMARK_TABLE} (consumer, table_name, update_date, last_key, exported_at) "
+            f"VALUES ({p}, {p}, {p}, {p}, {p}) ON CONFLICT (consumer, table_name) DO UPDATE SET "
+            "update_date = excluded.update_date, last_key = excluded.last_key, exported_at = excluded.exported_at"
+        )
+        values = (consumer, self.table, watermark.update_date, watermark.key,
+                  datetime.now().isoformat(timespec="seconds"))
+        with self.database.pool.connection() as connection:
+            connection.cursor().execute(statement, values)
+            connection.commit()
+
+    def _upper_bound(self, cursor) -> Optional[str]:
+        cursor.execute(f"SELECT MAX({quote_identifier(self.column)}) FROM {quote_identifier(self.table)}")
+        return cursor.fetchone()[0]
+
+    def _decode(self, row: Tuple[Any, ...]) -> Dict[str, Any]:
+        record = {}
+        decoders = self._decoders
+        version = row[-1]
+        current = version == self.database.schema_version
+        for name, value in zip(self.columns if current else self.columns + self._legacy, row):
+            if value is None:
+                continue
+            decoder = decoders.get(name)
+            record[name] = decoder(value) if decoder else value
+        if not current:
+            # Fila de una versión anterior: se actualiza al exportarla, sin reescribirla
+            record = self.database.upgrade_record(self.table, record, version)
+        return record
+
+    def iter_batches(self, since: Watermark = Watermark(), upto: Optional[str] = None,
+                     batch_size: Optional[int] = None) -> Iterator[Tuple[List[Dict[str, Any]], Watermark]]:
+        """
+        Lotes de registros modificados después de `since`, en orden (update_date, llave)
+
+        Args:
+            since: Marca de agua inicial (vacía = desde el principio)
+            upto: update_date máximo a incluir (por defecto el máximo al iniciar,
+                  para que la exportación tenga un final aunque sigan llegando cambios)
+            batch_size: Registros por lote
+
+        Yields:
+            (registros, marca de agua del último registro del lote)
+        """
+        batch_size = batch_size or self.batch_size
+        pool = self.database.pool
+        if upto is None:
+            with pool.connection() as connection:
+                upto = self._upper_bound(connection.cursor())
+        if upto is None:
+            return
+        # Los registros sin update_date no se exportan (el campo es obligatorio)
+        position = tuple(since) if since.update_date is not None else None
+        column_index = self.columns.index(self.column)
+        while True:
+            # La conexión se devuelve al pool antes de entregar cada lote
+            with pool.connection() as connection:
+                cursor = connection.cursor()
+                if position is None:
+                    cursor.execute(self._select_first, (upto, batch_size))
+                else:
+                    cursor.execute(self._select_after, (*position, upto, batch_size))
+                rows = cursor.fetchall()
+            if not rows:
+                return
+            last = rows[-1]
+            position = (last[column_index], last[0])
+            yield [self._decode(row) for row in rows], Watermark(*position)
+            if len(rows) < batch_size:
+                return
+
+    def export(self, consumer: str, writer: Writer, batch_size: Optional[int] = None) -> ExportReport:
+        """
+        Exporta los cambios pendientes de un consumidor y avanza su marca de agua
+
+        Args:
+            consumer: Nombre del consumidor (ej. "deportes", "reportes_institucionales")
+            writer: Función que recibe cada lote (JsonlWriter, ColumnarWriter, ...)
+            batch_size: Registros por lote
+
+        Returns:
+            Resumen de la exportación
+        """
+        start = time.perf_counter()
+        if not self._schema_ready:
+            self.ensure_schema()
+        watermark = self.watermark(consumer)
+        records = batches = 0
+        masking = self.masking
+        for batch, watermark in self.iter_batches(watermark, batch_size=batch_size):
+            writer(masking.mask_records(batch) if masking else batch)
+            self.set_watermark(consumer, watermark)
+            records += len(batch)
+            batches += 1
+        return ExportReport(consumer, self.table, records, batches, watermark, time.perf_counter() - start)
+
+
+class JsonlWriter:
+    """Escribe los lotes como JSONL (se agrega al final del archivo)"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._handle = open(path, "a", encoding="utf-8")
+
+    def __call__(self, records: List[Dict[str, Any]]) -> None:
+        handle = self._handle
+        for record in records:
+            handle.write(json.dumps(record, ensure_ascii=False, default=str))
+            handle.write("\n")
+        handle.flush()
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ColumnarWriter:
+    """
+    Escribe cada lote como un archivo columnar en un directorio
+
+    - fmt="json": {"rows": n, "columns": {columna: [valores]}} (sin dependencias)
+    - fmt="parquet": archivo Parquet (requiere pyarrow)
+    """
+
+    def __init__(self, directory: str, columns: List[str], prefix: str = "batch", fmt: str = "json"):
+        if fmt not in ("json", "parquet"):
+            raise ExportError(f"Formato columnar no soportado: {fmt}")
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ExportError("El formato parquet requiere el paquete pyarrow") from None
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.columns = list(columns)
+        self.prefix = prefix
+        self.fmt = fmt
+        self.files: List[str] = []
+
+    def _next_path(self) -> str:
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        return os.path.join(self.directory, f"{self.prefix}-{stamp}-{len(self.files) + 1:05d}.{self.fmt}")
+
+    def __call__(self, records: List[Dict[str, Any]]) -> None:
+        data = {column: [record.get(column) for record in records] for column in self.columns}
+        path = self._next_path()
+        if self.fmt == "parquet":
+            import pyarrow
+            import pyarrow.parquet
+
+            pyarrow.parquet.write_table(pyarrow.table(data), path)
+        else:
+            with open(path, "w", encoding="utf-8") as handle:
+                json.dump({"rows": len(records), "columns": data}, handle, ensure_ascii=False, default=str)
+        self.files.append(path)
+
+    def close(self) -> None:
+        """Sin recursos abiertos; existe para usarse igual que JsonlWriter"""
+
+
+def columnar_writer(exporter: ChangeExporter, directory: str, fmt: str = "json") -> ColumnarWriter:
+    """ColumnarWriter con las columnas de la tabla del exportador (sin las suprimidas)"""
+    columns = exporter.masking.output_columns(exporter.columns) if exporter.masking else exporter.columns
+    return ColumnarWriter(directory, columns, prefix=exporter.table, fmt=fmt)
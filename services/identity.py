@@ -0,0 +1,285 @@
+"""
+Índices de identidad y asignación de códigos de usuario sin colisiones
+
+Índices hash O(1) sobre numero_documento (normalizado con
+format_document_number), email, codigo_estudiante, codigo_empleado y el
+código de usuario generado. Se construyen de forma masiva desde una
+importación y se guardan en disco para un arranque en caliente rápido.
+"""
+
+import os
+import pickle
+import re
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+import utils
+
+INDEX_FORMAT_VERSION = 1
+
+DOCUMENT_FIELD = "numero_documento"
+USER_CODE_FIELD = "codigo_usuario"
+INDEXED_FIELDS = (DOCUMENT_FIELD, "email", "codigo_estudiante", "codigo_empleado")
+
+# Motivo de rechazo en el archivo de errores de la importación
+IDENTITY_CONFLICT = "identity_conflict"
+
+_LETTER_PATTERN = re.compile(r"[A-Za-z]")
+_NON_ALNUM_PATTERN = re.compile(r"[^0-9A-Za-z]")
+
+
+class IdentityConflictError(ValueError):
+    """Otra persona ya tiene el mismo documento, email o código"""
+
+    def __init__(self, field: str, value: Any, owner: Hashable):
+        super().__init__(f"{field} '{value}' ya está asignado a {owner}")
+        self.field = field
+        self.value = value
+        self.owner = owner
+
+
+def normalize_document(document_number: str) -> str:
+    """
+    Normaliza un número de documento para usarlo como llave
+
+    Los documentos numéricos se normalizan con utils.format_document_number;
+    los alfanuméricos (CE, pasaporte) conservan sus letras en mayúscula.
+    """
+    if _LETTER_PATTERN.search(document_number):
+        return _NON_ALNUM_PATTERN.sub("", document_number).upper()
+    return utils.format_document_number(document_number)
+
+
+# Normalización por campo indexado
+NORMALIZERS: Dict[str, Callable[[str], str]] = {
+    DOCUMENT_FIELD: normalize_document,
+    "email": lambda value: value.strip().lower(),
+    "codigo_estudiante": lambda value: value.strip().upper(),
+    "codigo_empleado": lambda value: value.strip().upper(),
+    USER_CODE_FIELD: lambda value: value.strip().upper(),
+}
+
+
+class IdentityIndex:
+    """Índices de búsqueda por identificadores de persona"""
+
+    def __init__(self):
+        self.indexes: Dict[str, Dict[str, Hashable]] = {
+            field: {} for field in INDEXED_FIELDS + (USER_CODE_FIELD,)
+        }
+        # Llaves normalizadas de cada persona, para actualizar o eliminar
+        self._keys: Dict[Hashable, Dict[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, record_id: Hashable) -> bool:
+        return record_id in self._keys
+
+    @staticmethod
+    def normalize(field: str, value: Any) -> Optional[str]:
+        """Normaliza el valor de un campo indexado (None si está vacío)"""
+        if value is None:
+            return None
+        key = NORMALIZERS[field](str(value))
+        return key or None
+
+    def find(self, field: str, value: Any) -> Optional[Hashable]:
+        """
+        Busca la persona que tiene un valor en un campo indexado
+
+        Args:
+            field: Campo (numero_documento, email, codigo_estudiante, codigo_empleado, codigo_usuario)
+            value: Valor a buscar (se normaliza)
+
+        Returns:
+            Identificador de la persona o None
+        """
+        try:
+            index = self.indexes[field]
+        except KeyError:
+            raise KeyError(f"Campo no indexado: {field}") from None
+        key = self.normalize(field, value)
+        return index.get(key) if key is not None else None
+
+    def find_by_document(self, document_number: str) -> Optional[Hashable]:
+        return self.find(DOCUMENT_FIELD, document_number)
+
+    def find_by_email(self, email: str) -> Optional[Hashable]:
+        return self.find("email", email)
+
+    def find_by_user_code(self, user_code: str) -> Optional[Hashable]:
+        return self.find(USER_CODE_FIELD, user_code)
+
+    def user_code_of(self, record_id: Hashable) -> Optional[str]:
+        """Código de usuario asignado a una persona"""
+        return self._keys.get(record_id, {}).get(USER_CODE_FIELD)
+
+    def add(self, record: Mapping[str, Any], role: str, record_id: Optional[Hashable] = None) -> str:
+        """
+        Indexa (o actualiza) una persona y le asigna su código de usuario
+
+        Args:
+            record: Registro con numero_documento y, opcionalmente, email y códigos
+            role: Rol/estamento para el prefijo del código de usuario
+            record_id: Identificador de la persona (por defecto el documento normalizado)
+
+        Returns:
+            Código de usuario asignado (se conserva si la persona ya tenía uno)
+
+        Raises:
+            ValueError: Si el registro no tiene numero_documento
+            IdentityConflictError: Si otro registro ya usa alguno de sus identificadores
+        """
+        document_key = self.normalize(DOCUMENT_FIELD, record.get(DOCUMENT_FIELD))
+        if document_key is None:
+            raise ValueError("El registro no tiene numero_documento")
+        if record_id is None:
+            record_id = document_key
+
+        keys = {}
+        for field in INDEXED_FIELDS:
+            key = self.normalize(field, record.get(field))
+            if key is None:
+                continue
+            owner = self.indexes[field].get(key)
+            if owner is not None and owner != record_id:
+                raise IdentityConflictError(field, record.get(field), owner)
+            keys[field] = key
+
+        previous = self._keys.get(record_id, {})
+        user_code = previous.get(USER_CODE_FIELD)
+        if user_code is None:
+            user_code = self._next_user_code(role, str(record[DOCUMENT_FIELD]))
+        keys[USER_CODE_FIELD] = user_code
+
+        for field, key in previous.items():
+            if keys.get(field) != key:
+                self.indexes[field].pop(key, None)
+        for field, key in keys.items():
+            self.indexes[field][key] = record_id
+        self._keys[record_id] = keys
+        return user_code
+
+    def remove(self, record_id: Hashable) -> bool:
+        """Elimina una persona de todos los índices; retorna False si no existía"""
+        keys = self._keys.pop(record_id, None)
+        if keys is None:
+            return False
+        for field, key in keys.items():
+            self.indexes[field].pop(key, None)
+        return True
+
+    def _next_user_code(self, role: str, document_number: str) -> str:
+        """
+        Genera el primer código libre de forma determinista
+
+        Se parte de utils.generate_user_code (6 dígitos finales); si ya está
+        usado se toman más dígitos del documento, y si el documento completo
+        también choca se agrega un consecutivo (-2, -3, ...).
+        """
+        codes = self.indexes[USER_CODE_FIELD]
+        digits = len(utils.NON_DIGIT_PATTERN.sub("", document_number))
+        for suffix_length in range(6, max(digits, 6) + 1):
+            code = utils.generate_user_code(role, document_number, suffix_length)
+            if code not in codes:
+                return code
+        base = utils.generate_user_code(role, document_number, max(digits, 6))
+        counter = 2
+        while f"{base}-{counter}" in codes:
+            counter += 1
+        return f"{base}-{counter}"
+
+    def _add_all(self, records: Iterable[Mapping[str, Any]], role: str, id_field: Optional[str],
+                 conflicts: List[Dict[str, Any]], write_code: bool = False,
+                 rejected: Optional[List[Tuple[int, list]]] = None) -> List[Mapping[str, Any]]:
+        """
+        Indexa los registros; los que chocan van a `conflicts` (y a `rejected`
+        como (posición, errores)) y no se indexan. Retorna los indexados
+        """
+        indexed = []
+        for position, record in enumerate(records):
+            record_id = record.get(id_field) if id_field else None
+            try:
+                user_code = self.add(record, role, record_id)
+            except IdentityConflictError as error:
+                conflicts.append({"record": record, "field": error.field, "owner": error.owner})
+                if rejected is not None:
+                    rejected.append((position, [(error.field, IDENTITY_CONFLICT)]))
+                continue
+            if write_code:
+                record[USER_CODE_FIELD] = user_code
+            indexed.append(record)
+        return indexed
+
+    def build(self, records: Iterable[Mapping[str, Any]], role: str,
+              id_field: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Construcción masiva desde una importación
+
+        Args:
+            records: Registros a indexar
+            role: Rol/estamento de los registros
+            id_field: Campo con el identificador de la persona (por defecto el documento normalizado)
+
+        Returns:
+            Conflictos encontrados: [{"record": registro, "field": campo, "owner": id}]
+        """
+        conflicts: List[Dict[str, Any]] = []
+        self._add_all(records, role, id_field, conflicts)
+        return conflicts
+
+    def import_sink(self, role: str, id_field: Optional[str] = None,
+                    conflicts: Optional[List[Dict[str, Any]]] = None
+                    ) -> Callable[[List[Dict[str, Any]]], List[Tuple[int, list]]]:
+        """
+        Destino para services.importer.ImportPipeline que indexa cada bloque aceptado
+
+        El código asignado se escribe en cada registro como 'codigo_usuario'.
+        Como en build(), un registro cuyo documento, email o código ya es de
+        otra persona no detiene la importación: se agrega a `conflicts`, se
+        quita del bloque (un destino encadenado después, ej. la base de
+        datos, solo recibe los registros indexados) y se retorna al pipeline
+        como rechazado con el motivo IDENTITY_CONFLICT, de modo que el
+        reporte no lo cuenta como aceptado y llega al archivo de errores.
+
+        Args:
+            role: Rol/estamento de los registros
+            id_field: Campo con el identificador de la persona
+            conflicts: Lista donde se agregan los conflictos (mismo formato que build())
+        """
+        found = conflicts if conflicts is not None else []
+
+        def sink(records: List[Dict[str, Any]]) -> List[Tuple[int, list]]:
+            rejected: List[Tuple[int, list]] = []
+            records[:] = self._add_all(records, role, id_field, found, write_code=True, rejected=rejected)
+            return rejected
+        return sink
+
+    def save(self, path: str) -> None:
+        """Guarda el índice en disco (escritura atómica)"""
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as handle:
+            pickle.dump((INDEX_FORMAT_VERSION, self._keys), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> "IdentityIndex":
+        """
+        Carga un índice guardado con save()
+
+        Solo debe usarse con archivos generados por el propio sistema
+        (pickle no es seguro con archivos de terceros).
+
+        Raises:
+            ValueError: Si el archivo es de otra versión de formato
+        """
+        with open(path, "rb") as handle:
+            version, keys = pickle.load(handle)
+        if version != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Versión de índice no soportada: {version}")
+        index = cls()
+        index._keys = keys
+        for record_id, record_keys in keys.items():
+            for field, key in record_keys.items():
+                index.indexes[field][key] = record_id
+        return index
@@ -0,0 +1,382 @@
+"""
+Pipeline de importación por flujo para registros de caracterización
+Lector por bloques -> sanitize_string -> safe_cast -> validación -> destino
+
+Solo se mantiene en memoria un bloque de filas a la vez; las filas
+rechazadas se escriben de inmediato en un archivo de errores (JSONL).
+El destino también puede rechazar filas (ej. conflictos de identidad):
+retorna [(posición en el bloque, errores)] y esas filas se cuentan y se
+escriben como las demás rechazadas.
+"""
+
+import csv
+import json
+import logging
+import time
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+import utils
+from models.data_dictionary import DataDictionary, DataDictionaryView, get_shared_dictionary
+from models.validators import INVALID_TYPE, RecordValidator, compile_schema
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+ARRAY_SEPARATOR = ";"
+
+# Vocabulario de booleanos en texto (CSV); cualquier otro texto es un tipo inválido
+BOOLEAN_VALUES = {
+    "true": True, "1": True, "si": True, "sí": True, "yes": True, "verdadero": True,
+    "false": False, "0": False, "no": False, "falso": False,
+}
+
+# Tipos declarados en el diccionario -> tipo objetivo de safe_cast
+CAST_TYPES = {
+    "integer": int,
+    "float": float,
+    "boolean": bool,
+    "date": datetime,
+    "datetime": datetime,
+}
+
+# Destino de cada bloque aceptado; puede retornar las filas que rechaza como
+# [(posición en el bloque, [(variable, motivo), ...])]
+Sink = Callable[[List[Dict[str, Any]]], Optional[List[Tuple[int, list]]]]
+
+
+class Row:
+    """Fila en tránsito por el pipeline"""
+
+    __slots__ = ("line", "raw", "values")
+
+    def __init__(self, line: int, raw: Dict[str, Any]):
+        self.line = line
+        self.raw = raw
+        self.values = raw
+
+
+class StageStats:
+    """Métricas de una etapa del pipeline"""
+
+    __slots__ = ("name", "rows_in", "rows_out", "seconds")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows_in = 0
+        self.rows_out = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_in / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "seconds": round(self.seconds, 4),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+class ImportReport:
+    """Resumen de una importación"""
+
+    def __init__(self, stage_names: Iterable[str]):
+        self.stages: Dict[str, StageStats] = {name: StageStats(name) for name in stage_names}
+        self.accepted = 0
+        self.rejected = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "stages": {name: stats.as_dict() for name, stats in self.stages.items()},
+        }
+
+
+def iter_source(source: Any, fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lee registros uno a uno desde un archivo CSV/JSONL o un iterable
+
+    Args:
+        source: Ruta de archivo o iterable de diccionarios
+        fmt: "csv" o "jsonl" (por defecto según la extensión)
+
+    Returns:
+        Iterador de registros (diccionarios)
+    """
+    if not isinstance(source, str):
+        yield from source
+        return
+
+    if fmt is None:
+        fmt = "csv" if source.lower().endswith(".csv") else "jsonl"
+
+    with open(source, newline="" if fmt == "csv" else None, encoding="utf-8") as handle:
+        if fmt == "csv":
+            yield from csv.DictReader(handle)
+        elif fmt == "jsonl":
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            raise ValueError(f"Formato de importación no soportado: {fmt}")
+
+
+def iter_chunks(records: Iterable[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Row]]:
+    """Agrupa registros en bloques de a lo sumo chunk_size filas"""
+    numbered = enumerate(records, start=1)
+    while True:
+        chunk = [Row(line, raw) for line, raw in islice(numbered, chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def _sanitize_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return utils.sanitize_string(value) or None
+    if isinstance(value, list):
+        return [utils.sanitize_string(item) if isinstance(item, str) else item for item in value]
+    return value
+
+
+def _cast_array(value: Any) -> Optional[list]:
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(ARRAY_SEPARATOR) if item.strip()]
+    return value if isinstance(value, list) else None
+
+
+def _cast_boolean(value: Any) -> Optional[bool]:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return BOOLEAN_VALUES.get(value.strip().lower())
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    return None
+
+
+def _cast_choices(value: Any) -> Any:
+    # Variables con lista de valores: "Danza;Teatro" -> ["Danza", "Teatro"] (multivaluadas)
+    if isinstance(value, str) and ARRAY_SEPARATOR in value:
+        return _cast_array(value)
+    return value
+
+
+def build_caster(declared: Union[str, List[str]]) -> Callable[[Any], Any]:
+    """
+    Construye la función de conversión de una columna según su tipo declarado
+
+    Las columnas de fecha (fecha_nacimiento, update_date, fecha_autorizacion,
+    fecha_solicitud, ...) reciben su propio DateTimeParser, que fija el
+    formato detectado en la columna. Los booleanos solo aceptan BOOLEAN_VALUES
+    y las variables con lista de valores se separan por ARRAY_SEPARATOR.
+
+    Returns:
+        Función valor -> valor convertido, o None si no es convertible
+    """
+    if isinstance(declared, (list, tuple)):
+        return _cast_choices
+    if declared == "array":
+        return _cast_array
+    if declared == "boolean":
+        return _cast_boolean
+    target_type = CAST_TYPES[declared]
+    if target_type is datetime:
+        parse = utils.DateTimeParser().parse
+        as_date = declared == "date"
+
+        def cast_datetime(value):
+            if isinstance(value, str):
+                parsed = parse(value)
+            elif isinstance(value, datetime):
+                parsed = value
+            else:
+                return None
+            if as_date and parsed is not None:
+                return parsed.date()
+            return parsed
+        return cast_datetime
+    return lambda value: utils.safe_cast(value, target_type)
+
+
+class ImportPipeline:
+    """Pipeline de importación por bloques con memoria acotada"""
+
+    STAGES = ("read", "sanitize", "cast", "validate", "sink")
+
+    def __init__(self, validator: RecordValidator, variables: Mapping[str, Any],
+                 sink: Optional[Sink] = None, error_path: Optional[str] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            validator: Validador compilado del estamento o área
+            variables: Variables declaradas (nombre -> tipo) usadas para el casteo
+            sink: Función que recibe cada bloque de registros aceptados y
+                  opcionalmente retorna los que rechaza (ver Sink)
+            error_path: Archivo JSONL donde se escriben las filas rechazadas
+            chunk_size: Filas por bloque
+        """
+        self.validator = validator
+        self.variables = variables
+        self.sink = sink
+        self.error_path = error_path
+        self.chunk_size = chunk_size
+        self._casts: Tuple[Tuple[str, Callable[[Any], Any]], ...] = tuple(
+            (variable, build_caster(declared)) for variable, declared in variables.items()
+            if isinstance(declared, (list, tuple)) or declared == "array" or declared in CAST_TYPES
+        )
+
+    @classmethod
+    def for_estamento(cls, estamento: str, data_dict: Union[DataDictionary, DataDictionaryView, None] = None,
+                      **kwargs) -> "ImportPipeline":
+        """Crea un pipeline para registros de un estamento"""
+        data_dict = data_dict or get_shared_dictionary()
+        validator = compile_schema(data_dict).for_estamento(estamento)
+        return cls(validator, data_dict.get_variables_by_estamento(estamento), **kwargs)
+
+    @classmethod
+    def for_area(cls, area: str, data_dict: Union[DataDictionary, DataDictionaryView, None] = None,
+                 **kwargs) -> "ImportPipeline":
+        """Crea un pipeline para registros de un área de bienestar"""
+        data_dict = data_dict or get_shared_dictionary()
+        validator = compile_schema(data_dict).for_area(area)
+        return cls(validator, data_dict.get_variables_by_area(area), **kwargs)
+
+    # Etapas: cast y validate retornan (aceptadas, rechazadas con motivos)
+
+    def sanitize(self, chunk: List[Row]) -> List[Row]:
+        for row in chunk:
+            row.values = {key: _sanitize_value(value) for key, value in row.raw.items()}
+        return chunk
+
+    def cast(self, chunk: List[Row]) -> Tuple[List[Row], List[Tuple[Row, list]]]:
+        accepted, rejected = [], []
+        for row in chunk:
+            values = row.values
+            errors = []
+            for variable, caster in self._casts:
+                value = values.get(variable)
+                if value is None:
+                    continue
+                cast = caster(value)
+                if cast is None:
+                    errors.append((variable, INVALID_TYPE))
+                values[variable] = cast
+            if errors:
+                rejected.append((row, errors))
+            else:
+                accepted.append(row)
+        return accepted, rejected
+
+    def validate(self, chunk: List[Row]) -> Tuple[List[Row], List[Tuple[Row, list]]]:
+        accepted, rejected = [], []
+        validate = self.validator.validate
+        for row in chunk:
+            errors = validate(row.values)
+            if errors:
+                rejected.append((row, errors))
+            else:
+                accepted.append(row)
+        return accepted, rejected
+
+    def run(self, source: Any, fmt: Optional[str] = None) -> ImportReport:
+        """
+        Ejecuta la importación completa
+
+        Args:
+            source: Ruta de archivo CSV/JSONL o iterable de diccionarios
+            fmt: Formato explícito del archivo ("csv" o "jsonl")
+
+        Returns:
+            ImportReport con filas aceptadas/rechazadas y filas por segundo de cada etapa
+        """
+        report = ImportReport(self.STAGES)
+        stats = report.stages
+        clock = time.perf_counter
+        error_file = open(self.error_path, "w", encoding="utf-8") if self.error_path else None
+        try:
+            chunks = iter_chunks(iter_source(source, fmt), self.chunk_size)
+            while True:
+                start = clock()
+                chunk = next(chunks, None)
+                stats["read"].seconds += clock() - start
+                if chunk is None:
+                    break
+                stats["read"].rows_in += len(chunk)
+                stats["read"].rows_out += len(chunk)
+
+                start = clock()
+                chunk = self.sanitize(chunk)
+                self._record(stats["sanitize"], len(chunk), len(chunk), clock() - start)
+
+                for name, stage in (("cast", self.cast), ("validate", self.validate)):
+                    start = clock()
+                    accepted, rejected = stage(chunk)
+                    self._record(stats[name], len(chunk), len(accepted), clock() - start)
+                    self._write_rejected(error_file, rejected, report)
+                    chunk = accepted
+
+                start = clock()
+                rejected = None
+                if self.sink is not None and chunk:
+                    rejected = self.sink([row.values for row in chunk])
+                accepted = len(chunk) - len(rejected or ())
+                self._record(stats["sink"], len(chunk), accepted, clock() - start)
+                if rejected:
+                    self._write_rejected(error_file, [(chunk[position], errors) for position, errors in rejected],
+                                         report)
+                report.accepted += accepted
+        finally:
+            if error_file is not None:
+                error_file.close()
+
+        for stage in stats.values():
+            logger.info("Importación etapa %s: %s filas, %.0f filas/s",
+                        stage.name, stage.rows_in, stage.rows_per_second)
+        return report
+
+    @staticmethod
+    def _record(stats: StageStats, rows_in: int, rows_out: int, seconds: float) -> None:
+        stats.rows_in += rows_in
+        stats.rows_out += rows_out
+        stats.seconds += seconds
+
+    @staticmethod
+    def _write_rejected(error_file, rejected: List[Tuple[Row, list]], report: ImportReport) -> None:
+        report.rejected += len(rejected)
+        if error_file is None:
+            return
+        for row, errors in rejected:
+            error_file.write(json.dumps(
+                {"line": row.line, "record": row.raw, "errors": [list(error) for error in errors]},
+                ensure_ascii=False, default=_json_default,
+            ))
+            error_file.write("\n")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def jsonl_sink(path: str) -> Tuple[Sink, Callable[[], None]]:
+    """
+    Crea un destino que escribe los registros aceptados en un archivo JSONL
+
+    Returns:
+        (sink, close): función destino y función para cerrar el archivo
+    """
+    handle = open(path, "w", encoding="utf-8")
+
+    def sink(records: List[Dict[str, Any]]) -> None:
+        for record in records:
+            handle.write(json.dumps(record, ensure_ascii=False, default=_json_default))
+            handle.write("\n")
+
+    return sink, handle.close
@@ -0,0 +1,386 @@
+"""
+Instrumentación opcional de rutas críticas
+
+Con la instrumentación desactivada no hay ningún costo: las funciones de
+utils y los accesores del diccionario son los originales. Al activarla
+(instrument() o METRICS_ENABLED=true) se reemplazan por envoltorios que
+registran llamadas, latencia y motivos de fallo, con un costo de ~1.7 µs
+por llamada (benchmarks/bench_instrumentation.py):
+
+- Validadores escalares: fallo "invalid" cuando retornan False
+- Validadores por lotes: un fallo por cada motivo de BatchValidation.reasons
+- safe_cast: fallo "default" cuando se retorna el valor por defecto
+- Excepciones: fallo con el nombre de la clase de la excepción
+
+Las métricas se exportan en formato de texto de Prometheus y como una
+línea de log periódica (LOGGING_CONFIG). El perfilador por muestreo
+(PROFILER_ENABLED=true) guarda las pilas en formato "folded" para
+generar flame graphs.
+"""
+
+import collections
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import utils
+from config import get_config
+from models.data_dictionary import DataDictionary, DataDictionaryView
+from .metrics import LatencyHistogram
+
+# Funciones de utils y accesores del diccionario que se instrumentan
+UTILS_FUNCTIONS = (
+    "validate_document_number", "validate_email", "validate_phone_number",
+    "validate_document_numbers", "validate_emails", "validate_phone_numbers",
+    "safe_cast", "parse_datetime_column", "parse_datetime_array",
+)
+DICTIONARY_ACCESSORS = (
+    "get_variables_by_estamento", "get_variables_by_area",
+    "get_obligatory_variables", "get_all_variables",
+)
+
+logger = logging.getLogger("bienestar_upc.metrics")
+
+
+class FunctionMetrics:
+    """Histograma de latencia (incluye el conteo de llamadas) y fallos por motivo de una función"""
+
+    __slots__ = ("latency", "failures", "_lock")
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.failures: Dict[str, int] = collections.Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self) -> int:
+        return self.latency.count
+
+    def reset(self) -> None:
+        self.latency.reset()
+        with self._lock:
+            self.failures.clear()
+
+    def fail(self, reasons: Dict[str, int]) -> None:
+        with self._lock:
+            for reason, count in reasons.items():
+                self.failures[reason] += count
+
+
+class MetricsRegistry:
+    """Métricas por función instrumentada"""
+
+    def __init__(self, namespace: Optional[str] = None):
+        self.namespace = namespace or get_config("metrics").get("namespace", "bienestar_upc")
+        self.functions: Dict[str, FunctionMetrics] = {}
+        self._lock = threading.Lock()
+
+    def function(self, name: str) -> FunctionMetrics:
+        """Métricas de una función (se crean al primer uso)"""
+        metrics = self.functions.get(name)
+        if metrics is None:
+            with self._lock:
+                metrics = self.functions.setdefault(name, FunctionMetrics())
+        return metrics
+
+    def record(self, name: str, seconds: float, failures: Optional[Dict[str, int]] = None) -> None:
+        """Registra una llamada con su duración y motivos de fallo"""
+        metrics = self.function(name)
+        metrics.latency.observe(seconds)
+        if failures:
+            metrics.fail(failures)
+
+    def reset(self) -> None:
+        """Vuelve a cero las métricas (los envoltorios activos conservan su referencia)"""
+        with self._lock:
+            for metrics in self.functions.values():
+                metrics.reset()
+
+    def _items(self) -> List[Tuple[str, FunctionMetrics]]:
+        with self._lock:
+            return sorted(self.functions.items())
+
+    def to_prometheus(self) -> str:
+        """Exporta las métricas en formato de texto de Prometheus"""
+        prefix = self.namespace
+        functions = self._items()
+        lines = [
+            f"# HELP {prefix}_calls_total Llamadas a funciones instrumentadas",
+            f"# TYPE {prefix}_calls_total counter",
+        ]
+        lines.extend(f'{prefix}_calls_total{{function="{name}"}} {metrics.calls}' for name, metrics in functions)
+        lines.extend([
+            f"# HELP {prefix}_failures_total Fallos por motivo",
+            f"# TYPE {prefix}_failures_total counter",
+        ])
+        for name, metrics in functions:
+            lines.extend(f'{prefix}_failures_total{{function="{name}",reason="{reason}"}} {count}'
+                         for reason, count in sorted(metrics.failures.items()))
+        lines.extend([
+            f"# HELP {prefix}_call_duration_seconds Latencia de las funciones instrumentadas",
+            f"# TYPE {prefix}_call_duration_seconds histogram",
+        ])
+        for name, metrics in functions:
+            histogram = metrics.latency
+            cumulative = 0
+            for bound, count in zip(histogram.bounds + (float("inf"),), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{prefix}_call_duration_seconds_bucket{{function="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_call_duration_seconds_sum{{function="{name}"}} {histogram.total}')
+            lines.append(f'{prefix}_call_duration_seconds_count{{function="{name}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def summary_line(self) -> str:
+        """Resumen de una línea: llamadas, p95 y fallos por función"""
+        parts = []
+        for name, metrics in self._items():
+            if not metrics.calls:
+                continue
+            p95 = metrics.latency.percentile(0.95)
+            parts.append(f"{name} calls={metrics.calls} p95<={p95 * 1e3:g}ms "
+                         f"failures={sum(metrics.failures.values())}")
+        return "; ".join(parts) or "sin llamadas instrumentadas"
+
+
+registry = MetricsRegistry()
+
+
+def _bool_failures(result: Any, args: tuple, kwargs: dict) -> Optional[Dict[str, int]]:
+    return None if result else {"invalid": 1}
+
+
+def _batch_failures(result: Any, args: tuple, kwargs: dict) -> Optional[Dict[str, int]]:
+    reasons = [reason for reason in result.reasons if reason is not None]
+    return collections.Counter(reasons) if reasons else None
+
+
+def _cast_failures(result: Any, args: tuple, kwargs: dict) -> Optional[Dict[str, int]]:
+    default = args[2] if len(args) > 2 else kwargs.get("default")
+    value = args[0] if args else kwargs.get("value")
+    if result is default and value is not default:
+        return {"default": 1}
+    return None
+
+
+CLASSIFIERS: Dict[str, Callable[[Any, tuple, dict], Optional[Dict[str, int]]]] = {
+    "validate_document_number": _bool_failures,
+    "validate_email": _bool_failures,
+    "validate_phone_number": _bool_failures,
+    "validate_document_numbers": _batch_failures,
+    "validate_emails": _batch_failures,
+    "validate_phone_numbers": _batch_failures,
+    "safe_cast": _cast_failures,
+}
+
+
+def _wrap(function: Callable, name: str,
+          classify: Optional[Callable[[Any, tuple, dict], Optional[Dict[str, int]]]] = None) -> Callable:
+    clock = time.perf_counter
+    metrics = registry.function(name)
+    observe = metrics.latency.observe
+    fail = metrics.fail
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            result = function(*args, **kwargs)
+        except Exception as error:
+            observe(clock() - start)
+            fail({type(error).__name__: 1})
+            raise
+        observe(clock() - start)
+        if classify is not None:
+            failures = classify(result, args, kwargs)
+            if failures:
+                fail(failures)
+        return result
+
+    wrapper.__instrumented__ = function
+    return wrapper
+
+
+# Originales reemplazados: (objeto, atributo) -> valor original
+_originals: Dict[Tuple[Any, str], Any] = {}
+_instrument_lock = threading.Lock()
+
+
+def is_instrumented() -> bool:
+    return bool(_originals)
+
+
+def instrument() -> None:
+    """Reemplaza las funciones de utils y los accesores del diccionario por envoltorios"""
+    with _instrument_lock:
+        if _originals:
+            return
+        for name in UTILS_FUNCTIONS:
+            original = getattr(utils, name)
+            _originals[(utils, name)] = original
+            setattr(utils, name, _wrap(original, f"utils.{name}", CLASSIFIERS.get(name)))
+        for cls in (DataDictionary, DataDictionaryView):
+            for name in DICTIONARY_ACCESSORS:
+                original = cls.__dict__.get(name)
+                if original is None:
+                    continue
+                _originals[(cls, name)] = original
+                setattr(cls, name, _wrap(original, f"{cls.__name__}.{name}"))
+
+
+def uninstrument() -> None:
+    """Restaura las funciones originales"""
+    with _instrument_lock:
+        for (owner, name), original in _originals.items():
+            setattr(owner, name, original)
+        _originals.clear()
+
+
+def configure_logger() -> logging.Logger:
+    """
+    Logger de métricas con el nivel y formato de LOGGING_CONFIG
+
+    Si ni este logger ni el raíz tienen handlers, se agrega un archivo en
+    LOGGING_CONFIG["file_path"].
+    """
+    config = get_config("logging")
+    logger.setLevel(config.get("level", "INFO"))
+    if not logger.handlers and not logging.getLogger().handlers:
+        path = config.get("file_path")
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler: logging.Handler = logging.FileHandler(path, encoding="utf-8")
+        else:
+            handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(config.get("format")))
+        logger.addHandler(handler)
+    return logger
+
+
+class _PeriodicThread(ABC):
+    """Hilo daemon que ejecuta una tarea cada cierto intervalo hasta stop()"""
+
+    # Identificadores de estos hilos auxiliares (el perfilador no los muestrea)
+    thread_ids = set()
+
+    def __init__(self, interval: float, name: str):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+
+    def start(self) -> "_PeriodicThread":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _loop(self) -> None:
+        _PeriodicThread.thread_ids.add(threading.get_ident())
+        try:
+            while not self._stop.wait(self.interval):
+                self.tick()
+            self.finish()
+        finally:
+            _PeriodicThread.thread_ids.discard(threading.get_ident())
+
+    @abstractmethod
+    def tick(self) -> None:
+        """Tarea de cada intervalo"""
+
+    def finish(self) -> None:
+        """Se ejecuta una vez al detenerse"""
+
+
+class MetricsLogger(_PeriodicThread):
+    """Escribe el resumen de métricas en el log cada `interval` segundos"""
+
+    def __init__(self, interval: Optional[float] = None, metrics: Optional[MetricsRegistry] = None):
+        super().__init__(interval or get_config("metrics").get("log_interval_seconds", 60), "metrics-logger")
+        self.metrics = metrics or registry
+        self.logger = configure_logger()
+
+    def tick(self) -> None:
+        self.logger.info("metrics %s", self.metrics.summary_line())
+
+    def finish(self) -> None:
+        # Última línea al detenerse, para no perder el intervalo en curso
+        self.tick()
+
+
+class SamplingProfiler(_PeriodicThread):
+    """
+    Perfilador por muestreo de pilas de todos los hilos
+
+    Cada intervalo toma sys._current_frames() y cuenta las pilas en formato
+    "folded" (marco;marco;marco cantidad), compatible con flamegraph.pl y
+    speedscope. Al detenerse escribe el archivo de salida.
+    """
+
+    def __init__(self, interval_ms: Optional[float] = None, output: Optional[str] = None, max_depth: int = 64):
+        config = get_config("metrics")
+        super().__init__((interval_ms or config.get("profiler_interval_ms", 10)) / 1000, "sampling-profiler")
+        self.output = output or config.get("profiler_output")
+        self.max_depth = max_depth
+        self.samples: Dict[str, int] = collections.Counter()
+
+    def tick(self) -> None:
+        helpers = _PeriodicThread.thread_ids
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id in helpers:
+                continue
+            stack: List[str] = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def finish(self) -> None:
+        if not self.output or not self.samples:
+            return
+        directory = os.path.dirname(self.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.output, "w", encoding="utf-8") as handle:
+            handle.write(self.folded())
+
+
+_active: Dict[str, _PeriodicThread] = {}
+
+
+def configure_from_env() -> Dict[str, bool]:
+    """
+    Activa la instrumentación y el perfilador según METRICS_CONFIG (variables de entorno)
+
+    Returns:
+        {"metrics": activada, "profiler": activado}
+    """
+    config = get_config("metrics")
+    if config.get("enabled"):
+        instrument()
+        if "logger" not in _active:
+            _active["logger"] = MetricsLogger().start()
+    if config.get("profiler_enabled") and "profiler" not in _active:
+        _active["profiler"] = SamplingProfiler().start()
+    return {"metrics": is_instrumented(), "profiler": "profiler" in _active}
+
+
+def shutdown() -> None:
+    """Detiene el log periódico y el perfilador (escribe su salida) y restaura las funciones"""
+    for thread in _active.values():
+        thread.stop()
+    _active.clear()
+    uninstrument()
@@ -0,0 +1,327 @@
+"""
+Enmascaramiento y seudonimización por flujo de los datos sensibles
+
+La política se compila a partir de get_sensitive_variables() del
+diccionario y se aplica por columnas a cada lote (no campo por campo en
+cada registro):
+
+- Seudónimo con clave (BLAKE2b con clave) para la llave de la persona
+  (numero_documento): el mismo documento produce siempre el mismo
+  seudónimo, por lo que los lotes y exportaciones siguen siendo cruzables.
+- Supresión de los demás identificadores directos y de los datos
+  sensibles de texto libre o listas (ej. reportes_discriminacion).
+- Celdas pequeñas en los datos sensibles categóricos (sexo_biologico,
+  identidad_genero, ...): solo se conservan para quien autorizó su manejo
+  y no solicitó confidencialidad, y los valores con menos de N personas en
+  el lote se agrupan en SMALL_CELL_VALUE (o se suprimen si el grupo
+  también es pequeño). En las variables de selección múltiple (ej.
+  poblacion_diferencial) cada valor de la lista se cuenta y se agrupa por
+  separado.
+"""
+
+import hashlib
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from config import get_config
+from models.data_dictionary import DataDictionary, DataDictionaryView, get_shared_dictionary
+
+ACTION_PSEUDONYM = "pseudonym"
+ACTION_SUPPRESS = "suppress"
+ACTION_SMALL_CELL = "small_cell"
+ACTIONS = (ACTION_PSEUDONYM, ACTION_SUPPRESS, ACTION_SMALL_CELL)
+
+# Valor que reemplaza a las categorías con pocas personas
+SMALL_CELL_VALUE = "Otra (agrupada)"
+
+_TRUE_TEXT = frozenset({"true", "1", "si", "sí", "t", "yes"})
+
+_MULTIPLE = (list, tuple, set, frozenset)
+
+Column = List[Any]
+ColumnTransform = Callable[[Column, List[bool]], Column]
+
+
+class MaskingError(ValueError):
+    """Política de enmascaramiento inválida o incompleta"""
+
+
+class MaskingPolicy(NamedTuple):
+    """Acción por columna y variables que habilitan los datos sensibles"""
+    actions: Mapping[str, str]
+    authorization: str
+    confidentiality: str
+    threshold: int
+
+
+def _flag(value: Any) -> bool:
+    """Interpreta booleanos almacenados como bool, 0/1 o texto"""
+    if value is True or value is False:
+        return value
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE_TEXT
+    return value == 1
+
+
+def _variable_types(data_dict: Union[DataDictionary, DataDictionaryView]) -> Dict[str, Any]:
+    declared: Dict[str, Any] = dict(data_dict.identificacion_variables)
+    for group in (data_dict.estamentos_variables, data_dict.areas_bienestar_variables):
+        for variables in group.values():
+            for name, kind in variables.items():
+                declared.setdefault(name, kind)
+    return declared
+
+
+def compile_policy(data_dict: Union[DataDictionary, DataDictionaryView, None] = None,
+                   keep: Iterable[str] = (), threshold: Optional[int] = None,
+                   overrides: Optional[Mapping[str, str]] = None) -> MaskingPolicy:
+    """
+    Deriva la política de enmascaramiento del diccionario de datos
+
+    Args:
+        data_dict: Diccionario de datos (por defecto la instancia compartida)
+        keep: Identificadores directos que el consumidor necesita en claro
+              (ej. ("nombres", "apellidos") para listados de inscripción)
+        threshold: Mínimo de personas por categoría (por defecto el de la configuración)
+        overrides: Acciones adicionales o distintas por columna
+
+    Returns:
+        Política con una acción por columna
+
+    Raises:
+        MaskingError: Si una acción no existe o un dato sensible queda en claro
+    """
+    data_dict = data_dict or get_shared_dictionary()
+    sensitive = data_dict.get_sensitive_variables()
+    declared = _variable_types(data_dict)
+    keep = set(keep)
+    protected = set(sensitive["datos_sensibles"])
+    if keep & protected:
+        raise MaskingError(f"Los datos sensibles no se pueden exportar en claro: {sorted(keep & protected)}")
+
+    actions: Dict[str, str] = {}
+    identifiers = sensitive["identificadores_directos"]
+    for position, name in enumerate(identifiers):
+        if name in keep:
+            continue
+        # El primero (numero_documento) es la llave: se seudonimiza para poder cruzar lotes
+        actions[name] = ACTION_PSEUDONYM if position == 0 else ACTION_SUPPRESS
+    for name in sensitive["datos_sensibles"]:
+        categorical = isinstance(declared.get(name), (list, tuple))
+        actions[name] = ACTION_SMALL_CELL if categorical else ACTION_SUPPRESS
+    for name, action in (overrides or {}).items():
+        if action not in ACTIONS:
+            raise MaskingError(f"Acción de enmascaramiento desconocida para {name}: {action}")
+        actions[name] = action
+
+    if threshold is None:
+        threshold = get_config("privacy").get("small_cell_threshold", 5)
+    return MaskingPolicy(actions, sensitive["autorizacion"], sensitive["confidencialidad"], max(1, int(threshold)))
+
+
+def pseudonymizer(key: Union[str, bytes], length: Optional[int] = None) -> Callable[[Any], str]:
+    """
+    Función de seudónimo con clave: BLAKE2b en modo con clave (un MAC, como
+    HMAC) de `length` caracteres hexadecimales
+
+    El estado inicial con la clave se calcula una sola vez y se copia por
+    valor (más rápido que hmac.new/copy, que se ejecutan en Python).
+    """
+    if not key:
+        raise MaskingError("Los seudónimos requieren una clave (PSEUDONYM_KEY)")
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    if len(key) > hashlib.blake2b.MAX_KEY_SIZE:
+        key = hashlib.sha512(key).digest()
+    length = length or get_config("privacy").get("pseudonym_length", 16)
+    keyed = hashlib.blake2b(key=key, digest_size=(length + 1) // 2)
+
+    def pseudonym(value: Any) -> str:
+        digest = keyed.copy()
+        digest.update(str(value).encode("utf-8"))
+        return digest.hexdigest()[:length]
+
+    return pseudonym
+
+
+def _pseudonym_transform(pseudonym: Callable[[Any], str]) -> ColumnTransform:
+    def transform(values: Column, allowed: List[bool]) -> Column:
+        # Un cálculo por valor distinto del lote; las listas se seudonimizan valor por valor
+        distinct = set()
+        for value in values:
+            if isinstance(value, _MULTIPLE):
+                distinct.update(value)
+            elif value is not None:
+                distinct.add(value)
+        table = {value: pseudonym(value) for value in distinct if value is not None}
+        table[None] = None
+        return [[table[item] for item in value] if isinstance(value, _MULTIPLE) else table[value]
+                for value in values]
+    return transform
+
+
+def _small_cell_transform(threshold: int) -> ColumnTransform:
+    def transform(values: Column, allowed: List[bool]) -> Column:
+        gated = [value if ok else None for value, ok in zip(values, allowed)]
+        counts: Counter = Counter()
+        multiple = False
+        for value in gated:
+            if isinstance(value, _MULTIPLE):
+                # Cada persona cuenta una vez por valor seleccionado
+                counts.update(set(value))
+                multiple = True
+            elif value is not None:
+                counts[value] += 1
+        counts.pop(None, None)
+        small = {value for value, count in counts.items() if count < threshold}
+        if not small:
+            return gated
+        if not multiple:
+            # Si el grupo de categorías pequeñas también es pequeño, se suprime
+            grouped = sum(counts[value] for value in small)
+            replacement = SMALL_CELL_VALUE if grouped >= threshold else None
+            return [replacement if value in small else value for value in gated]
+        grouped = sum(1 for value in gated
+                      if (any(item in small for item in value) if isinstance(value, _MULTIPLE) else value in small))
+        replacement = SMALL_CELL_VALUE if grouped >= threshold else None
+        masked: Column = []
+        for value in gated:
+            if not isinstance(value, _MULTIPLE):
+                masked.append(replacement if value in small else value)
+            elif not any(item in small for item in value):
+                masked.append(value)
+            else:
+                items: List[Any] = []
+                for item in value:
+                    item = replacement if item in small else item
+                    if item is not None and item not in items:
+                        items.append(item)
+                masked.append(items or None)
+        return masked
+    return transform
+
+
+class MaskingStage:
+    """
+    Etapa de enmascaramiento aplicable a lotes de registros o de columnas
+
+    Los registros de entrada no se modifican: cada lote produce registros
+    nuevos sin las columnas suprimidas.
+    """
+
+    def __init__(self, policy: Optional[MaskingPolicy] = None, key: Union[str, bytes, None] = None):
+        """
+        Args:
+            policy: Política compilada (por defecto compile_policy())
+            key: Clave de los seudónimos (por defecto PSEUDONYM_KEY de la configuración)
+        """
+        self.policy = policy or compile_policy()
+        transforms: List[Tuple[str, ColumnTransform]] = []
+        suppressed: List[str] = []
+        pseudonym = None
+        for column, action in self.policy.actions.items():
+            if action == ACTION_SUPPRESS:
+                suppressed.append(column)
+            elif action == ACTION_PSEUDONYM:
+                if pseudonym is None:
+                    pseudonym = _pseudonym_transform(
+                        pseudonymizer(key if key is not None else get_config("privacy").get("pseudonym_key")))
+                transforms.append((column, pseudonym))
+            else:
+                transforms.append((column, _small_cell_transform(self.policy.threshold)))
+        self.suppressed = tuple(suppressed)
+        self._transforms = transforms
+
+    def _allowed(self, authorization: Column, confidentiality: Column) -> List[bool]:
+        """Por registro: autorizó el manejo de datos sensibles y no pidió confidencialidad"""
+        return [_flag(granted) and not _flag(private) for granted, private in zip(authorization, confidentiality)]
+
+    def mask_columns(self, columns: Mapping[str, Column]) -> Dict[str, Column]:
+        """
+        Enmascara un lote columnar ({columna: [valores]})
+
+        Returns:
+            Columnas nuevas; las suprimidas no se incluyen
+        """
+        size = len(next(iter(columns.values()), ()))
+        missing = [None] * size
+        allowed = self._allowed(columns.get(self.policy.authorization, missing),
+                                columns.get(self.policy.confidentiality, missing))
+        masked = {name: values for name, values in columns.items() if name not in self.suppressed}
+        for column, transform in self._transforms:
+            values = masked.get(column)
+            if values is not None:
+                masked[column] = transform(values, allowed)
+        return masked
+
+    def mask_records(self, records: List[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Enmascara un lote de registros
+
+        Returns:
+            Registros nuevos; los valores suprimidos no aparecen en ellos
+        """
+        masked = [dict(record) for record in records]
+        for column in self.suppressed:
+            for record in masked:
+                record.pop(column, None)
+        allowed = self._allowed([record.get(self.policy.authorization) for record in records],
+                                [record.get(self.policy.confidentiality) for record in records])
+        for column, transform in self._transforms:
+            values = [record.get(column) for record in masked]
+            for record, old, new in zip(masked, values, transform(values, allowed)):
+                if new is old:
+                    continue
+                if new is None:
+                    del record[column]
+                else:
+                    record[column] = new
+        return masked
+
+    __call__ = mask_records
+
+    def stream(self, batches: Iterable[List[Mapping[str, Any]]]) -> Iterator[List[Dict[str, Any]]]:
+        """Enmascara una secuencia de lotes a medida que se consumen"""
+        for batch in batches:
+            yield self.mask_records(batch)
+
+    def wrap(self, writer: Callable[[List[Dict[str, Any]]], None]) -> Callable[[List[Mapping[str, Any]]], None]:
+        """Destino que enmascara cada lote antes de entregarlo a `writer`"""
+        def masked_writer(records: List[Mapping[str, Any]]) -> None:
+            writer(self.mask_records(records))
+        return masked_writer
+
+    def output_columns(self, columns: Iterable[str]) -> List[str]:
+        """Columnas que sobreviven al enmascaramiento, en el mismo orden"""
+        return [column for column in columns if column not in self.suppressed]
+
+
+def suppress_small_cells(counts: Mapping[Any, Any], threshold: Optional[int] = None) -> Dict[Any, Any]:
+    """
+    Aplica el umbral de celdas pequeñas a un conteo o tabla cruzada de reporte
+
+    Acepta la salida de AggregationEngine.group_by ({valor: conteo}) o de
+    crosstab ({fila: {columna: conteo}}). Los conteos menores al umbral se
+    agrupan en SMALL_CELL_VALUE; si el grupo también es menor, se omite.
+
+    Args:
+        counts: Conteos por valor (o por fila y columna)
+        threshold: Mínimo de personas por celda (por defecto el de la configuración)
+
+    Returns:
+        Conteos nuevos sin celdas pequeñas
+    """
+    if threshold is None:
+        threshold = get_config("privacy").get("small_cell_threshold", 5)
+    result: Dict[Any, Any] = {}
+    grouped = 0
+    for value, count in counts.items():
+        if isinstance(count, Mapping):
+            result[value] = suppress_small_cells(count, threshold)
+        elif count >= threshold or count == 0:
+            result[value] = count
+        else:
+            grouped += count
+    if grouped >= threshold:
+        result[SMALL_CELL_VALUE] = result.get(SMALL_CELL_VALUE, 0) + grouped
+    return result
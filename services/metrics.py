@@ -0,0 +1,73 @@
+"""
+Métricas de latencia compartidas por los servicios
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Optional, Sequence
+
+# Límites superiores de los buckets en segundos (escala aproximadamente logarítmica)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0,
+)
+
+
+class LatencyHistogram:
+    """Histograma de latencias con buckets fijos (seguro entre hilos)"""
+
+    __slots__ = ("bounds", "counts", "count", "total", "_lock")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)  # El último es +Inf
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """Registra una observación"""
+        position = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[position] += 1
+            self.count += 1
+            self.total += seconds
+
+    def reset(self) -> None:
+        """Vuelve a cero todos los buckets"""
+        with self._lock:
+            self.counts = [0] * (len(self.bounds) + 1)
+            self.count = 0
+            self.total = 0.0
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Estima un percentil (límite superior del bucket que lo contiene)
+
+        Args:
+            fraction: Fracción entre 0 y 1 (ej. 0.95)
+        """
+        if not self.count:
+            return None
+        target = fraction * self.count
+        cumulative = 0
+        for position, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return self.bounds[position] if position < len(self.bounds) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, object]:
+        """Resumen serializable del histograma"""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": dict(zip([str(bound) for bound in self.bounds] + ["+Inf"], self.counts)),
+        }
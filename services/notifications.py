@@ -0,0 +1,534 @@
+"""
+Despacho de notificaciones por correo con conexiones SMTP persistentes
+
+Configurado desde get_config("external")["email_service"]. Los mensajes
+(respuestas de PQRS, confirmaciones de actividades, avisos de veto) se
+agrupan en lotes; cada lote se envía por una conexión del pool, sin abrir
+una conexión (ni repetir STARTTLS y login) por mensaje. Varios lotes se
+envían en paralelo, uno por conexión.
+
+- Límite de envío: cubeta de fichas compartida (mensajes por segundo).
+- Reintentos con espera exponencial para errores transitorios (códigos
+  4xx, desconexiones); los errores permanentes (5xx) no se reintentan.
+- Plantillas compiladas una sola vez por plantilla (string.Template).
+- LocalSMTPServer: servidor SMTP mínimo en memoria para desarrollo y pruebas.
+"""
+
+import base64
+import binascii
+import functools
+import itertools
+import queue
+import random
+import smtplib
+import socketserver
+import ssl
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from email.utils import formatdate, make_msgid
+from string import Template
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+from config import get_config
+
+# Plantillas incluidas: (asunto, cuerpo) con variables $nombre
+DEFAULT_TEMPLATES = {
+    "pqrs_respuesta": (
+        "Respuesta a su $tipo_solicitud",
+        "Hola $nombre,\n\n"
+        "Su solicitud radicada el $fecha_solicitud fue respondida:\n\n"
+        "$respuesta\n\n"
+        "Bienestar Universitario UPC\n",
+    ),
+    "confirmacion_actividad": (
+        "Inscripción confirmada: $actividad",
+        "Hola $nombre,\n\n"
+        "Su inscripción en $actividad ($area) quedó confirmada. "
+        "Horario: $horario.\n\n"
+        "Bienestar Universitario UPC\n",
+    ),
+    "aviso_veto": (
+        "Aviso de seguimiento académico - $area",
+        "Hola $nombre,\n\n"
+        "Su participación en $area queda suspendida porque su promedio ($promedio) "
+        "está por debajo del mínimo requerido ($promedio_minimo). "
+        "Puede acercarse a Bienestar Universitario para recibir acompañamiento.\n\n"
+        "Bienestar Universitario UPC\n",
+    ),
+}
+
+
+class NotificationError(Exception):
+    """Error de configuración o de plantilla de una notificación"""
+
+
+class Notification(NamedTuple):
+    """Mensaje a enviar: destinatario, plantilla y variables de la plantilla"""
+    recipient: str
+    template: str
+    context: Mapping[str, Any]
+
+
+class DispatchReport(NamedTuple):
+    sent: int
+    failed: List[Tuple[str, str]]  # (destinatario, error)
+    retries: int
+    batches: int
+    connections_opened: int
+    seconds: float
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.sent / self.seconds if self.seconds else 0.0
+
+
+@functools.lru_cache(maxsize=1024)
+def encode_header(value: str) -> str:
+    """
+    Codifica un encabezado no ASCII como palabras codificadas RFC 2047 (UTF-8, base64)
+
+    Se cachea por valor: los asuntos se repiten entre los mensajes de una
+    misma plantilla (email.header.Header cuesta ~100 µs por mensaje).
+    """
+    if value.isascii():
+        return value
+    words, chunk = [], b""
+    for char in value:
+        encoded = char.encode("utf-8")
+        if len(chunk) + len(encoded) > 45:  # 45 bytes -> 60 en base64: palabra de menos de 75 caracteres
+            words.append(chunk)
+            chunk = b""
+        chunk += encoded
+    words.append(chunk)
+    return "\r\n ".join(f"=?utf-8?b?{base64.b64encode(word).decode('ascii')}?=" for word in words)
+
+
+class TemplateRegistry:
+    """Plantillas de notificación compiladas una sola vez por plantilla"""
+
+    def __init__(self, templates: Optional[Mapping[str, Tuple[str, str]]] = None):
+        self._compiled: Dict[str, Tuple[Template, Template]] = {}
+        for name, (subject, body) in (templates if templates is not None else DEFAULT_TEMPLATES).items():
+            self.register(name, subject, body)
+
+    def register(self, name: str, subject: str, body: str) -> None:
+        """Registra (o reemplaza) una plantilla"""
+        self._compiled[name] = (Template(subject), Template(body))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._compiled
+
+    def render(self, name: str, context: Mapping[str, Any]) -> Tuple[str, str]:
+        """
+        Genera el asunto y el cuerpo de una plantilla
+
+        Raises:
+            NotificationError: Si la plantilla no existe o falta una variable
+        """
+        try:
+            subject, body = self._compiled[name]
+        except KeyError:
+            raise NotificationError(f"Plantilla de notificación desconocida: {name}") from None
+        try:
+            return subject.substitute(context), body.substitute(context)
+        except KeyError as error:
+            raise NotificationError(f"Falta la variable {error.args[0]} en la plantilla {name}") from None
+
+
+class RateLimiter:
+    """Cubeta de fichas compartida entre hilos (rate mensajes por segundo)"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Args:
+            rate: Mensajes por segundo (0 o menos = sin límite)
+            burst: Mensajes que se pueden enviar seguidos (por defecto un segundo de envío)
+        """
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Espera hasta que haya una ficha disponible"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+class SMTPConnectionPool:
+    """Pool de conexiones SMTP persistentes (STARTTLS y login una vez por conexión)"""
+
+    def __init__(self, config: Optional[Mapping[str, Any]] = None,
+                 factory: Callable[..., smtplib.SMTP] = smtplib.SMTP):
+        """
+        Args:
+            config: Configuración de correo (por defecto get_config("external")["email_service"])
+            factory: Clase de conexión (smtplib.SMTP; smtplib.SMTP_SSL para el puerto 465)
+        """
+        self.config = dict(config if config is not None else get_config("external").get("email_service", {}))
+        if not self.config.get("smtp_server"):
+            raise NotificationError("No hay servidor SMTP configurado (SMTP_SERVER)")
+        self.size = int(self.config.get("pool_size", 4))
+        self.factory = factory
+        self.opened = 0
+        self._idle: "queue.LifoQueue" = queue.LifoQueue(maxsize=self.size)
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> smtplib.SMTP:
+        config = self.config
+        connection = self.factory(config["smtp_server"], int(config.get("smtp_port", 587)),
+                                  timeout=float(config.get("timeout_seconds", 30)))
+        try:
+            if config.get("use_tls") and self.factory is smtplib.SMTP:
+                connection.starttls(context=ssl.create_default_context())
+            if config.get("username"):
+                connection.login(config["username"], config.get("password", ""))
+        except Exception:
+            connection.close()
+            raise
+        self.opened += 1
+        return connection
+
+    def acquire(self, timeout: Optional[float] = None) -> smtplib.SMTP:
+        """Obtiene una conexión libre (o abre una si el pool no está lleno)"""
+        if self._closed:
+            raise NotificationError("El pool de conexiones SMTP está cerrado")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._created -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise NotificationError("No hay conexiones SMTP disponibles en el pool") from None
+
+    def release(self, connection: smtplib.SMTP) -> None:
+        """Devuelve una conexión al pool"""
+        if self._closed:
+            self.discard(connection)
+            return
+        self._idle.put_nowait(connection)
+
+    def discard(self, connection: smtplib.SMTP) -> None:
+        """Descarta una conexión dañada; la siguiente solicitud abre otra"""
+        try:
+            connection.close()
+        finally:
+            with self._lock:
+                self._created -= 1
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[smtplib.SMTP]:
+        """Contexto que presta una conexión y la devuelve al pool"""
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self) -> None:
+        """Cierra (QUIT) todas las conexiones libres"""
+        self._closed = True
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                connection.quit()
+            except (smtplib.SMTPException, OSError):
+                connection.close()
+
+
+def is_transient(error: Exception) -> bool:
+    """Errores que vale la pena reintentar: códigos 4xx, desconexiones y errores de red"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError))
+
+
+def _breaks_connection(error: Exception) -> bool:
+    """Errores tras los cuales la conexión no se puede reutilizar"""
+    return not isinstance(error, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused))
+
+
+class NotificationDispatcher:
+    """Envío masivo de notificaciones por lotes sobre conexiones SMTP persistentes"""
+
+    def __init__(self, pool: Optional[SMTPConnectionPool] = None,
+                 templates: Optional[TemplateRegistry] = None,
+                 config: Optional[Mapping[str, Any]] = None):
+        """
+        Args:
+            pool: Pool de conexiones SMTP (por defecto con la configuración de correo)
+            templates: Plantillas (por defecto DEFAULT_TEMPLATES)
+            config: Configuración de correo (por defecto la del pool)
+        """
+        self.pool = pool or SMTPConnectionPool(config)
+        self.config = dict(config if config is not None else self.pool.config)
+        self.templates = templates or TemplateRegistry()
+        self.sender = self.config.get("sender", "bienestar@upc.edu.co")
+        self._domain = self.sender.rpartition("@")[2] or None
+        self.batch_size = max(1, int(self.config.get("batch_size", 100)))
+        self.max_retries = int(self.config.get("max_retries", 3))
+        self.backoff = float(self.config.get("retry_backoff_seconds", 1.0))
+        self.rate_limiter = RateLimiter(float(self.config.get("rate_limit_per_second", 0)))
+        self.sleep = time.sleep
+
+    def build_message(self, notification: Notification) -> bytes:
+        """
+        Genera el mensaje MIME (texto plano UTF-8, quoted-printable) de una notificación
+
+        Se arma directamente en bytes: EmailMessage cuesta más de 1 ms por
+        mensaje y sería el cuello de botella del envío masivo. sendmail envía
+        los bytes tal cual, así que todos los saltos de línea (incluidos los
+        cortes suaves "=" de quoted-printable) van como CRLF (RFC 5321).
+        """
+        recipient = notification.recipient
+        if "\r" in recipient or "\n" in recipient:
+            raise NotificationError(f"Destinatario inválido: {recipient!r}")
+        subject, body = self.templates.render(notification.template, notification.context)
+        headers = (
+            f"From: {self.sender}\r\n"
+            f"To: {recipient}\r\n"
+            f"Subject: {encode_header(subject)}\r\n"
+            f"Date: {formatdate(localtime=True)}\r\n"
+            f"Message-ID: {make_msgid(domain=self._domain)}\r\n"
+            "MIME-Version: 1.0\r\n"
+            'Content-Type: text/plain; charset="utf-8"\r\n'
+            "Content-Transfer-Encoding: quoted-printable\r\n\r\n"
+        )
+        body = body.replace("\r\n", "\n").replace("\r", "\n")
+        encoded = binascii.b2a_qp(body.encode("utf-8"), istext=True).replace(b"\n", b"\r\n")
+        return headers.encode("utf-8") + encoded
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Espera exponencial con variación aleatoria (evita reintentos sincronizados)"""
+        return self.backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+    def _send_batch(self, batch: List[Notification]) -> Tuple[int, List[Tuple[str, str]], int]:
+        """Envía un lote por una conexión del pool; retorna (enviados, fallidos, reintentos)"""
+        sent = retries = 0
+        failed: List[Tuple[str, str]] = []
+        connection = None
+        try:
+            for notification in batch:
+                try:
+                    data = self.build_message(notification)
+                except NotificationError as error:
+                    failed.append((notification.recipient, str(error)))
+                    continue
+                self.rate_limiter.acquire()
+                attempt = 0
+                while True:
+                    try:
+                        if connection is None:
+                            connection = self.pool.acquire()
+                        connection.sendmail(self.sender, [notification.recipient], data)
+                        sent += 1
+                        break
+                    except (smtplib.SMTPException, OSError) as error:
+                        if connection is not None and _breaks_connection(error):
+                            self.pool.discard(connection)
+                            connection = None
+                        attempt += 1
+                        if not is_transient(error) or attempt > self.max_retries:
+                            failed.append((notification.recipient, f"{type(error).__name__}: {error}"))
+                            break
+                        retries += 1
+                        self.sleep(self._retry_delay(attempt))
+        finally:
+            if connection is not None:
+                self.pool.release(connection)
+        return sent, failed, retries
+
+    def send(self, notification: Notification) -> DispatchReport:
+        """Envía una sola notificación (con reintentos)"""
+        return self.send_many([notification])
+
+    def send_many(self, notifications: Iterable[Notification]) -> DispatchReport:
+        """
+        Envía notificaciones en lotes, un lote por conexión y varios en paralelo
+
+        Las notificaciones se consumen a medida que se envían (se admite un
+        generador sobre toda la población estudiantil).
+
+        Args:
+            notifications: Notificaciones a enviar
+
+        Returns:
+            Resumen del envío (enviados, fallidos con su error, reintentos)
+        """
+        start = time.perf_counter()
+        opened_before = self.pool.opened
+        iterator = iter(notifications)
+        batches = iter(lambda: list(itertools.islice(iterator, self.batch_size)), [])
+        sent = retries = batch_count = 0
+        failed: List[Tuple[str, str]] = []
+        in_flight = set()
+        with ThreadPoolExecutor(max_workers=self.pool.size, thread_name_prefix="smtp") as executor:
+            for batch in batches:
+                batch_count += 1
+                in_flight.add(executor.submit(self._send_batch, batch))
+                if len(in_flight) >= 2 * self.pool.size:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        batch_sent, batch_failed, batch_retries = future.result()
+                        sent += batch_sent
+                        retries += batch_retries
+                        failed.extend(batch_failed)
+            for future in in_flight:
+                batch_sent, batch_failed, batch_retries = future.result()
+                sent += batch_sent
+                retries += batch_retries
+                failed.extend(batch_failed)
+        return DispatchReport(sent, failed, retries, batch_count, self.pool.opened - opened_before,
+                              time.perf_counter() - start)
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Sesión SMTP mínima: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def reply(self, line: str) -> None:
+        delay = self.server.delay
+        if delay:
+            time.sleep(delay)
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self) -> None:
+        server = self.server
+        sender, recipients = None, []
+        self.reply("220 localhost SMTP local de BienestarUPC")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.reply("250-localhost\r\n250 8BITMIME")
+            elif command == b"HELO":
+                self.reply("250 localhost")
+            elif command == b"MAIL":
+                sender, recipients = line[10:].strip().decode("utf-8", "replace"), []
+                if server.should_fail():
+                    self.reply("451 4.3.0 Falla temporal simulada")
+                else:
+                    self.reply("250 OK")
+            elif command == b"RCPT":
+                recipients.append(line[8:].strip().decode("utf-8", "replace"))
+                self.reply("250 OK")
+            elif command == b"DATA":
+                self.reply("354 Fin con <CRLF>.<CRLF>")
+                chunks, bare_lf = [], False
+                for data_line in self.rfile:
+                    if data_line == b".\r\n":
+                        break
+                    bare_lf = bare_lf or not data_line.endswith(b"\r\n")
+                    chunks.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+                if bare_lf:
+                    # Como Postfix/Exchange: LF sin CR viola RFC 5321
+                    self.reply("550 5.5.2 Salto de linea LF sin CR")
+                    continue
+                server.store(sender, recipients, b"".join(chunks))
+                self.reply("250 OK")
+            elif command in (b"RSET", b"NOOP"):
+                if command == b"RSET":
+                    sender, recipients = None, []
+                self.reply("250 OK")
+            elif command == b"QUIT":
+                self.reply("221 Adios")
+                return
+            else:
+                self.reply("502 Comando no implementado")
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """
+    Servidor SMTP local en memoria para desarrollo, pruebas y benchmarks
+
+    Guarda los mensajes recibidos en `messages` como (remitente,
+    destinatarios, datos). Con fail_every=N responde 451 (falla temporal) a
+    cada N-ésimo MAIL FROM; con delay agrega una espera por respuesta para
+    simular la latencia de un servidor remoto. Como los servidores reales,
+    rechaza con 550 los mensajes con saltos de línea LF sin CR.
+
+    Uso:
+        with LocalSMTPServer() as server:
+            config = {**email_config, **server.config}
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, fail_every: int = 0, delay: float = 0.0):
+        super().__init__((host, port), _SMTPHandler)
+        self.fail_every = fail_every
+        self.delay = delay
+        self.messages: List[Tuple[str, List[str], bytes]] = []
+        self.connections = 0
+        self._mail_commands = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Configuración de correo para conectarse a este servidor"""
+        host, port = self.server_address[:2]
+        return {"smtp_server": host, "smtp_port": port, "use_tls": False, "username": ""}
+
+    def process_request(self, request, client_address) -> None:
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            self._mail_commands += 1
+            return bool(self.fail_every) and self._mail_commands % self.fail_every == 0
+
+    def store(self, sender: str, recipients: List[str], data: bytes) -> None:
+        with self._lock:
+            self.messages.append((sender, recipients, data))
+
+    def start(self) -> "LocalSMTPServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="smtp-local", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "LocalSMTPServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
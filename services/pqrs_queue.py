@@ -0,0 +1,187 @@
+"""
+Cola asíncrona de atención de PQRS con planificación por vencimiento (SLA)
+
+Las solicitudes se ordenan por fecha límite de respuesta (fecha_solicitud +
+plazo del tipo_solicitud) y, con el mismo vencimiento, por prioridad del
+tipo. Un número fijo de trabajadores atiende la cola (concurrencia acotada)
+y la recepción se bloquea cuando la cola está llena (contrapresión).
+Se registra un histograma de latencia por estado de la solicitud.
+"""
+
+import asyncio
+import itertools
+import time
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, MutableMapping, Optional, Tuple
+
+from config import get_config
+from .metrics import LatencyHistogram
+
+# Estados de estado_pqrs manejados por la cola
+ESTADO_RADICADA = "Radicada"
+ESTADO_EN_PROCESO = "En proceso"
+ESTADO_RESPONDIDA = "Respondida"
+ESTADO_ERROR = "Con error"
+
+Handler = Callable[[MutableMapping[str, Any]], Awaitable[Optional[str]]]
+
+
+def normalize_tipo(tipo_solicitud: Optional[str]) -> str:
+    """Normaliza el tipo de solicitud: minúsculas y sin tildes ("Petición" -> "peticion")"""
+    if not tipo_solicitud:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", tipo_solicitud.strip().lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class SLAPolicy:
+    """Calcula vencimientos y llaves de prioridad a partir de PQRS_CONFIG"""
+
+    def __init__(self, config: Optional[Mapping[str, Any]] = None):
+        config = config if config is not None else get_config("pqrs")
+        self.sla = {tipo: timedelta(hours=hours) for tipo, hours in config.get("sla_hours", {}).items()}
+        self.default_sla = timedelta(hours=config.get("default_sla_hours", 15 * 24))
+        self.type_priority = dict(config.get("type_priority", {}))
+        self.lowest_priority = max(self.type_priority.values(), default=0) + 1
+
+    def deadline(self, pqrs: Mapping[str, Any]) -> datetime:
+        """Fecha límite de respuesta de una solicitud"""
+        requested = pqrs.get("fecha_solicitud")
+        if not isinstance(requested, datetime):
+            requested = datetime.now()
+        return requested + self.sla.get(normalize_tipo(pqrs.get("tipo_solicitud")), self.default_sla)
+
+    def priority_key(self, pqrs: Mapping[str, Any]) -> Tuple[float, int]:
+        """Llave de orden: (vencimiento en segundos epoch, prioridad del tipo)"""
+        rank = self.type_priority.get(normalize_tipo(pqrs.get("tipo_solicitud")), self.lowest_priority)
+        return (self.deadline(pqrs).timestamp(), rank)
+
+
+class PQRSQueue:
+    """Recepción y atención asíncrona de PQRS"""
+
+    def __init__(self, handler: Handler, policy: Optional[SLAPolicy] = None,
+                 max_concurrency: Optional[int] = None, maxsize: Optional[int] = None):
+        """
+        Args:
+            handler: Corrutina que atiende una PQRS; puede retornar el nuevo estado_pqrs
+            policy: Política de vencimientos (por defecto según get_config("pqrs"))
+            max_concurrency: Trabajadores simultáneos
+            maxsize: Tamaño máximo de la cola antes de aplicar contrapresión
+        """
+        config = get_config("pqrs")
+        self.handler = handler
+        self.policy = policy or SLAPolicy(config)
+        self.max_concurrency = max_concurrency or config.get("max_concurrency", 8)
+        self.maxsize = maxsize if maxsize is not None else config.get("queue_maxsize", 10000)
+        self.latency: Dict[str, LatencyHistogram] = {
+            ESTADO_RADICADA: LatencyHistogram(),
+            ESTADO_EN_PROCESO: LatencyHistogram(),
+        }
+        self.processed = 0
+        self.failed = 0
+        self.overdue = 0
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._sequence = itertools.count()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        """Inicia los trabajadores (dentro del loop de asyncio en ejecución)"""
+        if self._workers:
+            return
+        self._queue = asyncio.PriorityQueue(maxsize=self.maxsize)
+        self._workers = [asyncio.ensure_future(self._worker()) for _ in range(self.max_concurrency)]
+
+    def _started_queue(self) -> asyncio.PriorityQueue:
+        if self._queue is None:
+            raise RuntimeError("La cola de PQRS no está iniciada (llamar start())")
+        return self._queue
+
+    def _entry(self, pqrs: MutableMapping[str, Any]) -> tuple:
+        pqrs["estado_pqrs"] = ESTADO_RADICADA
+        key = self.policy.priority_key(pqrs)
+        return (key[0], key[1], next(self._sequence), time.perf_counter(), pqrs)
+
+    async def submit(self, pqrs: MutableMapping[str, Any]) -> None:
+        """
+        Encola una PQRS; espera si la cola está llena (contrapresión)
+
+        Raises:
+            RuntimeError: Si la cola no está iniciada
+        """
+        queue = self._started_queue()
+        await queue.put(self._entry(pqrs))
+
+    def submit_nowait(self, pqrs: MutableMapping[str, Any]) -> None:
+        """
+        Encola una PQRS sin esperar
+
+        Raises:
+            RuntimeError: Si la cola no está iniciada
+            asyncio.QueueFull: Si la cola está llena
+        """
+        queue = self._started_queue()
+        queue.put_nowait(self._entry(pqrs))
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        clock = time.perf_counter
+        while True:
+            deadline, _, _, enqueued, pqrs = await queue.get()
+            started = clock()
+            self.latency[ESTADO_RADICADA].observe(started - enqueued)
+            pqrs["estado_pqrs"] = ESTADO_EN_PROCESO
+            try:
+                new_state = await self.handler(pqrs)
+                pqrs["estado_pqrs"] = new_state or ESTADO_RESPONDIDA
+                answered = pqrs.get("fecha_respuesta")
+                if answered is None:
+                    answered = pqrs["fecha_respuesta"] = datetime.now()
+                elif not isinstance(answered, datetime):
+                    # Valor del handler que no es fecha: el SLA se mide con la hora actual
+                    answered = datetime.now()
+                if answered.timestamp() > deadline:
+                    self.overdue += 1
+                self.processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pqrs["estado_pqrs"] = ESTADO_ERROR
+                self.failed += 1
+            finally:
+                self.latency[ESTADO_EN_PROCESO].observe(clock() - started)
+                queue.task_done()
+
+    async def join(self) -> None:
+        """Espera a que se atiendan todas las PQRS encoladas"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self, drain: bool = True) -> None:
+        """
+        Detiene los trabajadores
+
+        Args:
+            drain: Atender primero las PQRS pendientes
+        """
+        if drain:
+            await self.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores e histogramas de latencia por estado"""
+        return {
+            "pending": self.pending,
+            "processed": self.processed,
+            "failed": self.failed,
+            "overdue": self.overdue,
+            "latency": {state: histogram.snapshot() for state, histogram in self.latency.items()},
+        }
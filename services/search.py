@@ -0,0 +1,464 @@
+"""
+Búsqueda de texto completo sobre las PQRS (descripcion y respuesta)
+
+Índice invertido en memoria, actualizado por solicitud (alta, cambio o
+baja), con ranking BM25 y filtros por estado_pqrs y tipo_solicitud. Sirve
+para encontrar quejas parecidas o duplicadas sin recorrer todas las
+solicitudes.
+
+Tokenización en español sin tildes: utils.normalize_text (sanitize_string
++ minúsculas + sin tildes), palabras alfanuméricas, sin palabras vacías y
+con el plural simple recortado ("quejas" -> "queja"). El índice se guarda
+en disco para un arranque rápido.
+"""
+
+import heapq
+import math
+import os
+import pickle
+import re
+from collections import Counter
+from operator import itemgetter
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple, Union
+
+import utils
+from .pqrs_queue import normalize_tipo
+
+INDEX_FORMAT_VERSION = 1
+
+# Variación relativa de la longitud promedio que invalida los aportes BM25 guardados
+AVERAGE_DRIFT = 0.02
+
+# Holgura relativa de la poda top-k: cubre el redondeo entre sumar los aportes
+# de un documento y la cota de los términos pendientes
+PRUNE_TOLERANCE = 1e-9
+
+# Términos distintos usados como máximo por consulta (los de mayor idf)
+MAX_QUERY_TERMS = 16
+
+# En similar(), los términos presentes en más de esta fracción de las PQRS no
+# distinguen duplicados y se omiten
+SIMILAR_MAX_DOCUMENT_RATIO = 0.05
+
+TEXT_FIELDS = ("descripcion", "respuesta")
+FILTER_FIELDS = ("estado_pqrs", "tipo_solicitud")
+
+# Palabras vacías del español, ya normalizadas (sin tildes)
+STOPWORDS = frozenset("""
+a al algo algunas algunos ante antes como con contra cual cuando de del desde donde durante e el ella
+ellas ellos en entre era eres es esa esas ese eso esos esta estaba estan estar estas este esto estos
+fue fueron ha han hay hasta la las le les lo los me mi mis mucho muy nada ni no nos nosotros o otra
+otras otro otros para pero poco por porque que quien quienes se sea si sin sobre son su sus tambien
+te tiene tienen ti todo todos tu tus un una uno unos y ya yo
+""".split())
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+Filter = Mapping[str, Union[Any, Iterable[Any]]]
+
+
+class SearchHit(NamedTuple):
+    ticket_id: Hashable
+    score: float
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Términos indexables de un texto
+
+    Args:
+        text: Texto libre (descripcion o respuesta)
+
+    Returns:
+        Términos normalizados en el orden del texto (con repeticiones)
+    """
+    if not text:
+        return []
+    terms = []
+    for word in _WORD_PATTERN.findall(utils.normalize_text(text)):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word[-1] == "s":
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+def _filter_value(value: Any) -> Any:
+    return normalize_tipo(value) if isinstance(value, str) else value
+
+
+class _TermImpacts:
+    """Aportes de un término por documento, su máximo y (bajo demanda) su orden descendente"""
+
+    __slots__ = ("impacts", "maximum", "_ordered")
+
+    def __init__(self, impacts: Dict[int, float]):
+        self.impacts = impacts
+        self.maximum = max(impacts.values())
+        self._ordered: Optional[List[Tuple[float, int]]] = None
+
+    def ordered(self) -> List[Tuple[float, int]]:
+        if self._ordered is None:
+            self._ordered = sorted(zip(self.impacts.values(), self.impacts.keys()), reverse=True)
+        return self._ordered
+
+
+class PQRSSearchIndex:
+    """Índice invertido con ranking BM25 sobre el texto de las PQRS"""
+
+    def __init__(self, text_fields: Iterable[str] = TEXT_FIELDS,
+                 filter_fields: Iterable[str] = FILTER_FIELDS, k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            text_fields: Variables de texto que se indexan
+            filter_fields: Variables categóricas disponibles como filtro
+            k1: Saturación de la frecuencia del término (BM25)
+            b: Normalización por longitud del documento (BM25)
+        """
+        self.text_fields = tuple(text_fields)
+        self.filter_fields = tuple(filter_fields)
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.filters: Dict[str, Dict[Any, Set[int]]] = {field: {} for field in self.filter_fields}
+        self._ids: List[Optional[Hashable]] = []
+        self._positions: Dict[Hashable, int] = {}
+        self._lengths: List[int] = []
+        self._terms: List[Tuple[str, ...]] = []
+        self._values: List[Tuple[Any, ...]] = []
+        self._free: List[int] = []
+        self._total_length = 0
+        self._impact_cache: Dict[str, _TermImpacts] = {}
+        self._impact_average = 0.0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, ticket_id: Hashable) -> bool:
+        return ticket_id in self._positions
+
+    @property
+    def average_length(self) -> float:
+        return self._total_length / len(self._positions) if self._positions else 0.0
+
+    def add(self, ticket_id: Hashable, pqrs: Mapping[str, Any]) -> None:
+        """
+        Indexa una PQRS (o la reemplaza si ya estaba indexada)
+
+        Args:
+            ticket_id: Identificador de la solicitud
+            pqrs: Registro con las variables del área pqrs
+        """
+        if ticket_id in self._positions:
+            self.remove(ticket_id)
+        counts = Counter()
+        for field in self.text_fields:
+            counts.update(tokenize(pqrs.get(field)))
+        values = tuple(_filter_value(pqrs.get(field)) for field in self.filter_fields)
+        length = sum(counts.values())
+
+        if self._free:
+            position = self._free.pop()
+            self._ids[position] = ticket_id
+            self._lengths[position] = length
+            self._terms[position] = tuple(counts)
+            self._values[position] = values
+        else:
+            position = len(self._ids)
+            self._ids.append(ticket_id)
+            self._lengths.append(length)
+            self._terms.append(tuple(counts))
+            self._values.append(values)
+        self._positions[ticket_id] = position
+        self._total_length += length
+
+        postings = self.postings
+        cache = self._impact_cache
+        for term, frequency in counts.items():
+            cache.pop(term, None)
+            term_postings = postings.get(term)
+            if term_postings is None:
+                postings[term] = {position: frequency}
+            else:
+                term_postings[position] = frequency
+        for field, value in zip(self.filter_fields, values):
+            self.filters[field].setdefault(value, set()).add(position)
+
+    def remove(self, ticket_id: Hashable) -> bool:
+        """Quita una PQRS del índice; retorna False si no estaba"""
+        position = self._positions.pop(ticket_id, None)
+        if position is None:
+            return False
+        postings = self.postings
+        cache = self._impact_cache
+        for term in self._terms[position]:
+            cache.pop(term, None)
+            term_postings = postings[term]
+            del term_postings[position]
+            if not term_postings:
+                del postings[term]
+        for field, value in zip(self.filter_fields, self._values[position]):
+            members = self.filters[field][value]
+            members.discard(position)
+            if not members:
+                del self.filters[field][value]
+        self._total_length -= self._lengths[position]
+        self._ids[position] = None
+        self._lengths[position] = 0
+        self._terms[position] = ()
+        self._values[position] = ()
+        self._free.append(position)
+        return True
+
+    def build(self, records: Iterable[Mapping[str, Any]], id_field: str = "id") -> int:
+        """
+        Indexa un conjunto de PQRS
+
+        Returns:
+            Número de solicitudes indexadas
+        """
+        count = 0
+        for record in records:
+            self.add(record[id_field], record)
+            count += 1
+        return count
+
+    def import_sink(self, id_field: str = "id"):
+        """Destino para ImportPipeline que indexa cada lote importado"""
+        def sink(records: List[Dict[str, Any]]) -> None:
+            for record in records:
+                self.add(record[id_field], record)
+        return sink
+
+    def _allowed(self, where: Optional[Filter]) -> Optional[Set[int]]:
+        """Posiciones que cumplen los filtros (None = sin filtro)"""
+        if not where:
+            return None
+        allowed: Optional[Set[int]] = None
+        for field, wanted in where.items():
+            if field not in self.filters:
+                raise KeyError(f"{field} no es un filtro del índice ({', '.join(self.filter_fields)})")
+            if isinstance(wanted, (list, tuple, set, frozenset)):
+                members: Set[int] = set()
+                for value in wanted:
+                    members |= self.filters[field].get(_filter_value(value), set())
+            else:
+                members = self.filters[field].get(_filter_value(wanted), set())
+            allowed = members if allowed is None else allowed & members
+            if not allowed:
+                return set()
+        return allowed
+
+    def _impacts(self, term: str, postings: Dict[int, int]) -> "_TermImpacts":
+        """
+        Aportes BM25 (sin idf) de un término por documento
+
+        Se calculan al consultar el término y se guardan hasta que cambian sus
+        documentos o la longitud promedio se mueve más de AVERAGE_DRIFT.
+        """
+        cached = self._impact_cache.get(term)
+        if cached is None:
+            k1, lengths = self.k1, self._lengths
+            base = k1 * (1 - self.b)
+            per_length = k1 * self.b / (self._impact_average or 1.0)
+            impacts = {position: (k1 + 1) * tf / (tf + base + per_length * lengths[position])
+                       for position, tf in postings.items()}
+            cached = self._impact_cache[term] = _TermImpacts(impacts)
+        return cached
+
+    def _score(self, terms: Mapping[str, int], allowed: Optional[Set[int]], k: int) -> Dict[int, float]:
+        """
+        Puntajes BM25 de los documentos que pueden quedar entre los k mejores
+
+        Los términos se recorren del de mayor aporte posible al de menor.
+        Con θ = k-ésimo puntaje parcial y R = suma de los aportes máximos de
+        los términos pendientes, un documento que aún no es candidato solo
+        puede llegar a los k mejores si el término actual le aporta al menos
+        θ - R: de cada término se recorre solo esa cabeza (aportes en orden
+        descendente) y, para los candidatos, se consulta su aporte. Los
+        candidatos con puntaje + R < θ se descartan. R se toma de sumas de
+        cola calculadas una vez (0 exacto después del último término) y la
+        poda deja una holgura PRUNE_TOLERANCE, así que un documento entre los
+        k mejores nunca se descarta. El resultado es exacto.
+        """
+        documents = len(self._positions)
+        if not documents:
+            return {}
+        average = self.average_length
+        if abs(average - self._impact_average) > AVERAGE_DRIFT * self._impact_average:
+            self._impact_cache.clear()
+            self._impact_average = average
+        weighted = []
+        for term, query_frequency in terms.items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            frequency = len(postings)
+            idf = math.log(1 + (documents - frequency + 0.5) / (frequency + 0.5)) * query_frequency
+            term_impacts = self._impacts(term, postings)
+            weighted.append((idf * term_impacts.maximum, idf, term_impacts))
+        weighted.sort(key=itemgetter(0), reverse=True)
+        # Suma de las cotas de los términos posteriores a cada uno
+        suffixes = [0.0] * len(weighted)
+        for index in range(len(weighted) - 2, -1, -1):
+            suffixes[index] = suffixes[index + 1] + weighted[index + 1][0]
+
+        scores: Dict[int, float] = {}
+        threshold = 0.0
+        next_bounds = [bound for bound, _, _ in weighted[1:]] + [0.0]
+        for (bound, idf, term_impacts), next_bound, remaining in zip(weighted, next_bounds, suffixes):
+            impacts = term_impacts.impacts
+            slack = PRUNE_TOLERANCE * threshold
+            cutoff = (threshold - remaining - slack) / idf if len(scores) >= k else 0.0
+            get = scores.get
+            if cutoff <= 0:
+                if allowed is None:
+                    for position, impact in impacts.items():
+                        scores[position] = get(position, 0.0) + idf * impact
+                else:
+                    for position in impacts.keys() & allowed:
+                        scores[position] = get(position, 0.0) + idf * impacts[position]
+            else:
+                # Candidatos con aporte bajo la cabeza (la cabeza se suma abajo)
+                if len(scores) < len(impacts):
+                    lookup = impacts.get
+                    for position in scores:
+                        impact = lookup(position)
+                        if impact is not None and impact < cutoff:
+                            scores[position] += idf * impact
+                else:
+                    for position in scores.keys() & impacts.keys():
+                        impact = impacts[position]
+                        if impact < cutoff:
+                            scores[position] += idf * impact
+                for impact, position in term_impacts.ordered():
+                    if impact < cutoff:
+                        break
+                    if allowed is None or position in allowed:
+                        scores[position] = get(position, 0.0) + idf * impact
+            # θ no supera al máximo: se calcula solo si puede servir para el siguiente término
+            if len(scores) > k and max(scores.values()) > remaining - next_bound:
+                threshold = heapq.nlargest(k, scores.values())[-1]
+                floor = threshold - remaining - PRUNE_TOLERANCE * threshold
+                if floor > 0:
+                    scores = {position: score for position, score in scores.items() if score >= floor}
+        return scores
+
+    def _top(self, scores: Dict[int, float], k: int) -> List[SearchHit]:
+        ids = self._ids
+        return [SearchHit(ids[position], score)
+                for score, position in heapq.nlargest(k, zip(scores.values(), scores.keys()))]
+
+    def _distinctive(self, terms: Iterable[str], max_terms: Optional[int],
+                     max_documents: Optional[int] = None) -> List[str]:
+        """Los max_terms términos indexados más distintivos (menos documentos = mayor idf)"""
+        postings = self.postings
+        present = [term for term in terms if term in postings]
+        if max_documents is not None:
+            present = [term for term in present if len(postings[term]) <= max_documents]
+        if max_terms is None or len(present) <= max_terms:
+            return present
+        return heapq.nsmallest(max_terms, present, key=lambda term: len(postings[term]))
+
+    def search(self, query: str, k: int = 10, where: Optional[Filter] = None,
+               max_terms: Optional[int] = MAX_QUERY_TERMS) -> List[SearchHit]:
+        """
+        Busca las PQRS más relevantes para un texto
+
+        Args:
+            query: Texto de búsqueda (puede ser la descripción completa de otra PQRS)
+            k: Número máximo de resultados
+            where: Filtros, ej. {"estado_pqrs": "Radicada", "tipo_solicitud": ["queja", "reclamo"]}
+            max_terms: Términos distintos de la consulta usados, los de mayor
+                       idf (None = todos); acota el costo de consultas largas
+
+        Returns:
+            Resultados ordenados por puntaje BM25 (mayor primero)
+        """
+        counts = Counter(tokenize(query))
+        terms = {term: counts[term] for term in self._distinctive(counts, max_terms)}
+        return self._top(self._score(terms, self._allowed(where), k), k)
+
+    def similar(self, ticket_id: Hashable, k: int = 10, where: Optional[Filter] = None,
+                max_terms: Optional[int] = MAX_QUERY_TERMS) -> List[SearchHit]:
+        """
+        PQRS parecidas a una ya indexada (posibles duplicados)
+
+        La consulta se arma con los `max_terms` términos más distintivos de la
+        solicitud (mayor idf), como en search(), sin los términos presentes en
+        más de SIMILAR_MAX_DOCUMENT_RATIO de las PQRS.
+
+        Args:
+            ticket_id: Solicitud de referencia (no se incluye en el resultado)
+            k: Número máximo de resultados
+            where: Filtros como en search()
+            max_terms: Términos de la solicitud usados en la consulta
+
+        Returns:
+            Resultados ordenados por puntaje BM25
+        """
+        position = self._positions.get(ticket_id)
+        if position is None:
+            return []
+        max_documents = max(1, int(len(self._positions) * SIMILAR_MAX_DOCUMENT_RATIO))
+        terms = self._distinctive(self._terms[position], max_terms, max_documents)
+        scores = self._score({term: 1 for term in terms}, self._allowed(where), k + 1)
+        scores.pop(position, None)
+        return self._top(scores, k)
+
+    def save(self, path: str) -> None:
+        """Guarda el índice en disco (escritura atómica)"""
+        state = {
+            "text_fields": self.text_fields,
+            "filter_fields": self.filter_fields,
+            "k1": self.k1,
+            "b": self.b,
+            "ids": self._ids,
+            "terms": self._terms,
+            "values": self._values,
+            "postings": self.postings,
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as handle:
+            pickle.dump((INDEX_FORMAT_VERSION, state), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> "PQRSSearchIndex":
+        """
+        Carga un índice guardado con save()
+
+        Solo debe usarse con archivos generados por el propio sistema
+        (pickle no es seguro con archivos de terceros).
+
+        Raises:
+            ValueError: Si el archivo es de otra versión de formato
+        """
+        with open(path, "rb") as handle:
+            version, state = pickle.load(handle)
+        if version != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Versión de índice no soportada: {version}")
+        index = cls(state["text_fields"], state["filter_fields"], state["k1"], state["b"])
+        index.postings = state["postings"]
+        index._ids = state["ids"]
+        index._terms = state["terms"]
+        index._values = state["values"]
+        # Longitudes, posiciones libres y filtros se derivan de lo guardado
+        lengths = [0] * len(index._ids)
+        for term_postings in index.postings.values():
+            for position, tf in term_postings.items():
+                lengths[position] += tf
+        index._lengths = lengths
+        index._total_length = sum(lengths)
+        for position, ticket_id in enumerate(index._ids):
+            if ticket_id is None:
+                index._free.append(position)
+                continue
+            index._positions[ticket_id] = position
+            for field, value in zip(index.filter_fields, index._values[position]):
+                index.filters[field].setdefault(value, set()).add(position)
+        return index
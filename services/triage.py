@@ -0,0 +1,314 @@
+"""
+Triaje de casos de ayuda social: siguiente caso más urgente
+
+Cada caso abierto del área ayuda_social recibe un puntaje configurable
+(TRIAGE_CONFIG) a partir de nivel_urgencia, estado_socioeconomico,
+tipo_asistencia_requerida y el tiempo de espera. Los casos se mantienen en
+un montículo indexado (IndexedHeap) que permite actualizar la prioridad de
+un caso en O(log n) sin reordenar la lista, además de una vista por tipo
+de asistencia.
+
+El tiempo de espera suma la misma cantidad de puntos por día a todos los
+casos, así que el orden entre dos casos no cambia con el paso del tiempo:
+la llave del montículo es puntaje_base - aging * día_de_apertura y el
+puntaje actual es llave + aging * hoy. Solo se reubica un caso cuando
+cambian sus datos.
+"""
+
+import itertools
+import time
+from datetime import datetime
+from functools import lru_cache
+from heapq import heappop, heappush
+from typing import Any, Dict, Generic, Hashable, List, Mapping, NamedTuple, Optional, Tuple, TypeVar
+
+import utils
+from config import get_config
+
+SECONDS_PER_DAY = 86_400.0
+
+Item = TypeVar("Item", bound=Hashable)
+
+
+@lru_cache(maxsize=1024)
+def _category(value: str) -> str:
+    """Valor de una lista de valores normalizado (los valores se repiten entre casos)"""
+    return utils.normalize_text(value)
+
+
+class IndexedHeap(Generic[Item]):
+    """
+    Montículo binario de mínimos con índice de posiciones
+
+    Cada elemento aparece una sola vez; update cambia su llave (aumento o
+    disminución) en O(log n) y remove lo quita en O(log n).
+    """
+
+    def __init__(self):
+        self._keys: List[Any] = []
+        self._items: List[Item] = []
+        self._positions: Dict[Item, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: Item) -> bool:
+        return item in self._positions
+
+    def key(self, item: Item) -> Any:
+        return self._keys[self._positions[item]]
+
+    def _move(self, index: int, key: Any, item: Item) -> None:
+        self._keys[index] = key
+        self._items[index] = item
+        self._positions[item] = index
+
+    def _sift_up(self, index: int) -> None:
+        keys, items = self._keys, self._items
+        key, item = keys[index], items[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if not key < keys[parent]:
+                break
+            self._move(index, keys[parent], items[parent])
+            index = parent
+        self._move(index, key, item)
+
+    def _sift_down(self, index: int) -> None:
+        keys, items = self._keys, self._items
+        size = len(keys)
+        key, item = keys[index], items[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and keys[child + 1] < keys[child]:
+                child += 1
+            if not keys[child] < key:
+                break
+            self._move(index, keys[child], items[child])
+            index = child
+        self._move(index, key, item)
+
+    def push(self, item: Item, key: Any) -> None:
+        """Agrega un elemento o actualiza su llave si ya está"""
+        index = self._positions.get(item)
+        if index is not None:
+            self.update(item, key)
+            return
+        self._keys.append(key)
+        self._items.append(item)
+        self._positions[item] = len(self._items) - 1
+        self._sift_up(len(self._items) - 1)
+
+    def update(self, item: Item, key: Any) -> None:
+        """
+        Cambia la llave de un elemento
+
+        Raises:
+            KeyError: Si el elemento no está en el montículo
+        """
+        index = self._positions[item]
+        previous = self._keys[index]
+        self._keys[index] = key
+        if key < previous:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def remove(self, item: Item) -> Any:
+        """
+        Quita un elemento y retorna su llave
+
+        Raises:
+            KeyError: Si el elemento no está en el montículo
+        """
+        index = self._positions.pop(item)
+        key = self._keys[index]
+        last_key, last_item = self._keys.pop(), self._items.pop()
+        if index < len(self._items):
+            self._move(index, last_key, last_item)
+            if last_key < key:
+                self._sift_up(index)
+            else:
+                self._sift_down(index)
+        return key
+
+    def peek(self) -> Optional[Tuple[Item, Any]]:
+        """(elemento, llave) con la menor llave, sin quitarlo"""
+        return (self._items[0], self._keys[0]) if self._items else None
+
+    def pop(self) -> Tuple[Item, Any]:
+        """
+        Quita y retorna (elemento, llave) con la menor llave
+
+        Raises:
+            IndexError: Si el montículo está vacío
+        """
+        if not self._items:
+            raise IndexError("pop de un montículo vacío")
+        item = self._items[0]
+        return item, self.remove(item)
+
+    def smallest(self, k: int) -> List[Tuple[Item, Any]]:
+        """Los k elementos de menor llave en orden, en O(k log k) sin modificar el montículo"""
+        keys, items = self._keys, self._items
+        result = []
+        frontier = [(keys[0], 0)] if keys else []
+        while frontier and len(result) < k:
+            key, index = heappop(frontier)
+            result.append((items[index], key))
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(keys):
+                    heappush(frontier, (keys[child], child))
+        return result
+
+
+class TriageCase(NamedTuple):
+    """Caso en la cola con su puntaje al momento de la consulta"""
+    case_id: Hashable
+    score: float
+    nivel_urgencia: Optional[str]
+    tipos: Tuple[str, ...]
+    opened: datetime
+
+
+class TriagePolicy:
+    """Función de puntaje compilada a partir de TRIAGE_CONFIG"""
+
+    def __init__(self, config: Optional[Mapping[str, Any]] = None):
+        config = config if config is not None else get_config("triage")
+        self.urgency = {utils.normalize_text(name): float(points)
+                        for name, points in config.get("nivel_urgencia", {}).items()}
+        self.socioeconomic = {utils.normalize_text(name): float(points)
+                              for name, points in config.get("estado_socioeconomico", {}).items()}
+        self.assistance = {utils.normalize_text(name): float(points)
+                           for name, points in config.get("tipo_asistencia", {}).items()}
+        self.default_assistance = float(config.get("tipo_asistencia_default", 0.0))
+        self.aging_per_day = float(config.get("aging_per_day", 1.0))
+
+    def tipos(self, record: Mapping[str, Any]) -> Tuple[str, ...]:
+        """Tipos de asistencia normalizados y sin repetir"""
+        value = record.get("tipo_asistencia_requerida") or ()
+        if isinstance(value, str):
+            value = (value,)
+        return tuple(sorted({_category(tipo) for tipo in value if tipo}))
+
+    def base_score(self, record: Mapping[str, Any], tipos: Optional[Tuple[str, ...]] = None) -> float:
+        """Puntaje sin tiempo de espera: urgencia + condición socioeconómica + tipo de asistencia más alto"""
+        tipos = self.tipos(record) if tipos is None else tipos
+        urgency = self.urgency.get(_category(record.get("nivel_urgencia") or ""), 0.0)
+        socioeconomic = self.socioeconomic.get(_category(record.get("estado_socioeconomico") or ""), 0.0)
+        assistance = max((self.assistance.get(tipo, self.default_assistance) for tipo in tipos), default=0.0)
+        return urgency + socioeconomic + assistance
+
+    def score(self, record: Mapping[str, Any], opened: datetime, now: Optional[datetime] = None) -> float:
+        """Puntaje actual incluyendo los días de espera"""
+        now = now or datetime.now()
+        return self.base_score(record) + self.aging_per_day * (now - opened).total_seconds() / SECONDS_PER_DAY
+
+
+class _Case(NamedTuple):
+    nivel_urgencia: Optional[str]
+    tipos: Tuple[str, ...]
+    opened: datetime
+    key: Tuple[float, float, int]
+
+
+class TriageQueue:
+    """Casos abiertos de ayuda social ordenados por urgencia, con vistas por tipo de asistencia"""
+
+    def __init__(self, policy: Optional[TriagePolicy] = None):
+        self.policy = policy or TriagePolicy()
+        self._cases: Dict[Hashable, _Case] = {}
+        self._heap: IndexedHeap = IndexedHeap()
+        self._by_type: Dict[str, IndexedHeap] = {}
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._cases)
+
+    def __contains__(self, case_id: Hashable) -> bool:
+        return case_id in self._cases
+
+    def types(self) -> List[str]:
+        """Tipos de asistencia con casos abiertos"""
+        return sorted(tipo for tipo, heap in self._by_type.items() if len(heap))
+
+    def upsert(self, case_id: Hashable, record: Mapping[str, Any], opened: Optional[datetime] = None) -> None:
+        """
+        Abre un caso o actualiza sus datos (O(log n) por vista)
+
+        Args:
+            case_id: Identificador del caso
+            record: Registro del área ayuda_social
+            opened: Apertura del caso (por defecto ahora); en una
+                    actualización se conserva la apertura original
+        """
+        policy = self.policy
+        tipos = policy.tipos(record)
+        previous = self._cases.get(case_id)
+        if previous is not None:
+            opened = previous.opened
+            sequence = previous.key[2]
+        else:
+            opened = opened or datetime.now()
+            sequence = next(self._sequence)
+        days = opened.timestamp() / SECONDS_PER_DAY
+        # Menor llave = más urgente; con el mismo puntaje, el caso más antiguo
+        priority = policy.base_score(record, tipos) - policy.aging_per_day * days
+        key = (-priority, days, sequence)
+        self._cases[case_id] = _Case(record.get("nivel_urgencia"), tipos, opened, key)
+        self._heap.push(case_id, key)
+        if previous is not None:
+            for tipo in previous.tipos:
+                if tipo not in tipos:
+                    self._by_type[tipo].remove(case_id)
+        for tipo in tipos:
+            heap = self._by_type.get(tipo)
+            if heap is None:
+                heap = self._by_type[tipo] = IndexedHeap()
+            heap.push(case_id, key)
+
+    def close(self, case_id: Hashable) -> bool:
+        """Cierra un caso (sale de la cola y de sus vistas); retorna False si no estaba abierto"""
+        case = self._cases.pop(case_id, None)
+        if case is None:
+            return False
+        self._heap.remove(case_id)
+        for tipo in case.tipos:
+            self._by_type[tipo].remove(case_id)
+        return True
+
+    def _view(self, tipo: Optional[str]) -> Optional[IndexedHeap]:
+        return self._heap if tipo is None else self._by_type.get(_category(tipo))
+
+    def _case(self, case_id: Hashable, key: Tuple[float, float, int], now: float) -> TriageCase:
+        case = self._cases[case_id]
+        return TriageCase(case_id, -key[0] + self.policy.aging_per_day * now, case.nivel_urgencia,
+                          case.tipos, case.opened)
+
+    def top(self, k: int = 10, tipo: Optional[str] = None) -> List[TriageCase]:
+        """
+        Los k casos más urgentes (de todos o de un tipo de asistencia) en O(k log k)
+
+        Returns:
+            Casos de mayor a menor puntaje actual
+        """
+        view = self._view(tipo)
+        if view is None:
+            return []
+        now = time.time() / SECONDS_PER_DAY
+        return [self._case(case_id, key, now) for case_id, key in view.smallest(k)]
+
+    def next(self, tipo: Optional[str] = None) -> Optional[TriageCase]:
+        """Caso más urgente sin quitarlo de la cola"""
+        cases = self.top(1, tipo)
+        return cases[0] if cases else None
+
+    def take(self, tipo: Optional[str] = None) -> Optional[TriageCase]:
+        """Quita y retorna el caso más urgente (ej. al asignarlo a un profesional)"""
+        case = self.next(tipo)
+        if case is not None:
+            self.close(case.case_id)
+        return case
@@ -0,0 +1,320 @@
+"""
+Veto automático de participación en deportes y cultura
+
+Las áreas deportes y cultura registran promedio_academico y
+seguimiento_administrador "para veto automático". Las reglas (promedio
+mínimo por programa_academico y valores de seguimiento que vetan) se
+compilan una vez en VetoPolicy; VetoEngine mantiene a los participantes
+en un índice ordenado por promedio (cubetas de 0.01 en la escala de 0 a 5)
+por programa, de modo que:
+
+- Un lote de notas nuevas solo reevalúa a los estudiantes del lote
+- Un cambio del promedio mínimo de un programa solo reevalúa a quienes
+  quedan entre el mínimo anterior y el nuevo
+
+Los cambios de estado_participacion se emiten como un flujo de deltas
+(ParticipationChange con número de secuencia) hacia los destinos
+suscritos, ej. la base de datos o avisos de veto por correo.
+"""
+
+import itertools
+from functools import lru_cache
+from typing import (Any, Callable, Dict, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple,
+                    Union)
+
+import utils
+from config import get_config
+from .notifications import Notification
+
+# Estados de estado_participacion manejados por el motor; los demás (ej. "Retirado") no se cambian
+ESTADO_ACTIVO = "Activo"
+ESTADO_VETADO = "Vetado"
+
+# Motivos de veto
+MOTIVO_PROMEDIO = "promedio"
+MOTIVO_SEGUIMIENTO = "seguimiento"
+
+GRADE_MAX = 5.0
+# Cubetas por unidad de promedio (notas con dos decimales)
+BUCKETS_PER_UNIT = 100
+_BUCKETS = int(GRADE_MAX * BUCKETS_PER_UNIT) + 1
+
+Grades = Union[Mapping[Hashable, Optional[float]], Iterable[Tuple[Hashable, Optional[float]]]]
+ChangeSink = Callable[[List["ParticipationChange"]], None]
+
+
+class ParticipationChange(NamedTuple):
+    """Cambio de estado_participacion de un participante en un área"""
+    sequence: int
+    participant: Hashable
+    area: str
+    previous: str
+    current: str
+    reason: Optional[str]  # MOTIVO_PROMEDIO, MOTIVO_SEGUIMIENTO o None al levantar el veto
+    promedio: Optional[float]
+    promedio_minimo: float
+
+
+@lru_cache(maxsize=1024)
+def program_key(programa_academico: Optional[str]) -> str:
+    """Programa normalizado ("Enfermería " -> "enfermeria")"""
+    return utils.normalize_text(programa_academico) if programa_academico else ""
+
+
+def _bucket(average: float) -> int:
+    return min(max(int(average * BUCKETS_PER_UNIT), 0), _BUCKETS - 1)
+
+
+class VetoPolicy:
+    """Reglas de veto compiladas a partir de VETO_CONFIG"""
+
+    def __init__(self, config: Optional[Mapping[str, Any]] = None):
+        config = config if config is not None else get_config("veto")
+        self.areas = tuple(config.get("areas", ("deportes", "cultura")))
+        self.default_minimum = float(config.get("promedio_minimo", 3.0))
+        self.minimums = {program_key(program): float(minimum)
+                         for program, minimum in config.get("promedio_minimo_programa", {}).items()}
+        self.flags = frozenset(utils.normalize_text(flag) for flag in config.get("seguimiento_veto", ()))
+
+    def minimum(self, program: str) -> float:
+        """Promedio mínimo de un programa ya normalizado con program_key"""
+        return self.minimums.get(program, self.default_minimum)
+
+    def flagged(self, seguimiento_administrador: Optional[str]) -> bool:
+        return bool(seguimiento_administrador) and utils.normalize_text(seguimiento_administrador) in self.flags
+
+    def reason(self, program: str, average: Optional[float], flagged: bool) -> Optional[str]:
+        """Motivo de veto, o None si puede participar (sin promedio todavía no se veta)"""
+        if flagged:
+            return MOTIVO_SEGUIMIENTO
+        if average is not None and average < self.minimum(program):
+            return MOTIVO_PROMEDIO
+        return None
+
+
+class _Participant:
+    __slots__ = ("program", "average", "flagged", "states")
+
+    def __init__(self, program: str):
+        self.program = program
+        self.average: Optional[float] = None
+        self.flagged = False
+        self.states: Dict[str, str] = {}
+
+
+class VetoEngine:
+    """Estado de participación de las inscripciones y reevaluación incremental"""
+
+    def __init__(self, policy: Optional[VetoPolicy] = None, sinks: Iterable[ChangeSink] = ()):
+        """
+        Args:
+            policy: Reglas de veto (por defecto según get_config("veto"))
+            sinks: Destinos del flujo de cambios; cada uno recibe la lista de
+                   cambios de cada operación que cambió algún estado
+        """
+        self.policy = policy or VetoPolicy()
+        self.sinks: List[ChangeSink] = list(sinks)
+        self.evaluated = 0  # Participantes reevaluados (para comparar con un recorrido completo)
+        self._participants: Dict[Hashable, _Participant] = {}
+        # Programa -> cubeta de promedio -> participantes
+        self._index: Dict[str, List[Set[Hashable]]] = {}
+        self._sequence = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self._participants)
+
+    def subscribe(self, sink: ChangeSink) -> None:
+        self.sinks.append(sink)
+
+    def state(self, participant: Hashable, area: str) -> Optional[str]:
+        """estado_participacion actual, o None si no está inscrito en el área"""
+        entry = self._participants.get(participant)
+        return entry.states.get(area) if entry is not None else None
+
+    def _buckets(self, program: str) -> List[Set[Hashable]]:
+        buckets = self._index.get(program)
+        if buckets is None:
+            buckets = self._index[program] = [set() for _ in range(_BUCKETS)]
+        return buckets
+
+    def _set_average(self, participant: Hashable, entry: _Participant, average: Optional[float]) -> None:
+        if entry.average is not None:
+            self._index[entry.program][_bucket(entry.average)].discard(participant)
+        entry.average = average
+        if average is not None:
+            self._buckets(entry.program)[_bucket(average)].add(participant)
+
+    def _evaluate(self, participant: Hashable, entry: _Participant, changes: List[ParticipationChange]) -> None:
+        self.evaluated += 1
+        reason = self.policy.reason(entry.program, entry.average, entry.flagged)
+        target = ESTADO_VETADO if reason else ESTADO_ACTIVO
+        for area, current in entry.states.items():
+            if current != target and current in (ESTADO_ACTIVO, ESTADO_VETADO):
+                entry.states[area] = target
+                changes.append(ParticipationChange(next(self._sequence), participant, area, current, target,
+                                                   reason, entry.average, self.policy.minimum(entry.program)))
+
+    def _emit(self, changes: List[ParticipationChange]) -> List[ParticipationChange]:
+        if changes:
+            for sink in self.sinks:
+                sink(changes)
+        return changes
+
+    def enroll(self, records: Iterable[Mapping[str, Any]], area: str,
+               key_field: str = "numero_documento") -> List[ParticipationChange]:
+        """
+        Inscribe (o actualiza) participantes de un área y los evalúa
+
+        Args:
+            records: Registros del área con registro_programa_academico (o
+                     programa_academico), promedio_academico,
+                     seguimiento_administrador y estado_participacion
+                     (por defecto "Activo")
+            area: Área de bienestar (una de policy.areas)
+            key_field: Variable que identifica al estudiante entre áreas y lotes de notas
+
+        Returns:
+            Cambios de estado_participacion
+
+        Raises:
+            ValueError: Si el área no tiene veto automático
+        """
+        if area not in self.policy.areas:
+            raise ValueError(f"El área {area} no tiene veto automático")
+        changes: List[ParticipationChange] = []
+        for record in records:
+            participant = record[key_field]
+            program = program_key(record.get("registro_programa_academico") or record.get("programa_academico"))
+            entry = self._participants.get(participant)
+            if entry is None:
+                entry = self._participants[participant] = _Participant(program)
+            elif entry.program != program:
+                self._set_average(participant, entry, None)
+                entry.program = program
+            self._set_average(participant, entry, record.get("promedio_academico"))
+            entry.flagged = self.policy.flagged(record.get("seguimiento_administrador"))
+            entry.states[area] = record.get("estado_participacion") or ESTADO_ACTIVO
+            self._evaluate(participant, entry, changes)
+        return self._emit(changes)
+
+    def withdraw(self, participant: Hashable, area: Optional[str] = None) -> None:
+        """Retira a un participante de un área (o de todas); sus cambios dejan de emitirse"""
+        entry = self._participants.get(participant)
+        if entry is None:
+            return
+        if area is not None:
+            entry.states.pop(area, None)
+        if area is None or not entry.states:
+            self._set_average(participant, entry, None)
+            del self._participants[participant]
+
+    def apply_grades(self, grades: Grades) -> List[ParticipationChange]:
+        """
+        Publica un lote de promedios; solo se reevalúan los estudiantes del lote
+
+        Args:
+            grades: {participante: promedio_academico} o pares (participante, promedio);
+                    los estudiantes no inscritos se ignoran
+
+        Returns:
+            Cambios de estado_participacion
+        """
+        changes: List[ParticipationChange] = []
+        participants = self._participants
+        for participant, average in (grades.items() if isinstance(grades, Mapping) else grades):
+            entry = participants.get(participant)
+            if entry is None or entry.average == average:
+                continue
+            self._set_average(participant, entry, average)
+            self._evaluate(participant, entry, changes)
+        return self._emit(changes)
+
+    def apply_flags(self, flags: Mapping[Hashable, Optional[str]]) -> List[ParticipationChange]:
+        """Actualiza seguimiento_administrador de participantes y los reevalúa"""
+        changes: List[ParticipationChange] = []
+        for participant, seguimiento in flags.items():
+            entry = self._participants.get(participant)
+            if entry is None:
+                continue
+            entry.flagged = self.policy.flagged(seguimiento)
+            self._evaluate(participant, entry, changes)
+        return self._emit(changes)
+
+    def _between(self, program: str, low: float, high: float) -> List[Hashable]:
+        """Participantes del programa con low <= promedio < high"""
+        buckets = self._index.get(program)
+        if buckets is None or low >= high:
+            return []
+        found = []
+        for bucket in range(_bucket(low), _bucket(high) + 1):
+            for participant in buckets[bucket]:
+                if low <= self._participants[participant].average < high:
+                    found.append(participant)
+        return found
+
+    def set_minimum(self, programa_academico: Optional[str], minimum: float) -> List[ParticipationChange]:
+        """
+        Cambia el promedio mínimo de un programa (None = el mínimo general)
+
+        Solo se reevalúan los participantes con promedio entre el mínimo
+        anterior y el nuevo.
+
+        Returns:
+            Cambios de estado_participacion
+        """
+        policy = self.policy
+        minimum = float(minimum)
+        if programa_academico is None:
+            programs = [program for program in self._index if program not in policy.minimums]
+            previous = policy.default_minimum
+            policy.default_minimum = minimum
+        else:
+            program = program_key(programa_academico)
+            programs = [program]
+            previous = policy.minimum(program)
+            policy.minimums[program] = minimum
+        changes: List[ParticipationChange] = []
+        for program in programs:
+            for participant in self._between(program, min(previous, minimum), max(previous, minimum)):
+                self._evaluate(participant, self._participants[participant], changes)
+        return self._emit(changes)
+
+    def at_risk(self, programa_academico: str, margin: float = 0.2) -> List[Tuple[Hashable, float]]:
+        """
+        Participantes activos con promedio a menos de `margin` por encima del mínimo
+
+        Returns:
+            (participante, promedio) de menor a mayor promedio
+        """
+        program = program_key(programa_academico)
+        minimum = self.policy.minimum(program)
+        found = [(participant, self._participants[participant].average)
+                 for participant in self._between(program, minimum, minimum + margin)
+                 if not self._participants[participant].flagged]
+        return sorted(found, key=lambda item: item[1])
+
+
+def veto_notifications(changes: Iterable[ParticipationChange],
+                       people: Mapping[Hashable, Mapping[str, Any]]) -> List[Notification]:
+    """
+    Avisos "aviso_veto" para los vetos por promedio de un flujo de cambios
+
+    Args:
+        changes: Cambios emitidos por VetoEngine
+        people: {participante: registro con email y nombres}
+
+    Returns:
+        Notificaciones para services.notifications.NotificationDispatcher
+    """
+    notifications = []
+    for change in changes:
+        person = people.get(change.participant)
+        if change.current != ESTADO_VETADO or change.reason != MOTIVO_PROMEDIO or not person or not person.get("email"):
+            continue
+        notifications.append(Notification(person["email"], "aviso_veto", {
+            "nombre": person.get("nombres", ""),
+            "area": change.area.capitalize(),
+            "promedio": f"{change.promedio:.2f}",
+            "promedio_minimo": f"{change.promedio_minimo:.2f}",
+        }))
+    return notifications
@@ -0,0 +1,51 @@
+"""Índices de mapas de bits del motor de agregación"""
+
+import random
+
+from services.aggregation import AggregationEngine
+
+
+def snapshot(engine):
+    return {name: {value: bits for value, bits in index.bitmaps.items() if bits}
+            for name, index in engine.indexes.items()}
+
+
+def test_bulk_load_repeated_id_keeps_last_values():
+    engine = AggregationEngine(["facultad"])
+    engine.bulk_load([(1, {"facultad": "A"}), (1, {"facultad": "B"}), (1, {"facultad": "C"})])
+    assert engine.group_by("facultad") == {"C": 1}
+    assert len(engine) == 1
+
+
+def test_bulk_load_matches_upserts():
+    rng = random.Random(8)
+    for _ in range(200):
+        batch = [(rng.randint(0, 6), {"facultad": rng.choice(["A", "B", "C", None]),
+                                      "deportes": rng.sample(["futbol", "tenis", "ajedrez"], rng.randint(0, 2))})
+                 for _ in range(rng.randint(1, 15))]
+        preloaded = [(record_id, {"facultad": "A"}) for record_id in rng.sample(range(10), 3)]
+        bulk = AggregationEngine(["facultad", "deportes"])
+        sequential = AggregationEngine(["facultad", "deportes"])
+        for engine in (bulk, sequential):
+            for record_id, record in preloaded:
+                engine.upsert(record_id, record)
+        bulk.bulk_load(batch)
+        for record_id, record in batch:
+            sequential.upsert(record_id, record)
+        assert snapshot(bulk) == snapshot(sequential)
+        assert bulk.live == sequential.live
+        assert bulk.crosstab("facultad", "deportes") == sequential.crosstab("facultad", "deportes")
+
+
+def test_filters_and_remove():
+    engine = AggregationEngine(["facultad", "deportes"])
+    engine.bulk_load([(1, {"facultad": "A", "deportes": ["futbol", "tenis"]}),
+                      (2, {"facultad": "B", "deportes": ["futbol"]}),
+                      (3, {"facultad": "A"})])
+    assert engine.count({"facultad": "A"}) == 2
+    assert engine.count({"facultad": ["A", "B"], "deportes": "futbol"}) == 2
+    assert sorted(engine.record_ids(engine.select({"deportes": "futbol"}))) == [1, 2]
+    assert engine.remove(1) and not engine.remove(1)
+    assert engine.group_by("deportes") == {"futbol": 1}
+    engine.upsert(4, {"facultad": "B"})
+    assert engine.group_by("facultad") == {"A": 1, "B": 2}
@@ -0,0 +1,94 @@
+"""Asignación de cupos por lote"""
+
+from services.allocation import (
+    MOTIVO_AREA,
+    MOTIVO_LIMITE,
+    MOTIVO_REPETIDA,
+    ActivityGroup,
+    EnrollmentRequest,
+    SlotAllocator,
+)
+
+CONFIG = {"priority_by_estamento": {"estudiante": 0, "egresado": 1}, "max_requests_per_student": 3}
+
+
+def make_allocator(groups, seed=1):
+    return SlotAllocator(groups, seed=seed, config=CONFIG)
+
+
+def test_area_mismatch_is_rejected():
+    allocator = make_allocator([ActivityGroup("F1", "deportes", "futbol", 1, ((0, 8),))])
+    allocator.submit(EnrollmentRequest("s1", "cultura", "futbol"))
+    result = allocator.allocate()
+    assert result.assigned == [] and [reason for _, reason in result.rejected] == [MOTIVO_AREA]
+    assert allocator.release("s1", "futbol") == []
+    assert allocator.free("futbol") == 1
+
+
+def test_frecuencia_semanal_limits_sessions_per_area():
+    allocator = make_allocator([
+        ActivityGroup("F1", "deportes", "futbol", 5, ((0, 8), (2, 8))),
+        ActivityGroup("T1", "deportes", "tenis", 5, ((1, 8),)),
+        ActivityGroup("D1", "cultura", "danza", 5, ((3, 8), (4, 8))),
+    ])
+    for preference, (area, activity) in enumerate([("deportes", "futbol"), ("deportes", "tenis"), ("cultura", "danza")]):
+        allocator.submit(EnrollmentRequest("s1", area, activity, preference, frecuencia_semanal=2))
+    result = allocator.allocate()
+    assert sorted(assignment.group for assignment in result.assigned) == ["D1", "F1"]
+    assert allocator.waitlist("tenis") == ["s1"]
+    # Al liberar fútbol baja la carga de deportes y entra a tenis
+    assert [assignment.group for assignment in allocator.release("s1", "futbol")] == ["T1"]
+
+
+def test_schedule_conflicts_and_group_choice():
+    allocator = make_allocator([
+        ActivityGroup("F1", "deportes", "futbol", 1, ((0, 8),)),
+        ActivityGroup("F2", "deportes", "futbol", 3, ((1, 8),)),
+    ])
+    allocator.submit(EnrollmentRequest("s1", "deportes", "futbol", busy=frozenset({(1, 8)})))
+    allocator.submit(EnrollmentRequest("s2", "deportes", "futbol"))
+    allocator.allocate()
+    assert allocator.assignments_of("s1")[0].group == "F1"
+    assert allocator.assignments_of("s2")[0].group == "F2"
+
+
+def test_waitlist_refill_and_add_capacity():
+    allocator = make_allocator([ActivityGroup("D1", "cultura", "danza", 1, ((0, 8),))])
+    for student in ("s1", "s2", "s3"):
+        allocator.submit(EnrollmentRequest(student, "cultura", "danza"))
+    result = allocator.allocate()
+    assert len(result.assigned) == 1 and result.waitlisted == 2
+    first = result.assigned[0].student
+    waiting = allocator.waitlist("danza")
+    assert [assignment.student for assignment in allocator.release(first, "danza")] == waiting[:1]
+    assert [assignment.student for assignment in allocator.add_capacity("D1", 1)] == waiting[1:]
+    assert allocator.waitlist("danza") == [] and len(allocator.members("D1")) == 2
+
+
+def test_rounds_priority_and_reproducible_lottery():
+    groups = [ActivityGroup("F1", "deportes", "futbol", 2, ((0, 8),)),
+              ActivityGroup("T1", "deportes", "tenis", 1, ((1, 8),))]
+    requests = [EnrollmentRequest("e1", "deportes", "futbol", 0, estamento="egresado")]
+    requests += [EnrollmentRequest(f"s{index}", "deportes", "futbol", 1) for index in range(3)]
+    requests += [EnrollmentRequest(f"s{index}", "deportes", "tenis", 0) for index in range(3)]
+    outcomes = []
+    for _ in range(2):
+        allocator = make_allocator(groups, seed=42)
+        for request in requests:
+            allocator.submit(request)
+        outcomes.append(allocator.allocate().assigned)
+    assert outcomes[0] == outcomes[1]
+    # La primera opción del egresado va antes que la segunda de los estudiantes
+    assert any(assignment.student == "e1" for assignment in outcomes[0])
+
+
+def test_repeated_and_excess_requests():
+    allocator = make_allocator([ActivityGroup(f"G{index}", "deportes", f"a{index}", 5, ((index, 8),))
+                                for index in range(4)])
+    allocator.submit(EnrollmentRequest("s1", "deportes", "a0"))
+    allocator.submit(EnrollmentRequest("s1", "deportes", "a0", 1))
+    for index in range(1, 4):
+        allocator.submit(EnrollmentRequest("s1", "deportes", f"a{index}", index + 1))
+    result = allocator.allocate()
+    assert [reason for _, reason in result.rejected] == [MOTIVO_REPETIDA, MOTIVO_LIMITE]
+    assert len(result.assigned) == 3
@@ -0,0 +1,43 @@
+"""Caché por usuario del autorizador al recompilar"""
+
+import pytest
+
+from services.authorization import Authorizer
+
+ROLES = {
+    "estudiante": {"default_permissions": ["read_profile"], "restricted_actions": ["admin_functions"]},
+    "profesor": {"default_permissions": ["read_profile", "grade"], "restricted_actions": []},
+}
+
+
+def test_compile_keeps_registered_users():
+    authorizer = Authorizer(ROLES)
+    authorizer.user_mask("u1", "estudiante")
+    authorizer.user_mask("u2", ["estudiante", "docente"])
+
+    # Nuevo permiso al inicio: cambian los bits de los existentes
+    authorizer.compile({
+        "estudiante": {"default_permissions": ["vote", "read_profile"], "restricted_actions": []},
+        "profesor": {"default_permissions": ["grade"], "restricted_actions": []},
+    })
+    assert authorizer.user_can("u1", "vote") and authorizer.user_can("u1", "read_profile")
+    assert not authorizer.user_can("u1", "grade")
+    assert authorizer.user_can("u2", "grade")
+    assert authorizer.user_mask("u2") == authorizer.mask_for(["estudiante", "profesor"])
+
+
+def test_compile_drops_removed_roles_from_users():
+    authorizer = Authorizer(ROLES)
+    authorizer.user_mask("u1", ["estudiante", "profesor"])
+    authorizer.compile({"estudiante": ROLES["estudiante"]})
+    assert authorizer.user_can("u1", "read_profile")
+    assert not authorizer.user_can("u1", "grade")
+
+
+def test_forget_removes_user_across_compiles():
+    authorizer = Authorizer(ROLES)
+    authorizer.user_mask("u1", "estudiante")
+    authorizer.forget("u1")
+    authorizer.compile(ROLES)
+    with pytest.raises(KeyError):
+        authorizer.user_can("u1", "read_profile")
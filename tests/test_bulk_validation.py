@@ -0,0 +1,108 @@
+"""Pruebas de la validación masiva por fragmentos"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from benchmarks.data import make_people
+from services.bulk_validation import BulkValidator, to_columns, validate_columns, validate_records
+
+ENRICH = ("edad", "documento_formateado", "email_normalizado")
+
+
+@pytest.fixture(scope="module")
+def people():
+    rng = random.Random(25)
+    people = make_people(1200)
+    for person in rng.sample(people, 120):
+        field = rng.choice(("email", "cel", "numero_documento", "fecha_nacimiento", "sexo_biologico", "nombres"))
+        if field == "nombres":
+            del person[field]
+        else:
+            person[field] = {"email": "sin-arroba", "cel": "12345", "numero_documento": "12",
+                             "fecha_nacimiento": "2001-02-03", "sexo_biologico": "X"}[field]
+    return people
+
+
+def run(people, workers, source=list):
+    batches = []
+    validator = BulkValidator("estudiante", workers=workers, shard_size=250, enrich=ENRICH)
+    report = validator.run(source(people), sink=lambda start, columns: batches.append((start, columns)))
+    return report, batches
+
+
+def comparable(report):
+    return report._replace(seconds=None, worker_seconds=None, workers=None)
+
+
+@pytest.mark.parametrize("source", [list, iter], ids=["lista compartida", "fragmentos columnares"])
+def test_report_does_not_depend_on_workers(people, source):
+    serial, serial_batches = run(people, 1)
+    parallel, parallel_batches = run(people, 2, source)
+    assert comparable(parallel) == comparable(serial)
+    assert parallel_batches == serial_batches
+    assert (serial.records, serial.shards, parallel.workers) == (1200, 5, 2)
+    assert serial.valid == 1200 - len({index for index, _, _ in serial.errors})
+    assert serial.errors == sorted(serial.errors)
+    assert sum(serial.counts.values()) == len(serial.errors)
+
+
+def test_enriched_columns_follow_validity(people):
+    report, batches = run(people, 1)
+    invalid = {index for index, _, _ in report.errors}
+    assert [start for start, _ in batches] == [0, 250, 500, 750, 1000]
+    for start, columns in batches:
+        for offset, email in enumerate(columns["email_normalizado"]):
+            person = people[start + offset]
+            if start + offset in invalid:
+                assert email is None and columns["edad"][offset] is None
+            else:
+                assert email == person["email"].strip().lower()
+
+
+def test_columnar_batch_matches_records(people):
+    validator = BulkValidator("estudiante", workers=1, enrich=ENRICH)
+    chunk = people[:300] + [dict(people[0], update_date=datetime(2025, 1, 1, tzinfo=timezone.utc)),
+                            dict(people[1], fecha_nacimiento=None, update_date=None)]
+    batch = to_columns(chunk, validator.columns, validator.dated)
+    expected = validate_records(validator.validator, ENRICH, chunk, shard=3, start=900)
+    result = validate_columns(validator.validator, ENRICH, batch, shard=3, start=900)
+    assert result._replace(seconds=0) == expected._replace(seconds=0)
+
+    # Una columna con valores que no son fechas (o con zona horaria) viaja como lista sin cambios
+    packed = dict(zip(*batch))
+    assert isinstance(packed["update_date"], list)
+    assert isinstance(packed["fecha_nacimiento"], list)
+    assert ("fecha_nacimiento", "invalid_type") in expected.counts
+    assert packed["cel"] == [person.get("cel") for person in chunk]
+
+
+class Recorder:
+    """Validador que guarda los registros que recibe"""
+
+    def __init__(self, seen):
+        self.seen = seen
+
+    def validate(self, record):
+        self.seen.append(record)
+        return []
+
+
+def test_dates_round_trip_through_columns():
+    moments = [datetime(1969, 12, 31, 23, 59, 59, 999999), datetime(2025, 8, 1, 10, 30), None,
+               datetime(1970, 1, 1) + timedelta(microseconds=1)]
+    records = [{"update_date": moment, "fecha_nacimiento": moment.date() if moment else None} for moment in moments]
+    batch = to_columns(records, ["update_date", "fecha_nacimiento"])
+    assert [kind for kind, _ in batch[1]] == ["datetime", "date"]
+    seen = []
+    validate_columns(Recorder(seen), (), batch)
+    assert seen == records
+
+
+@pytest.mark.parametrize("kwargs, error", [({}, ValueError), ({"estamento": "otro"}, KeyError),
+                                           ({"area": "otra"}, KeyError),
+                                           ({"estamento": "estudiante", "enrich": ["nada"]}, ValueError)])
+def test_invalid_configuration(kwargs, error):
+    with pytest.raises(error):
+        BulkValidator(**kwargs)
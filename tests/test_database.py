@@ -0,0 +1,74 @@
+"""Pruebas de la capa de datos (SQLite en memoria y adaptación por motor)"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import pytest
+
+from services.database import PERSON_TABLE, ConnectionPool, Database, adapt_value, column_decoders
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.calls = []
+
+    def executemany(self, statement, rows):
+        self.calls.append((statement, rows))
+
+
+def person():
+    return {"numero_documento": "1065123456", "autorizacion_datos_sensibles": True,
+            "fecha_nacimiento": date(2001, 5, 4), "fecha_autorizacion": datetime(2024, 2, 1, 9, 30),
+            "confidencialidad_solicitada": False}
+
+
+def test_adapt_value_per_engine():
+    assert adapt_value(True) == 1
+    assert adapt_value(date(2001, 5, 4)) == "2001-05-04"
+    assert adapt_value(True, "postgresql") is True
+    assert adapt_value(date(2001, 5, 4), "postgresql") == date(2001, 5, 4)
+    assert adapt_value(["a", "b"], "postgresql") == '["a", "b"]'
+    assert column_decoders({"activo": "boolean", "lista": "array"}, "postgresql") == {}
+
+
+def test_postgresql_rows_keep_booleans_and_dates():
+    database = Database(ConnectionPool({"engine": "postgresql", "batch_size": 10}))
+    cursor = RecordingCursor()
+    database._execute_upserts(cursor, PERSON_TABLE, [person()])
+    statement, rows = cursor.calls[0]
+    row = dict(zip(person(), rows[0]))
+    assert "%s" in statement
+    assert row["autorizacion_datos_sensibles"] is True
+    assert row["fecha_nacimiento"] == date(2001, 5, 4)
+    assert row["confidencialidad_solicitada"] is False
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_sqlite_round_trip(in_memory, tmp_path):
+    path = ":memory:" if in_memory else str(tmp_path / "bienestar.db")
+    database = Database(ConnectionPool({"engine": "sqlite", "sqlite_path": path, "pool_size": 4}))
+    database.create_schema()
+    database.bulk_upsert(PERSON_TABLE, [person()])
+    stored = database.fetch_one(PERSON_TABLE, "1065123456")
+    # fetch_one entrega el formato de almacenamiento de SQLite
+    assert stored["autorizacion_datos_sensibles"] == 1
+    assert stored["confidencialidad_solicitada"] == 0
+    assert stored["fecha_nacimiento"] == "2001-05-04"
+    assert database.decoders(PERSON_TABLE)["autorizacion_datos_sensibles"](stored["autorizacion_datos_sensibles"]) is True
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_pool_shares_one_database_across_threads(in_memory, tmp_path):
+    path = ":memory:" if in_memory else str(tmp_path / "bienestar.db")
+    pool = ConnectionPool({"engine": "sqlite", "sqlite_path": path, "pool_size": 4})
+    # Cada conexión a :memory: sería una base distinta: el pool se limita a una
+    assert pool.size == (1 if in_memory else 4)
+    database = Database(pool)
+    database.create_schema()
+
+    def load(index):
+        database.bulk_upsert(PERSON_TABLE, [{**person(), "numero_documento": f"10651234{index:02d}"}])
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(load, range(12)))
+    assert all(database.fetch_one(PERSON_TABLE, f"10651234{index:02d}") for index in range(12))
@@ -0,0 +1,50 @@
+"""Pruebas de paridad del parser de fechas con el strptime original de safe_cast"""
+
+import random
+from datetime import datetime
+
+import pytest
+
+import utils
+
+# Comportamiento original de safe_cast(valor, datetime)
+FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y')
+BASES = ("2024-01-02 03:04:05", "2024-12-31 23:59:59", "2024-01-02", "02/01/2024", "02-01-2024")
+ALPHABET = "0123456789-/: .+TZ"
+
+
+def strptime_reference(value: str):
+    for fmt in FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def fuzzed(seed: int, count: int):
+    rng = random.Random(seed)
+    values = []
+    for _ in range(count):
+        value = list(rng.choice(BASES))
+        for _ in range(rng.randint(0, 3)):
+            value[rng.randrange(len(value))] = rng.choice(ALPHABET)
+        values.append("".join(value))
+    return values
+
+
+@pytest.mark.parametrize("value", ["2024-01-02 03:04+05", "2024-01-02 03-04:05", "2028-01-02 03:04.05",
+                                   "2024-01-02T03:04:05", "2024-1-2 3:4:5", "2-1-2024", "2024-02-30"])
+def test_edge_cases_match_strptime(value):
+    assert utils.safe_cast(value, datetime) == strptime_reference(value)
+    assert utils.DateTimeParser().parse(value) == strptime_reference(value)
+
+
+def test_fuzzed_values_match_strptime():
+    values = fuzzed(6, 50_000)
+    expected = [strptime_reference(value) for value in values]
+    assert [utils.safe_cast(value, datetime) for value in values] == expected
+    # La columna fija el primer formato detectado y usa los atajos en los siguientes valores
+    assert utils.DateTimeParser().parse_column(values) == expected
+    for parsed in utils.parse_datetime_column(values):
+        assert parsed is None or parsed.tzinfo is None
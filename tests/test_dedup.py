@@ -0,0 +1,97 @@
+"""Pruebas de la detección incremental de duplicados"""
+
+import pytest
+
+from benchmarks.data import make_duplicate_feed
+from services.dedup import KEYS, DedupEngine, phonetic_key, score_pair
+
+
+@pytest.fixture(scope="module")
+def feed():
+    return make_duplicate_feed(600, duplicate_rate=0.1)
+
+
+def pair_set(matches):
+    return {frozenset((match.first, match.second)) for match in matches}
+
+
+def sorted_clusters(engine):
+    return sorted(sorted(cluster) for cluster in engine.clusters())
+
+
+def test_incremental_batches_match_single_batch(feed):
+    people, _ = feed
+    single = DedupEngine(workers=1)
+    report = single.add_batch(people, "id")
+    incremental = DedupEngine(workers=1)
+    reports = [incremental.add_batch(people[start:start + 150], "id") for start in range(0, len(people), 150)]
+
+    assert pair_set(incremental.matches) == pair_set(single.matches) == pair_set(report.matches)
+    assert sum(batch.candidates for batch in reports) == report.candidates
+    assert sorted_clusters(incremental) == sorted_clusters(single)
+
+
+def test_finds_true_duplicates_and_compares_each_pair_once(feed):
+    people, pairs = feed
+    engine = DedupEngine(workers=1)
+    report = engine.add_batch(people, "id")
+    assert {frozenset(pair) for pair in pairs} <= pair_set(report.matches)
+
+    # Cada par que comparte un bloque activo se compara una sola vez
+    features = engine.features
+    sharing = sum(1 for second in range(len(features)) for first in range(second)
+                  if features[first][KEYS] & features[second][KEYS])
+    assert report.candidates == sharing
+
+    # El bloqueo no pierde pares sobre el umbral frente a comparar todos
+    brute = {frozenset((engine.ids[first], engine.ids[second]))
+             for second in range(len(features)) for first in range(second)
+             if score_pair(features[first], features[second]) >= engine.threshold}
+    assert pair_set(report.matches) == brute
+
+
+def test_parallel_scoring_matches_serial(feed):
+    people, _ = feed
+    serial = DedupEngine(workers=1)
+    expected = serial.add_batch(people, "id")
+    parallel = DedupEngine(workers=2)
+    parallel.min_parallel_pairs = 0
+    report = parallel.add_batch(people, "id")
+    assert report.candidates == expected.candidates
+    assert pair_set(parallel.matches) == pair_set(serial.matches)
+
+
+def test_save_and_load_continue_incrementally(feed, tmp_path):
+    people, _ = feed
+    single = DedupEngine(workers=1)
+    single.add_batch(people, "id")
+
+    first = DedupEngine(workers=1)
+    first.add_batch(people[:300], "id")
+    path = str(tmp_path / "dedup.pkl")
+    first.save(path)
+    loaded = DedupEngine.load(path, workers=1)
+    loaded.add_batch(people[300:], "id")
+    assert pair_set(loaded.matches) == pair_set(single.matches)
+    assert sorted_clusters(loaded) == sorted_clusters(single)
+
+
+def test_repeated_ids_are_skipped(feed):
+    people, _ = feed
+    engine = DedupEngine(workers=1)
+    engine.add_batch(people[:100], "id")
+    report = engine.add_batch(people[:100], "id")
+    assert (report.records, report.candidates, report.matches) == (0, 0, [])
+    assert len(engine) == 100
+
+
+def test_phonetic_variants_share_key():
+    assert phonetic_key("vasquez") == phonetic_key("basques")
+    engine = DedupEngine(workers=1)
+    report = engine.add_batch([
+        {"id": 1, "nombres": "Ana María", "apellidos": "Vásquez Pérez", "fecha_nacimiento": "2001-03-04"},
+        {"id": 2, "nombres": "ANA MARIA", "apellidos": "Basques Perez", "fecha_nacimiento": "2001-03-04"},
+        {"id": 3, "nombres": "Luis", "apellidos": "Torres", "fecha_nacimiento": "2001-03-04"},
+    ], "id")
+    assert engine.cluster_of(1) == [1, 2]
+    assert [(match.first, match.second) for match in report.matches] == [(1, 2)]
@@ -0,0 +1,60 @@
+"""Pruebas de los índices de identidad"""
+
+import json
+
+from services.identity import IDENTITY_CONFLICT, IdentityIndex
+from services.importer import ImportPipeline
+from tests.test_importer import STUDENT, write_csv
+
+
+def test_import_sink_rejects_only_conflicting_rows():
+    index = IdentityIndex()
+    conflicts = []
+    sink = index.import_sink("estudiante", conflicts=conflicts)
+    batch = [
+        {"numero_documento": "1065123456", "email": "ana@upc.edu.co", "codigo_estudiante": "e1"},
+        {"numero_documento": "1065999999", "email": "ANA@upc.edu.co "},
+        {"numero_documento": "1065555555", "codigo_estudiante": "E1"},
+        {"numero_documento": "1065888888", "email": "luis@upc.edu.co"},
+    ]
+    rejected = sink(batch)
+    assert [record["numero_documento"] for record in batch] == ["1065123456", "1065888888"]
+    assert all("codigo_usuario" in record for record in batch)
+    assert rejected == [(1, [("email", IDENTITY_CONFLICT)]), (2, [("codigo_estudiante", IDENTITY_CONFLICT)])]
+    assert [(conflict["field"], conflict["owner"]) for conflict in conflicts] == [
+        ("email", "1.065.123.456"), ("codigo_estudiante", "1.065.123.456")]
+    assert len(index) == 2
+    # El segundo bloque sigue indexándose
+    second = [{"numero_documento": "1065777777"}]
+    sink(second)
+    assert index.find_by_document("1065777777") == IdentityIndex.normalize("numero_documento", "1065777777")
+
+
+def test_build_reports_conflicts_without_writing_codes():
+    index = IdentityIndex()
+    records = [{"numero_documento": "2000", "email": "a@upc.edu.co"}, {"numero_documento": "3000", "email": "a@upc.edu.co"}]
+    conflicts = index.build(records, "estudiante")
+    assert [conflict["field"] for conflict in conflicts] == ["email"]
+    assert all("codigo_usuario" not in record for record in records)
+
+
+def test_pipeline_counts_identity_conflicts_as_rejected(tmp_path):
+    index = IdentityIndex()
+    rows = [
+        STUDENT,
+        dict(STUDENT, numero_documento="1065999999"),  # email de otra persona
+        dict(STUDENT, numero_documento="1065888888", email="luis@upc.edu.co"),
+        dict(STUDENT, numero_documento="1065777777", email="mal", sexo_biologico="X"),  # inválido
+    ]
+    error_path = tmp_path / "errores.jsonl"
+    pipeline = ImportPipeline.for_estamento("estudiante", sink=index.import_sink("estudiante"),
+                                            error_path=str(error_path), chunk_size=2)
+    report = pipeline.run(write_csv(tmp_path / "entrada.csv", rows))
+
+    assert (report.accepted, report.rejected) == (2, 2)
+    assert report.stages["sink"].rows_in == 3 and report.stages["sink"].rows_out == 2
+    assert len(index) == 2
+    errors = [json.loads(line) for line in error_path.read_text(encoding="utf-8").splitlines()]
+    conflict = next(error for error in errors if error["line"] == 2)
+    assert conflict["errors"] == [["email", IDENTITY_CONFLICT]]
+    assert conflict["record"]["numero_documento"] == "1065999999"
@@ -0,0 +1,84 @@
+"""Pipeline de importación por flujo"""
+
+import csv
+import json
+
+import pytest
+
+from services.importer import BOOLEAN_VALUES, ImportPipeline, build_caster
+
+STUDENT = {
+    "tipo_documento": "CC", "numero_documento": "1065123456", "nombres": "Ana", "apellidos": "Díaz",
+    "sexo_biologico": "Femenino", "identidad_genero": "Mujer", "expresion_genero": "Femenina",
+    "orientacion_sexual": "Prefiero no responder", "pronombres_preferidos": "ella/ella",
+    "fecha_nacimiento": "2003-05-17", "email": "ana.diaz@upc.edu.co", "cel": "3001234567",
+    "update_date": "2025-02-01 10:00:00", "autorizacion_datos_sensibles": "si",
+    "fecha_autorizacion": "2025-02-01 10:00:00", "programa_academico": "Ingeniería de Sistemas",
+    "facultad": "Ingenierías", "promedio": "4.1",
+}
+
+INCLUSION = {"fecha_caracterizacion": "2025-02-01 10:00:00", "protocolos_atencion": "Ruta de atención"}
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=sorted({key for row in rows for key in row}))
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+def run_pipeline(pipeline_factory, rows, tmp_path):
+    accepted = []
+    error_path = tmp_path / "errores.jsonl"
+    pipeline = pipeline_factory(sink=accepted.extend, error_path=str(error_path))
+    report = pipeline.run(write_csv(tmp_path / "entrada.csv", rows))
+    errors = [json.loads(line) for line in error_path.read_text(encoding="utf-8").splitlines()]
+    return report, accepted, errors
+
+
+@pytest.mark.parametrize("text, expected", [("si", True), ("Sí", True), ("TRUE", True), ("1", True),
+                                            ("no", False), ("false", False), ("0", False)])
+def test_boolean_vocabulary(text, expected):
+    assert build_caster("boolean")(text) is expected
+    assert build_caster("boolean")(expected) is expected
+
+
+@pytest.mark.parametrize("value", ["maybe", "no sé", "2", 2, 0.5, "x"])
+def test_boolean_rejects_unknown_values(value):
+    assert build_caster("boolean")(value) is None
+
+
+def test_required_consent_must_be_explicit(tmp_path):
+    rows = [STUDENT, {**STUDENT, "autorizacion_datos_sensibles": "maybe"},
+            {**STUDENT, "autorizacion_datos_sensibles": "No"}]
+    report, accepted, errors = run_pipeline(lambda **kwargs: ImportPipeline.for_estamento("estudiante", **kwargs),
+                                            rows, tmp_path)
+    assert (report.accepted, report.rejected) == (2, 1)
+    assert [record["autorizacion_datos_sensibles"] for record in accepted] == [True, False]
+    assert errors[0]["line"] == 2
+    assert errors[0]["errors"] == [["autorizacion_datos_sensibles", "invalid_type"]]
+    assert isinstance(accepted[0]["promedio"], float)
+
+
+def test_multivalued_choices_are_split(tmp_path):
+    rows = [{**INCLUSION, "poblacion_diferencial": value}
+            for value in ("LGBTIQ+;Migrante", "Indígena", "Migrante;Marciana")]
+    report, accepted, errors = run_pipeline(
+        lambda **kwargs: ImportPipeline.for_area("diversidad_inclusion", **kwargs), rows, tmp_path)
+    assert (report.accepted, report.rejected) == (2, 1)
+    assert [record["poblacion_diferencial"] for record in accepted] == [["LGBTIQ+", "Migrante"], "Indígena"]
+    assert errors[0]["errors"] == [["poblacion_diferencial", "invalid_enum"]]
+
+
+def test_cultura_activities_from_csv(tmp_path):
+    row = {"registro_programa_academico": "Ingeniería de Sistemas", "facultad_inscrito": "Ingenierías",
+           "promedio_academico": "3.8", "actividades_disponibles": "Danza; Teatro"}
+    report, accepted, errors = run_pipeline(lambda **kwargs: ImportPipeline.for_area("cultura", **kwargs),
+                                            [row], tmp_path)
+    assert errors == [] and report.accepted == 1
+    assert accepted[0]["actividades_disponibles"] == ["Danza", "Teatro"]
+
+
+def test_boolean_vocabulary_is_lowercase():
+    assert all(key == key.strip().lower() for key in BOOLEAN_VALUES)
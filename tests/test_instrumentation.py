@@ -0,0 +1,21 @@
+"""Hilos periódicos de la instrumentación"""
+
+import pytest
+
+from services import instrumentation
+
+
+def test_periodic_thread_requires_tick():
+    class Incomplete(instrumentation._PeriodicThread):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(1, "incompleto")
+
+
+def test_metrics_logger_ticks_on_stop():
+    lines = []
+    logger = instrumentation.MetricsLogger(interval=3600, metrics=instrumentation.MetricsRegistry())
+    logger.tick = lambda: lines.append("tick")
+    logger.start().stop()
+    assert lines == ["tick"]
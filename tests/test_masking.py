@@ -0,0 +1,38 @@
+"""Pruebas del enmascaramiento de datos sensibles"""
+
+from services.masking import SMALL_CELL_VALUE, MaskingStage, compile_policy
+
+
+def person(documento, poblacion, autorizo=True):
+    return {"numero_documento": documento, "nombres": "Ana", "poblacion_diferencial": poblacion,
+            "autorizacion_datos_sensibles": autorizo, "confidencialidad_solicitada": False}
+
+
+def test_multivalued_small_cells_are_grouped_per_value():
+    stage = MaskingStage(compile_policy(threshold=2), key="clave")
+    records = [
+        person("1001", ["Afrodescendiente", "Migrante"]),
+        person("1002", ["Afrodescendiente"]),
+        person("1003", ["Indígena", "Adulto mayor"]),
+        person("1004", ["Víctima del conflicto"], autorizo=False),
+        person("1005", []),
+    ]
+    masked = stage.mask_records(records)
+    assert [record.get("poblacion_diferencial") for record in masked] == [
+        ["Afrodescendiente", SMALL_CELL_VALUE], ["Afrodescendiente"], [SMALL_CELL_VALUE], None, []]
+    assert all("nombres" not in record for record in masked)
+    assert records[0]["poblacion_diferencial"] == ["Afrodescendiente", "Migrante"]
+
+
+def test_multivalued_values_are_pseudonymized_per_item():
+    stage = MaskingStage(compile_policy(threshold=2, overrides={"poblacion_diferencial": "pseudonym"}), key="clave")
+    masked = stage.mask_records([person("1001", ["Migrante", "Indígena"]), person("1002", ["Migrante"])])
+    first, second = (record["poblacion_diferencial"] for record in masked)
+    assert len(first) == 2 and first[0] == second[0] and "Migrante" not in first
+
+
+def test_small_scalar_cells_are_suppressed_when_the_group_is_small():
+    stage = MaskingStage(compile_policy(threshold=2), key="clave")
+    records = [dict(person(str(index), None), identidad_genero=value)
+               for index, value in enumerate(["Mujer", "Mujer", "Hombre"])]
+    assert [record.get("identidad_genero") for record in stage.mask_records(records)] == ["Mujer", "Mujer", None]
@@ -0,0 +1,29 @@
+"""Pruebas del versionado del esquema y la actualización perezosa"""
+
+import json
+
+from models.data_dictionary import SCHEMA_VERSION
+from models.migrations import (BASE_VERSION, MIGRATIONS, Migration, RecordEnvelope, SchemaMigrator, add_default,
+                               rename)
+
+
+def test_current_schema_has_no_history():
+    assert SCHEMA_VERSION == BASE_VERSION + len(MIGRATIONS)
+
+
+def test_unenveloped_record_is_not_migrated():
+    record = {"numero_documento": "1065123456", "identidad_genero": "Otro"}
+    envelope = RecordEnvelope.from_json(json.dumps(record))
+    migrator = SchemaMigrator()
+    assert migrator.read(envelope) == record
+    assert "confidencialidad_solicitada" not in migrator.read(envelope)
+
+
+def test_declared_history_is_applied_once():
+    history = (Migration(2, "ejemplo", (rename("telefono", "cel"),)),
+               Migration(3, "ejemplo", (add_default("activo", True),)))
+    migrator = SchemaMigrator(history, current=3)
+    upgraded = migrator.upgrade({"telefono": "3001234567"}, 1)
+    assert upgraded == {"cel": "3001234567", "activo": True}
+    assert migrator.upgrade(upgraded, 3) is upgraded
+    assert migrator.renames(1) == {"telefono": "cel"}
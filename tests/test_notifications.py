@@ -0,0 +1,59 @@
+"""Mensajes SMTP del despachador de notificaciones"""
+
+import email
+import re
+import smtplib
+from email import policy
+
+import pytest
+
+from services.notifications import (
+    LocalSMTPServer,
+    Notification,
+    NotificationDispatcher,
+    SMTPConnectionPool,
+    TemplateRegistry,
+)
+
+BARE_LF = re.compile(rb"(?<!\r)\n")
+BODY = "Hola $nombre,\r\n\r\n" + "Línea larga con tildes: áéíóú ñ " * 8 + "\rfin\n" + "x" * 200
+
+
+def make_dispatcher(config):
+    templates = TemplateRegistry({"prueba": ("Aviso de $nombre ñ", BODY)})
+    config = {**config, "sender": "bienestar@upc.edu.co", "pool_size": 1, "max_retries": 0}
+    return NotificationDispatcher(SMTPConnectionPool(config), templates, config)
+
+
+def test_messages_use_crlf_only():
+    with LocalSMTPServer() as server:
+        dispatcher = make_dispatcher(server.config)
+        try:
+            report = dispatcher.send_many([Notification("ana@upc.edu.co", "prueba", {"nombre": "Ana"})])
+        finally:
+            dispatcher.close()
+        assert report.sent == 1
+        data = server.messages[0][2]
+    assert not BARE_LF.search(data)
+    assert all(len(line) <= 78 for line in data.split(b"\r\n"))
+    message = email.message_from_bytes(data, policy=policy.SMTP)
+    assert message["Subject"] == "Aviso de Ana ñ"
+    expected = BODY.replace("$nombre", "Ana").replace("\r\n", "\n").replace("\r", "\n")
+    assert message.get_content().replace("\r\n", "\n").rstrip("\n") == expected
+
+
+def test_build_message_without_line_breaks():
+    dispatcher = make_dispatcher({"smtp_server": "localhost", "smtp_port": 25})
+    dispatcher.templates.register("larga", "Asunto", "y" * 300)
+    data = dispatcher.build_message(Notification("ana@upc.edu.co", "larga", {}))
+    assert not BARE_LF.search(data)
+    assert b"=\r\n" in data
+
+
+def test_local_server_rejects_bare_lf():
+    with LocalSMTPServer() as server:
+        with smtplib.SMTP(server.config["smtp_server"], server.config["smtp_port"]) as connection:
+            with pytest.raises(smtplib.SMTPDataError):
+                connection.sendmail("a@upc.edu.co", ["b@upc.edu.co"], b"Subject: x\r\n\r\nuno\ndos\r\n")
+            connection.sendmail("a@upc.edu.co", ["b@upc.edu.co"], b"Subject: x\r\n\r\nuno\r\n")
+        assert len(server.messages) == 1
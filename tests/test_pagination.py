@@ -0,0 +1,54 @@
+"""Pruebas de la paginación por cursor y de paginate_results"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import utils
+
+
+def pages(source_factory, sort_key, per_page):
+    cursor, result = None, []
+    while True:
+        page = utils.paginate_cursor(source_factory(), sort_key, cursor, per_page)
+        result.append(page['data'])
+        cursor = page['pagination']['next_cursor']
+        if cursor is None:
+            return result
+
+
+@pytest.mark.parametrize("factory", [list, iter])
+def test_tuple_sort_key_with_datetimes(factory):
+    start = datetime(2024, 1, 1)
+    records = sorted(({"update_date": start + timedelta(hours=index // 3), "numero_documento": f"{index % 7:04d}"}
+                      for index in range(50)), key=lambda record: (record["update_date"], record["numero_documento"]))
+
+    def key(record):
+        return record["update_date"], record["numero_documento"]
+
+    result = pages(lambda: factory(records), key, 4)
+    assert [record for page in result for record in page] == records
+
+
+@pytest.mark.parametrize("value", [datetime(2024, 5, 1, 8, 30), date(2024, 5, 1), ("a", 3),
+                                   (datetime(2024, 5, 1), "1065"), [1, (2, date(2020, 1, 1))], "texto", 7])
+def test_cursor_round_trip(value):
+    assert utils.decode_cursor(utils.encode_cursor(value, 2)) == (value, 2)
+
+
+def test_invalid_cursor():
+    with pytest.raises(ValueError):
+        utils.decode_cursor(utils.encode_cursor(1).upper())
+
+
+@pytest.mark.parametrize("page", [-1, 0, 1, 2, 3, 4, 5])
+def test_paginate_results_matches_slicing(page):
+    data = list(range(23))
+    result = utils.paginate_results(data, page, 10)
+    assert result['data'] == (data[(page - 1) * 10:page * 10] if page >= 1 else [])
+    assert result['pagination']['total_pages'] == 3
+    assert result['pagination']['has_next'] == (page < 3)
+    generated = utils.paginate_results(iter(data), page, 10)
+    assert generated['data'] == result['data']
+    assert generated['pagination']['has_next'] == (1 <= page < 3)
+    assert generated['pagination']['total_items'] is None
@@ -0,0 +1,70 @@
+"""Contadores de la cola de PQRS"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.pqrs_queue import ESTADO_ERROR, ESTADO_RESPONDIDA, PQRSQueue
+
+
+def run_queue(handler, requests):
+    async def main():
+        queue = PQRSQueue(handler, max_concurrency=2, maxsize=10)
+        await queue.start()
+        for pqrs in requests:
+            await queue.submit(pqrs)
+        await queue.stop()
+        return queue.stats()
+
+    return asyncio.run(main())
+
+
+def test_non_datetime_answer_counts_once():
+    async def handler(pqrs):
+        pqrs["fecha_respuesta"] = pqrs["respuesta_manual"]
+
+    requests = [{"tipo_solicitud": "Petición", "fecha_solicitud": datetime.now(), "respuesta_manual": value}
+                for value in ("2026-01-01", None, datetime.now())]
+    stats = run_queue(handler, requests)
+    assert (stats["processed"], stats["failed"], stats["overdue"]) == (3, 0, 0)
+    assert all(pqrs["estado_pqrs"] == ESTADO_RESPONDIDA for pqrs in requests)
+    assert requests[0]["fecha_respuesta"] == "2026-01-01"
+    assert isinstance(requests[1]["fecha_respuesta"], datetime)
+
+
+def test_unanswered_record_gets_fecha_respuesta():
+    async def handler(pqrs):
+        return None
+
+    old = datetime.now() - timedelta(days=400)
+    requests = [{"tipo_solicitud": "Petición", "fecha_solicitud": old, "fecha_respuesta": None},
+                {"tipo_solicitud": "Petición", "fecha_solicitud": datetime.now(), "fecha_respuesta": None}]
+    stats = run_queue(handler, requests)
+    assert (stats["processed"], stats["failed"], stats["overdue"]) == (2, 0, 1)
+    assert all(isinstance(pqrs["fecha_respuesta"], datetime) for pqrs in requests)
+
+
+def test_submit_before_start_raises_runtime_error():
+    async def handler(pqrs):
+        return None
+
+    queue = PQRSQueue(handler, max_concurrency=1, maxsize=1)
+    with pytest.raises(RuntimeError):
+        queue.submit_nowait({"tipo_solicitud": "Petición"})
+    with pytest.raises(RuntimeError):
+        asyncio.run(queue.submit({"tipo_solicitud": "Petición"}))
+
+
+def test_failures_and_overdue():
+    async def handler(pqrs):
+        if pqrs["tipo_solicitud"] == "Queja":
+            raise ValueError("sin respuesta")
+
+    old = datetime.now() - timedelta(days=400)
+    requests = [{"tipo_solicitud": "Queja", "fecha_solicitud": old},
+                {"tipo_solicitud": "Petición", "fecha_solicitud": old},
+                {"tipo_solicitud": "Petición", "fecha_solicitud": datetime.now()}]
+    stats = run_queue(handler, requests)
+    assert (stats["processed"], stats["failed"], stats["overdue"]) == (2, 1, 1)
+    assert requests[0]["estado_pqrs"] == ESTADO_ERROR
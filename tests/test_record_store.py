@@ -0,0 +1,113 @@
+"""Pruebas del almacén columnar de personas"""
+
+from datetime import date, datetime
+
+import pytest
+
+from benchmarks.data import make_people
+from models.record_store import (CategoryColumn, DigitTextColumn, PackedTextColumn, RecordStore,
+                                 UNIQUE_TEXT_VARIABLES)
+
+
+@pytest.fixture
+def store():
+    store = RecordStore.for_estamento("estudiante")
+    store.extend(make_people(50))
+    return store
+
+
+def test_rows_round_trip(store):
+    people = make_people(50)
+    assert [store.to_dict(index) for index in range(len(store))] == people
+    assert dict(store[-1]) == people[-1]
+
+
+def test_row_behaves_like_dict(store):
+    row = store[0]
+    assert "nombre_social" not in row
+    assert row.get("nombre_social") is None
+    row["nombre_social"] = "Sam"
+    assert row["nombre_social"] == "Sam"
+    del row["nombre_social"]
+    with pytest.raises(KeyError):
+        row["nombre_social"]
+    with pytest.raises(KeyError):
+        del row["nombre_social"]
+    with pytest.raises(KeyError):
+        row["variable_inexistente"] = 1
+
+
+def test_update_is_atomic_on_invalid_enum(store):
+    before = store.to_dict(3)
+    with pytest.raises(ValueError):
+        store.update(3, {"nombres": "Otro", "email": "otro@upc.edu.co", "cel": "3000000000",
+                         "semestre": 9, "sexo_biologico": "no permitido"})
+    assert store.to_dict(3) == before
+
+
+def test_update_is_atomic_on_unknown_variable(store):
+    before = store.to_dict(3)
+    with pytest.raises(KeyError):
+        store.update(3, {"nombres": "Otro", "variable_inexistente": 1})
+    assert store.to_dict(3) == before
+
+
+def test_update_writes_all_changes(store):
+    store.update(-1, {"nombres": "Otro", "email": None, "cel": "0300", "fecha_nacimiento": datetime(2000, 2, 29, 10)})
+    row = store.to_dict(len(store) - 1)
+    assert row["nombres"] == "Otro"
+    assert "email" not in row
+    assert row["cel"] == "0300"
+    assert row["fecha_nacimiento"] == date(2000, 2, 29)
+    with pytest.raises(IndexError):
+        store.update(len(store), {"nombres": "Otro"})
+
+
+def test_append_rolls_back_partial_row(store):
+    size = len(store)
+    record = dict(make_people(1, seed=7)[0], numero_documento="CE-123", sexo_biologico="no permitido")
+    with pytest.raises(ValueError):
+        store.append(record)
+    assert len(store) == size
+    assert all(len(column) == size for column in store.columns.values())
+    assert store.columns["numero_documento"].overflow == {}
+    record["sexo_biologico"] = store[0]["sexo_biologico"]
+    assert store.to_dict(store.append(record)) == record
+
+
+@pytest.mark.parametrize("value", ["0123", "1065", "0", "CE-4455", "١٢٣", "9" * 19, 1065])
+def test_digit_text_round_trip(value):
+    column = DigitTextColumn("numero_documento")
+    column.append("1")
+    column.append(value)
+    column.append(None)
+    assert [column.get(index) for index in range(3)] == ["1", value, None]
+    column.set(1, "42")
+    assert column.get(1) == "42" and column.overflow == {}
+
+
+@pytest.mark.parametrize("value", ["", "a@upc.edu.co", "ñandú@upc.edu.co", "x" * 300, "\ud800", 7])
+def test_packed_text_round_trip(value):
+    column = PackedTextColumn("email")
+    for stored in ("primero@upc.edu.co", value, None):
+        column.append(stored)
+    assert [column.get(index) for index in range(3)] == ["primero@upc.edu.co", value, None]
+    column.set(0, value)
+    assert column.get(0) == value and column.get(1) == value
+    assert "email" in UNIQUE_TEXT_VARIABLES
+
+
+def test_category_column_widens_codes():
+    column = CategoryColumn("nombres")
+    values = [f"nombre {index}" for index in range(300)] + [None, ["a", "b"]]
+    for value in values:
+        column.append(value)
+    assert column.values.typecode == "H"
+    assert [column.get(index) for index in range(len(values))] == values
+    assert column.get(0) is column.get(0)
+
+
+def test_memory_per_record():
+    store = RecordStore.for_estamento("estudiante")
+    store.extend(make_people(5000))
+    assert store.memory_per_record() < 140
@@ -0,0 +1,56 @@
+"""Pruebas del ranking BM25 con poda top-k de PQRSSearchIndex"""
+
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from services.search import PQRSSearchIndex, tokenize
+
+VOCABULARY = [f"termino{index}x" for index in range(60)]
+ESTADOS = ["Radicada", "En trámite", "Cerrada"]
+
+
+def brute_force(index: PQRSSearchIndex, tickets, query: str, where=None):
+    """Puntaje BM25 de cada PQRS que contiene algún término de la consulta"""
+    documents = [(ticket_id, Counter(tokenize(pqrs["descripcion"])), pqrs["estado_pqrs"])
+                 for ticket_id, pqrs in tickets.items()]
+    average = sum(sum(counts.values()) for _, counts, _ in documents) / len(documents)
+    frequencies = Counter(term for _, counts, _ in documents for term in counts)
+    scores = {}
+    for ticket_id, counts, estado in documents:
+        if where and estado != where["estado_pqrs"]:
+            continue
+        length = sum(counts.values())
+        score = 0.0
+        for term, query_frequency in Counter(tokenize(query)).items():
+            tf = counts.get(term, 0)
+            if not tf:
+                continue
+            n = frequencies[term]
+            idf = math.log(1 + (len(documents) - n + 0.5) / (n + 0.5)) * query_frequency
+            score += idf * (index.k1 + 1) * tf / (tf + index.k1 * (1 - index.b + index.b * length / average))
+        if score > 0:
+            scores[ticket_id] = score
+    return scores
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_search_matches_brute_force(seed):
+    rng = random.Random(seed)
+    vocabulary = VOCABULARY[:rng.randint(5, len(VOCABULARY))]
+    tickets = {ticket_id: {"descripcion": " ".join(rng.choices(vocabulary, k=rng.randint(1, 30))),
+                           "estado_pqrs": rng.choice(ESTADOS)}
+               for ticket_id in range(rng.randint(5, 80))}
+    index = PQRSSearchIndex()
+    index.build(({"id": ticket_id, **pqrs} for ticket_id, pqrs in tickets.items()))
+    query = " ".join(rng.choices(vocabulary, k=rng.randint(1, 12)))
+    where = {"estado_pqrs": rng.choice(ESTADOS)} if rng.random() < 0.5 else None
+    k = rng.randint(1, 6)
+
+    expected = sorted(brute_force(index, tickets, query, where).values(), reverse=True)[:k]
+    hits = index.search(query, k=k, where=where, max_terms=None)
+    assert len(hits) == len(expected)
+    for hit, score in zip(hits, expected):
+        assert hit.score == pytest.approx(score, rel=1e-9)
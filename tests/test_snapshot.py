@@ -0,0 +1,74 @@
+"""Snapshot precompilado del diccionario"""
+
+import pytest
+
+from models import snapshot as snapshot_module
+from models.data_dictionary import DataDictionary, DataDictionaryView
+from models.migrations import __file__ as migrations_file
+from models.snapshot import SOURCE_MODULES, SnapshotError, build_snapshot, load_snapshot
+from models.validators import compile_schema
+
+VALID = {"tipo_documento": "CC", "numero_documento": "1065123456", "email": "ana@upc.edu.co"}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "dictionary.snapshot")
+
+
+def test_round_trip_matches_source(path):
+    source = DataDictionaryView(DataDictionary())
+    snapshot = build_snapshot(path)
+    try:
+        view = DataDictionaryView(snapshot.data_dictionary())
+        assert view.get_variables_by_estamento("estudiante") == source.get_variables_by_estamento("estudiante")
+        assert view.get_obligatory_variables() == source.get_obligatory_variables()
+        assert view.schema_version == source.schema_version
+        expected = compile_schema(source).for_estamento("estudiante")
+        validator = snapshot.validator("estamentos", "estudiante")
+        assert validator.required == expected.required
+        assert validator.validate(VALID) == expected.validate(VALID)
+        assert snapshot.enum_table("estamentos", "estudiante", "tipo_documento")[0] is None
+    finally:
+        snapshot.close()
+
+
+def test_sections_decode_lazily(path):
+    build_snapshot(path).close()
+    snapshot = load_snapshot(path, rebuild=False)
+    try:
+        snapshot.validator("areas", "cultura")
+        assert set(snapshot._sections) == {"required", "spec/areas/cultura"}
+    finally:
+        snapshot.close()
+
+
+def test_migrations_module_is_part_of_source_hash():
+    assert migrations_file in {module.__file__ for module in SOURCE_MODULES}
+
+
+def test_stale_or_damaged_snapshot_is_rebuilt(path, monkeypatch):
+    build_snapshot(path).close()
+    monkeypatch.setattr(snapshot_module, "source_hash", lambda: "otro")
+    with pytest.raises(SnapshotError):
+        load_snapshot(path, rebuild=False)
+    rebuilt = load_snapshot(path)
+    assert rebuilt.source_hash == "otro"
+    rebuilt.close()
+
+    with open(path, "r+b") as handle:
+        handle.seek(-1, 2)
+        last = handle.read(1)
+        handle.seek(-1, 2)
+        handle.write(bytes([last[0] ^ 0xFF]))
+    damaged = load_snapshot(path)
+    try:
+        with pytest.raises(SnapshotError):
+            damaged.compiled_schema()
+    finally:
+        damaged.close()
+
+
+def test_missing_file(path):
+    with pytest.raises(SnapshotError):
+        load_snapshot(path, rebuild=False)
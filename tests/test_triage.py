@@ -0,0 +1,169 @@
+"""Pruebas del montículo indexado y de la cola de triaje"""
+
+import random
+from datetime import datetime, timedelta
+from heapq import heappop, heappush
+
+import pytest
+
+from services.triage import IndexedHeap, TriagePolicy, TriageQueue
+
+CONFIG = {
+    "nivel_urgencia": {"Crítica": 60, "Alta": 40, "Media": 20, "Baja": 5},
+    "estado_socioeconomico": {"Estrato 1": 20, "Estrato 2": 15},
+    "tipo_asistencia": {"Alimentaria": 15, "Salud": 12, "Transporte": 5},
+    "tipo_asistencia_default": 3,
+    "aging_per_day": 2.0,
+}
+
+
+class LazyHeap:
+    """Referencia con heapq: las llaves viejas se descartan al sacarlas"""
+
+    def __init__(self):
+        self.heap = []
+        self.keys = {}
+
+    def push(self, item, key):
+        self.keys[item] = key
+        heappush(self.heap, (key, item))
+
+    def remove(self, item):
+        return self.keys.pop(item)
+
+    def pop(self):
+        while True:
+            key, item = heappop(self.heap)
+            if self.keys.get(item) == key:
+                del self.keys[item]
+                return item, key
+
+    def smallest(self, k):
+        return sorted(((item, key) for item, key in self.keys.items()), key=lambda pair: pair[1])[:k]
+
+
+def assert_heap_invariant(heap):
+    keys = heap._keys
+    for index in range(1, len(keys)):
+        assert not keys[index] < keys[(index - 1) >> 1]
+    assert all(heap._items[position] == item for item, position in heap._positions.items())
+    assert len(heap._positions) == len(heap._items)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_indexed_heap_matches_heapq(seed):
+    rng = random.Random(seed)
+    heap, reference = IndexedHeap(), LazyHeap()
+    for step in range(2000):
+        operation = rng.random()
+        # Llaves (valor, desempate) únicas para que el orden esté definido
+        key = (rng.randint(0, 50), step)
+        if operation < 0.4 or not reference.keys:
+            item = rng.randrange(300)
+            heap.push(item, key)
+            reference.push(item, key)
+        elif operation < 0.6:
+            item = rng.choice(list(reference.keys))
+            heap.update(item, key)
+            reference.push(item, key)
+        elif operation < 0.75:
+            item = rng.choice(list(reference.keys))
+            assert heap.remove(item) == reference.remove(item)
+        elif operation < 0.9:
+            assert heap.pop() == reference.pop()
+        else:
+            k = rng.randint(0, 10)
+            assert heap.smallest(k) == reference.smallest(k)
+        assert len(heap) == len(reference.keys)
+        assert_heap_invariant(heap)
+    while reference.keys:
+        assert heap.peek() == reference.smallest(1)[0]
+        assert heap.pop() == reference.pop()
+    assert heap.peek() is None
+
+
+def test_indexed_heap_errors():
+    heap = IndexedHeap()
+    with pytest.raises(IndexError):
+        heap.pop()
+    with pytest.raises(KeyError):
+        heap.update("x", 1)
+    with pytest.raises(KeyError):
+        heap.remove("x")
+    heap.push("x", 2)
+    heap.push("x", 1)
+    assert len(heap) == 1 and heap.key("x") == 1 and "x" in heap
+
+
+def case(urgencia, tipos, estrato=None):
+    return {"nivel_urgencia": urgencia, "tipo_asistencia_requerida": tipos, "estado_socioeconomico": estrato}
+
+
+def test_queue_order_matches_current_scores():
+    rng = random.Random(3)
+    policy = TriagePolicy(CONFIG)
+    queue = TriageQueue(policy)
+    now = datetime.now()
+    records = {}
+    for index in range(300):
+        record = case(rng.choice(["Crítica", "Alta", "Media", "Baja", None]),
+                      rng.sample(["Alimentaria", "Salud", "Transporte", "Otra"], rng.randint(0, 2)),
+                      rng.choice(["Estrato 1", "Estrato 2", None]))
+        opened = now - timedelta(days=rng.randint(0, 30), minutes=index)
+        records[index] = (record, opened)
+        queue.upsert(index, record, opened)
+
+    for _ in range(50):
+        index = rng.randrange(300)
+        if index in queue:
+            if rng.random() < 0.5:
+                record = case("Crítica", ["Transporte"])
+                records[index] = (record, records[index][1])
+                queue.upsert(index, record, now)  # La apertura original se conserva
+            else:
+                queue.close(index)
+                del records[index]
+
+    expected = sorted(records, key=lambda index: -policy.score(records[index][0], records[index][1], now))
+    top = queue.top(40)
+    assert [item.case_id for item in top] == expected[:40]
+    for item in top:
+        assert item.score == pytest.approx(policy.score(*records[item.case_id], now), abs=1e-3)
+        assert item.opened == records[item.case_id][1]
+
+    salud = [index for index in expected if "salud" in policy.tipos(records[index][0])]
+    assert [item.case_id for item in queue.top(10, "Salud")] == salud[:10]
+
+
+def test_waiting_time_overtakes_base_score():
+    queue = TriageQueue(TriagePolicy(CONFIG))
+    now = datetime.now()
+    queue.upsert("nuevo", case("Alta", ["Salud"]), now)  # 40 + 12
+    queue.upsert("antiguo", case("Media", ["Salud"]), now - timedelta(days=15))  # 20 + 12 + 30 días de espera
+    queue.upsert("reciente", case("Media", ["Salud"]), now - timedelta(days=5))  # 20 + 12 + 10 días de espera
+    assert [item.case_id for item in queue.top(3)] == ["antiguo", "nuevo", "reciente"]
+
+    # Mismo puntaje y misma apertura: primero el que llegó antes
+    opened = now - timedelta(days=1)
+    for case_id in ("b", "a", "c"):
+        queue.upsert(case_id, case("Crítica", ["Alimentaria"]), opened)
+    assert [item.case_id for item in queue.top(3)] == ["b", "a", "c"]
+
+
+def test_type_views_follow_updates_and_take():
+    queue = TriageQueue(TriagePolicy(CONFIG))
+    now = datetime.now()
+    queue.upsert(1, case("Alta", ["Salud", "Transporte"]), now)
+    queue.upsert(2, case("Baja", ["Salud"]), now)
+    assert queue.types() == ["salud", "transporte"]
+
+    queue.upsert(1, case("Alta", ["Alimentaria"]))
+    assert queue.types() == ["alimentaria", "salud"]
+    assert [item.case_id for item in queue.top(5, "Salud")] == [2]
+    assert queue.top(5, "Transporte") == []
+
+    assert queue.take("alimentaria").case_id == 1
+    assert 1 not in queue and queue.top(5, "Alimentaria") == []
+    assert queue.next().case_id == 2
+    assert queue.close(2) and not queue.close(2)
+    assert queue.take() is None and len(queue) == 0
@@ -0,0 +1,51 @@
+"""Paridad de los validadores por lotes de utils con los escalares"""
+
+import random
+
+import pytest
+
+import utils
+
+EDGE_DOCUMENTS = ["", "   ", "12.345.678", "١٢٣٤٥٦٧٨", "12345", "AB123456", "1234567890123", "10 234 567 89",
+                  "1065123456", "X1234"]
+EDGE_EMAILS = ["", "a@b.co", "a@b.co\n", "ana@UPC.EDU.CO", "sin-arroba", "x@upc.edu.co.fake", "ñ@upc.edu.co",
+               "ana.diaz@upc.edu.co"]
+EDGE_PHONES = ["", "300 123 4567", "(605) 5712345", "2123456789", "5712345", "+57 300 123 4567", "³００1234567",
+               "3001234567"]
+DOCUMENT_TYPES = ["CC", "ce", "TI", "pasaporte", "PAS", "cedula_ciudadania"]
+
+
+def random_text(rng: random.Random, alphabet: str) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 14)))
+
+
+@pytest.mark.parametrize("document_type", DOCUMENT_TYPES)
+def test_document_numbers_single_type(document_type):
+    rng = random.Random(2)
+    documents = EDGE_DOCUMENTS + [random_text(rng, "0123456789 .-AB") for _ in range(2000)]
+    expected = [utils.validate_document_number(document, document_type) for document in documents]
+    assert utils.validate_document_numbers(documents, document_type).mask == expected
+
+
+def test_document_numbers_type_column():
+    documents = [document for document in EDGE_DOCUMENTS for _ in DOCUMENT_TYPES]
+    types = DOCUMENT_TYPES * len(EDGE_DOCUMENTS)
+    result = utils.validate_document_numbers(documents, types)
+    assert result.mask == [utils.validate_document_number(d, t) for d, t in zip(documents, types)]
+    assert all((reason is None) == valid for valid, reason in zip(result.mask, result.reasons))
+    with pytest.raises(ValueError):
+        utils.validate_document_numbers(documents, types[:-1])
+
+
+@pytest.mark.parametrize("institutional", [False, True])
+def test_emails(institutional):
+    rng = random.Random(3)
+    emails = EDGE_EMAILS + [random_text(rng, "ab.@-_ñUPCedu") for _ in range(2000)]
+    expected = [utils.validate_email(email, institutional) for email in emails]
+    assert utils.validate_emails(emails, institutional).mask == expected
+
+
+def test_phone_numbers():
+    rng = random.Random(4)
+    phones = EDGE_PHONES + [random_text(rng, "0123456789 +()-") for _ in range(2000)]
+    assert utils.validate_phone_numbers(phones).mask == [utils.validate_phone_number(phone) for phone in phones]
@@ -0,0 +1,121 @@
+"""Pruebas del veto automático de participación"""
+
+import random
+
+import pytest
+
+from services.veto import ESTADO_ACTIVO, ESTADO_VETADO, MOTIVO_PROMEDIO, VetoEngine, VetoPolicy, program_key
+
+CONFIG = {
+    "areas": ("deportes", "cultura"),
+    "promedio_minimo": 3.0,
+    "promedio_minimo_programa": {"Enfermería": 3.3},
+    "seguimiento_veto": ("Vetado", "Suspendido"),
+}
+
+
+def make_engine(records, area="deportes"):
+    engine = VetoEngine(VetoPolicy(CONFIG))
+    engine.enroll(records, area)
+    return engine
+
+
+def student(document, promedio, programa="Derecho", **extra):
+    return dict(numero_documento=document, programa_academico=programa, promedio_academico=promedio, **extra)
+
+
+@pytest.mark.parametrize("promedio, estado", [(2.99, ESTADO_VETADO), (3.0, ESTADO_ACTIVO), (3.01, ESTADO_ACTIVO),
+                                              (None, ESTADO_ACTIVO), (0.0, ESTADO_VETADO), (5.0, ESTADO_ACTIVO)])
+def test_minimum_is_inclusive(promedio, estado):
+    engine = make_engine([student("1", promedio)])
+    assert engine.state("1", "deportes") == estado
+
+
+def test_set_minimum_boundaries():
+    averages = {"a": 2.99, "b": 3.0, "c": 3.1, "d": 3.19, "e": 3.2, "f": 3.21}
+    engine = make_engine([student(document, average) for document, average in averages.items()])
+    engine.evaluated = 0
+
+    raised = engine.set_minimum("Derecho", 3.2)
+    assert [(change.participant, change.current, change.reason) for change in sorted(raised)] == [
+        ("b", ESTADO_VETADO, MOTIVO_PROMEDIO), ("c", ESTADO_VETADO, MOTIVO_PROMEDIO),
+        ("d", ESTADO_VETADO, MOTIVO_PROMEDIO)]
+    assert all(change.promedio_minimo == 3.2 for change in raised)
+    # Solo se reevalúa el rango [3.0, 3.2)
+    assert engine.evaluated == 3
+
+    lowered = engine.set_minimum("Derecho", 3.1)
+    assert sorted(change.participant for change in lowered) == ["c", "d"]
+    assert all(change.current == ESTADO_ACTIVO and change.reason is None for change in lowered)
+    assert {document: engine.state(document, "deportes") for document in averages} == {
+        "a": ESTADO_VETADO, "b": ESTADO_VETADO, "c": ESTADO_ACTIVO, "d": ESTADO_ACTIVO,
+        "e": ESTADO_ACTIVO, "f": ESTADO_ACTIVO}
+
+    assert engine.set_minimum("Derecho", 3.1) == []
+
+
+def test_default_minimum_skips_programs_with_their_own():
+    engine = make_engine([student("1", 3.1), student("2", 3.1, programa="Enfermería ")])
+    assert engine.state("2", "deportes") == ESTADO_VETADO
+    changes = engine.set_minimum(None, 3.5)
+    assert [change.participant for change in changes] == ["1"]
+    assert engine.set_minimum("enfermeria", 3.0)[0].participant == "2"
+    assert engine.state("2", "deportes") == ESTADO_ACTIVO
+
+
+def test_flagged_and_other_states_are_not_lifted():
+    engine = make_engine([
+        student("1", 2.5, seguimiento_administrador="suspendido"),
+        student("2", 2.5, estado_participacion="Retirado"),
+    ])
+    assert engine.state("1", "deportes") == ESTADO_VETADO
+    assert engine.set_minimum("Derecho", 2.0) == []
+    assert engine.state("1", "deportes") == ESTADO_VETADO
+    assert engine.state("2", "deportes") == "Retirado"
+    changes = engine.apply_flags({"1": None})
+    assert [(change.participant, change.current) for change in changes] == [("1", ESTADO_ACTIVO)]
+
+
+def test_changes_reach_sinks_in_sequence():
+    received = []
+    engine = VetoEngine(VetoPolicy(CONFIG), sinks=[received.extend])
+    engine.enroll([student("1", 2.0)], "deportes")
+    engine.enroll([student("1", 2.0)], "cultura")
+    engine.apply_grades({"1": 3.5, "desconocido": 1.0})
+    assert [(change.area, change.current) for change in received] == [
+        ("deportes", ESTADO_VETADO), ("cultura", ESTADO_VETADO),
+        ("deportes", ESTADO_ACTIVO), ("cultura", ESTADO_ACTIVO)]
+    assert [change.sequence for change in received] == [1, 2, 3, 4]
+    with pytest.raises(ValueError):
+        engine.enroll([student("1", 2.0)], "salud")
+
+
+def test_incremental_matches_full_evaluation():
+    rng = random.Random(5)
+    programs = ["Derecho", "Enfermería", "Licenciatura en Música"]
+    records = [student(str(index), rng.choice([None, round(rng.uniform(2.0, 4.5), 2)]), rng.choice(programs),
+                       seguimiento_administrador=rng.choice(["", "", "", "Vetado"]))
+               for index in range(400)]
+    engine = make_engine(records)
+    flags = {record["numero_documento"]: engine.policy.flagged(record["seguimiento_administrador"])
+             for record in records}
+    averages = {record["numero_documento"]: record["promedio_academico"] for record in records}
+    program_of = {record["numero_documento"]: program_key(record["programa_academico"]) for record in records}
+
+    for _ in range(30):
+        if rng.random() < 0.5:
+            engine.set_minimum(rng.choice(programs + [None]), round(rng.uniform(2.5, 4.0), 2))
+        else:
+            batch = {str(rng.randrange(400)): round(rng.uniform(2.0, 4.5), 2) for _ in range(20)}
+            averages.update(batch)
+            engine.apply_grades(batch)
+        for document, average in averages.items():
+            reason = engine.policy.reason(program_of[document], average, flags[document])
+            expected = ESTADO_VETADO if reason else ESTADO_ACTIVO
+            assert engine.state(document, "deportes") == expected, document
+
+
+def test_at_risk_is_sorted_and_excludes_flagged():
+    engine = make_engine([student("1", 3.15), student("2", 3.05), student("3", 3.2),
+                          student("4", 3.1, seguimiento_administrador="Vetado"), student("5", 2.9)])
+    assert engine.at_risk("Derecho", margin=0.2) == [("2", 3.05), ("1", 3.15)]
@@ -3,11 +3,68 @@ Utilidades generales del sistema
 Funciones auxiliares para validación, formateo y operaciones comunes
 """
 
+import base64
+import json
 import re
-from typing import Any, Dict, List, Optional
+import unicodedata
+from array import array
+from collections.abc import Sequence, Sized
+from itertools import dropwhile, islice
+from operator import itemgetter, length_hint
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 from datetime import datetime, date
 from enum import Enum
 
+# Patrones precompilados (evitan la consulta a la caché de `re` en cada llamada)
+NON_DIGIT_PATTERN = re.compile(r'[^0-9]')
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+INSTITUTIONAL_EMAIL_DOMAIN = '@upc.edu.co'
+
+# Longitud permitida por tipo de documento: (mínimo, máximo, solo_digitos)
+DOCUMENT_LENGTH_RULES = {
+    'cc': (6, 12, True),
+    'cedula_ciudadania': (6, 12, True),
+    'ce': (6, 12, True),
+    'cedula_extranjeria': (6, 12, True),
+    'ti': (10, 11, True),
+    'tarjeta_identidad': (10, 11, True),
+    'pasaporte': (6, 15, False),  # Puede tener letras
+}
+
+# Prefijo del código de usuario por rol/estamento
+ROLE_PREFIXES = {
+    'estudiante': 'EST',
+    'profesor': 'PROF',
+    'docente': 'PROF',
+    'administrativo': 'ADM',
+    'egresado': 'EGR'
+}
+
+# Códigos de motivo para la validación por lotes
+REASON_EMPTY = 'empty'
+REASON_INVALID_LENGTH = 'invalid_length'
+REASON_INVALID_FORMAT = 'invalid_format'
+REASON_INVALID_PREFIX = 'invalid_prefix'
+REASON_UNKNOWN_TYPE = 'unknown_type'
+REASON_NOT_INSTITUTIONAL = 'not_institutional'
+
+
+class BatchValidation(NamedTuple):
+    """Resultado de validar una columna: máscara booleana y motivo de rechazo por valor"""
+    mask: List[bool]
+    reasons: List[Optional[str]]
+
+    @property
+    def valid_count(self) -> int:
+        return sum(self.mask)
+
+
+def _digits_only(value: str) -> str:
+    """Equivalente a re.sub(r'[^0-9]', '', value) con atajo para cadenas ya limpias"""
+    if value.isascii() and value.isdigit():
+        return value
+    return NON_DIGIT_PATTERN.sub('', value)
+
 def validate_document_number(document_number: str, document_type: str) -> bool:
     """
     Valida el número de documento según el tipo
@@ -22,20 +79,16 @@ def validate_document_number(document_number: str, document_type: str) -> bool:
     if not document_number or not document_number.strip():
         return False
     
-    # Remover espacios y caracteres especiales
-    clean_number = re.sub(r'[^0-9]', '', document_number)
-    
     # Validaciones específicas por tipo
-    if document_type.lower() in ['cc', 'cedula_ciudadania']:
-        return 6 <= len(clean_number) <= 12
-    elif document_type.lower() in ['ce', 'cedula_extranjeria']:
-        return 6 <= len(clean_number) <= 12
-    elif document_type.lower() in ['ti', 'tarjeta_identidad']:
-        return 10 <= len(clean_number) <= 11
-    elif document_type.lower() == 'pasaporte':
-        return 6 <= len(document_number) <= 15  # Puede tener letras
+    rule = DOCUMENT_LENGTH_RULES.get(document_type.lower())
+    if rule is None:
+        return False
     
-    return False
+    min_length, max_length, digits_only = rule
+    if digits_only:
+        # Remover espacios y caracteres especiales
+        return min_length <= len(_digits_only(document_number)) <= max_length
+    return min_length <= len(document_number) <= max_length
 
 def validate_email(email: str, is_institutional: bool = False) -> bool:
     """
@@ -52,14 +105,12 @@ def validate_email(email: str, is_institutional: bool = False) -> bool:
         return False
     
     # Patrón básico de email
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
-    if not re.match(email_pattern, email):
+    if not EMAIL_PATTERN.match(email):
         return False
     
     # Validar dominio institucional si es requerido
     if is_institutional:
-        return email.lower().endswith('@upc.edu.co')
+        return email.lower().endswith(INSTITUTIONAL_EMAIL_DOMAIN)
     
     return True
 
@@ -77,7 +128,7 @@ def validate_phone_number(phone: str) -> bool:
         return False
     
     # Remover espacios y caracteres especiales
-    clean_phone = re.sub(r'[^0-9]', '', phone)
+    clean_phone = _digits_only(phone)
     
     # Validar longitud y formato colombiano
     if len(clean_phone) == 10:
@@ -89,6 +140,113 @@ def validate_phone_number(phone: str) -> bool:
     
     return False
 
+# Validadores por columna: la máscara y el motivo de cada rechazo, con el mismo resultado
+# que los escalares (tests/test_utils_batch.py). No son una ruta vectorizada ni una
+# optimización: el costo por valor es el de la expresión regular y la limpieza de dígitos,
+# igual que en el ciclo escalar (benchmarks/bench_utils_batch.py). Una sola pasada de `re`
+# sobre la columna unida cuesta lo mismo y numpy no es dependencia del proyecto.
+
+def _batch_result(reasons: List[Optional[str]]) -> BatchValidation:
+    """Construye la máscara a partir de los motivos (None = válido)"""
+    return BatchValidation([reason is None for reason in reasons], reasons)
+
+def validate_document_numbers(document_numbers: Iterable[str],
+                              document_types: Union[str, Iterable[str]]) -> BatchValidation:
+    """
+    Valida una columna de números de documento (equivale a validate_document_number por valor)
+    
+    Args:
+        document_numbers: Columna de números (lista, generador o arreglo de strings)
+        document_types: Tipo único para toda la columna o columna de tipos alineada
+        
+    Returns:
+        BatchValidation con la máscara de válidos y el motivo de cada rechazo
+    """
+    if isinstance(document_types, str):
+        single_rule = DOCUMENT_LENGTH_RULES.get(document_types.lower())
+        pairs = ((number, single_rule) for number in document_numbers)
+    else:
+        if hasattr(document_numbers, '__len__') and hasattr(document_types, '__len__'):
+            if len(document_numbers) != len(document_types):
+                raise ValueError("Las columnas de números y tipos de documento deben tener la misma longitud")
+        rules_by_type: Dict[str, Any] = {}
+        
+        def rule_for(document_type: str):
+            try:
+                return rules_by_type[document_type]
+            except KeyError:
+                rule = rules_by_type[document_type] = DOCUMENT_LENGTH_RULES.get(document_type.lower())
+                return rule
+        
+        pairs = ((number, rule_for(document_type))
+                 for number, document_type in zip(document_numbers, document_types))
+    
+    reasons: List[Optional[str]] = []
+    append = reasons.append
+    for number, rule in pairs:
+        if not number or not number.strip():
+            append(REASON_EMPTY)
+            continue
+        if rule is None:
+            append(REASON_UNKNOWN_TYPE)
+            continue
+        min_length, max_length, digits_only = rule
+        length = len(_digits_only(number)) if digits_only else len(number)
+        append(None if min_length <= length <= max_length else REASON_INVALID_LENGTH)
+    return _batch_result(reasons)
+
+def validate_emails(emails: Iterable[str], is_institutional: bool = False) -> BatchValidation:
+    """
+    Valida una columna de emails (equivale a validate_email por valor)
+    
+    Args:
+        emails: Columna de emails
+        is_institutional: Si deben ser emails institucionales
+        
+    Returns:
+        BatchValidation con la máscara de válidos y el motivo de cada rechazo
+    """
+    match = EMAIL_PATTERN.match
+    reasons: List[Optional[str]] = []
+    append = reasons.append
+    for email in emails:
+        if not email:
+            append(REASON_EMPTY)
+        elif not match(email):
+            append(REASON_INVALID_FORMAT)
+        elif is_institutional and not email.lower().endswith(INSTITUTIONAL_EMAIL_DOMAIN):
+            append(REASON_NOT_INSTITUTIONAL)
+        else:
+            append(None)
+    return _batch_result(reasons)
+
+def validate_phone_numbers(phones: Iterable[str]) -> BatchValidation:
+    """
+    Valida una columna de teléfonos (equivale a validate_phone_number por valor)
+    
+    Args:
+        phones: Columna de números telefónicos
+        
+    Returns:
+        BatchValidation con la máscara de válidos y el motivo de cada rechazo
+    """
+    reasons: List[Optional[str]] = []
+    append = reasons.append
+    for phone in phones:
+        if not phone:
+            append(REASON_EMPTY)
+            continue
+        clean_phone = _digits_only(phone)
+        length = len(clean_phone)
+        if length == 10:
+            # Celular: inicia con 3
+            append(None if clean_phone[0] == '3' else REASON_INVALID_PREFIX)
+        elif length == 7:
+            append(None)
+        else:
+            append(REASON_INVALID_LENGTH)
+    return _batch_result(reasons)
+
 def calculate_age(birth_date: date) -> int:
     """
     Calcula la edad basada en la fecha de nacimiento
@@ -135,6 +293,164 @@ def format_document_number(document_number: str) -> str:
     
     return clean_number
 
+# Formatos de fecha aceptados por safe_cast (en orden de prueba)
+DATETIME_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y')
+
+# Carácter que debe contener una cadena para poder coincidir con cada formato
+_FORMAT_MARKERS = {
+    '%Y-%m-%d %H:%M:%S': ':',
+    '%Y-%m-%d': '-',
+    '%d/%m/%Y': '/',
+    '%d-%m-%Y': '-',
+}
+
+# Valor "NaT" (fecha nula) compatible con numpy.datetime64
+NAT = -2 ** 63
+EPOCH = datetime(1970, 1, 1)
+
+# Forma canónica exacta de los formatos ISO: fromisoformat aceptaría además zonas horarias,
+# fracciones de segundo y otros separadores que strptime rechaza
+_ISO_DATETIME = re.compile(r'\d{4}-\d\d-\d\d \d\d:\d\d:\d\d', re.ASCII)
+_ISO_DATE = re.compile(r'\d{4}-\d\d-\d\d', re.ASCII)
+
+def _fast_iso_datetime(value: str) -> Optional[datetime]:
+    if len(value) == 19 and _ISO_DATETIME.fullmatch(value):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+def _fast_iso_date(value: str) -> Optional[datetime]:
+    if len(value) == 10 and _ISO_DATE.fullmatch(value):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+def _fast_day_first(separator: str) -> Callable[[str], Optional[datetime]]:
+    def parse(value: str) -> Optional[datetime]:
+        if (len(value) == 10 and value[2] == separator and value[5] == separator
+                and value.isascii() and value[:2].isdigit() and value[3:5].isdigit() and value[6:].isdigit()):
+            try:
+                return datetime(int(value[6:]), int(value[3:5]), int(value[:2]))
+            except ValueError:
+                return None
+        return None
+    return parse
+
+# Atajos sin strptime para la forma canónica (con ceros) de cada formato
+_FAST_PARSERS = {
+    '%Y-%m-%d %H:%M:%S': _fast_iso_datetime,
+    '%Y-%m-%d': _fast_iso_date,
+    '%d/%m/%Y': _fast_day_first('/'),
+    '%d-%m-%Y': _fast_day_first('-'),
+}
+
+class DateTimeParser:
+    """
+    Parser de fechas por columna con detección de formato
+    
+    Acepta exactamente los mismos textos que safe_cast(valor, datetime). El
+    primer formato que funciona queda fijo y se prueba primero en los valores
+    siguientes; las formas canónicas se convierten sin strptime.
+    """
+    
+    __slots__ = ('formats', 'detected')
+    
+    def __init__(self, formats: Iterable[str] = DATETIME_FORMATS):
+        self.formats = tuple(formats)
+        self.detected: Optional[str] = None
+    
+    def _candidates(self) -> Iterable[str]:
+        detected = self.detected
+        if detected is None:
+            return self.formats
+        return (detected,) + tuple(fmt for fmt in self.formats if fmt != detected)
+    
+    def parse(self, value: str) -> Optional[datetime]:
+        """
+        Convierte un texto a datetime
+        
+        Args:
+            value: Texto con la fecha
+            
+        Returns:
+            datetime o None si ningún formato coincide
+        """
+        detected = self.detected
+        if detected is not None:
+            fast = _FAST_PARSERS.get(detected)
+            parsed = fast(value) if fast is not None else None
+            if parsed is not None:
+                return parsed
+        for fmt in self._candidates():
+            if _FORMAT_MARKERS.get(fmt, '') not in value:
+                continue
+            fast = _FAST_PARSERS.get(fmt)
+            parsed = fast(value) if fast is not None else None
+            if parsed is None:
+                try:
+                    parsed = datetime.strptime(value, fmt)
+                except ValueError:
+                    continue
+            self.detected = fmt
+            return parsed
+        return None
+    
+    def parse_column(self, values: Iterable[Any]) -> List[Optional[datetime]]:
+        """
+        Convierte una columna completa; valores no convertibles quedan en None
+        
+        Args:
+            values: Columna de textos (los datetime se conservan)
+            
+        Returns:
+            Lista de datetime o None
+        """
+        parse = self.parse
+        return [
+            value if isinstance(value, datetime)
+            else parse(value) if isinstance(value, str)
+            else None
+            for value in values
+        ]
+    
+    def parse_array(self, values: Iterable[Any]) -> array:
+        """
+        Convierte una columna a un arreglo int64 de microsegundos desde 1970-01-01
+        
+        El arreglo es compatible con numpy sin copia:
+        `numpy.frombuffer(resultado, dtype='datetime64[us]')`; los valores no
+        convertibles quedan como NAT.
+        
+        Args:
+            values: Columna de textos
+            
+        Returns:
+            array('q') con microsegundos desde la época
+        """
+        result = array('q')
+        append = result.append
+        for parsed in self.parse_column(values):
+            if parsed is None:
+                append(NAT)
+                continue
+            delta = parsed.replace(tzinfo=None) - EPOCH
+            append((delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+        return result
+
+_default_datetime_parser = DateTimeParser()
+
+def parse_datetime_column(values: Iterable[Any]) -> List[Optional[datetime]]:
+    """Convierte una columna de textos a datetime con detección de formato"""
+    return DateTimeParser().parse_column(values)
+
+def parse_datetime_array(values: Iterable[Any]) -> array:
+    """Convierte una columna de textos a un arreglo int64 (microsegundos, estilo datetime64)"""
+    return DateTimeParser().parse_array(values)
+
 def safe_cast(value: Any, target_type: type, default: Any = None) -> Any:
     """
     Convierte un valor a un tipo específico de forma segura
@@ -154,42 +470,37 @@ def safe_cast(value: Any, target_type: type, default: Any = None) -> Any:
             return bool(value)
         elif target_type == datetime:
             if isinstance(value, str):
-                # Intentar varios formatos
-                formats = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y']
-                for fmt in formats:
-                    try:
-                        return datetime.strptime(value, fmt)
-                    except ValueError:
-                        continue
+                # Intentar varios formatos (ver DATETIME_FORMATS)
+                parsed = _default_datetime_parser.parse(value)
+                if parsed is not None:
+                    return parsed
             return target_type(value)
         else:
             return target_type(value)
     except (ValueError, TypeError):
         return default
 
-def generate_user_code(role: str, document_number: str) -> str:
+def generate_user_code(role: str, document_number: str, suffix_length: int = 6) -> str:
     """
-    Genera un código de usuario único
+    Genera un código de usuario a partir del rol y el documento
+    
+    El código no es único por sí solo (dos documentos pueden terminar en los
+    mismos dígitos); para asignar códigos sin colisiones usar
+    services.identity.IdentityIndex.
     
     Args:
         role: Rol del usuario
         document_number: Número de documento
+        suffix_length: Cantidad de dígitos finales del documento a usar
         
     Returns:
-        Código único del usuario
+        Código del usuario
     """
-    role_prefixes = {
-        'estudiante': 'EST',
-        'profesor': 'PROF',
-        'administrativo': 'ADM',
-        'egresado': 'EGR'
-    }
-    
-    prefix = role_prefixes.get(role.lower(), 'USR')
-    clean_doc = re.sub(r'[^0-9]', '', document_number)
+    prefix = ROLE_PREFIXES.get(role.lower(), 'USR')
+    clean_doc = _digits_only(document_number)
     
-    # Tomar últimos 6 dígitos del documento
-    doc_suffix = clean_doc[-6:] if len(clean_doc) >= 6 else clean_doc
+    # Tomar últimos dígitos del documento (6 por defecto)
+    doc_suffix = clean_doc[-suffix_length:] if len(clean_doc) >= suffix_length else clean_doc
     
     return f"{prefix}{doc_suffix}"
 
@@ -216,6 +527,22 @@ def sanitize_string(input_string: str, max_length: Optional[int] = None) -> str:
     
     return cleaned
 
+def normalize_text(input_string: str) -> str:
+    """
+    Normaliza texto para búsquedas: sanitize_string, minúsculas y sin tildes
+    
+    Args:
+        input_string: Texto a normalizar
+        
+    Returns:
+        Texto ASCII en minúsculas ("Atención médica" -> "atencion medica");
+        se descartan los caracteres sin equivalente ASCII
+    """
+    cleaned = sanitize_string(input_string).lower()
+    if cleaned.isascii():
+        return cleaned
+    return unicodedata.normalize('NFKD', cleaned).encode('ascii', 'ignore').decode('ascii')
+
 def enum_to_dict(enum_class: Enum) -> Dict[str, str]:
     """
     Convierte un Enum a diccionario para serialización
@@ -228,25 +555,39 @@ def enum_to_dict(enum_class: Enum) -> Dict[str, str]:
     """
     return {item.name: item.value for item in enum_class}
 
-def paginate_results(data: List[Any], page: int = 1, per_page: int = 10) -> Dict[str, Any]:
+def paginate_results(data: Iterable[Any], page: int = 1, per_page: int = 10) -> Dict[str, Any]:
     """
     Pagina una lista de resultados
     
+    Se mantiene por compatibilidad: las secuencias se cortan directamente
+    (slice) y los iteradores (ej. un generador) delegan en paginate_cursor
+    con la posición de cada elemento como llave, de modo que solo se
+    consumen los elementos hasta la página pedida (los totales quedan en
+    None). Con page <= 0 la página viene vacía (antes un page negativo
+    cortaba desde el final de la lista). Para listados grandes usar
+    paginate_cursor directamente.
+    
     Args:
-        data: Lista de datos
+        data: Lista de datos (o iterable)
         page: Página actual (inicia en 1)
         per_page: Elementos por página
         
     Returns:
         Diccionario con datos paginados y metadatos
     """
-    total_items = len(data)
-    total_pages = (total_items + per_page - 1) // per_page
-    
     start_index = (page - 1) * per_page
-    end_index = start_index + per_page
-    
-    paginated_data = data[start_index:end_index]
+    if isinstance(data, Sequence):
+        paginated_data = data[start_index:start_index + per_page] if page >= 1 else data[0:0]
+        total_items = len(data)
+        total_pages = (total_items + per_page - 1) // per_page
+        has_next = page < total_pages
+    else:
+        # Cursor justo después de la posición start_index - 1 (las posiciones no se repiten)
+        cursor = encode_cursor(start_index - 1, 1) if page > 1 else None
+        result = paginate_cursor(enumerate(data), itemgetter(0), cursor, per_page)
+        paginated_data = [item for _, item in result['data']] if page >= 1 else []
+        total_items = total_pages = None
+        has_next = page >= 1 and result['pagination']['has_next']
     
     return {
         'data': paginated_data,
@@ -255,7 +596,161 @@ def paginate_results(data: List[Any], page: int = 1, per_page: int = 10) -> Dict
             'per_page': per_page,
             'total_items': total_items,
             'total_pages': total_pages,
-            'has_next': page < total_pages,
+            'has_next': has_next,
             'has_prev': page > 1
         }
-    }
\ No newline at end of file
+    }
+
+def _tag_cursor_value(value: Any) -> List[Any]:
+    """Valor de la llave de orden en JSON conservando fechas y tuplas (también anidadas)"""
+    if isinstance(value, datetime):
+        return ['dt', value.isoformat()]
+    if isinstance(value, date):
+        return ['d', value.isoformat()]
+    if isinstance(value, tuple):
+        return ['t', [_tag_cursor_value(item) for item in value]]
+    if isinstance(value, list):
+        return ['l', [_tag_cursor_value(item) for item in value]]
+    return ['v', value]
+
+def _untag_cursor_value(tagged: Any) -> Any:
+    tag, value = tagged
+    if tag == 'dt':
+        return datetime.fromisoformat(value)
+    if tag == 'd':
+        return date.fromisoformat(value)
+    if tag == 't':
+        return tuple(_untag_cursor_value(item) for item in value)
+    if tag == 'l':
+        return [_untag_cursor_value(item) for item in value]
+    if tag == 'v':
+        return value
+    raise ValueError(f"Etiqueta de cursor desconocida: {tag}")
+
+def encode_cursor(sort_value: Any, ties: int = 0) -> str:
+    """
+    Codifica la posición de paginación en un token opaco
+    
+    Args:
+        sort_value: Valor de la llave de orden del último elemento entregado;
+                    puede ser una tupla, ej. (update_date, numero_documento)
+        ties: Elementos ya entregados con ese mismo valor (empates)
+        
+    Returns:
+        Token URL-safe
+    """
+    payload = json.dumps([_tag_cursor_value(sort_value), ties], separators=(',', ':'), ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token: str) -> Tuple[Any, int]:
+    """
+    Decodifica un token generado por encode_cursor
+    
+    Args:
+        token: Token de continuación
+        
+    Returns:
+        Tupla (valor de la llave de orden, empates ya entregados)
+        
+    Raises:
+        ValueError: Si el token es inválido
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        tagged, ties = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return _untag_cursor_value(tagged), int(ties)
+    except (ValueError, TypeError, UnicodeError) as error:
+        raise ValueError(f"Cursor de paginación inválido: {token}") from error
+
+def _seek_sequence(data: Sequence, key: Callable[[Any], Any], value: Any, descending: bool) -> int:
+    """Búsqueda binaria del primer índice cuya llave no precede a `value`"""
+    low, high = 0, len(data)
+    while low < high:
+        middle = (low + high) // 2
+        current = key(data[middle])
+        precedes = current > value if descending else current < value
+        if precedes:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+def paginate_cursor(source: Iterable[Any], sort_key: Union[str, Callable[[Any], Any]],
+                    cursor: Optional[str] = None, per_page: int = 10,
+                    descending: bool = False, include_total: bool = False) -> Dict[str, Any]:
+    """
+    Paginación por llave (keyset) con token de continuación
+    
+    La fuente debe venir ordenada por `sort_key` (ascendente, o descendente si
+    `descending`). Con secuencias (listas) la página se ubica por búsqueda
+    binaria; con iteradores se descartan los elementos anteriores al cursor
+    sin materializarlos. En ambos casos solo se construye la página pedida.
+    
+    Args:
+        source: Secuencia o iterador ordenado
+        sort_key: Nombre del campo (ej. 'update_date', 'numero_documento') o función llave
+        cursor: Token de la página anterior (None para la primera página)
+        per_page: Elementos por página
+        descending: Si la fuente está en orden descendente
+        include_total: Incluir total de elementos (exacto para secuencias, estimado para iteradores)
+        
+    Returns:
+        Diccionario con datos paginados y metadatos ('next_cursor' es None en la última página)
+    """
+    if per_page < 1:
+        raise ValueError("per_page debe ser mayor que cero")
+    key = itemgetter(sort_key) if isinstance(sort_key, str) else sort_key
+    cursor_value, cursor_ties = decode_cursor(cursor) if cursor else (None, 0)
+    
+    total_items = None
+    total_is_estimate = False
+    if include_total:
+        if isinstance(source, Sized):
+            total_items = len(source)
+        else:
+            total_items = length_hint(source) or None
+            total_is_estimate = True
+    
+    if isinstance(source, Sequence):
+        start_index = 0
+        if cursor is not None:
+            start_index = _seek_sequence(source, key, cursor_value, descending) + cursor_ties
+        window = list(source[start_index:start_index + per_page + 1])
+    else:
+        iterator = iter(source)
+        if cursor is not None:
+            if descending:
+                iterator = dropwhile(lambda item: key(item) > cursor_value, iterator)
+            else:
+                iterator = dropwhile(lambda item: key(item) < cursor_value, iterator)
+            # Saltar los empates ya entregados en la página anterior
+            iterator = islice(iterator, cursor_ties, None)
+        window = list(islice(iterator, per_page + 1))
+    
+    page_data = window[:per_page]
+    has_next = len(window) > per_page
+    
+    next_cursor = None
+    if has_next:
+        last_value = key(page_data[-1])
+        ties = 0
+        for item in reversed(page_data):
+            if key(item) != last_value:
+                break
+            ties += 1
+        if ties == len(page_data) and cursor is not None and cursor_value == last_value:
+            ties += cursor_ties
+        next_cursor = encode_cursor(last_value, ties)
+    
+    return {
+        'data': page_data,
+        'pagination': {
+            'per_page': per_page,
+            'cursor': cursor,
+            'next_cursor': next_cursor,
+            'has_next': has_next,
+            'has_prev': cursor is not None,
+            'total_items': total_items,
+            'total_is_estimate': total_is_estimate
+        }
+    }